@@ -9,6 +9,8 @@ import kotlinx.serialization.Serializable
 import kotlinx.serialization.Transient
 import kotlinx.serialization.encodeToString
 import kotlinx.serialization.json.Json
+import kotlinx.serialization.json.JsonArray
+import kotlinx.serialization.json.decodeFromJsonElement
 import org.gradle.api.DefaultTask
 import org.gradle.api.GradleException
 import org.gradle.api.file.DuplicatesStrategy
@@ -23,6 +25,7 @@ import java.io.File
 import java.nio.file.FileSystems
 import java.nio.file.Files
 import java.nio.file.StandardOpenOption
+import java.security.MessageDigest
 import java.util.zip.ZipFile
 
 /*
@@ -45,6 +48,15 @@ open class RepoTask : DefaultTask() {
         }
     }
 
+    // js-sources' js-index.json carries more per source than the repo index
+    // (pkg, version, icon) and a numeric id
+    private val distIndexJson by lazy {
+        Json {
+            ignoreUnknownKeys = true
+            isLenient = true
+        }
+    }
+
     init {
         val repoTask = this
         project.gradle.projectsEvaluated {
@@ -69,14 +81,14 @@ open class RepoTask : DefaultTask() {
         generateJars(apkDir, repoDir)
 
         // Generate JS bundles for iOS
-        val jsSources = generateJsBundles(jsDir)
+        val jsIndex = generateJsBundles(jsDir)
 
         val rawBadgings = parseBadgings(apkDir) ?: return
         val badgings = ensureValidState(rawBadgings)
         extractIcons(apkDir, iconDir, badgings)
 
         // Generate repo index with JS info
-        generateRepo(repoDir, badgings, jsSources)
+        generateRepo(repoDir, badgings, jsIndex)
 
         // Create .gitignore
         createGitignore(repoDir)
@@ -90,73 +102,95 @@ open class RepoTask : DefaultTask() {
     }
 
     /**
-     * Generate JS bundles for iOS and return list of JS source info.
+     * Copy the JS bundles for iOS and return the JS index for the repo.
      *
-     * All JS-enabled sources are compiled into a single bundle (sources-bundle.js).
-     * Each source has its own init function (e.g., initFreeWebNovelKmp).
-     * The iOS app loads the bundle once and calls the appropriate init function.
+     * In a split js-sources build (-Pireader.js.split=true) every JS-enabled source
+     * has its own bundle (<lang>-<id>.js) with only its code, and what the sources
+     * share is in the runtime files (runtime.js, shared.js). The iOS app evaluates
+     * the runtime files once, then a source's bundle when the source is first used,
+     * and calls its init function (e.g. initFreeWebNovelKmp). Otherwise every source
+     * points at sources-bundle.js, with every source and dependency, which is
+     * published either way for clients that load everything at once.
      */
-    private fun generateJsBundles(jsDir: File): List<JsSourceInfo> {
+    private fun generateJsBundles(jsDir: File): JsIndex? {
         jsDir.mkdirs()
-        val jsSources = mutableListOf<JsSourceInfo>()
 
-        // Copy webpack bundled JS from js-sources module (self-contained, includes all deps)
-        val webpackDir = File(project.rootDir, "js-sources/build/kotlin-webpack/js/productionExecutable")
         val jsSourcesDistDir = File(project.rootDir, "js-sources/build/js-dist")
+        val indexFile = File(jsSourcesDistDir, "js-index.json")
+        val bundleFile = File(jsSourcesDistDir, "sources-bundle.js")
 
-        if (webpackDir.exists()) {
-            print("Copying JS sources from js-sources module (webpack bundle)...\n")
+        if (!bundleFile.exists()) {
+            print("No JS bundles found. Run ':js-sources:createSourceIndex' first to generate JS output.\n")
+            return null
+        }
 
-            // Parse js-sources index.json to get source info
-            val indexFile = File(jsSourcesDistDir, "index.json")
-            if (indexFile.exists()) {
-                try {
-                    val indexJson = Json.decodeFromString<JsIndex>(indexFile.readText())
-
-                    // Copy the single webpack bundle (contains ALL sources)
-                    val bundleFile = File(webpackDir, "sources-bundle.js")
-                    if (bundleFile.exists()) {
-                        val destFile = File(jsDir, "sources-bundle.js")
-                        bundleFile.copyTo(destFile, overwrite = true)
-                        print("  - ${destFile.name} (${destFile.length() / 1024}KB) - contains ${indexJson.sources.size} source(s)\n")
-
-                        // Copy source map
-                        val mapFile = File(webpackDir, "sources-bundle.js.map")
-                        if (mapFile.exists()) {
-                            mapFile.copyTo(File(jsDir, "sources-bundle.js.map"), overwrite = true)
-                        }
+        print("Copying JS sources from js-sources module (webpack bundles)...\n")
 
-                        // Add each source to the index (all use the same bundle file)
-                        indexJson.sources.forEach { source ->
-                            jsSources.add(JsSourceInfo(
-                                id = source.id,
-                                name = source.name,
-                                lang = source.lang,
-                                file = "sources-bundle.js",  // All sources share the same bundle
-                                initFunction = source.initFunction
-                            ))
-                            print("    - ${source.name} (${source.lang}) -> ${source.initFunction}()\n")
-                        }
-                    }
-                } catch (e: Exception) {
-                    print("Warning: Could not parse js-sources index.json: ${e.message}\n")
-                }
+        // Hashes are taken from the copies, so the index matches what is published
+        fun copyBundle(name: String): JsBundle? {
+            val source = File(jsSourcesDistDir, name)
+            if (!source.exists()) {
+                print("Warning: $name is missing from js-sources/build/js-dist\n")
+                return null
+            }
+            val dest = source.copyTo(File(jsDir, name), overwrite = true)
+            File(jsSourcesDistDir, "$name.map").takeIf { it.exists() }?.copyTo(File(jsDir, "$name.map"), overwrite = true)
+            return JsBundle(name, sha256(dest), dest.length())
+        }
+
+        if (!indexFile.exists()) {
+            // Fallback: just copy the bundle file
+            val destFile = bundleFile.copyTo(File(jsDir, "sources.js"), overwrite = true)
+            print("  - ${destFile.name} (${destFile.length() / 1024}KB)\n")
+            return null
+        }
+
+        // Version 1 (no split) is a plain array of sources, all in sources-bundle.js
+        val index = try {
+            val element = distIndexJson.parseToJsonElement(indexFile.readText())
+            if (element is JsonArray) {
+                JsIndex(sources = distIndexJson.decodeFromJsonElement<List<JsIndexSource>>(element))
             } else {
-                // Fallback: just copy the bundle file
-                val bundleFile = File(webpackDir, "sources-bundle.js")
-                if (bundleFile.exists()) {
-                    val destFile = File(jsDir, "sources.js")
-                    bundleFile.copyTo(destFile, overwrite = true)
-                    print("  - ${destFile.name} (${destFile.length() / 1024}KB)\n")
-                }
+                distIndexJson.decodeFromJsonElement<JsIndex>(element)
             }
-        } else {
-            print("No JS bundles found. Run ':js-sources:jsBrowserProductionWebpack' first to generate JS output.\n")
+        } catch (e: Exception) {
+            print("Warning: Could not parse js-sources js-index.json: ${e.message}\n")
+            return null
+        }
+
+        val bundle = copyBundle(bundleFile.name)
+        val runtime = index.runtime.mapNotNull { copyBundle(it.file) }
+        runtime.forEach { print("  - ${it.file} (${(it.size ?: 0) / 1024}KB) - shared runtime\n") }
+        bundle?.let { print("  - ${it.file} (${(it.size ?: 0) / 1024}KB) - all ${index.sources.size} source(s)\n") }
+
+        if (index.version < 2) {
+            index.sources.forEach { print("    - ${it.name} (${it.lang}) -> ${it.initFunction}()\n") }
+            return JsIndex(
+                version = 1,
+                note = "JS sources require runtime.js from the main IReader app",
+                sources = index.sources.map { it.copy(file = bundleFile.name) }
+            )
         }
 
-        return jsSources
+        val copied = mutableMapOf(bundleFile.name to bundle)
+        val sources = index.sources.mapNotNull { source ->
+            val own = copied.getOrPut(source.file) { copyBundle(source.file) } ?: return@mapNotNull null
+            print("    - ${source.name} (${source.lang}) -> ${own.file} (${(own.size ?: 0) / 1024}KB), ${source.initFunction}()\n")
+            source.copy(sha256 = own.sha256, size = own.size)
+        }
+
+        return JsIndex(
+            version = 2,
+            note = "Load the runtime files once, in order, then a source's file before calling its initFunction",
+            runtime = runtime,
+            bundle = bundle,
+            sources = sources,
+        )
     }
 
+    private fun sha256(file: File): String =
+        MessageDigest.getInstance("SHA-256").digest(file.readBytes()).joinToString("") { "%02x".format(it) }
+
     private fun parseBadgings(apkDir: File): List<Badging>? {
         print("Parsing Badging for ${apkDir.name}...\n")
         return apkDir.listFiles()
@@ -346,7 +380,7 @@ open class RepoTask : DefaultTask() {
         }
     }
 
-    private fun generateRepo(repoDir: File, badgings: List<Badging>, jsSources: List<JsSourceInfo>) {
+    private fun generateRepo(repoDir: File, badgings: List<Badging>, jsIndex: JsIndex?) {
         val sortedBadgings = badgings.sortedBy { it.pkg }
 
         // Generate index.min.json as a flat array for backward compatibility with merge script
@@ -360,18 +394,13 @@ open class RepoTask : DefaultTask() {
         }
 
         // Generate separate JS index if there are JS sources
-        if (jsSources.isNotEmpty()) {
-            val jsIndex = JsIndex(
-                version = 1,
-                note = "JS sources require runtime.js from the main IReader app",
-                sources = jsSources.map { JsIndexSource(it.id, it.name, it.lang, it.file, it.initFunction) }
-            )
+        if (jsIndex != null && jsIndex.sources.isNotEmpty()) {
             File(repoDir, "js-index.json").writer().use {
                 it.write(prettyJson.encodeToString(jsIndex))
             }
         }
 
-        print("Generated repo index with ${sortedBadgings.size} extensions and ${jsSources.size} JS sources\n")
+        print("Generated repo index with ${sortedBadgings.size} extensions and ${jsIndex?.sources?.size ?: 0} JS sources\n")
     }
 
     fun generateJars(apkDir: File, repoDir: File) {
@@ -594,42 +623,31 @@ open class RepoTask : DefaultTask() {
         val assetsDir: String? = null,
     )
 
-    // JS source info for iOS
-    @Serializable
-    private data class JsSourceInfo(
-        val id: String,
-        val name: String,
-        val lang: String,
-        val file: String,
-        val initFunction: String
-    )
-
-    @Serializable
-    private data class JsSection(
-        val note: String,
-        val sources: List<JsSourceInfo>
-    )
-
-    @Serializable
-    private data class RepoIndex(
-        val extensions: List<Badging>,
-        val js: JsSection? = null
-    )
-
-    // For parsing js-sources index.json
+    // js-index.json, both as js-sources writes it and as the repo publishes it
     @Serializable
     private data class JsIndex(
         val version: Int = 1,
         val note: String? = null,
+        val runtime: List<JsBundle> = emptyList(),
+        val bundle: JsBundle? = null,
         val sources: List<JsIndexSource> = emptyList()
     )
 
+    @Serializable
+    private data class JsBundle(
+        val file: String,
+        val sha256: String? = null,
+        val size: Long? = null
+    )
+
     @Serializable
     private data class JsIndexSource(
         val id: String,
         val name: String,
         val lang: String,
         val file: String,
-        val initFunction: String
+        val initFunction: String,
+        val sha256: String? = null,
+        val size: Long? = null
     )
 }
@@ -35,8 +35,12 @@ android {
         named("main") {
             manifest.srcFile("$rootDir/extensions/AndroidManifest.xml")
             java.srcDirs("main/src")
-            // Include minimal icon from extensions/res (67 bytes)
-            res.srcDirs("main/res", "$rootDir/extensions/res")
+            // Include minimal icon from extensions/res (67 bytes) unless the
+            // source ships its own mipmaps (scripts/optimize-assets.py)
+            res.srcDirs("main/res")
+            if (!file("main/res/mipmap-mdpi").exists()) {
+                res.srcDirs("$rootDir/extensions/res")
+            }
             resources.setSrcDirs(emptyList<Any>())
         }
         extensionList.forEach { extension ->
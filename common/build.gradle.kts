@@ -30,6 +30,11 @@ kotlin {
             compileOnly(libs.ktor.cio)
         }
 
+        jvmTest.dependencies {
+            implementation(libs.kotlin.test)
+            implementation(libs.ktor.cio)
+        }
+
         jsMain.dependencies {
             api(libs.ktor.client.js)
         }
@@ -0,0 +1,125 @@
+package ireader.common.utils
+
+import kotlin.coroutines.cancellation.CancellationException
+import kotlinx.coroutines.async
+import kotlinx.coroutines.awaitAll
+import kotlinx.coroutines.coroutineScope
+
+/**
+ * Fetches paginated chapter lists.
+ *
+ * Page-number and offset lists are fetched [parallelism] pages at a time, so a
+ * novel with 40 pages costs about 40 / parallelism round trips instead of 40.
+ * Results are merged in page order and de-duplicated by [key]. Fetching stops
+ * at the first empty page, a page shorter than the first one, or a page with
+ * nothing new (sites that repeat the last page for out-of-range numbers).
+ * Every page request goes through [ErrorHandler.withRetry].
+ */
+object ChapterPagination {
+
+    const val DEFAULT_PARALLELISM = 4
+    const val MAX_PAGES = 1000
+
+    /**
+     * Fetches pages [firstPage], [firstPage] + 1, ... until the list is exhausted.
+     */
+    suspend fun <T> byPage(
+        firstPage: Int = 1,
+        parallelism: Int = DEFAULT_PARALLELISM,
+        retry: ErrorHandler.RetryConfig = ErrorHandler.RetryConfig(),
+        key: (T) -> Any? = { it },
+        fetch: suspend (page: Int) -> List<T>
+    ): List<T> = collect(parallelism, retry, key, pageSize = null) { index -> fetch(firstPage + index) }
+
+    /**
+     * Fetches offsets 0, [pageSize], 2 * [pageSize], ... until the list is exhausted.
+     */
+    suspend fun <T> byOffset(
+        pageSize: Int,
+        parallelism: Int = DEFAULT_PARALLELISM,
+        retry: ErrorHandler.RetryConfig = ErrorHandler.RetryConfig(),
+        key: (T) -> Any? = { it },
+        fetch: suspend (offset: Int) -> List<T>
+    ): List<T> = collect(parallelism, retry, key, pageSize) { index -> fetch(index * pageSize) }
+
+    /**
+     * Follows cursors from [start] until [fetch] returns no next cursor.
+     *
+     * Each page names the next one, so cursor lists cannot be fetched
+     * concurrently; pages are still retried and merged the same way.
+     */
+    suspend fun <T> byCursor(
+        start: String? = null,
+        retry: ErrorHandler.RetryConfig = ErrorHandler.RetryConfig(),
+        key: (T) -> Any? = { it },
+        fetch: suspend (cursor: String?) -> Pair<List<T>, String?>
+    ): List<T> {
+        val merged = LinkedHashMap<Any?, T>()
+        val visited = mutableSetOf<String?>()
+        var cursor = start
+        while (visited.add(cursor) && visited.size <= MAX_PAGES) {
+            val (items, next) = fetchWithRetry(retry) { fetch(cursor) }
+            items.forEach { merged.getOrPut(key(it)) { it } }
+            cursor = next ?: break
+        }
+        return merged.values.toList()
+    }
+
+    private suspend fun <T> collect(
+        parallelism: Int,
+        retry: ErrorHandler.RetryConfig,
+        key: (T) -> Any?,
+        pageSize: Int?,
+        fetch: suspend (index: Int) -> List<T>
+    ): List<T> {
+        val merged = LinkedHashMap<Any?, T>()
+        val window = parallelism.coerceAtLeast(1)
+        var fullPage = pageSize
+        var index = 0
+        while (index < MAX_PAGES) {
+            val pages = coroutineScope {
+                (index until minOf(index + window, MAX_PAGES)).map { page ->
+                    async {
+                        try {
+                            Result.success(fetchWithRetry(retry) { fetch(page) })
+                        } catch (e: CancellationException) {
+                            throw e
+                        } catch (e: Exception) {
+                            Result.failure<List<T>>(e)
+                        }
+                    }
+                }.awaitAll()
+            }
+            for ((offset, result) in pages.withIndex()) {
+                // Pages past the end may be fetched speculatively; a site answering
+                // those with 404/503 has simply run out of chapters
+                val items = result.getOrElse { e ->
+                    if (index + offset > 0 && e is ErrorHandler.SourceError.SourceUnavailable) {
+                        return merged.values.toList()
+                    }
+                    throw e
+                }
+                val before = merged.size
+                items.forEach { merged.getOrPut(key(it)) { it } }
+                val expected = fullPage ?: items.size
+                fullPage = expected
+                if (items.isEmpty() || items.size < expected || merged.size == before) {
+                    return merged.values.toList()
+                }
+            }
+            index += window
+        }
+        return merged.values.toList()
+    }
+
+    private suspend fun <R> fetchWithRetry(retry: ErrorHandler.RetryConfig, block: suspend () -> R): R =
+        ErrorHandler.withRetry(retry) {
+            try {
+                block()
+            } catch (e: CancellationException) {
+                throw e
+            } catch (e: Exception) {
+                throw ErrorHandler.categorizeError(e)
+            }
+        }
+}
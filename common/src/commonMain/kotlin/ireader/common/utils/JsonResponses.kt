@@ -0,0 +1,31 @@
+package ireader.common.utils
+
+import io.ktor.client.statement.HttpResponse
+import kotlinx.serialization.DeserializationStrategy
+import kotlinx.serialization.json.Json
+import kotlinx.serialization.serializer
+
+/**
+ * Json configuration for typed API responses.
+ * Keys the data classes don't declare are skipped, and nulls or unknown values
+ * for properties with defaults fall back to the default.
+ */
+val ApiJson = Json {
+    ignoreUnknownKeys = true
+    isLenient = true
+    coerceInputValues = true
+    explicitNulls = false
+}
+
+/**
+ * Decodes the body of this response as [T] without building a JsonElement tree.
+ * On the JVM the body is read straight from the response stream instead of
+ * being buffered into a String first.
+ */
+suspend inline fun <reified T> HttpResponse.decodeJson(json: Json = ApiJson): T =
+    decodeJson(json, serializer<T>())
+
+/**
+ * Decodes the body of this response with [deserializer].
+ */
+expect suspend fun <T> HttpResponse.decodeJson(json: Json, deserializer: DeserializationStrategy<T>): T
@@ -0,0 +1,147 @@
+package ireader.common.utils
+
+import com.fleeksoft.ksoup.Ksoup
+import com.fleeksoft.ksoup.nodes.Document
+import io.ktor.client.HttpClient
+import io.ktor.client.request.HttpRequestBuilder
+import io.ktor.client.request.request
+import io.ktor.client.statement.bodyAsText
+import io.ktor.http.HttpHeaders
+import io.ktor.http.HttpMethod
+import io.ktor.http.HttpStatusCode
+import io.ktor.http.isSuccess
+import kotlinx.coroutines.sync.Mutex
+import kotlinx.coroutines.sync.withLock
+import kotlin.time.Duration
+import kotlin.time.Duration.Companion.days
+import kotlin.time.Duration.Companion.hours
+import kotlin.time.Duration.Companion.minutes
+import kotlin.time.ExperimentalTime
+
+/**
+ * Per-source cache of response bodies with conditional revalidation.
+ *
+ * A body younger than its endpoint's TTL is returned without a request. Once
+ * it is older, the request is sent with If-None-Match / If-Modified-Since from
+ * the stored ETag / Last-Modified, and a 304 reuses the stored body. Entries are
+ * evicted least recently used first once [maxEntries] or [maxChars] is exceeded.
+ */
+class ResponseCache(
+    private val maxEntries: Int = 256,
+    private val maxChars: Long = 8L * 1024 * 1024,
+    private val ttls: Map<Endpoint, Duration> = DEFAULT_TTLS,
+    private val clock: () -> Long = ::currentTimeMillis,
+) {
+    /**
+     * What a request fetches; each kind has its own TTL.
+     */
+    enum class Endpoint { LATEST, POPULAR, SEARCH, DETAIL, CHAPTERS, CONTENT }
+
+    private class Entry(
+        val body: String,
+        val etag: String?,
+        val lastModified: String?,
+        var storedAt: Long,
+    )
+
+    private val mutex = Mutex()
+    // Insertion order doubles as recency order: a hit is moved to the end
+    private val entries = LinkedHashMap<String, Entry>()
+    private var chars = 0L
+
+    var hits = 0
+        private set
+    var revalidated = 0
+        private set
+    var misses = 0
+        private set
+
+    /**
+     * Body of [request], from the cache when it is fresh or the server answers 304.
+     * Only GET requests are cached; anything else goes straight to the network.
+     */
+    suspend fun fetch(client: HttpClient, request: HttpRequestBuilder, endpoint: Endpoint): String {
+        if (request.method != HttpMethod.Get) {
+            return client.request(request).bodyAsText()
+        }
+        val key = request.url.buildString()
+        val now = clock()
+        val cached = mutex.withLock { entries.remove(key)?.also { entries[key] = it } }
+        if (cached != null && now - cached.storedAt < ttlOf(endpoint).inWholeMilliseconds) {
+            mutex.withLock { hits++ }
+            return cached.body
+        }
+
+        // The cache decides freshness, so intermediaries may serve what they have
+        request.headers.remove(HttpHeaders.CacheControl)
+        cached?.etag?.let { request.headers[HttpHeaders.IfNoneMatch] = it }
+        cached?.lastModified?.let { request.headers[HttpHeaders.IfModifiedSince] = it }
+        val response = client.request(request)
+
+        if (cached != null && response.status == HttpStatusCode.NotModified) {
+            mutex.withLock {
+                cached.storedAt = now
+                revalidated++
+            }
+            return cached.body
+        }
+        val body = response.bodyAsText()
+        mutex.withLock {
+            misses++
+            if (response.status.isSuccess() && body.length <= maxChars) {
+                put(key, Entry(body, response.headers[HttpHeaders.ETag], response.headers[HttpHeaders.LastModified], now))
+            }
+        }
+        return body
+    }
+
+    /**
+     * [fetch] parsed as HTML, with the request URL as base URI.
+     */
+    suspend fun fetchDocument(client: HttpClient, request: HttpRequestBuilder, endpoint: Endpoint): Document {
+        val url = request.url.buildString()
+        return Ksoup.parse(fetch(client, request, endpoint), url)
+    }
+
+    /**
+     * Drops every entry, e.g. after a login changes what pages show.
+     */
+    suspend fun clear() {
+        mutex.withLock {
+            entries.clear()
+            chars = 0
+        }
+    }
+
+    val size: Int get() = entries.size
+
+    private fun ttlOf(endpoint: Endpoint): Duration = ttls[endpoint] ?: DEFAULT_TTLS.getValue(endpoint)
+
+    private fun put(key: String, entry: Entry) {
+        entries.remove(key)?.let { chars -= it.body.length }
+        entries[key] = entry
+        chars += entry.body.length
+        val iterator = entries.entries.iterator()
+        while ((entries.size > maxEntries || chars > maxChars) && iterator.hasNext()) {
+            chars -= iterator.next().value.body.length
+            iterator.remove()
+        }
+    }
+
+    companion object {
+        /**
+         * Latest listings change within minutes, chapter text almost never.
+         */
+        val DEFAULT_TTLS = mapOf(
+            Endpoint.LATEST to 5.minutes,
+            Endpoint.POPULAR to 1.hours,
+            Endpoint.SEARCH to 10.minutes,
+            Endpoint.DETAIL to 1.hours,
+            Endpoint.CHAPTERS to 10.minutes,
+            Endpoint.CONTENT to 7.days,
+        )
+
+        @OptIn(ExperimentalTime::class)
+        private fun currentTimeMillis(): Long = kotlin.time.Clock.System.now().toEpochMilliseconds()
+    }
+}
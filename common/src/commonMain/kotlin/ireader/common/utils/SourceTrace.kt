@@ -0,0 +1,65 @@
+package ireader.common.utils
+
+import co.touchlab.kermit.Logger
+import co.touchlab.kermit.Severity
+import ireader.core.log.Log
+import kotlinx.serialization.json.buildJsonObject
+import kotlinx.serialization.json.put
+import kotlin.time.TimeMark
+import kotlin.time.TimeSource
+
+/**
+ * Timing hooks for the fetch, parse and select phases of a source.
+ *
+ * Spans are only measured while debug logging is on (Log.enableVerboseLogging,
+ * as the source test server does); with production logging every hook just
+ * runs its block. Each span is logged under [TAG] as one JSON object:
+ *
+ *     {"source":"NovelFull","operation":"chapters","phase":"fetch","ms":182.4}
+ *
+ * which the test server's LogCapture aggregates per source.
+ */
+class SourceTrace(private val source: String) {
+
+    enum class Phase { FETCH, PARSE, SELECT }
+
+    inline fun <T> fetch(operation: String, block: () -> T): T = span(Phase.FETCH, operation, block)
+
+    inline fun <T> parse(operation: String, block: () -> T): T = span(Phase.PARSE, operation, block)
+
+    inline fun <T> select(operation: String, block: () -> T): T = span(Phase.SELECT, operation, block)
+
+    inline fun <T> span(phase: Phase, operation: String, block: () -> T): T {
+        val mark = begin() ?: return block()
+        val result = block()
+        end(mark, phase, operation)
+        return result
+    }
+
+    /**
+     * Start of a span, or null when tracing is off.
+     */
+    fun begin(): TimeMark? = if (enabled) TimeSource.Monotonic.markNow() else null
+
+    /**
+     * Logs the span started at [mark]; does nothing for a null mark.
+     */
+    fun end(mark: TimeMark?, phase: Phase, operation: String) {
+        if (mark == null) return
+        val micros = mark.elapsedNow().inWholeMicroseconds
+        Logger.d(TAG) {
+            buildJsonObject {
+                put("source", source)
+                put("operation", operation)
+                put("phase", phase.name.lowercase())
+                put("ms", micros / 1000.0)
+            }.toString()
+        }
+    }
+
+    companion object {
+        const val TAG = "SourceTrace"
+
+        val enabled: Boolean get() = Log.minSeverity <= Severity.Debug
+    }
+}
@@ -0,0 +1,445 @@
+// Generated by scripts/generate-status-parser.py from scripts/keywords/status.json. Do not edit.
+
+package ireader.common.utils
+
+import ireader.core.source.model.MangaInfo
+
+/**
+ * Status keyword automaton: 196 keywords in 13 languages (ar, en, es, fr, in, jp, kr, pt, ru, tu, uk, vi, zh),
+ * 961 states. Numbers are stored as the chars of string constants.
+ */
+internal object StatusKeywords {
+
+    /** MangaInfo status of each rank, best first */
+    val STATUSES = longArrayOf(MangaInfo.ONGOING, MangaInfo.COMPLETED, MangaInfo.ON_HIATUS, MangaInfo.CANCELLED)
+
+    /** First edge of each state; the edges of s end at EDGE_START[s + 1] */
+    const val EDGE_START =
+        "\u0000\u0035\u003b\u003c\u003d\u003e\u003f\u0040\u0043\u0044\u0045\u0045\u0046\u0046\u0047\u0047" +
+        "\u0049\u004a\u004b\u004c\u004c\u004d\u004e\u004f\u004f\u0050\u0051\u0052\u0053\u0053\u0055\u0056" +
+        "\u0057\u0058\u0059\u005a\u005b\u005c\u005d\u005d\u005e\u005f\u0060\u0060\u0061\u0062\u0063\u0064" +
+        "\u0064\u0065\u0066\u0067\u0067\u006b\u006d\u006e\u006f\u0070\u0072\u0073\u0074\u0075\u0076\u0077" +
+        "\u0078\u0078\u0079\u007a\u007b\u007c\u007c\u007d\u007e\u007f\u0080\u0081\u0082\u0082\u0083\u0085" +
+        "\u0086\u0087\u0087\u0088\u0088\u0089\u008a\u008b\u008c\u008d\u008e\u008f\u008f\u0090\u0091\u0092" +
+        "\u0092\u0096\u0097\u0098\u0099\u009a\u009d\u009e\u009f\u009f\u00a0\u00a0\u00a1\u00a2\u00a2\u00a3" +
+        "\u00a4\u00a5\u00a6\u00a7\u00a8\u00a9\u00aa\u00ab\u00ac\u00ad\u00ae\u00af\u00af\u00b1\u00b2\u00b3" +
+        "\u00b4\u00b5\u00b8\u00b9\u00ba\u00ba\u00bb\u00bb\u00bb\u00bd\u00be\u00bf\u00c1\u00c2\u00c3\u00c3" +
+        "\u00c4\u00c5\u00c5\u00c6\u00c7\u00c8\u00ca\u00ca\u00cb\u00cc\u00cc\u00cd\u00ce\u00cf\u00d0\u00d1" +
+        "\u00d2\u00d2\u00d6\u00d8\u00d9\u00da\u00db\u00dc\u00dd\u00de\u00df\u00e0\u00e1\u00e2\u00e2\u00e3" +
+        "\u00e4\u00e5\u00e6\u00e7\u00e9\u00ea\u00ea\u00eb\u00ec\u00ed\u00ed\u00f1\u00f2\u00f3\u00f4\u00f5" +
+        "\u00f6\u00f7\u00f8\u00f8\u00f9\u00fa\u00fb\u00fc\u00fd\u00fe\u00ff\u00ff\u0100\u0101\u0102\u0103" +
+        "\u0104\u0105\u0106\u0107\u0108\u0108\u0109\u010a\u010b\u010c\u010c\u010d\u010e\u010f\u0110\u0111" +
+        "\u0111\u0112\u0113\u0114\u0115\u0116\u0117\u0118\u0119\u0119\u011b\u011c\u0120\u0121\u0122\u0123" +
+        "\u0124\u0125\u0126\u0127\u0128\u0128\u0129\u012a\u012b\u012c\u012c\u012d\u012e\u012f\u0130\u0131" +
+        "\u0132\u0133\u0134\u0135\u0135\u0136\u0137\u0138\u0139\u013a\u013b\u013c\u013d\u013e\u013e\u0140" +
+        "\u0144\u0145\u0146\u0147\u0148\u0149\u014a\u014a\u014c\u014d\u014e\u014f\u014f\u0150\u0151\u0152" +
+        "\u0152\u0153\u0154\u0155\u0156\u0157\u0158\u0158\u015a\u015c\u015d\u015e\u015f\u0160\u0161\u0161" +
+        "\u0162\u0164\u0164\u0164\u0165\u0166\u0167\u0168\u0169\u016a\u016b\u016c\u016d\u016d\u016e\u016f" +
+        "\u016f\u0171\u0172\u0174\u0175\u0176\u0177\u0178\u0179\u017a\u017a\u017b\u017c\u017d\u017e\u017e" +
+        "\u017f\u0180\u0180\u0181\u0182\u0183\u0184\u0185\u0186\u0187\u0188\u0189\u018a\u018b\u018c\u018c" +
+        "\u018e\u018f\u0190\u0192\u0192\u0193\u0193\u0194\u0195\u0196\u0197\u0198\u0199\u019a\u019b\u019b" +
+        "\u019d\u019f\u01a0\u01a1\u01a2\u01a3\u01a4\u01a5\u01a6\u01a7\u01a7\u01a8\u01a9\u01aa\u01ab\u01ac" +
+        "\u01ad\u01ae\u01ae\u01af\u01b0\u01b1\u01b2\u01b3\u01b4\u01b5\u01b6\u01b7\u01b8\u01b8\u01b9\u01ba" +
+        "\u01bb\u01bc\u01bd\u01be\u01be\u01c0\u01c1\u01c2\u01c3\u01c3\u01c4\u01c5\u01c6\u01c7\u01c8\u01c9" +
+        "\u01ca\u01cb\u01cc\u01cd\u01ce\u01ce\u01cf\u01d2\u01d4\u01d5\u01d6\u01d7\u01d8\u01d8\u01d9\u01da" +
+        "\u01db\u01db\u01dd\u01de\u01df\u01e0\u01e1\u01e1\u01e2\u01e3\u01e4\u01e4\u01e5\u01e6\u01e7\u01e8" +
+        "\u01e8\u01ea\u01eb\u01ec\u01ee\u01ef\u01f0\u01f0\u01f1\u01f1\u01f2\u01f3\u01f4\u01f6\u01f7\u01f8" +
+        "\u01f9\u01fa\u01fb\u01fc\u01fc\u01fd\u01fe\u01ff\u0200\u0200\u0201\u0203\u0204\u0205\u0205\u0206" +
+        "\u0207\u0208\u0209\u020a\u020b\u020b\u020d\u0210\u0211\u0212\u0213\u0214\u0215\u0216\u0217\u0218" +
+        "\u0219\u021a\u021b\u021c\u021c\u021d\u021e\u021f\u0220\u0220\u0221\u0222\u0223\u0224\u0225\u0227" +
+        "\u0228\u0229\u022a\u022b\u022b\u022c\u022d\u022d\u022e\u022f\u0230\u0231\u0232\u0234\u0235\u0235" +
+        "\u0235\u0239\u023a\u023b\u023d\u023e\u023f\u0240\u0242\u0243\u0243\u0244\u0245\u0245\u0245\u0246" +
+        "\u0247\u0248\u0249\u024c\u024d\u024e\u024e\u024e\u024e\u024f\u0250\u0251\u0252\u0253\u0253\u0254" +
+        "\u0255\u0257\u0258\u0259\u025a\u025a\u025b\u025d\u025e\u025f\u025f\u0260\u0261\u0261\u0262\u0263" +
+        "\u0264\u0265\u0266\u0267\u0268\u0268\u0269\u026a\u026b\u026c\u026d\u026e\u026e\u0270\u0271\u0272" +
+        "\u0273\u0276\u0277\u0278\u0279\u027a\u027b\u027c\u027d\u027d\u027e\u027e\u027f\u0280\u0281\u0282" +
+        "\u0283\u0284\u0285\u0286\u0286\u0287\u0288\u028a\u028b\u028c\u028d\u028e\u028f\u0290\u0291\u0292" +
+        "\u0292\u0293\u0293\u0294\u0295\u0296\u0297\u0298\u0298\u029b\u029c\u029d\u029e\u029f\u02a0\u02a1" +
+        "\u02a3\u02a4\u02a4\u02a4\u02a5\u02a6\u02a7\u02a8\u02a9\u02aa\u02aa\u02ac\u02ad\u02ae\u02af\u02b0" +
+        "\u02b1\u02b2\u02b3\u02b4\u02b4\u02b5\u02b6\u02b7\u02b8\u02b8\u02b9\u02bd\u02be\u02bf\u02c0\u02c1" +
+        "\u02c2\u02c2\u02c3\u02c4\u02c5\u02c7\u02c8\u02cb\u02cb\u02cc\u02cc\u02cc\u02cd\u02cd\u02d0\u02d1" +
+        "\u02d2\u02d3\u02d4\u02d4\u02d5\u02d6\u02d7\u02d8\u02d8\u02d9\u02da\u02db\u02dc\u02dd\u02dd\u02de" +
+        "\u02df\u02e0\u02e1\u02e2\u02e3\u02e4\u02e4\u02e5\u02e7\u02e8\u02e9\u02ea\u02eb\u02ec\u02ed\u02ef" +
+        "\u02f0\u02f0\u02f1\u02f1\u02f2\u02f3\u02f4\u02f5\u02f6\u02f8\u02f9\u02f9\u02fa\u02fa\u02fd\u02fe" +
+        "\u02ff\u0300\u0301\u0302\u0302\u0303\u0304\u0306\u0307\u0308\u0308\u0309\u030a\u030a\u030b\u030c" +
+        "\u030d\u030f\u0310\u0310\u0311\u0311\u0315\u0316\u0317\u0318\u0318\u0319\u031a\u031c\u031d\u031e" +
+        "\u031f\u0320\u0321\u0322\u0322\u0323\u0324\u0325\u0326\u0327\u0328\u0329\u032a\u032b\u032b\u032c" +
+        "\u032d\u032e\u032f\u0330\u0331\u0331\u0334\u0335\u0336\u0337\u0338\u033a\u033b\u033b\u033c\u033c" +
+        "\u033e\u033f\u0340\u0341\u0342\u0343\u0344\u0345\u0345\u0346\u0347\u0348\u0349\u034a\u034b\u034c" +
+        "\u034d\u034e\u034e\u034f\u0350\u0351\u0352\u0353\u0354\u0355\u0356\u0357\u0357\u0358\u0359\u035a" +
+        "\u035b\u035c\u035d\u035e\u035f\u035f\u0360\u0361\u0362\u0363\u0364\u0364\u0365\u0366\u0367\u0368" +
+        "\u0368\u0369\u036a\u036b\u036c\u036d\u036f\u0370\u0371\u0372\u0373\u0373\u0374\u0375\u0375\u037b" +
+        "\u037c\u037d\u037e\u037f\u037f\u0380\u0381\u0382\u0383\u0383\u0384\u0385\u0386\u0386\u0387\u0388" +
+        "\u0389\u038a\u038a\u038b\u038d\u038e\u038e\u038f\u038f\u0390\u0391\u0392\u0393\u0393\u0394\u0394" +
+        "\u0397\u0397\u0397\u0397\u0398\u0398\u0399\u0399\u039b\u039b\u039b\u039e\u039e\u039f\u03a0\u03a0" +
+        "\u03a0\u03a1\u03a2\u03a2\u03a3\u03a3\u03a4\u03a5\u03a6\u03a6\u03a7\u03a7\u03a8\u03a8\u03a9\u03a9" +
+        "\u03aa\u03aa\u03ab\u03ac\u03ac\u03ad\u03af\u03af\u03af\u03b0\u03b0\u03b1\u03b2\u03b2\u03b3\u03b4" +
+        "\u03b4\u03b5\u03b6\u03b6\u03b7\u03b9\u03ba\u03bb\u03bb\u03bc\u03bc\u03be\u03be\u03be\u03bf\u03bf" +
+        "\u03c0\u03c0"
+
+    /** Edge labels, sorted per state */
+    const val EDGE_CHARS =
+        "\u0061\u0062\u0063\u0064\u0065\u0066\u0067\u0068\u0069\u006c\u006e\u006f\u0070\u0072\u0073\u0074" +
+        "\u0075\u0079\u0111\u0431\u0432\u0437\u043d\u043e\u043f\u0441\u0442\u062c\u0642\u0645\u4e2d\u4f11" +
+        "\u505c\u5168\u592a\u5b8c\u5df2\u5f03\u6253\u65ad\u65b7\u6682\u66ab\u66f4\u672a\u68c4\u8fde\u9023" +
+        "\ubbf8\uc5f0\uc644\uc911\ud734\u0062\u0063\u006e\u0072\u0073\u0074\u0061\u006e\u0064\u006f\u006e" +
+        "\u0061\u0065\u006e\u0064\u006f\u0064\u00e9\u0068\u0074\u0065\u0076\u00e9\u0069\u0076\u0065\u006e" +
+        "\u0075\u006c\u00e9\u0061\u0072\u0020\u0076\u0065\u0072\u0069\u006c\u0064\u0069\u00ea\u0074\u00e9" +
+        "\u006b\u0131\u0064\u0061\u0069\u0076\u006f\u0065\u0069\u0131\u1ecf\u006c\u0072\u0075\u006d\u0020" +
+        "\u0073\u0074\u0065\u006c\u0065\u0073\u0061\u0069\u0061\u006d\u0061\u0074\u006c\u0061\u006e\u006a" +
+        "\u0075\u0074\u0074\u006d\u0074\u0069\u015f\u0069\u0072\u0061\u006b\u0131\u006c\u0064\u0131\u0020" +
+        "\u0064\u1edf\u0061\u0068\u006f\u00f2\u006e\u0063\u0065\u006c\u0061\u0065\u006c\u0064\u006f\u0064" +
+        "\u0065\u0064\u01b0\u0061\u0020\u0068\u006f\u00e0\u006e\u0020\u0074\u0068\u00e0\u006e\u0068\u006d" +
+        "\u006e\u0070\u006c\u0065\u0074\u0061\u0065\u006f\u0064\u006f\u0064\u0063\u0074\u006c\u0075\u0069" +
+        "\u00ed\u0064\u006f\u0064\u006f\u0069\u006e\u0075\u0065\u0069\u006e\u0067\u006e\u0020\u0074\u0069" +
+        "\u1ebf\u0070\u0065\u0069\u0072\u0075\u0073\u0076\u0063\u006f\u006e\u0074\u0069\u006e\u0075\u0061" +
+        "\u0064\u006f\u0061\u006d\u0020\u0065\u0064\u0065\u0069\u006e\u0079\u006f\u0072\u0062\u0068\u0073" +
+        "\u0074\u0061\u0074\u0061\u006c\u006b\u0061\u006e\u0065\u006e\u0074\u0069\u006b\u0061\u006e\u0063" +
+        "\u006f\u006e\u0074\u0069\u006e\u0075\u0065\u0064\u0075\u006e\u0064\u0061\u006f\u0070\u0070\u0065" +
+        "\u0064\u0072\u0064\u0075\u0072\u0075\u006c\u0064\u0075\u006d\u006e\u0020\u0061\u0068\u006c\u0070" +
+        "\u006e\u0064\u0061\u006d\u0065\u006e\u0074\u006f\u0069\u0061\u0074\u006f\u0061\u006e\u00e7\u0061" +
+        "\u006d\u0065\u006e\u0074\u006f\u0075\u0062\u006c\u0069\u0063\u0061\u00e7\u00e3\u006f\u0020\u0064" +
+        "\u0061\u0063\u0065\u0070\u0074\u0074\u0065\u006e\u0074\u0065\u006f\u0075\u0075\u0072\u0073\u0072" +
+        "\u0073\u006f\u006d\u0069\u0073\u0069\u00f3\u006e\u0061\u0075\u0072\u0075\u0075\u0074\u0069\u006f" +
+        "\u006e\u0073\u0061\u0065\u0062\u006c\u0069\u0063\u0061\u0074\u0069\u006f\u006e\u0065\u0064\u0069" +
+        "\u0075\u006e\u0061\u0069\u006c\u0069\u007a\u0061\u0064\u006f\u0073\u0068\u0065\u0064\u006c\u006c" +
+        "\u00fc\u006e\u0063\u0065\u006c\u006c\u0065\u006e\u0069\u0079\u006f\u0072\u0069\u006f\u0061\u0074" +
+        "\u006f\u0075\u0073\u00e0\u006e\u0020\u0074\u0068\u00e0\u006e\u0068\u006e\u0070\u0020\u0063\u0070" +
+        "\u0072\u006f\u0067\u0072\u0065\u0073\u0073\u006f\u006d\u0070\u006c\u0065\u0074\u0065\u0074\u0061" +
+        "\u006c\u0020\u0065\u0064\u0069\u006c\u0064\u0069\u0065\u006e\u0067\u006b\u0061\u0070\u0067\u006f" +
+        "\u1eeb\u006e\u0067\u0074\u0020\u0063\u006f\u006d\u0070\u006c\u0065\u0074\u0065\u0064\u006e\u0020" +
+        "\u002d\u0067\u0067\u0068\u006f\u0069\u006e\u0067\u006f\u006c\u0064\u0067\u0068\u006f\u0069\u006e" +
+        "\u0067\u006f\u006c\u0064\u006f\u0069\u006e\u0067\u0061\u0075\u0075\u0073\u0061\u0065\u0064\u006f" +
+        "\u0064\u0062\u006c\u0069\u0063\u0073\u00e1\u006e\u0064\u006f\u0073\u0065\u0068\u0069\u006e\u0067" +
+        "\u0065\u0068\u006c\u0061\u0074\u0065\u0061\u0073\u0069\u006e\u0067\u0065\u0075\u0064\u006c\u0072" +
+        "\u0061\u006e\u0067\u0020\u0062\u0065\u0072\u006a\u0061\u006c\u0061\u006e\u0065\u0073\u0061\u0069" +
+        "\u0069\u0061\u006c\u0069\u007a\u0061\u0069\u0074\u0069\u006f\u006e\u006e\u0067\u0073\u0070\u0065" +
+        "\u006e\u0064\u0065\u0075\u0064\u0061\u0065\u0072\u1ea1\u006d\u0061\u006d\u0074\u006c\u0061\u006e" +
+        "\u0064\u006d\u0131\u0131\u015f\u0072\u006d\u0069\u006e\u0061\u0065\u00e9\u0064\u006f\u1ecd\u006e" +
+        "\u0020\u0062\u1ed9\u006d\u0020\u0064\u006e\u1eeb\u006e\u0067\u0067\u01b0\u1eeb\u006e\u0067\u006e" +
+        "\u0067\u0070\u0064\u0061\u0074\u0069\u006e\u0067\u0061\u0079\u0131\u006e\u0064\u0061\u0061\u00e3" +
+        "\u006e\u0067\u0020\u0063\u0072\u0074\u1ead\u0070\u0020\u006e\u0068\u1ead\u0074\u0061\u0069\u1ebf" +
+        "\u006e\u0020\u0068\u00e0\u006e\u0068\u0020\u0068\u006f\u1ee7\u00e0\u006e\u0020\u0074\u0068\u00e0" +
+        "\u006e\u0068\u0079\u0440\u043e\u0448\u0435\u043d\u0020\u0438\u044b\u043f\u0440\u043e\u0446\u0435" +
+        "\u0441\u0441\u0456\u0435\u0445\u043e\u0434\u0438\u0442\u044c\u043f\u0445\u0443\u0441\u043a\u0430" +
+        "\u0435\u0442\u0441\u044f\u043e\u0434\u0438\u0442\u0430\u0431\u0432\u043a\u043c\u0440\u043e\u0448" +
+        "\u0435\u043d\u0435\u0440\u0448\u0435\u0451\u043d\u0430\u0438\u043e\u0439\u043d\u0438\u043e\u0456" +
+        "\u043d\u0443\u0442\u043e\u043d\u0447\u0435\u043d\u043d\u0447\u0435\u043d\u043e\u043e\u0440\u043e" +
+        "\u0436\u0435\u043d\u043e\u0435\u0020\u0437\u0437\u0430\u0432\u0435\u0440\u0448\u0435\u0451\u043d" +
+        "\u043d\u0430\u0432\u0435\u0440\u0448\u0435\u0451\u043d\u043d\u043a\u043d\u0442\u043e\u043d\u0447" +
+        "\u0435\u043d\u0433\u043e\u0438\u0456\u043d\u0433\u043d\u0433\u043c\u0435\u043d\u0435\u0451\u043d" +
+        "\u043d\u0430\u0435\u043e\u0440\u0443\u0437\u0430\u0440\u0435\u0432\u043a\u043e\u0434\u0438\u0442" +
+        "\u0441\u044f\u043b\u0430\u0434\u0430\u0454\u0442\u044c\u0441\u044f\u043a\u0438\u043d\u0443\u0442" +
+        "\u043e\u0435\u0438\u043e\u043a\u0440\u0430\u0449\u0435\u0451\u043d\u043d\u0437\u043e\u0443\u043f" +
+        "\u0438\u043d\u0435\u043d\u043e\u0441\u0442\u0430\u043d\u043e\u0432\u043b\u0435\u043d\u0434\u043e" +
+        "\u043b\u0436\u0430\u0435\u0442\u0441\u044f\u043a\u0430\u0441\u043e\u0432\u0430\u043d\u043e\u0440" +
+        "\u0438\u0432\u0430\u0454\u0627\u0631\u064a\u0629\u064a\u062f\u0020\u0627\u0644\u062a\u0646\u0631" +
+        "\u062c\u0645\u0629\u0634\u0631\u062a\u0633\u0639\u0643\u0644\u0646\u0648\u0642\u0641\u0629\u062a" +
+        "\u0645\u0631\u0629\u0644\u0642\u0629\u062a\u0645\u0644\u0629\u063a\u0627\u064a\u0629\u0629\u062a" +
+        "\u0647\u064a\u0629\u6b62\u520a\u6b62\u8f09\u66f4\u672c\u76d1\u76e3\u672c\u7d50\u7ed3\u6e08\u307f" +
+        "\u5b8c\u6210\u5751\u3061\u5207\u308a\u66f4\u66f4\u505c\u505c\u65b0\u4e2d\u5b8c\u7d50\u7ed3\u5751" +
+        "\u8f7d\u4e2d\u8f09\u4e2d\uc644\uacb0\uc7ac\u0020\uc911\uc911\ub2e8\ub2e8\uacb0\ub8cc\ub2e8\uc7ac"
+
+    /** Edge targets */
+    const val EDGE_TARGETS =
+        "\u0001\u0034\u0060\u00a1\u00e9\u0140\u0152\u015f\u016f\u018d\u0194\u01a5\u01c0\u01d9\u01e5\u0210" +
+        "\u023d\u0245\u024c\u0272\u0278\u0299\u02c6\u02dd\u02f5\u033c\u0345\u034b\u0350\u035e\u037d\u037f" +
+        "\u0383\u0385\u0387\u038a\u0390\u0393\u0395\u0399\u039b\u039d\u039f\u03a1\u03a4\u03a8\u03aa\u03ad" +
+        "\u03b0\u03b3\u03ba\u03bd\u03bf\u0002\u000f\u0018\u001d\u002b\u0030\u0003\u0004\u0005\u0006\u0007" +
+        "\u0008\u000b\u000d\u0009\u000a\u000c\u000e\u0010\u0014\u0011\u0012\u0013\u0015\u0016\u0017\u0019" +
+        "\u001a\u001b\u001c\u001e\u0027\u001f\u0020\u0021\u0022\u0023\u0024\u0025\u0026\u0028\u0029\u002a" +
+        "\u002c\u002d\u002e\u002f\u0031\u0032\u0033\u0035\u004d\u0054\u005c\u0036\u0046\u0037\u0038\u0039" +
+        "\u003a\u0041\u003b\u003c\u003d\u003e\u003f\u0040\u0042\u0043\u0044\u0045\u0047\u0048\u0049\u004a" +
+        "\u004b\u004c\u004e\u004f\u0052\u0050\u0051\u0053\u0055\u0056\u0057\u0058\u0059\u005a\u005b\u005d" +
+        "\u005e\u005f\u0061\u006e\u007c\u009a\u0062\u0063\u0064\u0065\u0066\u0069\u006b\u0067\u0068\u006a" +
+        "\u006c\u006d\u006f\u0070\u0071\u0072\u0073\u0074\u0075\u0076\u0077\u0078\u0079\u007a\u007b\u007d" +
+        "\u0088\u007e\u007f\u0080\u0081\u0082\u0085\u0087\u0083\u0084\u0086\u0089\u0092\u008a\u008b\u008c" +
+        "\u008f\u008d\u008e\u0090\u0091\u0093\u0094\u0095\u0096\u0097\u0098\u0099\u009b\u009c\u009d\u009e" +
+        "\u009f\u00a0\u00a2\u00ba\u00da\u00e0\u00a3\u00ae\u00a4\u00a5\u00a6\u00a7\u00a8\u00a9\u00aa\u00ab" +
+        "\u00ac\u00ad\u00af\u00b0\u00b1\u00b2\u00b3\u00b4\u00b6\u00b5\u00b7\u00b8\u00b9\u00bb\u00c3\u00cb" +
+        "\u00d5\u00bc\u00bd\u00be\u00bf\u00c0\u00c1\u00c2\u00c4\u00c5\u00c6\u00c7\u00c8\u00c9\u00ca\u00cc" +
+        "\u00cd\u00ce\u00cf\u00d0\u00d1\u00d2\u00d3\u00d4\u00d6\u00d7\u00d8\u00d9\u00db\u00dc\u00dd\u00de" +
+        "\u00df\u00e1\u00e2\u00e3\u00e4\u00e5\u00e6\u00e7\u00e8\u00ea\u010e\u00eb\u00ec\u00f5\u00fa\u0104" +
+        "\u00ed\u00ee\u00ef\u00f0\u00f1\u00f2\u00f3\u00f4\u00f6\u00f7\u00f8\u00f9\u00fb\u00fc\u00fd\u00fe" +
+        "\u00ff\u0100\u0101\u0102\u0103\u0105\u0106\u0107\u0108\u0109\u010a\u010b\u010c\u010d\u010f\u013d" +
+        "\u0110\u0117\u0120\u0127\u0111\u0112\u0113\u0114\u0115\u0116\u0118\u011c\u0119\u011a\u011b\u011d" +
+        "\u011e\u011f\u0121\u0122\u0123\u0124\u0125\u0126\u0128\u0133\u0129\u012f\u012a\u012b\u012c\u012d" +
+        "\u012e\u0130\u0131\u0132\u0134\u0135\u0136\u0137\u0138\u0139\u013a\u013b\u013c\u013e\u013f\u0141" +
+        "\u014f\u0142\u0143\u014a\u0144\u0145\u0146\u0147\u0148\u0149\u014b\u014c\u014d\u014e\u0150\u0151" +
+        "\u0153\u0154\u0155\u0156\u0157\u0158\u0159\u015a\u015b\u015c\u015d\u015e\u0160\u0166\u0161\u0162" +
+        "\u0163\u0164\u0165\u0167\u0168\u0169\u016a\u016b\u016c\u016d\u016e\u0170\u0182\u0171\u017a\u0172" +
+        "\u0173\u0174\u0175\u0176\u0177\u0178\u0179\u017b\u017c\u017d\u017e\u017f\u0180\u0181\u0183\u0184" +
+        "\u0185\u0186\u0187\u0188\u0189\u018a\u018b\u018c\u018e\u018f\u0190\u0191\u0192\u0193\u0195\u0199" +
+        "\u0196\u0197\u0198\u019a\u019b\u019c\u019d\u019e\u019f\u01a0\u01a1\u01a2\u01a3\u01a4\u01a6\u01a7" +
+        "\u01b1\u01bb\u01a8\u01ad\u01a9\u01aa\u01ab\u01ac\u01ae\u01af\u01b0\u01b2\u01b7\u01b3\u01b4\u01b5" +
+        "\u01b6\u01b8\u01b9\u01ba\u01bc\u01bd\u01be\u01bf\u01c1\u01c9\u01c2\u01c3\u01c4\u01c7\u01c5\u01c6" +
+        "\u01c8\u01ca\u01cb\u01cc\u01cd\u01d4\u01ce\u01cf\u01d0\u01d1\u01d2\u01d3\u01d5\u01d6\u01d7\u01d8" +
+        "\u01da\u01db\u01de\u01dc\u01dd\u01df\u01e0\u01e1\u01e2\u01e3\u01e4\u01e6\u0207\u01e7\u01f4\u01f9" +
+        "\u01e8\u01e9\u01ea\u01eb\u01ec\u01ed\u01ee\u01ef\u01f0\u01f1\u01f2\u01f3\u01f5\u01f6\u01f7\u01f8" +
+        "\u01fa\u01fb\u01fc\u01fd\u01fe\u01ff\u0204\u0200\u0201\u0202\u0203\u0205\u0206\u0208\u0209\u020a" +
+        "\u020b\u020c\u020d\u020f\u020e\u0211\u021e\u0228\u022e\u0212\u0213\u0214\u021d\u0215\u0216\u0217" +
+        "\u0218\u021a\u0219\u021b\u021c\u021f\u0220\u0221\u0222\u0223\u0226\u0227\u0224\u0225\u0229\u022a" +
+        "\u022b\u022c\u022d\u022f\u0230\u0231\u0235\u0232\u0233\u0234\u0236\u0237\u023a\u0238\u0239\u023b" +
+        "\u023c\u023e\u023f\u0240\u0241\u0242\u0243\u0244\u0246\u0247\u0248\u0249\u024a\u024b\u024d\u0264" +
+        "\u024e\u024f\u0250\u0251\u0259\u025b\u0252\u0253\u0254\u0255\u0256\u0257\u0258\u025a\u025c\u025d" +
+        "\u025e\u025f\u0260\u0261\u0262\u0263\u0265\u0266\u0267\u0270\u0268\u0269\u026a\u026b\u026c\u026d" +
+        "\u026e\u026f\u0271\u0273\u0274\u0275\u0276\u0277\u0279\u0283\u028a\u027a\u027b\u027c\u027d\u027e" +
+        "\u027f\u0280\u0282\u0281\u0284\u0285\u0286\u0287\u0288\u0289\u028b\u0294\u028c\u028d\u028e\u028f" +
+        "\u0290\u0291\u0292\u0293\u0295\u0296\u0297\u0298\u029a\u029b\u02a1\u02ad\u02be\u029c\u029d\u029e" +
+        "\u029f\u02a0\u02a2\u02a3\u02a4\u02a5\u02ab\u02a6\u02a7\u02a8\u02aa\u02a9\u02ac\u02ae\u02b3\u02b8" +
+        "\u02af\u02b0\u02b1\u02b2\u02b4\u02b5\u02b6\u02b7\u02b9\u02ba\u02bb\u02bc\u02bd\u02bf\u02c0\u02c1" +
+        "\u02c2\u02c3\u02c4\u02c5\u02c7\u02c8\u02d3\u02c9\u02ca\u02cb\u02cc\u02cd\u02ce\u02cf\u02d1\u02d0" +
+        "\u02d2\u02d4\u02d5\u02d6\u02d7\u02d8\u02d9\u02db\u02da\u02dc\u02de\u02e4\u02ed\u02df\u02e0\u02e1" +
+        "\u02e2\u02e3\u02e5\u02e6\u02e7\u02ea\u02e8\u02e9\u02eb\u02ec\u02ee\u02ef\u02f0\u02f1\u02f3\u02f2" +
+        "\u02f4\u02f6\u02fa\u030e\u0315\u02f7\u02f8\u02f9\u02fb\u02fc\u02fd\u0304\u02fe\u02ff\u0300\u0301" +
+        "\u0302\u0303\u0305\u0306\u0307\u0308\u0309\u030a\u030b\u030c\u030d\u030f\u0310\u0311\u0312\u0313" +
+        "\u0314\u0316\u031f\u0332\u0317\u0318\u0319\u031a\u031b\u031d\u031c\u031e\u0320\u0328\u0321\u0322" +
+        "\u0323\u0324\u0325\u0326\u0327\u0329\u032a\u032b\u032c\u032d\u032e\u032f\u0330\u0331\u0333\u0334" +
+        "\u0335\u0336\u0337\u0338\u0339\u033a\u033b\u033d\u033e\u033f\u0340\u0341\u0342\u0343\u0344\u0346" +
+        "\u0347\u0348\u0349\u034a\u034c\u034d\u034e\u034f\u0351\u0352\u0353\u0354\u0355\u0356\u035b\u0357" +
+        "\u0358\u0359\u035a\u035c\u035d\u035f\u0364\u0369\u036d\u0372\u0378\u0360\u0361\u0362\u0363\u0365" +
+        "\u0366\u0367\u0368\u036a\u036b\u036c\u036e\u036f\u0370\u0371\u0373\u0374\u0376\u0375\u0377\u0379" +
+        "\u037a\u037b\u037c\u037e\u0380\u0381\u0382\u0384\u0386\u0388\u0389\u038b\u038c\u038f\u038d\u038e" +
+        "\u0391\u0392\u0394\u0396\u0397\u0398\u039a\u039c\u039e\u03a0\u03a2\u03a3\u03a5\u03a6\u03a7\u03a9" +
+        "\u03ab\u03ac\u03ae\u03af\u03b1\u03b2\u03b4\u03b5\u03b8\u03b6\u03b7\u03b9\u03bb\u03bc\u03be\u03c0"
+
+    /** Failure link of each state */
+    const val FAIL =
+        "\u0000\u0000\u0034\u0001\u0018\u00a1\u01a5\u01a6\u0001\u00a1\u01a5\u00e9\u00a1\u0194\u0000\u0060" +
+        "\u006e\u00e9\u0000\u0000\u0210\u016f\u0000\u00e9\u0194\u0194\u023d\u018d\u0000\u01d9\u0001\u0000" +
+        "\u0000\u00e9\u01d9\u016f\u018d\u00a1\u00ba\u01d9\u0000\u0210\u0000\u01e5\u0000\u0000\u00a1\u0001" +
+        "\u0210\u016f\u0000\u01a5\u0000\u00e9\u018d\u023d\u0000\u0000\u01e5\u01e6\u01f4\u01f5\u01f6\u01f7" +
+        "\u01f8\u0210\u0211\u0212\u0213\u021d\u01d9\u018d\u0001\u0018\u0000\u023d\u0210\u016f\u0210\u0000" +
+        "\u016f\u0000\u0210\u016f\u0000\u01d9\u0001\u0000\u0000\u018d\u00a1\u0000\u0000\u0000\u00a1\u0000" +
+        "\u0000\u0001\u0018\u0060\u00e9\u018d\u0001\u00a1\u01a5\u018e\u00a1\u018d\u018e\u00a1\u015f\u0000" +
+        "\u0001\u0000\u015f\u0166\u0167\u0168\u0169\u016a\u016b\u016c\u016d\u016e\u01a5\u0000\u01c0\u018d" +
+        "\u018e\u0210\u0211\u00a1\u01a5\u021e\u00a1\u01a5\u01a6\u0060\u018d\u023d\u016f\u00a1\u01a5\u0000" +
+        "\u00a1\u01a5\u0210\u016f\u0170\u023d\u00e9\u016f\u0170\u0195\u0000\u0194\u0000\u0210\u016f\u0000" +
+        "\u01c0\u0000\u00e9\u01e5\u0060\u007c\u0088\u0092\u0093\u0094\u0095\u0001\u00a1\u01a5\u0000\u0001" +
+        "\u0000\u0000\u00e9\u00a1\u00a2\u010e\u00ba\u0245\u01a5\u01d9\u016f\u0034\u0001\u0030\u0211\u018d" +
+        "\u0000\u0001\u0018\u015f\u00e9\u010e\u0210\u016f\u0000\u0001\u0018\u01e5\u0060\u007c\u0088\u0092" +
+        "\u0093\u0094\u0095\u0096\u00a1\u0210\u023d\u0194\u00a1\u0001\u01d9\u01a5\u01c0\u01c0\u00e9\u00a1" +
+        "\u023d\u01d9\u00a1\u00e0\u00e1\u023d\u018d\u00a1\u00e0\u0000\u0000\u0000\u0001\u0018\u00a1\u0001" +
+        "\u0000\u00e9\u010e\u0210\u01a5\u015f\u0160\u0161\u0162\u0163\u018d\u0001\u0018\u0000\u0001\u0000" +
+        "\u00e9\u010e\u0210\u01a5\u01c0\u01c9\u01ca\u01cb\u01cc\u01cd\u0061\u0000\u0000\u01a5\u0194\u0000" +
+        "\u0001\u0030\u0210\u021e\u010e\u0210\u021e\u0060\u007c\u023d\u01d9\u01e5\u023d\u01d9\u01e5\u01a5" +
+        "\u00e9\u00ea\u016f\u01e5\u016f\u0000\u0194\u01c0\u01c1\u001d\u023d\u0210\u016f\u01a5\u01a6\u01c2" +
+        "\u01c3\u01c4\u01c7\u01c9\u01ca\u01cb\u01cc\u01cd\u0061\u0030\u0031\u01a5\u01a6\u00a1\u00a2\u00a1" +
+        "\u0000\u016f\u0170\u0001\u018d\u016f\u0000\u0001\u00a1\u01a5\u016f\u01e5\u015f\u00e9\u00a1\u023d" +
+        "\u018d\u018d\u0000\u0000\u0194\u0060\u00e9\u018d\u018d\u018e\u018f\u016f\u0245\u01a5\u01d9\u0000" +
+        "\u016f\u0001\u0030\u01a5\u023d\u01e5\u01a5\u0000\u0194\u0000\u0210\u015f\u0000\u0194\u015f\u0000" +
+        "\u0194\u0000\u01c0\u01d9\u01a5\u0152\u01d9\u01da\u01e5\u01e5\u0060\u007c\u007d\u007e\u007f\u0080" +
+        "\u0081\u0085\u01c0\u0210\u0211\u018d\u0000\u00e9\u00a1\u00ba\u018d\u00a1\u00ba\u0000\u00e9\u010e" +
+        "\u0195\u0000\u0001\u01c0\u0000\u0152\u0000\u0194\u0195\u01a5\u0210\u0000\u0060\u007c\u007d\u007e" +
+        "\u007f\u0080\u0081\u0085\u0086\u0000\u0194\u0000\u0152\u01a5\u016f\u0170\u0195\u015f\u0166\u018d" +
+        "\u00a1\u0000\u0152\u01a5\u016f\u0170\u0195\u015f\u0166\u018d\u00a1\u0195\u01a5\u016f\u0170\u0195" +
+        "\u0000\u0001\u023d\u01e5\u0001\u00a1\u01a5\u01e6\u01e7\u023d\u0034\u018d\u016f\u0060\u0000\u0194" +
+        "\u00a1\u01a5\u01e5\u01e6\u01e5\u015f\u0160\u0170\u0195\u0000\u00e9\u015f\u0001\u0030\u018d\u018e" +
+        "\u0001\u002b\u016f\u0170\u0195\u0000\u00e9\u00a1\u0001\u0018\u0195\u0000\u0034\u0035\u0046\u0000" +
+        "\u0001\u018d\u0001\u0018\u018d\u018e\u01e5\u0001\u016f\u01d9\u016f\u0001\u018d\u016f\u0000\u0001" +
+        "\u0030\u0031\u01a5\u01a6\u016f\u0170\u0195\u023d\u01e5\u01c0\u00e9\u010e\u013d\u013e\u013f\u00e0" +
+        "\u0000\u0001\u0000\u0001\u0000\u018d\u0001\u0018\u00a1\u0000\u0000\u0000\u0000\u0030\u00e9\u01d9" +
+        "\u0000\u016f\u0170\u0001\u00a1\u01a5\u00e9\u0000\u01d9\u0000\u0194\u0000\u0034\u0000\u0000\u0000" +
+        "\u0000\u00a1\u0000\u0194\u0195\u0194\u0195\u0000\u0194\u0195\u0196\u0197\u0198\u0000\u01c0\u00a1" +
+        "\u0001\u0030\u0031\u0170\u0195\u0000\u0001\u0245\u0000\u0194\u00a1\u0001\u0000\u0001\u0018\u0195" +
+        "\u0000\u0060\u0000\u01c0\u0000\u0194\u015f\u0000\u0210\u01d9\u0001\u0210\u016f\u0000\u0194\u0000" +
+        "\u015f\u0000\u0194\u015f\u0000\u0000\u015f\u0166\u0167\u0168\u0169\u016a\u016b\u016c\u016d\u016e" +
+        "\u0000\u0245\u0000\u0000\u02dd\u0000\u0000\u02c6\u0000\u0000\u02f5\u0315\u0332\u0000\u0000\u033c" +
+        "\u033c\u0000\u0000\u0000\u0000\u02dd\u0000\u0000\u0345\u0000\u0000\u02f5\u0000\u033c\u033d\u033e" +
+        "\u0000\u0345\u033c\u0000\u0000\u02dd\u0000\u0000\u0345\u0000\u0000\u0272\u0273\u0274\u0275\u0276" +
+        "\u0277\u0278\u0000\u0000\u0000\u0000\u02c6\u0000\u0000\u0000\u02dd\u0000\u02c6\u0000\u0000\u02c6" +
+        "\u0000\u0345\u02dd\u02dd\u02e4\u0000\u0000\u02c6\u0000\u02c6\u0000\u0000\u02c6\u02dd\u0000\u02dd" +
+        "\u0000\u02dd\u0000\u0000\u02c6\u02dd\u0000\u0000\u0000\u0299\u029a\u02a1\u02a2\u02a3\u02a4\u02a5" +
+        "\u02a6\u02ab\u02ac\u0299\u029a\u02a1\u02a2\u02a3\u02a4\u02a5\u02a6\u02ab\u02ac\u0000\u0000\u02dd" +
+        "\u02e4\u0000\u0000\u02c6\u02c6\u0000\u02dd\u0000\u02c6\u0000\u0000\u02c6\u0000\u0345\u0000\u0000" +
+        "\u02c6\u02c7\u02c6\u0000\u02c6\u0000\u0000\u0000\u0299\u029a\u0000\u0000\u0000\u0278\u02dd\u0000" +
+        "\u0000\u0345\u033c\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0345\u0000\u033c\u0000\u02dd\u02de" +
+        "\u0000\u02c6\u0000\u0345\u02dd\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u02c6\u0000\u02c6\u0000" +
+        "\u0299\u0000\u02f5\u0000\u02c6\u02c7\u02c6\u02dd\u02dd\u033c\u0345\u0000\u02c6\u02dd\u0278\u0000" +
+        "\u0000\u02c6\u02dd\u0000\u02dd\u0000\u0000\u0000\u0000\u0345\u033c\u0000\u0000\u0000\u0000\u033c" +
+        "\u02dd\u0278\u0000\u02c6\u02dd\u0000\u0000\u0000\u0278\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u034b\u035e\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0350\u0000\u0000\u0000\u0000\u035e\u0000\u0000\u0000\u0000\u0350\u0000\u0000\u0000\u035e" +
+        "\u0372\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u03a1\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u038a\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u03a1\u0000\u03a1\u0000\u0383\u0000" +
+        "\u0383\u0000\u0000\u037d\u0000\u038a\u038c\u038f\u0000\u0000\u0000\u0000\u037d\u0000\u0000\u037d" +
+        "\u0000\u03ba\u03bb\u0000\u0000\u0000\u03bd\u03be\u03bd\u03be\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000"
+
+    /** Keyword recognized in each state + 1, 0 for none */
+    const val OUTPUT =
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0001\u0000\u0002\u0000\u0003\u0000" +
+        "\u0000\u0000\u0000\u0004\u0000\u0000\u0000\u0005\u0000\u0000\u0000\u0000\u0006\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0007\u0000\u0000\u0000\u0008\u0000\u0000\u0000\u0000\u0009" +
+        "\u0000\u0000\u0000\u000a\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u000b\u0000\u0000\u0000\u0000\u000c\u0000\u0000\u0000\u0000\u0000\u0000\u000d\u0000\u0000\u0000" +
+        "\u0000\u000e\u0000\u000f\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0010\u0000\u0000\u0000\u0011" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0012\u0000\u0013\u0000\u0000\u0014\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0015\u0000\u0000\u0000\u0000" +
+        "\u0000\u0016\u0017\u0000\u0018\u0019\u001a\u001b\u0000\u0000\u0000\u0000\u0000\u0000\u001c\u0000" +
+        "\u0000\u001d\u0000\u0000\u0000\u0000\u001e\u0000\u0000\u001f\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0020\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0021\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0022\u0000\u0000\u0000\u0023\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0024\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0025\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0026\u0000\u0000\u0000\u0000\u0027\u0000\u0000\u0000\u0000\u0000\u0028" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0029\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u002a\u0000\u0000\u0000\u0000\u002b\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u002c\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u002d\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u002e\u0000\u0000\u0000\u0000\u002f\u0000\u0000\u0000\u0030" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0031\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0032\u0000" +
+        "\u0000\u0033\u0034\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0035\u0036\u0000\u0037" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0038\u0039\u0000\u0000\u0000\u003a\u0000" +
+        "\u0000\u003b\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u003c\u0000" +
+        "\u0000\u0000\u0000\u003d\u0000\u003e\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u003f\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0040\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0041\u0042\u0000\u0000\u0000\u0043\u0000\u0000\u0000\u0000\u0000\u0000\u0044\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0045\u0000\u0000\u0000\u0000\u0046\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0047\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0048\u0000\u0000\u0000" +
+        "\u0049\u0000\u0000\u0000\u0000\u0000\u004a\u0000\u0000\u0000\u004b\u0000\u0000\u0000\u0000\u004c" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u004d\u0000\u004e\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u004f\u0000\u0000\u0000\u0000\u0050\u0000\u0000\u0000\u0000\u0051\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0052\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0053\u0000\u0000\u0000\u0000\u0054\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0055\u0000\u0000\u0056\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0057\u0058" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0059\u0000\u0000\u005a\u005b\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u005c\u005d\u005e\u0000\u0000\u0000\u0000\u0000\u005f\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0060\u0000\u0000\u0000\u0000\u0061\u0000\u0000\u0062\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0063\u0000\u0000\u0000\u0000\u0000\u0000\u0064\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0065\u0000\u0066\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0067\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0068" +
+        "\u0000\u0069\u0000\u0000\u0000\u0000\u0000\u006a\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u006b\u006c\u0000\u0000\u0000\u0000\u0000\u0000\u006d\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u006e\u0000\u0000\u0000\u0000\u006f\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0070\u0000\u0000\u0000\u0000\u0000\u0071\u0072\u0000\u0073\u0074\u0000\u0075\u0000\u0000\u0000" +
+        "\u0000\u0000\u0076\u0000\u0000\u0000\u0000\u0077\u0000\u0000\u0000\u0000\u0000\u0078\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0079\u007a\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u007b\u0000\u007c\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u007d\u0000\u007e\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u007f\u0000\u0000\u0000\u0000\u0000\u0080\u0000\u0000\u0081\u0000\u0000\u0000" +
+        "\u0000\u0000\u0082\u0000\u0083\u0000\u0000\u0000\u0000\u0084\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0085\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0086\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0087\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0088\u0000\u0089\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u008a\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u008b\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u008c\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u008d\u0000\u0000\u0000\u0000\u0000\u008e\u0000\u0000\u0000\u0000\u008f" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0090\u0000\u0000\u0091\u0000\u0000" +
+        "\u0000\u0000\u0092\u0093\u0000\u0000\u0000\u0094\u0095\u0000\u0000\u0096\u0097\u0000\u0000\u0000" +
+        "\u0098\u0099\u0000\u0000\u0000\u009a\u009b\u009c\u0000\u0000\u0000\u009d\u009e\u0000\u009f\u0000" +
+        "\u00a0\u00a1\u00a2\u0000\u00a3\u0000\u00a4\u0000\u00a5\u00a6\u0000\u00a7\u00a8\u00a9\u00aa\u00ab" +
+        "\u0000\u0000\u00ac\u0000\u00ad\u0000\u0000\u0000\u00ae\u0000\u00af\u0000\u00b0\u0000\u00b1\u0000" +
+        "\u00b2\u0000\u0000\u00b3\u0000\u0000\u00b4\u00b5\u0000\u00b6\u0000\u00b7\u00b8\u0000\u00b9\u00ba" +
+        "\u0000\u0000\u00bb\u0000\u00bc\u0000\u00bd\u00be\u00bf\u00c0\u0000\u00c1\u00c2\u0000\u00c3\u0000" +
+        "\u00c4"
+
+    /** Nearest state with an output on the failure chain, 0 for none */
+    const val DICT =
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u01f8\u0000\u0000\u0000\u0000\u021d\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u016e\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0096\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0163\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0081\u0085\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0081\u0085\u0086\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u013d\u0000\u013f\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0198\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u016e" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0277\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u02a6\u0000\u02ac\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u02a6\u0000\u02ac\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u038c\u038f\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u03bb\u0000\u0000\u0000\u0000\u03be\u0000\u03be\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000"
+
+    /** Length of each keyword */
+    const val KEYWORD_LENGTH =
+        "\u000a\u0009\u0009\u0006\u0006\u0006\u000b\u0006\u0006\u0005\u000d\u000b\u0009\u0006\u0005\u0009" +
+        "\u0005\u0009\u0008\u0009\u000f\u0007\u0008\u000a\u0008\u0009\u0008\u0009\u0009\u0008\u000a\u0008" +
+        "\u000d\u000a\u000c\u000a\u000a\u000c\u0007\u0007\u000a\u000c\u0008\u000d\u000d\u000a\u0008\u0008" +
+        "\u000a\u000b\u0008\u0008\u000e\u0003\u0005\u000a\u0004\u0008\u0004\u000d\u0005\u0006\u000a\u000b" +
+        "\u0009\u000a\u0005\u000c\u0007\u0005\u000d\u0008\u0007\u0008\u0007\u0007\u0007\u0006\u000c\u000a" +
+        "\u0005\u0009\u000f\u0007\u000d\u000b\u0009\u0008\u000a\u000b\u0005\u0009\u0007\u0007\u0007\u0008" +
+        "\u0009\u0009\u0008\u0007\u000d\u0007\u000e\u000d\u0006\u0006\u000a\u0009\u0008\u000b\u0007\u0008" +
+        "\u0008\u0009\u000a\u0009\u0008\u0008\u0008\u0009\u0009\u000a\u000b\u000b\u000a\u000a\u0007\u0007" +
+        "\u0007\u0007\u0007\u0005\u000b\u000e\u0008\u0009\u0009\u000b\u000d\u000c\u0009\u0006\u0005\u000b" +
+        "\u0009\u0005\u0006\u0005\u0006\u0004\u0005\u0005\u0006\u0005\u0004\u0005\u0005\u0006\u0002\u0002" +
+        "\u0002\u0002\u0002\u0002\u0002\u0002\u0002\u0002\u0003\u0004\u0002\u0003\u0002\u0004\u0002\u0002" +
+        "\u0002\u0002\u0003\u0003\u0003\u0002\u0002\u0003\u0002\u0003\u0003\u0002\u0004\u0005\u0003\u0004" +
+        "\u0002\u0002\u0002\u0002"
+
+    /** Index of each keyword's status in STATUSES */
+    const val KEYWORD_RANK =
+        "\u0003\u0003\u0003\u0001\u0000\u0003\u0002\u0003\u0002\u0000\u0000\u0000\u0000\u0001\u0001\u0003" +
+        "\u0003\u0003\u0003\u0003\u0000\u0001\u0001\u0001\u0001\u0001\u0001\u0001\u0001\u0000\u0000\u0000" +
+        "\u0003\u0000\u0000\u0003\u0003\u0003\u0002\u0003\u0002\u0000\u0002\u0000\u0000\u0002\u0000\u0000" +
+        "\u0000\u0000\u0002\u0002\u0000\u0001\u0001\u0001\u0001\u0001\u0001\u0000\u0002\u0002\u0001\u0000" +
+        "\u0000\u0000\u0003\u0003\u0001\u0003\u0000\u0000\u0002\u0000\u0002\u0000\u0002\u0002\u0000\u0000" +
+        "\u0002\u0000\u0000\u0001\u0000\u0000\u0002\u0002\u0001\u0001\u0001\u0001\u0001\u0001\u0001\u0002" +
+        "\u0002\u0002\u0000\u0000\u0000\u0000\u0000\u0001\u0003\u0003\u0000\u0000\u0000\u0000\u0000\u0003" +
+        "\u0001\u0001\u0001\u0001\u0001\u0003\u0001\u0001\u0002\u0002\u0000\u0000\u0000\u0000\u0001\u0000" +
+        "\u0000\u0003\u0003\u0002\u0000\u0000\u0003\u0003\u0003\u0002\u0002\u0000\u0003\u0000\u0000\u0000" +
+        "\u0000\u0002\u0002\u0000\u0000\u0002\u0002\u0001\u0001\u0003\u0003\u0003\u0001\u0001\u0003\u0002" +
+        "\u0002\u0002\u0002\u0001\u0003\u0003\u0001\u0001\u0001\u0001\u0001\u0001\u0003\u0003\u0002\u0002" +
+        "\u0002\u0002\u0000\u0000\u0000\u0003\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0003\u0000\u0003" +
+        "\u0001\u0001\u0003\u0002"
+
+    /** 1 when a keyword only counts as a whole word */
+    const val KEYWORD_WHOLE_WORD =
+        "\u0000\u0000\u0000\u0000\u0001\u0000\u0000\u0000\u0000\u0001\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0001\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0001\u0001\u0000\u0001\u0000\u0001\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0001\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000\u0000" +
+        "\u0000\u0000\u0000\u0000"
+}
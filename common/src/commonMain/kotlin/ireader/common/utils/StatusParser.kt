@@ -1,33 +1,33 @@
 package ireader.common.utils
 
+import ireader.common.utils.StatusKeywords.DICT
+import ireader.common.utils.StatusKeywords.EDGE_CHARS
+import ireader.common.utils.StatusKeywords.EDGE_START
+import ireader.common.utils.StatusKeywords.EDGE_TARGETS
+import ireader.common.utils.StatusKeywords.FAIL
+import ireader.common.utils.StatusKeywords.KEYWORD_LENGTH
+import ireader.common.utils.StatusKeywords.KEYWORD_RANK
+import ireader.common.utils.StatusKeywords.KEYWORD_WHOLE_WORD
+import ireader.common.utils.StatusKeywords.OUTPUT
+import ireader.common.utils.StatusKeywords.STATUSES
 import ireader.core.source.model.MangaInfo
+import kotlin.concurrent.Volatile
 
 /**
  * Utility object for parsing publication status from various string formats.
  * Normalizes different status representations into standard MangaInfo status codes.
+ *
+ * Keywords come from scripts/keywords/status.json and are matched in one pass
+ * by the automaton in [StatusKeywords] (regenerate it with
+ * scripts/generate-status-parser.py). Overlapping keywords resolve to the
+ * longest one, so "discontinued" is not read as "continue"; separate matches
+ * resolve as ongoing, completed, hiatus, cancelled.
  */
 object StatusParser {
 
-    private val ongoingKeywords = mutableSetOf(
-        "ongoing", "on going", "on-going", "publishing", "serialization",
-        "updating", "active", "continue", "en cours", "em andamento",
-        "مستمر", "devam ediyor", "连载中"
-    )
-
-    private val completedKeywords = mutableSetOf(
-        "completed", "complete", "finished", "end", "ended",
-        "terminé", "completo", "concluído", "مكتمل", "tamamlandı", "完结"
-    )
-
-    private val hiatusKeywords = mutableSetOf(
-        "hiatus", "on hold", "paused", "suspended", "en pause",
-        "pausado", "متوقف", "ara verildi"
-    )
-
-    private val cancelledKeywords = mutableSetOf(
-        "cancelled", "canceled", "dropped", "discontinued",
-        "annulé", "cancelado", "ملغي", "iptal edildi"
-    )
+    // Keyword to rank in STATUSES; replaced as a whole so parseStatus needs no lock
+    @Volatile
+    private var customKeywords: List<Pair<String, Int>> = emptyList()
 
     /**
      * Parses a status string and returns the corresponding MangaInfo status code.
@@ -37,15 +37,23 @@ object StatusParser {
      *         MangaInfo.CANCELLED, or MangaInfo.UNKNOWN
      */
     fun parseStatus(statusStr: String): Long {
-        val normalized = statusStr.lowercase().trim()
+        val text = CharArray(statusStr.length)
+        var length = 0
+        for (char in statusStr) {
+            val c = if (char.isWhitespace()) ' ' else char.lowercaseChar()
+            if (c == ' ' && (length == 0 || text[length - 1] == ' ')) continue
+            text[length++] = c
+        }
 
-        return when {
-            ongoingKeywords.any { it in normalized } -> MangaInfo.ONGOING
-            completedKeywords.any { it in normalized } -> MangaInfo.COMPLETED
-            hiatusKeywords.any { it in normalized } -> MangaInfo.ON_HIATUS
-            cancelledKeywords.any { it in normalized } -> MangaInfo.CANCELLED
-            else -> MangaInfo.UNKNOWN
+        var best = match(text, length)
+        val custom = customKeywords
+        if (custom.isNotEmpty()) {
+            val normalized = text.concatToString(0, length)
+            for ((keyword, rank) in custom) {
+                if (rank < best && keyword in normalized) best = rank
+            }
         }
+        return if (best < STATUSES.size) STATUSES[best] else MangaInfo.UNKNOWN
     }
 
     /**
@@ -56,13 +64,63 @@ object StatusParser {
      * @param keywords Additional keywords to recognize for this status
      */
     fun addCustomKeywords(status: Long, vararg keywords: String) {
-        val targetSet = when (status) {
-            MangaInfo.ONGOING -> ongoingKeywords
-            MangaInfo.COMPLETED -> completedKeywords
-            MangaInfo.ON_HIATUS -> hiatusKeywords
-            MangaInfo.CANCELLED -> cancelledKeywords
-            else -> return
+        val rank = STATUSES.indexOf(status)
+        if (rank < 0) return
+        customKeywords = customKeywords + keywords.map { it.lowercase() to rank }
+    }
+
+    /**
+     * Best rank among the keywords in the normalized [text], STATUSES.size for none.
+     */
+    private fun match(text: CharArray, length: Int): Int {
+        // Start and rank of the matches so far; a match inside a later, longer one is dropped
+        var starts = IntArray(4)
+        var ranks = IntArray(4)
+        var count = 0
+        var state = 0
+        for (index in 0 until length) {
+            state = next(state, text[index])
+            var candidate = if (OUTPUT[state].code != 0) state else DICT[state].code
+            while (candidate != 0) {
+                val keyword = OUTPUT[candidate].code - 1
+                val start = index + 1 - KEYWORD_LENGTH[keyword].code
+                if (KEYWORD_WHOLE_WORD[keyword].code == 0 || isWholeWord(text, length, start, index + 1)) {
+                    while (count > 0 && starts[count - 1] >= start) count--
+                    if (count == starts.size) {
+                        starts = starts.copyOf(count * 2)
+                        ranks = ranks.copyOf(count * 2)
+                    }
+                    starts[count] = start
+                    ranks[count] = KEYWORD_RANK[keyword].code
+                    count++
+                    break
+                }
+                candidate = DICT[candidate].code
+            }
+        }
+        var best = STATUSES.size
+        for (i in 0 until count) {
+            if (ranks[i] < best) best = ranks[i]
+        }
+        return best
+    }
+
+    private fun next(from: Int, char: Char): Int {
+        var state = from
+        while (true) {
+            var low = EDGE_START[state].code
+            var high = EDGE_START[state + 1].code
+            val end = high
+            while (low < high) {
+                val mid = (low + high) ushr 1
+                if (EDGE_CHARS[mid] < char) low = mid + 1 else high = mid
+            }
+            if (low < end && EDGE_CHARS[low] == char) return EDGE_TARGETS[low].code
+            if (state == 0) return 0
+            state = FAIL[state].code
         }
-        targetSet.addAll(keywords.map { it.lowercase() })
     }
+
+    private fun isWholeWord(text: CharArray, length: Int, start: Int, end: Int): Boolean =
+        (start == 0 || !text[start - 1].isLetterOrDigit()) && (end == length || !text[end].isLetterOrDigit())
 }
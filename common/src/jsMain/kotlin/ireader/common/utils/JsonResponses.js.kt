@@ -0,0 +1,9 @@
+package ireader.common.utils
+
+import io.ktor.client.statement.HttpResponse
+import io.ktor.client.statement.bodyAsText
+import kotlinx.serialization.DeserializationStrategy
+import kotlinx.serialization.json.Json
+
+actual suspend fun <T> HttpResponse.decodeJson(json: Json, deserializer: DeserializationStrategy<T>): T =
+    json.decodeFromString(deserializer, bodyAsText())
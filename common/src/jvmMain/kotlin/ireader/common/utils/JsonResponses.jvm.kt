@@ -0,0 +1,20 @@
+package ireader.common.utils
+
+import io.ktor.client.statement.HttpResponse
+import io.ktor.client.statement.bodyAsChannel
+import io.ktor.utils.io.jvm.javaio.toInputStream
+import kotlinx.coroutines.Dispatchers
+import kotlinx.coroutines.withContext
+import kotlinx.serialization.DeserializationStrategy
+import kotlinx.serialization.ExperimentalSerializationApi
+import kotlinx.serialization.json.Json
+import kotlinx.serialization.json.decodeFromStream
+
+@OptIn(ExperimentalSerializationApi::class)
+actual suspend fun <T> HttpResponse.decodeJson(json: Json, deserializer: DeserializationStrategy<T>): T {
+    val channel = bodyAsChannel()
+    // decodeFromStream blocks on the channel while it waits for more bytes
+    return withContext(Dispatchers.IO) {
+        channel.toInputStream().use { json.decodeFromStream(deserializer, it) }
+    }
+}
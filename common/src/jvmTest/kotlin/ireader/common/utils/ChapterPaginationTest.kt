@@ -0,0 +1,111 @@
+package ireader.common.utils
+
+import kotlinx.coroutines.runBlocking
+import kotlin.test.Test
+import kotlin.test.assertEquals
+import kotlin.test.assertFailsWith
+
+class ChapterPaginationTest {
+
+    private val noDelay = ErrorHandler.RetryConfig(initialDelayMs = 1, maxDelayMs = 1)
+
+    private fun page(number: Int, size: Int = 3) = (1..size).map { "p$number-$it" }
+
+    @Test
+    fun stopsAtEmptyLastPage() = runBlocking {
+        val fetched = mutableListOf<Int>()
+        val chapters = ChapterPagination.byPage(parallelism = 2, retry = noDelay) { number ->
+            fetched += number
+            if (number <= 3) page(number) else emptyList()
+        }
+        assertEquals((1..3).flatMap { page(it) }, chapters)
+        // Two pages per round: 1-2, then 3-4, where 4 is empty
+        assertEquals(listOf(1, 2, 3, 4), fetched.sorted())
+    }
+
+    @Test
+    fun stopsAtShortPage() = runBlocking {
+        val chapters = ChapterPagination.byOffset(pageSize = 10, retry = noDelay) { offset ->
+            (offset until minOf(offset + 10, 24)).map { "c$it" }
+        }
+        assertEquals((0 until 24).map { "c$it" }, chapters)
+    }
+
+    @Test
+    fun dedupesKeysAcrossPages() = runBlocking {
+        val pages = mapOf(
+            1 to listOf("a" to "/1", "b" to "/2", "c" to "/3"),
+            2 to listOf("c again" to "/3", "d" to "/4", "e" to "/5"),
+        )
+        val chapters = ChapterPagination.byPage(retry = noDelay, key = { it.second }) { number ->
+            pages[number].orEmpty()
+        }
+        // The first page to list a key wins, in page order
+        assertEquals(listOf("a", "b", "c", "d", "e"), chapters.map { it.first })
+    }
+
+    @Test
+    fun stopsWhenPagesRepeat() = runBlocking {
+        // Sites that answer out-of-range page numbers with the last page
+        val chapters = ChapterPagination.byPage(parallelism = 1, retry = noDelay) { number ->
+            page(minOf(number, 2))
+        }
+        assertEquals(page(1) + page(2), chapters)
+    }
+
+    @Test
+    fun speculativePagesPastTheEndMayFail() = runBlocking {
+        val chapters = ChapterPagination.byPage(parallelism = 4, retry = noDelay) { number ->
+            if (number > 2) throw IllegalStateException("HTTP 404") else page(number)
+        }
+        assertEquals(page(1) + page(2), chapters)
+    }
+
+    @Test
+    fun firstPageFailureIsReported() {
+        assertFailsWith<ErrorHandler.SourceError.SourceUnavailable> {
+            runBlocking {
+                ChapterPagination.byPage<String>(retry = noDelay) { throw IllegalStateException("HTTP 503") }
+            }
+        }
+    }
+
+    @Test
+    fun retriesNetworkErrors() = runBlocking {
+        val attempts = mutableMapOf<Int, Int>()
+        val chapters = ChapterPagination.byPage(parallelism = 1, retry = noDelay) { number ->
+            val attempt = attempts.merge(number, 1, Int::plus)!!
+            when {
+                number == 1 && attempt == 1 -> throw IllegalStateException("Read timeout")
+                number == 1 -> page(1)
+                else -> emptyList()
+            }
+        }
+        assertEquals(page(1), chapters)
+        assertEquals(2, attempts[1])
+    }
+
+    @Test
+    fun cursorsEndWithoutNextCursor() = runBlocking {
+        val next = mapOf<String?, String?>(null to "b", "b" to "c", "c" to null)
+        val seen = mutableListOf<String?>()
+        val chapters = ChapterPagination.byCursor<String>(retry = noDelay) { cursor ->
+            seen += cursor
+            listOf("${cursor ?: "a"}1", "${cursor ?: "a"}2") to next.getValue(cursor)
+        }
+        assertEquals(listOf("a1", "a2", "b1", "b2", "c1", "c2"), chapters)
+        assertEquals(listOf(null, "b", "c"), seen)
+    }
+
+    @Test
+    fun cursorLoopsTerminate() = runBlocking {
+        var calls = 0
+        val chapters = ChapterPagination.byCursor<String>(start = "x", retry = noDelay) { cursor ->
+            calls++
+            // x -> y -> x: a site handing back an earlier cursor, with overlapping items
+            listOf("shared", "only-$cursor") to if (cursor == "x") "y" else "x"
+        }
+        assertEquals(listOf("shared", "only-x", "only-y"), chapters)
+        assertEquals(2, calls)
+    }
+}
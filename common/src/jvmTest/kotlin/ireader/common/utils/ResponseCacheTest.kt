@@ -0,0 +1,116 @@
+package ireader.common.utils
+
+import com.sun.net.httpserver.HttpServer
+import io.ktor.client.HttpClient
+import io.ktor.client.engine.cio.CIO
+import io.ktor.client.request.HttpRequestBuilder
+import io.ktor.client.request.url
+import io.ktor.http.HttpHeaders
+import kotlinx.coroutines.runBlocking
+import java.net.InetSocketAddress
+import java.util.concurrent.atomic.AtomicInteger
+import kotlin.test.AfterTest
+import kotlin.test.BeforeTest
+import kotlin.test.Test
+import kotlin.test.assertEquals
+import kotlin.time.Duration.Companion.minutes
+
+class ResponseCacheTest {
+
+    private lateinit var server: HttpServer
+    private val client = HttpClient(CIO)
+    private val requests = AtomicInteger()
+    private val notModified = AtomicInteger()
+    private var body = "chapters v1"
+    private var etag = "\"v1\""
+    private var now = 0L
+
+    @BeforeTest
+    fun start() {
+        server = HttpServer.create(InetSocketAddress("127.0.0.1", 0), 0)
+        server.createContext("/") { exchange ->
+            requests.incrementAndGet()
+            if (exchange.requestHeaders.getFirst(HttpHeaders.IfNoneMatch) == etag) {
+                notModified.incrementAndGet()
+                exchange.sendResponseHeaders(304, -1)
+            } else {
+                val bytes = body.toByteArray()
+                exchange.responseHeaders.add(HttpHeaders.ETag, etag)
+                exchange.responseHeaders.add(HttpHeaders.LastModified, "Mon, 05 Oct 2026 10:00:00 GMT")
+                exchange.sendResponseHeaders(200, bytes.size.toLong())
+                exchange.responseBody.use { it.write(bytes) }
+            }
+            exchange.close()
+        }
+        server.start()
+    }
+
+    @AfterTest
+    fun stop() {
+        server.stop(0)
+        client.close()
+    }
+
+    private fun request(path: String) = HttpRequestBuilder().apply {
+        url("http://127.0.0.1:${server.address.port}$path")
+    }
+
+    private fun cache(maxEntries: Int = 16) = ResponseCache(
+        maxEntries = maxEntries,
+        ttls = mapOf(ResponseCache.Endpoint.CHAPTERS to 10.minutes),
+        clock = { now },
+    )
+
+    @Test
+    fun `fresh entries are served without a request`() = runBlocking {
+        val cache = cache()
+        assertEquals("chapters v1", cache.fetch(client, request("/novel/1"), ResponseCache.Endpoint.CHAPTERS))
+        now += 5.minutes.inWholeMilliseconds
+        assertEquals("chapters v1", cache.fetch(client, request("/novel/1"), ResponseCache.Endpoint.CHAPTERS))
+        assertEquals(1, requests.get())
+        assertEquals(1, cache.hits)
+    }
+
+    @Test
+    fun `stale entries are revalidated and 304 reuses the body`() = runBlocking {
+        val cache = cache()
+        cache.fetch(client, request("/novel/1"), ResponseCache.Endpoint.CHAPTERS)
+        now += 11.minutes.inWholeMilliseconds
+        assertEquals("chapters v1", cache.fetch(client, request("/novel/1"), ResponseCache.Endpoint.CHAPTERS))
+        assertEquals(2, requests.get())
+        assertEquals(1, notModified.get())
+        assertEquals(1, cache.revalidated)
+
+        // The 304 restarted the TTL
+        now += 5.minutes.inWholeMilliseconds
+        cache.fetch(client, request("/novel/1"), ResponseCache.Endpoint.CHAPTERS)
+        assertEquals(2, requests.get())
+    }
+
+    @Test
+    fun `changed content replaces the entry`() = runBlocking {
+        val cache = cache()
+        cache.fetch(client, request("/novel/1"), ResponseCache.Endpoint.CHAPTERS)
+        body = "chapters v2"
+        etag = "\"v2\""
+        now += 11.minutes.inWholeMilliseconds
+        assertEquals("chapters v2", cache.fetch(client, request("/novel/1"), ResponseCache.Endpoint.CHAPTERS))
+        assertEquals(0, notModified.get())
+    }
+
+    @Test
+    fun `least recently used entries are evicted`() = runBlocking {
+        val cache = cache(maxEntries = 2)
+        cache.fetch(client, request("/novel/1"), ResponseCache.Endpoint.CHAPTERS)
+        cache.fetch(client, request("/novel/2"), ResponseCache.Endpoint.CHAPTERS)
+        cache.fetch(client, request("/novel/1"), ResponseCache.Endpoint.CHAPTERS)
+        cache.fetch(client, request("/novel/3"), ResponseCache.Endpoint.CHAPTERS)
+        assertEquals(2, cache.size)
+        assertEquals(3, requests.get())
+
+        cache.fetch(client, request("/novel/1"), ResponseCache.Endpoint.CHAPTERS)
+        assertEquals(3, requests.get())
+        cache.fetch(client, request("/novel/2"), ResponseCache.Endpoint.CHAPTERS)
+        assertEquals(4, requests.get())
+    }
+}
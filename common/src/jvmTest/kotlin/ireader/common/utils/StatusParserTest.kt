@@ -0,0 +1,102 @@
+// Generated by scripts/generate-status-parser.py from scripts/keywords/status.json. Do not edit.
+
+package ireader.common.utils
+
+import ireader.core.source.model.MangaInfo
+import kotlin.test.Test
+import kotlin.test.assertEquals
+import kotlin.time.measureTime
+
+class StatusParserTest {
+
+    private val corpus = listOf(
+        "مستمرة" to MangaInfo.ONGOING, // ar
+        "الحالة: مكتملة" to MangaInfo.COMPLETED, // ar
+        "متوقف مؤقتا" to MangaInfo.ON_HIATUS, // ar
+        "ملغاة" to MangaInfo.CANCELLED, // ar
+        "Ongoing" to MangaInfo.ONGOING, // en
+        "Status: OnGoing" to MangaInfo.ONGOING, // en
+        "Completed (1200 Chapters)" to MangaInfo.COMPLETED, // en
+        "COMPLETE" to MangaInfo.COMPLETED, // en
+        "The End" to MangaInfo.COMPLETED, // en
+        "On Hold" to MangaInfo.ON_HIATUS, // en
+        "Suspended" to MangaInfo.ON_HIATUS, // en
+        "Discontinued" to MangaInfo.CANCELLED, // en
+        "Dropped by the author" to MangaInfo.CANCELLED, // en
+        "Incomplete" to MangaInfo.ONGOING, // en
+        "Not completed" to MangaInfo.ONGOING, // en
+        "Weekend release" to MangaInfo.UNKNOWN, // en
+        "Inactive" to MangaInfo.UNKNOWN, // en
+        "Ongoing  /  Hiatus" to MangaInfo.ONGOING, // en
+        "" to MangaInfo.UNKNOWN, // en
+        "Licensed" to MangaInfo.UNKNOWN, // en
+        "En emisión" to MangaInfo.ONGOING, // es
+        "Finalizado" to MangaInfo.COMPLETED, // es
+        "En cours" to MangaInfo.ONGOING, // fr
+        "Terminé" to MangaInfo.COMPLETED, // fr
+        "En pause" to MangaInfo.ON_HIATUS, // fr
+        "Annulé" to MangaInfo.CANCELLED, // fr
+        "Infini" to MangaInfo.UNKNOWN, // fr
+        "Berlanjut" to MangaInfo.ONGOING, // in
+        "Tamat" to MangaInfo.COMPLETED, // in
+        "Belum tamat" to MangaInfo.ONGOING, // in
+        "Dihentikan" to MangaInfo.CANCELLED, // in
+        "連載中" to MangaInfo.ONGOING, // jp
+        "完結済み" to MangaInfo.COMPLETED, // jp
+        "休載中" to MangaInfo.ON_HIATUS, // jp
+        "打ち切り" to MangaInfo.CANCELLED, // jp
+        "연재중" to MangaInfo.ONGOING, // kr
+        "완결" to MangaInfo.COMPLETED, // kr
+        "미완결" to MangaInfo.ONGOING, // kr
+        "휴재" to MangaInfo.ON_HIATUS, // kr
+        "연재 중단" to MangaInfo.CANCELLED, // kr
+        "Em andamento" to MangaInfo.ONGOING, // pt
+        "Concluído" to MangaInfo.COMPLETED, // pt
+        "Em hiato" to MangaInfo.ON_HIATUS, // pt
+        "Cancelado" to MangaInfo.CANCELLED, // pt
+        "Inativo" to MangaInfo.UNKNOWN, // pt
+        "Продолжается" to MangaInfo.ONGOING, // ru
+        "Завершён" to MangaInfo.COMPLETED, // ru
+        "Не завершен" to MangaInfo.ONGOING, // ru
+        "Заморожен" to MangaInfo.ON_HIATUS, // ru
+        "Заброшен" to MangaInfo.CANCELLED, // ru
+        "Devam Ediyor" to MangaInfo.ONGOING, // tu
+        "Tamamlandı" to MangaInfo.COMPLETED, // tu
+        "Ara verildi" to MangaInfo.ON_HIATUS, // tu
+        "İptal Edildi" to MangaInfo.CANCELLED, // tu
+        "Триває" to MangaInfo.ONGOING, // uk
+        "Завершено" to MangaInfo.COMPLETED, // uk
+        "Призупинено" to MangaInfo.ON_HIATUS, // uk
+        "Покинуто" to MangaInfo.CANCELLED, // uk
+        "Đang tiến hành" to MangaInfo.ONGOING, // vi
+        "Hoàn thành" to MangaInfo.COMPLETED, // vi
+        "Chưa hoàn thành" to MangaInfo.ONGOING, // vi
+        "Tạm ngừng" to MangaInfo.ON_HIATUS, // vi
+        "Ngừng" to MangaInfo.CANCELLED, // vi
+        "Full" to MangaInfo.COMPLETED, // vi
+        "连载中" to MangaInfo.ONGOING, // zh
+        "状态：已完结" to MangaInfo.COMPLETED, // zh
+        "未完結" to MangaInfo.ONGOING, // zh
+        "停更" to MangaInfo.ON_HIATUS, // zh
+        "太监" to MangaInfo.CANCELLED, // zh
+    )
+
+    @Test
+    fun corpus() {
+        for ((text, status) in corpus) {
+            assertEquals(status, StatusParser.parseStatus(text), text)
+        }
+    }
+
+    @Test
+    fun benchmark() {
+        val rounds = 20_000
+        repeat(rounds / 10) { corpus.forEach { StatusParser.parseStatus(it.first) } }
+        var checksum = 0L
+        val elapsed = measureTime {
+            repeat(rounds) { corpus.forEach { checksum += StatusParser.parseStatus(it.first) } }
+        }
+        assertEquals(rounds * corpus.sumOf { it.second }, checksum)
+        println("StatusParser: ${elapsed.inWholeNanoseconds / (rounds.toLong() * corpus.size)} ns per status string")
+    }
+}
@@ -15,6 +15,13 @@
  * without requiring IReader's runtime.js or any external dependencies.
  * 
  * Output: sources-bundle.js (~1.6MB self-contained bundle)
+ *
+ * For clients that load sources lazily (iOS), a split build (opt-in, see
+ * jsSplit below) also emits one bundle per source (<lang>-<id>.js) holding only
+ * that source's code, plus runtime.js and shared.js with everything the sources
+ * have in common. See webpack.config.d/split.js; js-index.json points each
+ * source at its bundle and its SHA-256, and scripts/analyze-js-bundles.py
+ * reports what each source and dependency contributes.
  * 
  * NOTE: This module is SKIPPED during Android CI builds (when CI_CHUNK_NUM is set).
  *       JS builds run separately via build_js.yml workflow.
@@ -169,7 +176,39 @@ val jsSources: List<JsSourceConfig> = discoverJsSources().filter { source ->
     }
 }
 
+// Per-source bundles are opt-in until the split build has been verified:
+//   ./gradlew :js-sources:jsBrowserProductionWebpack :js-sources:createSourceIndex \
+//       -Pireader.js.split=true -Pkotlin.js.ir.output.granularity=per-file
+// Without it the build is the plain UMD sources-bundle.js, and every source in
+// js-index.json points at that.
+val jsSplit = (findProperty("ireader.js.split") as? String).toBoolean()
+
+if (jsSplit && findProperty("kotlin.js.ir.output.granularity") != "per-file") {
+    throw GradleException(
+        "-Pireader.js.split=true needs -Pkotlin.js.ir.output.granularity=per-file, " +
+            "so webpack can put each source in its own bundle"
+    )
+}
+
+// Name of the Kotlin/JS output module in split builds, and so of the npm
+// package directory (build/js/packages/<name>) that webpack runs in
+val jsModuleName = "ireader-js-sources"
+
+// Exports of the shared runtime bundle (see src/jsMain/kotlin/IReaderSources.kt)
+val jsRuntimeExports = listOf("SourceRegistry", "getHttpClient", "parseHtml", "parseHtmlFromUrl", "initializeBundle")
+
+fun jsBundleName(source: JsSourceConfig) = "${source.lang}-${source.id}"
+
 // Pre-generate JSON strings at configuration time for configuration cache compatibility
+val jsEntriesJson: String = run {
+    val exports = jsRuntimeExports.joinToString(",") { "\"$it\"" }
+    val entries = jsSources.joinToString(",") { source ->
+        """{"entry":"${jsBundleName(source)}","initFunction":"init${source.name}"}"""
+    }
+    """{"runtimeExports":[$exports],"sources":[$entries]}"""
+}
+
+// js-index.json without the split: a plain array, every source in sources-bundle.js
 val jsIndexMinJson: String = run {
     val iconBaseUrl = "https://raw.githubusercontent.com/IReaderorg/IReader-extensions/repov2/icon"
     "[" + jsSources.joinToString(",") { source ->
@@ -186,10 +225,30 @@ val jsIndexPrettyJson: String = run {
     } + "\n]"
 }
 
+// Split builds write version 2, an object with the runtime files and per-source
+// bundles. Its entries as (bundle file, JSON without its closing brace); the hash
+// and size of each bundle are only known once webpack has run
+val jsIndexEntries: List<Pair<String, String>> = run {
+    val iconBaseUrl = "https://raw.githubusercontent.com/IReaderorg/IReader-extensions/repov2/icon"
+    jsSources.map { source ->
+        val iconUrl = "$iconBaseUrl/ireader-${source.lang}-${source.id}-v${source.versionName}.png"
+        "${jsBundleName(source)}.js" to
+            """{"pkg":"${source.pkg}","name":"${source.name}","id":${source.sourceId},"lang":"${source.lang}","code":${source.versionCode},"version":"${source.versionName}","description":"${source.description}","nsfw":${source.nsfw},"initFunction":"init${source.name}","iconUrl":"$iconUrl""""
+    }
+}
+
 val jsSourceCount: Int = jsSources.size
 
 kotlin {
     js(IR) {
+        if (jsSplit) {
+            outputModuleName.set(jsModuleName)
+
+            // ES modules (one per Kotlin file, see jsSplit) let webpack split
+            // the output into per-source bundles
+            useEsModules()
+        }
+
         browser {
             webpackTask {
                 mainOutputFileName = "sources-bundle.js"
@@ -276,10 +335,30 @@ tasks.matching { it.name == "compileKotlinJs" }.configureEach {
     dependsOn(copyKspGeneratedFiles, copyJsRegistrationFiles)
 }
 
+// Source list for webpack.config.d/split.js, which reads it from the npm package directory
+val writeJsEntries by tasks.registering {
+    group = "js"
+    val entriesJson = jsEntriesJson
+    val entriesFile = rootProject.layout.buildDirectory.file("js/packages/$jsModuleName/js-entries.json")
+    inputs.property("entries", entriesJson)
+    outputs.file(entriesFile)
+    doLast {
+        entriesFile.get().asFile.apply { parentFile.mkdirs() }.writeText(entriesJson)
+    }
+}
+
+if (jsSplit) {
+    tasks.matching { it.name == "jsBrowserProductionWebpack" }.configureEach {
+        dependsOn(writeJsEntries)
+    }
+}
+
 tasks.register<Copy>("packageForDistribution") {
     group = "js"
     dependsOn("jsBrowserProductionWebpack")
-    from(layout.buildDirectory.dir("kotlin-webpack/js/productionExecutable")) { include("sources-bundle.js*") }
+    from(layout.buildDirectory.dir("kotlin-webpack/js/productionExecutable")) {
+        if (jsSplit) include("*.js", "*.js.map", "bundle-stats.json") else include("sources-bundle.js*")
+    }
     into(layout.buildDirectory.dir("js-dist"))
 }
 
@@ -289,8 +368,10 @@ tasks.register("createSourceIndex") {
     val outputDir = layout.buildDirectory.dir("js-dist")
     
     // Use pre-generated strings (captured at configuration time)
+    val split = jsSplit
     val minJsonContent = jsIndexMinJson
     val prettyJsonContent = jsIndexPrettyJson
+    val indexEntries = jsIndexEntries
     val sourceCount = jsSourceCount
     
     outputs.file(outputDir.map { it.file("js-index.json") })
@@ -298,9 +379,41 @@ tasks.register("createSourceIndex") {
     
     doLast {
         val outDir = outputDir.get().asFile.apply { mkdirs() }
-        File(outDir, "js-index.min.json").writeText(minJsonContent)
-        File(outDir, "js-index.json").writeText(prettyJsonContent)
-        logger.lifecycle("Created JS index with $sourceCount sources")
+        if (!split) {
+            File(outDir, "js-index.min.json").writeText(minJsonContent)
+            File(outDir, "js-index.json").writeText(prettyJsonContent)
+            logger.lifecycle("Created JS index with $sourceCount sources")
+            return@doLast
+        }
+
+        fun bundleJson(file: File): String {
+            val sha256 = MessageDigest.getInstance("SHA-256").digest(file.readBytes()).joinToString("") { "%02x".format(it) }
+            return """"file":"${file.name}","sha256":"$sha256","size":${file.length()}"""
+        }
+
+        // A source without its own bundle falls back to the full bundle
+        val bundle = File(outDir, "sources-bundle.js")
+        val runtime = listOf("runtime.js", "shared.js").map { File(outDir, it) }.filter { it.exists() }
+        val sources = indexEntries.map { (file, json) ->
+            val own = File(outDir, file)
+            "$json,${bundleJson(if (own.exists() && runtime.isNotEmpty()) own else bundle)}}"
+        }
+        val header = listOf(
+            """"version":2""",
+            """"note":"Load the runtime files once, in order, then a source's file before calling its initFunction"""",
+            """"runtime":[${runtime.joinToString(",") { "{${bundleJson(it)}}" }}]""",
+            """"bundle":{${bundleJson(bundle)}}""",
+        )
+
+        File(outDir, "js-index.min.json").writeText(
+            "{" + header.joinToString(",") + ""","sources":[""" + sources.joinToString(",") + "]}"
+        )
+        File(outDir, "js-index.json").writeText(
+            "{\n" + header.joinToString(",\n") { "  $it" } + ",\n  \"sources\": [\n" +
+                sources.joinToString(",\n") { "    $it" } + "\n  ]\n}\n"
+        )
+        val split = sources.size - sources.count { it.contains("\"file\":\"sources-bundle.js\"") }
+        logger.lifecycle("Created JS index with $sourceCount sources ($split with their own bundle)")
     }
 }
 
@@ -0,0 +1,99 @@
+
+// Per-source bundles for clients that load sources lazily (iOS)
+//
+// Next to the self-contained sources-bundle.js, a split production build
+// (-Pireader.js.split=true, see js-sources/build.gradle.kts) emits:
+//   runtime.js      webpack runtime, Kotlin stdlib, Ktor, Ksoup, SourceRegistry
+//   shared.js       modules used by two or more sources that runtime.js lacks
+//   <lang>-<id>.js  one source, nothing else
+// A client evaluates runtime.js and shared.js once, then a source's bundle the
+// first time the source is used, and calls its init function; all of them add
+// their exports to the global IReaderSources object.
+//
+// The source list comes from js-entries.json, written next to this config by
+// the writeJsEntries task in js-sources/build.gradle.kts, which only split
+// builds run; without it this config leaves the build alone. bundle-stats.json
+// is the input of scripts/analyze-js-bundles.py.
+
+;(function () {
+    const fs = require('fs');
+    const path = require('path');
+
+    const entriesFile = path.resolve(__dirname, 'js-entries.json');
+    if (config.mode !== 'production' || !fs.existsSync(entriesFile)) {
+        return;
+    }
+    const { runtimeExports, sources } = JSON.parse(fs.readFileSync(entriesFile, 'utf8'));
+
+    // The module Kotlin compiled; with per-file output it only re-exports, so
+    // webpack can follow each import to the one file that defines it
+    const kotlinMain = [].concat(config.entry.main)[0];
+    const kotlinDir = path.dirname(kotlinMain);
+
+    // Entry modules are tiny re-exports of the Kotlin module
+    const stubDir = path.resolve(__dirname, 'js-entries');
+    fs.mkdirSync(stubDir, { recursive: true });
+    function stub(name, exports) {
+        const file = path.join(stubDir, name + '.mjs');
+        fs.writeFileSync(file, 'export { ' + exports.join(', ') + ' } from ' + JSON.stringify(kotlinMain) + ';\n');
+        return file;
+    }
+
+    const library = { type: 'assign-properties', name: 'IReaderSources' };
+    config.entry = {
+        'sources-bundle': { import: kotlinMain, library: { type: 'umd', name: 'IReaderSources' } },
+        'runtime': { import: stub('runtime', runtimeExports), library: library },
+    };
+    sources.forEach(function (source) {
+        config.entry[source.entry] = {
+            import: stub(source.entry, [source.initFunction]),
+            dependOn: 'runtime',
+            library: library,
+        };
+    });
+
+    // Libraries are set per entry now
+    delete config.output.library;
+    delete config.output.libraryTarget;
+    config.output.filename = '[name].js';
+
+    // Kotlin files only run declarations at load time, so a file none of an
+    // entry's imports reach can be left out of that entry
+    config.module = config.module || {};
+    config.module.rules = config.module.rules || [];
+    config.module.rules.push({ test: /\.mjs$/, include: kotlinDir, sideEffects: false });
+
+    config.optimization = config.optimization || {};
+    config.optimization.splitChunks = {
+        cacheGroups: {
+            default: false,
+            defaultVendors: false,
+            shared: {
+                name: 'shared',
+                // sources-bundle.js stays self-contained
+                chunks: function (chunk) { return chunk.name !== 'sources-bundle' && chunk.name !== 'runtime'; },
+                minChunks: 2,
+                minSize: 0,
+                enforce: true,
+            },
+        },
+    };
+
+    config.plugins = config.plugins || [];
+    config.plugins.push({
+        apply: function (compiler) {
+            compiler.hooks.done.tap('IReaderBundleStats', function (stats) {
+                const json = stats.toJson({
+                    all: false,
+                    assets: true,
+                    chunks: true,
+                    chunkModules: true,
+                    nestedModules: true,
+                    entrypoints: true,
+                    ids: true,
+                });
+                fs.writeFileSync(path.join(compiler.outputPath, 'bundle-stats.json'), JSON.stringify(json));
+            });
+        },
+    });
+})();
@@ -3,224 +3,347 @@
 IReader Source Creator
 Creates extension sources with proper structure.
 
-Usage: python scripts/add-source.py
+Usage:
+    python scripts/add-source.py                          # Interactive
+    python scripts/add-source.py --batch sources.jsonl    # Many sources at once
+    python scripts/add-source.py --snapshots ./saved-pages   # Theme variant or html with selectors
+    python scripts/add-source.py --theme readnovelfull       # Variant of a multisrc theme
+    python scripts/add-source.py --type json --chapter-pagination page   # Chapters fetched page by page
+    python scripts/add-source.py --type json --json-samples ./api-samples   # Typed models from saved responses
+    python scripts/add-source.py --type html --http-cache --cache-ttl latest=60   # Cached, revalidated requests
+    python scripts/add-source.py --type html --instrument   # Fetch/parse/select timings for source-test-server
+
+Batch manifests are .jsonl or .csv with name, url, lang, type, nsfw columns
+and optional js, theme, snapshots, json_samples, chapter_pagination,
+http_cache and instrument columns (type "auto" picks the theme).
 """
 
 import sys
-import hashlib
-import re
 import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from typing import Optional
+from urllib.parse import urlparse
+
+from json_schema import SchemaError, infer_models
+from selector_detect import DEFAULT_SELECTORS, detect_selectors
+from source_catalog import load_catalog
+from source_ids import build_index, clean_name, generate_id
+from source_templates import (CACHEABLE, INSTRUMENTABLE, PAGINATED, PAGINATION_MODES, THEME_VARIANTS, TemplateError,
+                              cache_fields, hook_fields, pagination_fields, parse_cache_ttls, render, render_variant)
+from theme_fingerprint import load_signatures
+
+# Source type -> template in scripts/templates/
+TEMPLATES = {
+    "madara": "source/madara",
+    "html": "source/html",
+    "json": "source/json",
+}
+
+# Theme build files are shared by every variant, so appends are serialized
+BUILD_FILE_LOCK = threading.Lock()
+
+LANG_CODE = re.compile(r'^[a-z]{2,5}$')
+
+def normalize_url(url: str) -> str:
+    url = url.strip()
+    if not url.startswith("http"):
+        url = "https://" + url
+    return url.rstrip("/")
+
+def url_error(url: str) -> Optional[str]:
+    parsed = urlparse(url)
+    if parsed.scheme not in ("http", "https") or "." not in parsed.netloc or " " in url:
+        return f"bad URL: {url}"
+    return None
+
+def plan_source(name: str, url: str, lang: str, source_type: str, nsfw: bool,
+                theme: Optional[str] = None, js: bool = False, pagination: Optional[dict] = None,
+                cache: Optional[dict] = None, instrument: bool = False) -> dict:
+    # Resolve names, ID and the files a source would be written to.
+    # With a theme, the source becomes a variant of sources/multisrc/<theme>.
+    class_name = clean_name(name)
+    package = class_name.lower()
+    base = Path("sources") / "multisrc" / theme / package if theme else Path("sources") / lang / package
+    return {
+        "name": name,
+        "class_name": class_name,
+        "package": package,
+        "url": normalize_url(url),
+        "lang": lang,
+        "type": theme or source_type,
+        "theme": theme,
+        "nsfw": nsfw,
+        "js": js,
+        "pagination": pagination or pagination_fields(),
+        "cache": cache or cache_fields(),
+        "instrument": instrument,
+        "source_id": generate_id(class_name, lang),
+        "module": base.as_posix(),
+        "base": base,
+    }
 
-def generate_id(name: str, lang: str) -> int:
-    key = f"{name.lower()}/{lang}/1"
-    h = hashlib.md5(key.encode()).digest()
-    return int.from_bytes(h[:8], 'big') & 0x7FFFFFFFFFFFFFFF
-
-def clean_name(name: str) -> str:
-    return ''.join(word.capitalize() for word in re.sub(r'[^a-zA-Z0-9\s]', '', name).split())
-
-MADARA_TEMPLATE = '''package ireader.{package}
-
-import tachiyomix.annotations.MadaraSource
-
-@MadaraSource(
-    name = "{class_name}",
-    baseUrl = "{url}",
-    lang = "{lang}",
-    id = {source_id}L
-)
-object {class_name}Config
-'''
-
-HTML_TEMPLATE = '''package ireader.{package}
-
-import ireader.core.source.Dependencies
-import ireader.core.source.SourceFactory
-import ireader.core.source.model.*
-import tachiyomix.annotations.Extension
-import tachiyomix.annotations.AutoSourceId
-import tachiyomix.annotations.GenerateFilters
-import tachiyomix.annotations.GenerateCommands
-
-@Extension
-@AutoSourceId(seed = "{class_name}")
-@GenerateFilters(title = true, sort = true, sortOptions = ["Latest", "Popular"])
-@GenerateCommands(detailFetch = true, chapterFetch = true, contentFetch = true)
-abstract class {class_name}(deps: Dependencies) : SourceFactory(deps = deps) {{
-
-    override val name = "{class_name}"
-    override val baseUrl = "{url}"
-    override val lang = "{lang}"
-    override val id = {source_id}L
-
-    override val exploreFetchers = listOf(
-        BaseExploreFetcher(
-            "Latest",
-            endpoint = "/novels/page/{{page}}/",
-            selector = ".novel-item",
-            nameSelector = ".title",
-            coverSelector = "img",
-            coverAtt = "src",
-            linkSelector = "a",
-            linkAtt = "href",
-            addBaseUrlToLink = true,
-            addBaseurlToCoverLink = true
-        ),
-        BaseExploreFetcher(
-            "Search",
-            endpoint = "/search?q={{query}}",
-            selector = ".novel-item",
-            nameSelector = ".title",
-            coverSelector = "img",
-            coverAtt = "src",
-            linkSelector = "a",
-            linkAtt = "href",
-            addBaseUrlToLink = true,
-            addBaseurlToCoverLink = true,
-            type = SourceFactory.Type.Search
-        )
-    )
-
-    override val detailFetcher = SourceFactory.Detail(
-        nameSelector = "h1",
-        coverSelector = ".cover img",
-        coverAtt = "src",
-        descriptionSelector = ".description",
-        authorBookSelector = ".author",
-        categorySelector = ".genres a",
-        addBaseurlToCoverLink = true
-    )
-
-    override val chapterFetcher = SourceFactory.Chapters(
-        selector = ".chapter-list li",
-        nameSelector = "a",
-        linkSelector = "a",
-        linkAtt = "href",
-        addBaseUrlToLink = true,
-        reverseChapterList = true
-    )
-
-    override val contentFetcher = SourceFactory.Content(
-        pageContentSelector = ".chapter-content p"
-    )
-}}
-'''
-
-JSON_TEMPLATE = '''package ireader.{package}
-
-import io.ktor.client.request.*
-import io.ktor.client.statement.*
-import ireader.core.log.Log
-import ireader.core.source.Dependencies
-import ireader.core.source.SourceFactory
-import ireader.core.source.asJsoup
-import ireader.core.source.findInstance
-import ireader.core.source.model.*
-import kotlinx.serialization.json.*
-import tachiyomix.annotations.Extension
-import tachiyomix.annotations.AutoSourceId
-
-@Extension
-@AutoSourceId(seed = "{class_name}")
-abstract class {class_name}(deps: Dependencies) : SourceFactory(deps = deps) {{
-
-    override val lang: String get() = "{lang}"
-    override val baseUrl: String get() = "{url}"
-    override val id: Long get() = {class_name}SourceId.ID
-    override val name: String get() = "{class_name}"
-
-    override fun getFilters(): FilterList = listOf(Filter.Title())
-    override fun getCommands(): CommandList = listOf(
-        Command.Detail.Fetch(),
-        Command.Content.Fetch(),
-        Command.Chapter.Fetch(),
-    )
-
-    override suspend fun getMangaList(filters: FilterList, page: Int): MangasPageInfo {{
-        val query = filters.findInstance<Filter.Title>()?.value ?: ""
-        val endpoint = if (query.isNotBlank()) {{
-            "$baseUrl/api/search?q=$query&page=$page"
-        }} else {{
-            "$baseUrl/api/novels?page=$page&limit=20"
-        }}
-        return try {{
-            val response = client.get(requestBuilder(endpoint))
-            val body = response.bodyAsText()
-            val json = Json.parseToJsonElement(body).jsonObject
-            val data = json["data"]?.jsonArray ?: return MangasPageInfo(emptyList(), false)
-            val hasMore = json["hasMore"]?.jsonPrimitive?.boolean ?: false
-
-            val mangaList = data.map {{ element ->
-                val obj = element.jsonObject
-                MangaInfo(
-                    key = "$baseUrl/novel/${{obj["slug"]?.jsonPrimitive?.content}}",
-                    title = obj["title"]?.jsonPrimitive?.content ?: "",
-                    cover = obj["cover"]?.jsonPrimitive?.content ?: ""
-                )
-            }}
-            MangasPageInfo(mangaList, hasMore)
-        }} catch (e: Exception) {{
-            Log.error {{ "Error: ${{e.message}}" }}
-            MangasPageInfo(emptyList(), false)
-        }}
-    }}
-
-    override suspend fun getMangaDetails(manga: MangaInfo, commands: List<Command<*>>): MangaInfo {{
-        return try {{
-            val slug = manga.key.substringAfterLast("/")
-            val response = client.get(requestBuilder("$baseUrl/api/novel/$slug"))
-            val body = response.bodyAsText()
-            val json = Json.parseToJsonElement(body).jsonObject
-            manga.copy(
-                title = json["title"]?.jsonPrimitive?.content ?: manga.title,
-                cover = json["cover"]?.jsonPrimitive?.content ?: manga.cover,
-                description = json["description"]?.jsonPrimitive?.content ?: "",
-                author = json["author"]?.jsonPrimitive?.content ?: ""
-            )
-        }} catch (e: Exception) {{ manga }}
-    }}
-
-    override suspend fun getChapterList(manga: MangaInfo, commands: List<Command<*>>): List<ChapterInfo> {{
-        return try {{
-            val slug = manga.key.substringAfterLast("/")
-            val response = client.get(requestBuilder("$baseUrl/api/novel/$slug/chapters"))
-            val body = response.bodyAsText()
-            val json = Json.parseToJsonElement(body).jsonObject
-            val chapters = json["chapters"]?.jsonArray ?: return emptyList()
-
-            chapters.map {{ ch ->
-                val obj = ch.jsonObject
-                ChapterInfo(
-                    name = obj["title"]?.jsonPrimitive?.content ?: "",
-                    key = "$baseUrl/novel/$slug/chapter/${{obj["number"]?.jsonPrimitive?.int}}"
-                )
-            }}.reversed()
-        }} catch (e: Exception) {{ emptyList() }}
-    }}
-
-    override suspend fun getPageList(chapter: ChapterInfo, commands: List<Command<*>>): List<Page> {{
-        return try {{
-            val doc = client.get(requestBuilder(chapter.key)).asJsoup()
-            doc.select(".chapter-content p").map {{ Text(it.text()) }}
-        }} catch (e: Exception) {{ listOf(Text("Error loading content")) }}
-    }}
-}}
-'''
-
-BUILD_GRADLE = '''listOf("{lang}").map {{ lang ->
-    Extension(
-        name = "{class_name}",
-        versionCode = 1,
-        libVersion = "2",
-        lang = lang,
-        description = "",
-        nsfw = false,
-        icon = DEFAULT_ICON,
-        assetsDir = "{lang}/{package}/main/assets",
-    )
-}}.also(::register)
-'''
+def detect_type(snapshots: Path, signatures=None):
+    # Pick a multisrc theme from the saved pages, else fall back to html.
+    # Returns (theme or None, ThemeMatch or None).
+    signatures = signatures or load_signatures("sources")
+    pages = [path.read_text(encoding="utf-8", errors="replace") for path in sorted(snapshots.glob("*.htm*"))]
+    match = signatures.classify(pages)
+    return (match.theme if match and match.theme in THEME_VARIANTS else None), match
+
+def render_theme_variant(plan: dict) -> dict:
+    # Variant source file plus the theme build file with its Extension appended
+    fields = {key: plan[key] for key in ("class_name", "package", "url", "lang", "source_id")}
+    build_file = plan["base"].parent / "build.gradle.kts"
+    content = build_file.read_text(encoding="utf-8")
+    end = content.rfind(").also(::register)")
+    if end < 0:
+        raise TemplateError(f"{build_file} has no ).also(::register) to add the variant before")
+    entry = render("build/variant-extension", class_name=plan["class_name"], lang=plan["lang"],
+                   package=plan["package"], theme=plan["theme"], nsfw=plan["nsfw"], description="", js=plan["js"])
+    return {
+        plan["base"] / "src" / "ireader" / plan["package"] / f"{plan['class_name']}.kt": render_variant(plan["theme"], fields),
+        build_file: content[:end] + entry + content[end:],
+    }
+
+def pagination_error(plan: dict) -> Optional[str]:
+    if plan["pagination"]["paginated"] and (plan.get("theme") or TEMPLATES[plan["type"]] not in PAGINATED):
+        return f"chapter pagination is not available for {plan['type']} sources"
+    return None
+
+def cache_error(plan: dict) -> Optional[str]:
+    if plan["cache"]["http_cache"] and (plan.get("theme") or plan.get("models") or TEMPLATES[plan["type"]] not in CACHEABLE):
+        return f"the response cache is not available for {'typed json' if plan.get('models') else plan['type']} sources"
+    return None
+
+def instrument_error(plan: dict) -> Optional[str]:
+    if plan["instrument"] and (plan.get("theme") or plan.get("models") or TEMPLATES[plan["type"]] not in INSTRUMENTABLE):
+        return f"timing hooks are not available for {'typed json' if plan.get('models') else plan['type']} sources"
+    return None
+
+def render_source(plan: dict) -> dict:
+    # Map each output path to its rendered content
+    problem = pagination_error(plan) or cache_error(plan) or instrument_error(plan)
+    if problem:
+        raise TemplateError(problem)
+    if plan.get("theme"):
+        return render_theme_variant(plan)
+    base = plan["base"]
+    fields = {key: plan[key] for key in ("class_name", "package", "url", "lang", "source_id")}
+    fields.update(plan["pagination"])
+    fields.update(plan["cache"])
+    fields.update(hook_fields(plan["cache"]["http_cache"], plan["instrument"]))
+    if plan["type"] == "html":
+        fields.update({key: value for key, value in (plan.get("selectors") or DEFAULT_SELECTORS).items() if key in DEFAULT_SELECTORS})
+    template = TEMPLATES[plan["type"]]
+    if plan.get("models"):
+        fields.update(plan["models"])
+        template = "source/json-typed"
+    return {
+        base / "main" / "src" / "ireader" / plan["package"] / f"{plan['class_name']}.kt": render(template, fields),
+        base / "build.gradle.kts": render("build/individual", class_name=plan["class_name"], lang=plan["lang"],
+                                          package=plan["package"], nsfw=plan["nsfw"], description="", js=plan["js"],
+                                          common=(plan["pagination"]["paginated"] or plan["cache"]["http_cache"]
+                                                  or plan["instrument"] or bool(plan.get("models")))),
+    }
+
+def write_source(plan: dict):
+    # Write every file through a temp file so a failed row leaves nothing half-written;
+    # files written before the failure are picked up again by a re-run (see is_partial)
+    (plan["base"] / "assets" if plan.get("theme") else plan["base"] / "main" / "assets").mkdir(parents=True, exist_ok=True)
+    with BUILD_FILE_LOCK if plan.get("theme") else contextlib.nullcontext():
+        for path, content in render_source(plan).items():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(path.name + ".tmp")
+            tmp.write_text(content, encoding='utf-8')
+            os.replace(tmp, path)
+
+def own_files(plan: dict) -> set:
+    # Files write_source puts inside the module directory
+    if plan.get("theme"):
+        return {plan["base"] / "src" / "ireader" / plan["package"] / f"{plan['class_name']}.kt"}
+    return {plan["base"] / "main" / "src" / "ireader" / plan["package"] / f"{plan['class_name']}.kt",
+            plan["base"] / "build.gradle.kts"}
+
+def is_partial(plan: dict) -> bool:
+    # A directory left by an interrupted or failed write of this same source
+    own = own_files(plan) | {path.with_name(path.name + ".tmp") for path in own_files(plan)}
+    return all(path in own for path in plan["base"].rglob("*") if not path.is_dir())
+
+def check_source(plan: dict, catalog, index) -> Optional[str]:
+    # Returns an error message, "exists" when the same source is already there,
+    # "partial" when an earlier run stopped halfway through writing it, or None
+    existing = catalog.find(plan["class_name"], plan["lang"])
+    if existing:
+        if existing.module == plan["module"]:
+            return "exists"
+        return f"{plan['class_name']} ({plan['lang']}) already exists in {existing.module}"
+    if catalog.module_exists(plan["module"]):
+        return f"{plan['module']} already exists"
+    if plan["base"].exists():
+        if not is_partial(plan):
+            return f"{plan['module']} already exists"
+        partial = True
+    else:
+        partial = False
+    owners = index.lookup(plan["source_id"])
+    if owners:
+        return f"ID {plan['source_id']} is already used by {owners[0].name} ({owners[0].lang}) in {owners[0].module}"
+    return "partial" if partial else None
+
+def load_manifest(path: Path) -> list:
+    # Rows of name/url/lang/type/nsfw from a .jsonl or .csv manifest
+    # with the manifest line of each row; a line that is not a JSON object
+    # becomes a row with an "error" for run_batch to report
+    text = path.read_text(encoding='utf-8-sig')
+    if path.suffix.lower() == ".csv":
+        reader = csv.DictReader(io.StringIO(text))
+        rows = [(reader.line_num, row) for row in reader]
+    else:
+        rows = []
+        for line, raw in enumerate(text.splitlines(), start=1):
+            if not raw.strip():
+                continue
+            try:
+                row = json.loads(raw)
+                if not isinstance(row, dict):
+                    raise ValueError("expected an object")
+            except ValueError as e:
+                row = {"_error": f"invalid JSON: {e}"}
+            rows.append((line, row))
+
+    def flag(value) -> bool:
+        return str(value).strip().lower() in ("1", "true", "yes", "y")
+
+    return [
+        {
+            "name": str(row.get("name") or "").strip(),
+            "url": str(row.get("url") or "").strip(),
+            "lang": str(row.get("lang") or "en").strip().lower(),
+            "type": str(row.get("type") or ("auto" if row.get("snapshots") else
+                                            "json" if row.get("json_samples") else "html")).strip().lower(),
+            "theme": str(row.get("theme") or "").strip().lower(),
+            "nsfw": flag(row.get("nsfw", False)),
+            "js": flag(row.get("js", False)),
+            "snapshots": str(row.get("snapshots") or "").strip(),
+            "json_samples": str(row.get("json_samples") or "").strip(),
+            "chapter_pagination": str(row.get("chapter_pagination") or "").strip().lower(),
+            "http_cache": flag(row.get("http_cache", False)),
+            "instrument": flag(row.get("instrument", False)),
+            "line": line,
+            "error": row.get("_error"),
+        }
+        for line, row in rows
+    ]
+
+def run_batch(manifest: Path, jobs: int, parallelism: int = 4, page_size: int = 20, cache: Optional[dict] = None) -> bool:
+    rows = load_manifest(manifest)
+    catalog = load_catalog("sources")
+    index = build_index("sources", catalog=catalog)
+
+    # Validate every row before writing anything
+    signatures = None
+    plans, errors = [], []
+    seen_ids, seen_modules = {}, {}
+    for row in rows:
+        line = row["line"]
+        if row["error"]:
+            errors.append((line, row["name"], row["error"]))
+            continue
+        problems = []
+        if not clean_name(row["name"]):
+            problems.append("name required")
+        if not row["url"]:
+            problems.append("url required")
+        elif url_error(normalize_url(row["url"])):
+            problems.append(url_error(normalize_url(row["url"])))
+        if not LANG_CODE.match(row["lang"]):
+            problems.append(f"bad lang code: {row['lang']}")
+        if row["type"] not in TEMPLATES and row["type"] != "auto":
+            problems.append(f"unknown type: {row['type']}")
+        if row["theme"] and row["theme"] not in THEME_VARIANTS:
+            problems.append(f"unknown theme: {row['theme']}")
+        if row["chapter_pagination"] and row["chapter_pagination"] not in PAGINATION_MODES:
+            problems.append(f"unknown chapter pagination: {row['chapter_pagination']}")
+        if row["snapshots"] and not Path(row["snapshots"]).is_dir():
+            problems.append(f"snapshots folder not found: {row['snapshots']}")
+        elif row["type"] == "auto" and not row["snapshots"] and not row["theme"]:
+            problems.append("type auto needs a snapshots folder")
+        if row["json_samples"] and row["type"] != "json":
+            problems.append("json_samples needs type json")
+        elif row["json_samples"] and not Path(row["json_samples"]).is_dir():
+            problems.append(f"json samples folder not found: {row['json_samples']}")
+        if problems:
+            errors.append((line, row["name"], "; ".join(problems)))
+            continue
+
+        theme = row["theme"] or None
+        if row["type"] == "auto" and not theme:
+            signatures = signatures or load_signatures("sources")
+            theme, _ = detect_type(Path(row["snapshots"]), signatures)
+            row["type"] = "html"
+        pagination = pagination_fields(row["chapter_pagination"] or None, parallelism, page_size)
+        plan = plan_source(row["name"], row["url"], row["lang"], row["type"], row["nsfw"], theme, row["js"], pagination,
+                           dict(cache or cache_fields(), http_cache=row["http_cache"]), row["instrument"])
+        for seen, key, what in ((seen_ids, plan["source_id"], "ID"), (seen_modules, plan["module"], "directory")):
+            if key in seen:
+                problems.append(f"duplicate {what} with line {seen[key]}")
+            seen[key] = line
+
+        status = check_source(plan, catalog, index)
+        if status and status not in ("exists", "partial"):
+            problems.append(status)
+        if problems:
+            errors.append((line, row["name"], "; ".join(problems)))
+            continue
+        plan["status"] = "skipped" if status == "exists" else "pending"
+        plan["resumed"] = status == "partial"
+        if row["snapshots"] and plan["status"] == "pending" and plan["type"] == "html":
+            plan["selectors"] = detect_selectors(row["snapshots"])
+        try:
+            if row["json_samples"] and plan["status"] == "pending":
+                plan["models"] = infer_models(row["json_samples"])
+            render_source(plan)
+        except (TemplateError, SchemaError) as e:
+            errors.append((line, row["name"], str(e)))
+            continue
+        plans.append(plan)
+
+    if errors:
+        print(f"Manifest {manifest} has {len(errors)} invalid row(s), nothing was written:\n")
+        for line, name, problem in errors:
+            print(f"  line {line} ({name or '?'}): {problem}")
+        return False
+
+    pending = [plan for plan in plans if plan["status"] == "pending"]
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = {pool.submit(write_source, plan): plan for plan in pending}
+        for future in as_completed(futures):
+            plan = futures[future]
+            try:
+                future.result()
+                plan["status"] = "resumed" if plan["resumed"] else "created"
+            except (OSError, ValueError) as e:
+                plan["status"] = f"failed: {e}"
+
+    print(f"{'Name':<28} {'Lang':<5} {'Type':<13} {'ID':>20}  Status")
+    print("-" * 82)
+    for plan in plans:
+        print(f"{plan['class_name']:<28} {plan['lang']:<5} {plan['type']:<13} {plan['source_id']:>20}  {plan['status']}")
+
+    counts = {}
+    for plan in plans:
+        key = plan["status"].split(":")[0]
+        counts[key] = counts.get(key, 0) + 1
+    print("\n" + ", ".join(f"{count} {status}" for status, count in sorted(counts.items())))
+    return "failed" not in counts
 
 def main():
     parser = argparse.ArgumentParser(description='IReader Source Creator')
@@ -230,9 +353,43 @@ def main():
     parser.add_argument('--type', '-t', choices=['madara', 'html', 'json'], 
                        help='Source type')
     parser.add_argument('--nsfw', action='store_true', help='Mark as NSFW')
+    parser.add_argument('--js', action='store_true', help='Also build for iOS (enableJs = true, else false)')
     parser.add_argument('--quick', '-q', action='store_true', help='Skip confirmations')
+    parser.add_argument('--batch', '-b', type=Path, metavar='MANIFEST',
+                       help='Create every source listed in a .jsonl or .csv manifest')
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 4,
+                       help='Worker threads for --batch')
+    parser.add_argument('--snapshots', '-s', type=Path, metavar='DIR',
+                       help='Saved listing/detail/chapter pages: pick a multisrc theme or fill html selectors')
+    parser.add_argument('--theme', choices=sorted(THEME_VARIANTS),
+                       help='Create a variant of this multisrc theme')
+    parser.add_argument('--chapter-pagination', choices=sorted(PAGINATION_MODES),
+                       help='Fetch the chapter list in pages (html/json sources)')
+    parser.add_argument('--chapter-parallelism', type=int, default=4,
+                       help='Chapter pages fetched at once (page/offset modes)')
+    parser.add_argument('--chapter-page-size', type=int, default=20,
+                       help='Chapters per request (offset mode)')
+    parser.add_argument('--json-samples', type=Path, metavar='DIR',
+                       help='Saved listing/detail/chapters API responses: decode into typed classes (json sources)')
+    parser.add_argument('--http-cache', action='store_true',
+                       help='Keep responses in a per-source cache revalidated with ETag/Last-Modified (html/json sources)')
+    parser.add_argument('--cache-entries', type=int, default=256,
+                       help='Responses kept per source (default: 256)')
+    parser.add_argument('--cache-ttl', default='', metavar='ENDPOINT=SECONDS,...',
+                       help='TTL overrides for latest, popular, search, detail, chapters, content')
+    parser.add_argument('--instrument', action='store_true',
+                       help='Time fetch/parse/select per operation, reported by source-test-server (html/json sources)')
     args = parser.parse_args()
     
+    try:
+        pagination = pagination_fields(args.chapter_pagination, args.chapter_parallelism, args.chapter_page_size)
+        cache = cache_fields(args.http_cache, args.cache_entries, parse_cache_ttls(args.cache_ttl))
+    except TemplateError as e:
+        sys.exit(f"Error: {e}")
+    
+    if args.batch:
+        sys.exit(0 if run_batch(args.batch, args.jobs, args.chapter_parallelism, args.chapter_page_size, cache) else 1)
+    
     print("\n=== IReader Source Creator ===\n")
     
     name = args.name or input("Source name (e.g. NovelFull): ").strip()
@@ -244,14 +401,31 @@ def main():
     if not url:
         print("Error: URL required")
         return
-    if not url.startswith("http"):
-        url = "https://" + url
-    url = url.rstrip("/")
     
     lang = args.lang or input("Language code [en]: ").strip().lower() or "en"
     
-    source_type = args.type
-    if not source_type:
+    if args.snapshots and not args.snapshots.is_dir():
+        print(f"Error: snapshots folder not found: {args.snapshots}")
+        return
+    
+    if args.json_samples:
+        if args.type not in (None, "json") or args.theme or args.snapshots:
+            print("Error: --json-samples needs --type json")
+            return
+        if not args.json_samples.is_dir():
+            print(f"Error: json samples folder not found: {args.json_samples}")
+            return
+    
+    theme = args.theme
+    source_type = "json" if args.json_samples else args.type
+    if args.snapshots and not source_type and not theme:
+        theme, match = detect_type(args.snapshots)
+        if theme:
+            print(f"Matched multisrc theme: {theme} (score {match.score:.1f})")
+        else:
+            print("No multisrc theme matched, using html")
+            source_type = "html"
+    if not source_type and not theme:
         print("\nSource type:")
         print("  1. madara  - Madara/WordPress theme (zero code!)")
         print("  2. html    - Standard HTML scraping with CSS selectors")
@@ -263,42 +437,56 @@ def main():
     if not nsfw and not args.quick:
         nsfw = input("NSFW content? [y/N]: ").strip().lower() == 'y'
     
-    class_name = clean_name(name)
-    package = class_name.lower()
-    source_id = generate_id(class_name, lang)
-    
-    base = Path("sources") / lang / package
-    src = base / "main" / "src" / "ireader" / package
-    assets = base / "main" / "assets"
-    src.mkdir(parents=True, exist_ok=True)
-    assets.mkdir(parents=True, exist_ok=True)
-    
-    templates = {
-        "madara": MADARA_TEMPLATE,
-        "html": HTML_TEMPLATE,
-        "json": JSON_TEMPLATE,
-    }
-    
-    source_code = templates[source_type].format(
-        class_name=class_name,
-        package=package,
-        url=url,
-        lang=lang,
-        source_id=source_id
-    )
+    plan = plan_source(name, url, lang, source_type, nsfw, theme, args.js, pagination, cache, args.instrument)
+    if pagination_error(plan):
+        print(f"Error: {pagination_error(plan)}")
+        return
+    if args.snapshots and plan["type"] == "html":
+        plan["selectors"] = detect_selectors(args.snapshots)
+    if args.json_samples:
+        try:
+            plan["models"] = infer_models(args.json_samples)
+        except SchemaError as e:
+            print(f"Error: {e}")
+            return
+    if cache_error(plan) or instrument_error(plan):
+        print(f"Error: {cache_error(plan) or instrument_error(plan)}")
+        return
+    catalog = load_catalog("sources")
+    problem = check_source(plan, catalog, build_index("sources", catalog=catalog))
+    if problem == "exists":
+        problem = f"{plan['class_name']} ({lang}) already exists in {plan['module']}"
+    if problem == "partial":
+        print(f"Finishing {plan['module']}/, left incomplete by an earlier run")
+    elif problem:
+        print(f"Error: {problem}")
+        return
     
-    (src / f"{class_name}.kt").write_text(source_code, encoding='utf-8')
-    (base / "build.gradle.kts").write_text(
-        BUILD_GRADLE.format(class_name=class_name, lang=lang, package=package),
-        encoding='utf-8'
-    )
+    try:
+        write_source(plan)
+    except TemplateError as e:
+        print(f"Error: {e}")
+        return
+    class_name, package, source_id = plan["class_name"], plan["package"], plan["source_id"]
     
-    print(f"\nCreated: sources/{lang}/{package}/")
+    print(f"\nCreated: {plan['module']}/")
     print(f"Source ID: {source_id}")
-    print(f"Type: {source_type}")
+    print(f"Type: {plan['type']}")
     
+    if theme:
+        print(f"\nAdded {class_name} to sources/multisrc/{theme}/build.gradle.kts - no code needed!")
+        print(f"\nBuild: ./gradlew :extensions:multisrc:{theme}:assemble{package.capitalize()}-{lang}Debug")
+        return
     if source_type == "madara":
         print("\nMadara source created - no code needed!")
+    elif plan.get("models"):
+        print(f"\nModels inferred from {args.json_samples}; check the field mappings in {class_name}.kt")
+    elif plan.get("selectors"):
+        detected = plan["selectors"]["detected"]
+        missing = sorted(set(DEFAULT_SELECTORS) - set(detected))
+        print(f"\nDetected {len(detected)} of {len(DEFAULT_SELECTORS)} selectors from {args.snapshots}")
+        if missing:
+            print(f"Check the placeholders left for: {', '.join(missing)}")
     else:
         print(f"\nUpdate selectors in {class_name}.kt")
     
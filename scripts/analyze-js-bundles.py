@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Report what each JS source and dependency adds to the js-sources bundles.
+
+A split production build (js-sources/webpack.config.d/split.js, opt-in with
+-Pireader.js.split=true) writes bundle-stats.json next to the bundles: every chunk with the modules in it.
+Modules are grouped by dependency (npm package, or Kotlin library for the
+per-file Kotlin output; the sources' own code by Kotlin package), and each
+bundle's size on disk is shared out over its dependencies in proportion to
+their unminified module sizes, so figures are estimates of minified bytes.
+
+Listed per bundle: size, gzip size and the largest dependencies; per
+dependency: where its bytes end up. A dependency that several source bundles
+each carry a copy of belongs in the runtime. --budget fails the run when a
+source bundle is larger than the given size.
+
+Usage:
+    python scripts/analyze-js-bundles.py                           # js-sources/build/js-dist
+    python scripts/analyze-js-bundles.py path/to/js-dist --top 5
+    python scripts/analyze-js-bundles.py --budget 64               # CI: no source bundle over 64 KB
+    python scripts/analyze-js-bundles.py --json
+"""
+
+import argparse
+import gzip
+import json
+import re
+import statistics
+import sys
+from pathlib import Path
+
+DEFAULT_DIST = Path("js-sources/build/js-dist")
+OWN_MODULE = "ireader-js-sources"
+SHARED_CHUNKS = ("runtime", "shared")
+FULL_BUNDLE = "sources-bundle"
+
+def dependency_of(module: str) -> str:
+    """The npm package, Kotlin library or own Kotlin package a webpack module belongs to."""
+    name = module.replace("\\", "/")
+    if "node_modules/" in name:
+        parts = name.rsplit("node_modules/", 1)[1].split("/")
+        return "/".join(parts[:2]) if parts[0].startswith("@") else parts[0]
+    if name.startswith("webpack/"):
+        return "webpack runtime"
+    match = re.search(r"(?:^|/)kotlin/([^/]+)/(.*)", name)
+    if match:
+        library, rest = match.groups()
+        package = rest.split("/")[:-1]
+        return f"{library}:{'.'.join(package)}" if library == OWN_MODULE and package else library
+    if "js-entries/" in name:
+        return "entry"
+    return "other"
+
+def leaf_modules(modules: list):
+    """(name, size) of every module, looking inside concatenated ones."""
+    for module in modules:
+        if module.get("modules"):
+            yield from leaf_modules(module["modules"])
+        else:
+            yield module.get("name", ""), module.get("size", 0)
+
+def chunk_kind(name: str) -> str:
+    if name in SHARED_CHUNKS:
+        return name
+    return "full" if name == FULL_BUNDLE else "source"
+
+def analyze(stats: dict, dist: Path = None, index: dict = None) -> list:
+    """One dict per bundle: file, kind, name, bytes, gzip, {dependency: bytes}."""
+    asset_sizes = {asset["name"]: asset.get("size", 0) for asset in stats.get("assets", [])}
+    names = {source["file"]: source["name"] for source in (index or {}).get("sources", [])}
+    bundles = []
+    for chunk in stats.get("chunks", []):
+        files = [f for f in chunk.get("files", []) if f.endswith(".js")]
+        if not files:
+            continue
+        file = files[0]
+        chunk_name = (chunk.get("names") or [Path(file).stem])[0]
+        path = dist / file if dist else None
+        data = path.read_bytes() if path and path.exists() else None
+        size = len(data) if data is not None else asset_sizes.get(file, chunk.get("size", 0))
+
+        weights = {}
+        for module, module_size in leaf_modules(chunk.get("modules", [])):
+            dependency = dependency_of(module)
+            weights[dependency] = weights.get(dependency, 0) + module_size
+        total = sum(weights.values()) or 1
+        bundles.append({
+            "file": file,
+            "kind": chunk_kind(chunk_name),
+            "name": names.get(file, chunk_name),
+            "bytes": size,
+            "gzip": len(gzip.compress(data, 9)) if data is not None else None,
+            "dependencies": {dep: round(size * weight / total)
+                             for dep, weight in sorted(weights.items(), key=lambda item: -item[1])},
+        })
+    order = {"runtime": 0, "shared": 1, "source": 2, "full": 3}
+    bundles.sort(key=lambda b: (order[b["kind"]], -b["bytes"] if b["kind"] == "source" else 0, b["file"]))
+    return bundles
+
+def dependency_totals(bundles: list) -> dict:
+    """dependency -> {runtime, shared, sources, copies} over the split bundles."""
+    totals = {}
+    for bundle in bundles:
+        if bundle["kind"] == "full":
+            continue
+        for dep, size in bundle["dependencies"].items():
+            row = totals.setdefault(dep, {"runtime": 0, "shared": 0, "sources": 0, "copies": 0})
+            if bundle["kind"] == "source":
+                row["sources"] += size
+                row["copies"] += 1
+            else:
+                row[bundle["kind"]] += size
+    return dict(sorted(totals.items(), key=lambda item: -sum(v for k, v in item[1].items() if k != "copies")))
+
+def own_code(bundle: dict) -> int:
+    return sum(size for dep, size in bundle["dependencies"].items() if dep.split(":")[0] in (OWN_MODULE, "entry"))
+
+def kb(size) -> str:
+    return f"{size / 1024:.1f} KB" if size is not None else "-"
+
+def print_report(bundles: list, top: int):
+    print(f"  {'bundle':<32} {'bytes':>10} {'gzip':>10} {'own code':>10}  largest dependencies")
+    for bundle in bundles:
+        label = bundle["file"] if bundle["kind"] != "full" else f"{bundle['file']} (all)"
+        largest = ", ".join(f"{dep} {kb(size)}" for dep, size in list(bundle["dependencies"].items())[:top])
+        print(f"  {label:<32} {kb(bundle['bytes']):>10} {kb(bundle['gzip']):>10} {kb(own_code(bundle)):>10}  {largest}")
+
+    shared = sum(b["bytes"] for b in bundles if b["kind"] in SHARED_CHUNKS)
+    sources = [b["bytes"] for b in bundles if b["kind"] == "source"]
+    full = next((b["bytes"] for b in bundles if b["kind"] == "full"), None)
+    if sources:
+        print(f"\nFirst source loads {kb(shared + statistics.median(sources))} (runtime {kb(shared)} "
+              f"+ median source {kb(statistics.median(sources))}); each further source {kb(statistics.median(sources))}"
+              + (f"; sources-bundle.js is {kb(full)}" if full is not None else ""))
+
+    totals = dependency_totals(bundles)
+    print(f"\n  {'dependency':<40} {'runtime':>10} {'shared':>10} {'sources':>10} {'copies':>7}")
+    for dep, row in totals.items():
+        print(f"  {dep:<40} {kb(row['runtime']):>10} {kb(row['shared']):>10} {kb(row['sources']):>10} {row['copies']:>7}")
+    duplicated = [dep for dep, row in totals.items()
+                  if row["copies"] > 1 and dep.split(":")[0] not in (OWN_MODULE, "entry")]
+    if duplicated:
+        print(f"\nCarried by more than one source bundle (move to the runtime): {', '.join(duplicated)}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Bytes per JS source and dependency in the js-sources bundles")
+    parser.add_argument("dist", nargs="?", type=Path, default=DEFAULT_DIST,
+                        help=f"Directory with the bundles and bundle-stats.json (default: {DEFAULT_DIST})")
+    parser.add_argument("--stats", type=Path, help="bundle-stats.json elsewhere than in dist")
+    parser.add_argument("--top", type=int, default=3, help="Dependencies listed per bundle (default: 3)")
+    parser.add_argument("--budget", type=float, help="Fail when a source bundle is larger than this many KB")
+    parser.add_argument("--json", action="store_true", help="Print the analysis as JSON")
+    args = parser.parse_args()
+
+    stats_path = args.stats or args.dist / "bundle-stats.json"
+    if not stats_path.exists():
+        sys.exit(f"Error: {stats_path} not found. Run ./gradlew :js-sources:createSourceIndex "
+                 "-Pireader.js.split=true -Pkotlin.js.ir.output.granularity=per-file first.")
+    try:
+        stats = json.loads(stats_path.read_text(encoding="utf-8"))
+        index_path = args.dist / "js-index.json"
+        index = json.loads(index_path.read_text(encoding="utf-8")) if index_path.exists() else None
+    except ValueError as e:
+        sys.exit(f"Error: {e}")
+
+    bundles = analyze(stats, args.dist, index)
+    over = [b for b in bundles if b["kind"] == "source" and args.budget is not None and b["bytes"] > args.budget * 1024]
+    if args.json:
+        print(json.dumps({"bundles": bundles, "dependencies": dependency_totals(bundles),
+                          "overBudget": [b["file"] for b in over]}, indent=2))
+    else:
+        print_report(bundles, args.top)
+        if args.budget is not None:
+            print(f"\n{len(over)} source bundle(s) over {args.budget:g} KB"
+                  + (f": {', '.join(b['file'] for b in over)}" if over else ""))
+    if over:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+Stage-level benchmark of every source loaded in source-test-server.
+
+Each source runs explore -> detail -> chapters -> content through the test
+server's HTTP API, with its traffic sent to a local snapshot site instead of
+the live web. Latency (p50/p95/p99), bytes and item counts are recorded per
+stage and appended to a trend file, so a slowdown in a shared helper or a
+multisrc theme shows up as a regression against the previous run.
+
+The snapshot site serves the selector-sweep corpus:
+
+    corpus/en/novelfull/2026-10-16/listing.html, detail.html, chapter.html
+    corpus/en/novelfull/2026-10-16/site/api/novel/x/chapters.json   (optional)
+
+A request is answered with the file under site/ matching its path when there
+is one, otherwise with the saved page of the stage the source is running.
+The server is told where to send source requests through POST /api/mock-origin.
+
+Usage:
+    ./gradlew :source-test-server:run                          # In another terminal
+    python scripts/bench-sources.py                            # Every loaded source with a capture
+    python scripts/bench-sources.py novelfull --repeat 5       # Some sources, more samples
+    python scripts/bench-sources.py --record                   # Append to the trend file
+    python scripts/bench-sources.py --json > run.json
+
+The run fails when a stage's p95 or a source's total time grew by more than
+--max-regression over the last recorded run.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from selector_detect import find_snapshots
+from source_catalog import load_catalog
+from source_selectors import STAGE_PAGES, STAGES
+
+HISTORY = Path("source-bench-history.json")
+ORIGINAL_HOST_HEADER = "X-Original-Host"
+API_TIMEOUT = 120
+MAX_RUNS = 100
+MAX_REGRESSION = 0.25
+MIN_REGRESSION_MS = 20.0
+PERCENTILES = (50, 95, 99)
+
+class SnapshotSite:
+    """Local stand-in for the live sites, keyed by the host a source asked for."""
+
+    def __init__(self):
+        self.captures = {}
+        self.stages = {}
+        self.bytes = {}
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def add(self, host: str, capture: Path):
+        self.captures[host] = capture
+
+    def enter(self, host: str, stage: str):
+        self.stages[host] = stage
+
+    def served(self, host: str) -> int:
+        with self.lock:
+            return self.bytes.get(host, 0)
+
+    def page(self, host: str, path: str):
+        capture = self.captures.get(host)
+        if capture is None:
+            return None
+        site = capture / "site"
+        exact = (site / urllib.parse.unquote(path).lstrip("/")).resolve()
+        if exact.is_dir():
+            exact = exact / "index.html"
+        for candidate in (exact, exact.with_name(exact.name + ".json"), exact.with_name(exact.name + ".html")):
+            if candidate.is_file() and site.resolve() in candidate.parents:
+                return candidate
+        snapshots = find_snapshots(capture)
+        for kind in STAGE_PAGES.get(self.stages.get(host), ()):
+            if kind in snapshots:
+                return snapshots[kind]
+        return None
+
+    def _handler(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                host = (self.headers.get(ORIGINAL_HOST_HEADER) or self.headers.get("Host") or "").split(":")[0]
+                path = site.page(host, urllib.parse.urlsplit(self.path).path)
+                if path is None:
+                    self.send_error(404)
+                    return
+                body = path.read_bytes()
+                with site.lock:
+                    site.bytes[host] = site.bytes.get(host, 0) + len(body)
+                self.send_response(200)
+                kind = "application/json" if path.suffix == ".json" else "text/html; charset=utf-8"
+                self.send_header("Content-Type", kind)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_POST = do_GET
+
+            def log_message(self, format, *args):
+                pass
+        return Handler
+
+    def close(self):
+        self.server.shutdown()
+
+class TestServer:
+    """Thin client for the source-test-server JSON API."""
+
+    def __init__(self, url: str):
+        self.url = url.rstrip("/")
+
+    def call(self, path: str, method: str = "GET", **params):
+        query = urllib.parse.urlencode({k: v for k, v in params.items() if v is not None})
+        request = urllib.request.Request(f"{self.url}/api{path}" + (f"?{query}" if query else ""), method=method)
+        with urllib.request.urlopen(request, timeout=API_TIMEOUT) as response:
+            body = response.read()
+        return json.loads(body), len(body)
+
+def latest_capture(folder: Path):
+    versions = sorted(d for d in folder.iterdir() if d.is_dir() and find_snapshots(d)) if folder.is_dir() else []
+    return versions[-1] if versions else None
+
+def run_stage(server: TestServer, source: dict, stage: str, key):
+    """One API call; returns (sample, key for the next stage)."""
+    id = source["id"]
+    if stage == "explore":
+        data, size = server.call(f"/sources/{id}/search", page=1)
+        items = data["results"]
+        next_key = items[0]["key"] if items else None
+    elif stage == "detail":
+        data, size = server.call(f"/sources/{id}/details", url=key)
+        items = [data["manga"]] if data["manga"].get("title") else []
+        next_key = key
+    elif stage == "chapters":
+        data, size = server.call(f"/sources/{id}/chapters", url=key)
+        items = data["chapters"]
+        next_key = items[0]["key"] if items else None
+    else:
+        data, size = server.call(f"/sources/{id}/content", url=key)
+        items = [line for line in data["content"]["content"] if line.strip()]
+        next_key = None
+    return {"serverMs": data["timing"], "apiBytes": size, "items": len(items), "ok": bool(items)}, next_key
+
+def bench_source(server: TestServer, site: SnapshotSite, source: dict, repeat: int) -> dict:
+    host = urllib.parse.urlsplit(source["baseUrl"]).hostname or ""
+    samples = {stage: [] for stage in STAGES}
+    for _ in range(repeat):
+        key = None
+        for stage in STAGES:
+            if stage != "explore" and key is None:
+                break
+            site.enter(host, stage)
+            before = site.served(host)
+            started = time.perf_counter()
+            try:
+                sample, key = run_stage(server, source, stage, key)
+            except (OSError, ValueError, KeyError) as e:
+                sample, key = {"ok": False, "error": str(e)[:200]}, None
+            sample["ms"] = round((time.perf_counter() - started) * 1000, 1)
+            sample["siteBytes"] = site.served(host) - before
+            samples[stage].append(sample)
+    return {
+        "key": source["key"],
+        "source": f"{source['name']} ({source['lang']})",
+        "stages": {stage: summarize(values) for stage, values in samples.items() if values},
+        "samples": {stage: [s["ms"] for s in values] for stage, values in samples.items() if values},
+    }
+
+def percentile(values, pct: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[rank]
+
+def summarize(samples: list) -> dict:
+    ms = [s["ms"] for s in samples]
+    summary = {f"p{pct}": percentile(ms, pct) for pct in PERCENTILES}
+    summary.update({
+        "runs": len(samples),
+        "ok": sum(bool(s.get("ok")) for s in samples),
+        "items": max((s.get("items", 0) for s in samples), default=0),
+        "siteBytes": sum(s.get("siteBytes", 0) for s in samples) // len(samples),
+        "apiBytes": sum(s.get("apiBytes", 0) for s in samples) // len(samples),
+    })
+    errors = [s["error"] for s in samples if "error" in s]
+    if errors:
+        summary["error"] = errors[-1]
+    return summary
+
+def stage_totals(results: list) -> dict:
+    """Percentiles over every sample of a stage, across all sources."""
+    totals = {}
+    for stage in STAGES:
+        ms = [value for r in results for value in r["samples"].get(stage, [])]
+        if not ms:
+            continue
+        totals[stage] = {f"p{pct}": percentile(ms, pct) for pct in PERCENTILES}
+        per_source = [r["stages"][stage] for r in results if stage in r["stages"]]
+        totals[stage].update({
+            "samples": len(ms),
+            "ok": sum(s["ok"] for s in per_source),
+            "items": sum(s["items"] for s in per_source),
+            "siteBytes": sum(s["siteBytes"] for s in per_source),
+            "apiBytes": sum(s["apiBytes"] for s in per_source),
+        })
+    return totals
+
+def source_ms(result: dict) -> float:
+    return sum(stage["p50"] for stage in result["stages"].values())
+
+def regressions(run: dict, previous: dict, limit: float) -> list:
+    """(what, before ms, after ms) for everything that got slower than allowed."""
+    found = []
+
+    def check(what, before, after):
+        if before and after - before > max(before * limit, MIN_REGRESSION_MS):
+            found.append((what, before, after))
+
+    for stage, totals in run["stages"].items():
+        before = previous["stages"].get(stage)
+        if before:
+            check(f"{stage} p95", before["p95"], totals["p95"])
+    for key, result in run["sources"].items():
+        before = previous["sources"].get(key)
+        if before:
+            check(key, before["ms"], result["ms"])
+    return found
+
+def git_commit(root: Path) -> str:
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=root,
+                                capture_output=True, text=True, timeout=10)
+    except OSError:
+        return ""
+    return result.stdout.strip() if result.returncode == 0 else ""
+
+def write_json(path: Path, data):
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark source stages through source-test-server")
+    parser.add_argument("sources", nargs="*", help="Source names or module paths (default: all loaded)")
+    parser.add_argument("--server", default="http://127.0.0.1:8080", help="source-test-server URL")
+    parser.add_argument("--path", default="sources", help="Sources directory (default: sources)")
+    parser.add_argument("--corpus", type=Path, default=Path("corpus"), help="Corpus directory (default: corpus)")
+    parser.add_argument("--repeat", "-r", type=int, default=3, help="Runs per source (default: 3)")
+    parser.add_argument("--jobs", "-j", type=int, default=8, help="Sources benchmarked at once")
+    parser.add_argument("--history", type=Path, help=f"Trend file (default: {HISTORY} next to sources/)")
+    parser.add_argument("--record", action="store_true", help="Append this run to the trend file")
+    parser.add_argument("--max-regression", type=float, default=MAX_REGRESSION,
+                        help="Allowed slowdown against the last recorded run (default: 0.25)")
+    parser.add_argument("--json", action="store_true", help="Print the run as JSON")
+    args = parser.parse_args()
+
+    base = Path(args.path)
+    root = base.resolve().parent
+    history_path = args.history or root / HISTORY
+    catalog = load_catalog(base)
+    by_id = {record.source_id: record for record in catalog}
+    server = TestServer(args.server)
+
+    try:
+        loaded, _ = server.call("/sources")
+    except OSError as e:
+        sys.exit(f"Error: source-test-server not reachable at {args.server}: {e}")
+
+    site = SnapshotSite()
+    jobs, missing = [], []
+    wanted = {name.lower().strip("/") for name in args.sources}
+    for source in loaded:
+        record = by_id.get(int(source["id"])) or catalog.find(source["name"], source["lang"])
+        module = record.module if record else None
+        if wanted and not (source["name"].lower() in wanted or module and any(module.endswith(w) for w in wanted)):
+            continue
+        capture = latest_capture(args.corpus / Path(module).relative_to(base)) if module else None
+        host = urllib.parse.urlsplit(source["baseUrl"]).hostname
+        if capture is None or not host:
+            missing.append(source["name"])
+            continue
+        site.add(host, capture)
+        source["key"] = Path(module).relative_to(base).as_posix()
+        jobs.append(source)
+
+    if not jobs:
+        site.close()
+        sys.exit(f"Error: none of the {len(loaded)} loaded source(s) has a capture under {args.corpus}")
+
+    started = time.perf_counter()
+    server.call("/mock-origin", method="POST", url=site.url)
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+            results = list(pool.map(lambda s: bench_source(server, site, s, args.repeat), jobs))
+    finally:
+        server.call("/mock-origin", method="POST", url="")
+        site.close()
+    elapsed = time.perf_counter() - started
+
+    run = {
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(root),
+        "corpus": args.corpus.as_posix(),
+        "repeat": args.repeat,
+        "stages": stage_totals(results),
+        "sources": {r["key"]: {"ms": round(source_ms(r), 1), "stages": r["stages"]} for r in results},
+    }
+
+    history = json.loads(history_path.read_text(encoding="utf-8")) if history_path.exists() else {"runs": []}
+    previous = history["runs"][-1] if history["runs"] else None
+    slower = regressions(run, previous, args.max_regression) if previous else []
+    if args.record:
+        history["runs"] = (history["runs"] + [run])[-MAX_RUNS:]
+        write_json(history_path, history)
+
+    if args.json:
+        print(json.dumps(run, indent=2))
+    else:
+        print(f"\n=== {len(results)} source(s) x {args.repeat} run(s) ({elapsed:.2f}s) ===\n")
+        print(f"{'Stage':<10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'OK':>6} {'Items':>8} {'Site KB':>9} {'API KB':>8}")
+        print("-" * 72)
+        for stage, t in run["stages"].items():
+            print(f"{stage:<10} {t['p50']:>8.1f} {t['p95']:>8.1f} {t['p99']:>8.1f} {t['ok']:>6} {t['items']:>8} "
+                  f"{t['siteBytes'] / 1024:>9.1f} {t['apiBytes'] / 1024:>8.1f}")
+        slowest = sorted(results, key=source_ms, reverse=True)[:10]
+        print("\nSlowest sources (p50 over all stages):")
+        for r in slowest:
+            broken = [stage for stage, s in r["stages"].items() if not s["ok"]]
+            note = f"  failing: {', '.join(broken)}" if broken else ""
+            print(f"  {source_ms(r):>8.1f} ms  {r['source']}{note}")
+        if missing:
+            print(f"\n{len(missing)} loaded source(s) without a capture were skipped")
+        if previous:
+            print(f"\nCompared with {previous['date']} ({previous.get('commit') or 'unknown commit'}):")
+            for what, before, after in slower:
+                print(f"  {what}: {before:.1f} -> {after:.1f} ms")
+            if not slower:
+                print("  no regressions")
+        if args.record:
+            print(f"\nRecorded in {history_path}")
+
+    sys.exit(1 if slower else 0)
+
+if __name__ == "__main__":
+    main()
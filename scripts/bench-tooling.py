@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Benchmark the scripts themselves on synthetic sources/ trees.
+
+Trees of 100, 1k and 10k modules (a fifth of them multisrc variants, 50
+Extension(...) blocks per theme build file) are generated with
+synthetic_tree.py in a temporary directory. On each the benchmark times:
+
+    catalog-cold   load_catalog with no index
+    catalog-warm   load_catalog from the index
+    ids            build_index and generate_id for every source
+    bump           bump_version_codes over every build file
+    bump-variants  bump_modules for every multisrc variant at once
+    render         render_source for one html source per module
+
+and compares the best of --repeat runs with scripts/tests/bench-baselines.json.
+A step slower than its baseline times --tolerance (plus 50 ms, so tiny steps
+do not flap) fails the run.
+
+Usage:
+    python scripts/bench-tooling.py                        # 100 and 1k modules, compared with the baselines
+    python scripts/bench-tooling.py --sizes 100,1000,10000
+    python scripts/bench-tooling.py --update               # Record new baselines for this machine
+    python scripts/bench-tooling.py --json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from source_catalog import load_catalog
+from source_ids import build_index, generate_id
+from synthetic_tree import make_tree
+from tests.support import load_script
+
+SCRIPTS = Path(__file__).resolve().parent
+DEFAULT_BASELINES = SCRIPTS / "tests" / "bench-baselines.json"
+SLACK_SECONDS = 0.05
+
+def best_of(repeat: int, step, setup=None) -> float:
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            step()
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+def run_size(modules: int, repeat: int) -> dict:
+    """{step: seconds} for a tree of `modules` modules."""
+    bump = load_script("bump-version-codes")
+    add_source = load_script("add-source")
+    with tempfile.TemporaryDirectory(prefix="bench-tooling-") as tmp:
+        root = Path(tmp)
+        base = root / "sources"
+        make_tree(base, modules)
+        cache = root / ".cache" / "source-catalog.json"
+        ids_cache = root / ".cache" / "source-ids.json"
+        catalog = load_catalog(base, cache)
+        plans = [add_source.plan_source(record.name, f"https://{record.name.lower()}.example", record.lang, "html", False)
+                 for record in catalog]
+        variant_modules = [{"module": record.module, "buildFile": record.build_file, "sourceDir": record.source_dir}
+                           for record in catalog if record.is_multisrc]
+
+        def ids():
+            index = build_index(base, ids_cache, rebuild=True, catalog=catalog)
+            for record in catalog:
+                generate_id(record.name, record.lang)
+            return index
+
+        def render_all():
+            for plan in plans:
+                add_source.render_source(plan)
+
+        return {
+            "catalog-cold": best_of(repeat, lambda: load_catalog(base, cache, rebuild=True)),
+            "catalog-warm": best_of(repeat, lambda: load_catalog(base, cache), setup=lambda: load_catalog(base, cache)),
+            "ids": best_of(repeat, ids),
+            "bump": best_of(repeat, lambda: bump.bump_version_codes(str(base))),
+            "bump-variants": best_of(repeat, lambda: bump.bump_modules(variant_modules, root)),
+            "render": best_of(repeat, render_all),
+        }
+
+def compare(results: dict, baselines: dict, tolerance: float) -> list:
+    """[(size, step, seconds, baseline or None, regressed)] for every measurement."""
+    rows = []
+    for size, steps in results.items():
+        for step, seconds in steps.items():
+            baseline = baselines.get(size, {}).get(step)
+            regressed = baseline is not None and seconds > baseline * tolerance + SLACK_SECONDS
+            rows.append((size, step, seconds, baseline, regressed))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scripts on synthetic source trees")
+    parser.add_argument("--sizes", default="100,1000", help="Comma-separated module counts (default: 100,1000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per step, the best counts (default: 3)")
+    parser.add_argument("--baselines", type=Path, default=DEFAULT_BASELINES, help="Baseline file")
+    parser.add_argument("--tolerance", type=float, default=1.5,
+                        help="Slowdown factor over the baseline that fails (default: 1.5)")
+    parser.add_argument("--update", action="store_true", help="Write the results as the new baselines")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args()
+
+    try:
+        sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    except ValueError:
+        parser.error("--sizes takes comma-separated integers")
+    if not sizes or min(sizes) < 1 or args.repeat < 1:
+        parser.error("sizes and --repeat must be at least 1")
+
+    baselines = {}
+    if args.baselines.exists():
+        try:
+            baselines = json.loads(args.baselines.read_text(encoding="utf-8"))
+        except ValueError as e:
+            sys.exit(f"Error: {args.baselines}: {e}")
+
+    results = {}
+    for size in sizes:
+        print(f"Benchmarking {size} modules...", file=sys.stderr)
+        results[str(size)] = {step: round(seconds, 4) for step, seconds in run_size(size, args.repeat).items()}
+
+    if args.update:
+        merged = dict(baselines, **results)
+        args.baselines.parent.mkdir(parents=True, exist_ok=True)
+        tmp = args.baselines.with_name(args.baselines.name + ".tmp")
+        tmp.write_text(json.dumps(merged, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        os.replace(tmp, args.baselines)
+        print(f"Baselines for {', '.join(results)} modules written to {args.baselines}")
+        return
+
+    rows = compare(results, baselines, args.tolerance)
+    regressions = [row for row in rows if row[4]]
+    if args.json:
+        print(json.dumps({"results": results, "regressions": [
+            {"modules": int(size), "step": step, "seconds": seconds, "baseline": baseline}
+            for size, step, seconds, baseline, _ in regressions]}, indent=2))
+    else:
+        print(f"\n  {'modules':>7}  {'step':<14} {'seconds':>9} {'baseline':>9}")
+        for size, step, seconds, baseline, regressed in rows:
+            base = f"{baseline:>9.3f}" if baseline is not None else f"{'-':>9}"
+            flag = "  SLOWER" if regressed else ""
+            print(f"  {size:>7}  {step:<14} {seconds:>9.3f} {base}{flag}")
+        print(f"\n{len(regressions)} regression(s) at tolerance x{args.tolerance}")
+    if regressions:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
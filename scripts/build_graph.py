@@ -0,0 +1,213 @@
+"""
+Module dependency graph for build planning, shared by plan-build.py and
+bump-version-codes.py.
+
+Nodes are source flavors from the catalog. A changed path reaches them
+through:
+  - the module that owns it (multisrc theme code reaches every variant)
+  - projectDependencies = setOf(":...") in Extension(...) blocks
+  - imports of ireader.common.* (the :common project and sources/common)
+  - build-wide inputs (buildSrc, gradle/, settings, annotations, ...), which
+    reach everything
+Paths that never feed an extension APK (docs, scripts, CI files, ...) reach
+nothing. Any other path outside sources/ is treated as build-wide, to be safe.
+"""
+
+import re
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from source_catalog import cached_parse, parse_build_file
+
+CACHE_VERSION = 1
+DEFAULT_CACHE = Path(".cache") / "source-imports.json"
+
+# Inputs of every extension build (extension-setup.gradle.kts and friends)
+BUILD_WIDE = (
+    "buildSrc/", "gradle/", "settings.gradle.kts", "build.gradle.kts", "gradle.properties",
+    "gradlew", "annotations/", "compiler/", "multisrc/", "deeplink/", "defaultRes/", "extensions/",
+)
+# Paths that do not feed extension APKs
+NO_BUILD = (
+    ".github/", "docs/", "scripts/", "tutorial/", "ai-skills/", "source-test-server/",
+    "test-extensions/", "js-sources/", "kotlin-js-store/", ".cache/", "fixtures/", "corpus/",
+)
+NO_BUILD_SUFFIXES = (".md", ".txt", ".csv", ".json", ".jsonl", ".js", ".png", ".yml", ".yaml")
+COMMON_PATHS = ("common/", "sources/common/")
+COMMON_PROJECT = ":common"
+COMMON_IMPORT = re.compile(r'^\s*import\s+ireader\.common\.', re.M)
+
+def changed_files(ref: str, repo_root: Path, untracked: str = "sources") -> List[str]:
+    """Files changed between `ref` and the working tree, plus untracked files under `untracked`."""
+    def git(*args):
+        result = subprocess.run(
+            ["git", *args], cwd=repo_root, capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            sys.exit(f"Error: git {' '.join(args)} failed: {result.stderr.strip()}")
+        return [line for line in result.stdout.splitlines() if line]
+
+    diff = git("diff", "--name-only", ref, "--")
+    new = git("ls-files", "--others", "--exclude-standard", "--", untracked)
+    return sorted(set(diff) | set(new))
+
+def file_at(ref: str, path: str, repo_root: Path) -> Optional[str]:
+    """Content of `path` at git `ref`, or None if it did not exist."""
+    result = subprocess.run(
+        ["git", "show", f"{ref}:{path}"], cwd=repo_root, capture_output=True, text=True
+    )
+    return result.stdout if result.returncode == 0 else None
+
+def task_name(record, build_type: str = "Release") -> str:
+    """Gradle assemble task of one source flavor."""
+    flavor = record.flavor
+    return f"{record.project}:assemble{flavor[:1].upper()}{flavor[1:]}{build_type}"
+
+def _uses_common(content: str, path=None) -> bool:
+    return bool(COMMON_IMPORT.search(content))
+
+@dataclass
+class Impact:
+    records: list = field(default_factory=list)
+    reasons: Dict[str, List[str]] = field(default_factory=dict)
+    full: bool = False
+
+    def add(self, record, reason: str):
+        key = f"{record.project}:{record.flavor}"
+        if key not in self.reasons:
+            self.records.append(record)
+            self.reasons[key] = []
+        if reason not in self.reasons[key]:
+            self.reasons[key].append(reason)
+
+class BuildGraph:
+    """Which source flavors a set of changed paths can affect."""
+
+    def __init__(self, catalog, common_users: Set[str]):
+        self.catalog = catalog
+        self.common_users = common_users
+        self.dependents: Dict[str, list] = {}
+        for record in catalog:
+            for dependency in record.project_dependencies:
+                self.dependents.setdefault(dependency, []).append(record)
+
+    def project_dir(self, project: str) -> Optional[str]:
+        """Directory of a Gradle project path, mirroring settings.gradle.kts."""
+        parts = project.strip(":").split(":")
+        base = self.catalog.base.name
+        if parts[:2] == ["extensions", "individual"] and len(parts) == 4:
+            return f"{base}/{parts[2]}/{parts[3]}"
+        if parts[:2] == ["extensions", "multisrc"] and len(parts) == 3:
+            return f"{base}/multisrc/{parts[2]}"
+        return parts[0] if len(parts) == 1 else None
+
+    def _owner_projects(self, path: str) -> List[str]:
+        projects = {record.project for record in self.catalog.module_for_path(path)}
+        if path.startswith(COMMON_PATHS):
+            projects.add(COMMON_PROJECT)
+        for dependency in self.dependents:
+            directory = self.project_dir(dependency)
+            if directory and path.startswith(directory + "/"):
+                projects.add(dependency)
+        return sorted(projects)
+
+    def classify(self, path: str) -> str:
+        """One of: none, wide, common, source."""
+        sources = self.catalog.base.name + "/"
+        if path.startswith(NO_BUILD):
+            return "none"
+        if path.startswith(COMMON_PATHS):
+            return "common"
+        if path.startswith(BUILD_WIDE):
+            return "wide"
+        if path.startswith(sources):
+            return "none" if path.endswith(".md") else "source"
+        return "none" if path.endswith(NO_BUILD_SUFFIXES) else "wide"
+
+    def impact(self, paths: List[str], build_file_changes: Optional[Dict[str, list]] = None) -> Impact:
+        """
+        Source flavors affected by `paths`. `build_file_changes` maps a build
+        file to the records whose Extension(...) block changed; build files not
+        in it count as changed for every flavor they declare.
+        """
+        impact = Impact()
+        build_file_changes = build_file_changes or {}
+
+        for path in paths:
+            kind = self.classify(path)
+            if kind == "none":
+                continue
+            if kind == "wide":
+                impact.full = True
+                for record in self.catalog:
+                    impact.add(record, f"build-wide: {path}")
+                continue
+
+            if path in build_file_changes:
+                for record in build_file_changes[path]:
+                    impact.add(record, f"Extension block: {path}")
+            else:
+                for record in self.catalog.module_for_path(path):
+                    impact.add(record, path)
+
+            if kind == "common":
+                for record in self.catalog:
+                    if record.module in self.common_users:
+                        impact.add(record, f"imports ireader.common: {path}")
+
+            for project in self._owner_projects(path):
+                for record in self.dependents.get(project, []):
+                    impact.add(record, f"projectDependencies {project}: {path}")
+        return impact
+
+def changed_extension_records(build_file: str, old: Optional[str], new: Optional[str], base: Path) -> list:
+    """Records of a build file whose Extension(...) arguments differ between two versions."""
+    path = base.parent / build_file
+    old_records = {r.flavor: r for r in parse_build_file(old, path, base)} if old else {}
+    new_records = parse_build_file(new, path, base) if new else []
+    return [record for record in new_records if old_records.get(record.flavor) != record]
+
+def load_graph(catalog, rebuild: bool = False, cache_path=None) -> BuildGraph:
+    """Graph for `catalog`; Kotlin import scans are cached like the catalog."""
+    base = catalog.base
+    root = base.resolve().parent
+    cache = Path(cache_path) if cache_path else root / DEFAULT_CACHE
+
+    module_files = {}
+    for record in catalog:
+        if record.module in module_files:
+            continue
+        module_dir = root / record.module
+        theme_main = root / record.build_file.rsplit("/", 1)[0] / "main" if record.is_multisrc else None
+        dirs = [module_dir] + ([theme_main] if theme_main else [])
+        module_files[record.module] = sorted({p for d in dirs if d.is_dir() for p in d.rglob("*.kt")})
+
+    all_files = sorted({p for files in module_files.values() for p in files})
+    parsed = cached_parse(all_files, root, _uses_common, cache, CACHE_VERSION, rebuild)
+    common_users = {
+        module for module, files in module_files.items()
+        if any(parsed[p.relative_to(root).as_posix()] for p in files)
+    }
+    return BuildGraph(catalog, common_users)
+
+def shard(costs: Dict[str, float], projects: Dict[str, str], workers: int, overhead: float = 0.0) -> List[dict]:
+    """
+    Spread tasks over `workers`, longest first, each to the least loaded worker.
+    `overhead` is charged once per worker for every Gradle project it has to
+    configure, so tasks of one project tend to stay together.
+    """
+    shards = [{"tasks": [], "seconds": 0.0, "projects": set()} for _ in range(max(workers, 1))]
+    for task in sorted(costs, key=lambda t: (-costs[t], t)):
+        project = projects[task]
+
+        def load(s):
+            return s["seconds"] + costs[task] + (0 if project in s["projects"] else overhead)
+
+        target = min(shards, key=load)
+        target["seconds"] = load(target)
+        target["tasks"].append(task)
+        target["projects"].add(project)
+    return [{"tasks": sorted(s["tasks"]), "seconds": round(s["seconds"], 1)} for s in shards]
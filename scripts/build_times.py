@@ -0,0 +1,233 @@
+"""
+Gradle build-time history, shared by profile-build.py and plan-build.py.
+
+Builds are read from the HTML report `./gradlew --profile` writes to
+build/reports/profile/, which needs no network or build scan. Every task is
+stored with its project, outcome and a category:
+
+    ksp        ksp*Kotlin (SourceFactoryProcessor, SelectorValidatorProcessor, ...)
+    kotlinc    compile*Kotlin*
+    javac      compile*JavaWithJavac
+    dex        dexBuilder*, merge*Dex*, minify*
+    resources  *Resources*, *Assets*, *Manifest*
+    packaging  package*, assemble*, sign*, zip*
+    other      everything else
+
+in an SQLite database (default .cache/build-times.db) keyed by commit, so
+reports can follow a module across commits.
+
+    conn = connect()
+    record_build(conn, parse_profile(path), commit="abc123", wall=312.4)
+    project_times(conn)   # {":extensions:individual:en:novelfull": 41.2, ...}
+"""
+
+import re
+import sqlite3
+import statistics
+import subprocess
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from html_dom import parse_file
+
+SCHEMA_VERSION = 1
+DEFAULT_DB = Path(".cache") / "build-times.db"
+PROFILE_DIR = Path("build") / "reports" / "profile"
+
+# Outcomes of tasks that ran; the rest (UP-TO-DATE, FROM-CACHE, NO-SOURCE, SKIPPED) did no work
+EXECUTED = ("", "EXECUTED", "Did No Work")
+PHASES = ("Total Build Time", "Startup", "Settings and buildSrc", "Loading Projects",
+          "Configuring Projects", "Artifact Transforms", "Task Execution")
+CATEGORIES = ("ksp", "kotlinc", "javac", "dex", "resources", "packaging", "other")
+
+DURATION = re.compile(r'^(?:(\d+)d)?(?:(\d+)h)?(?:(\d+)m)?(?:(\d+(?:\.\d+)?)s)?$')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS builds (
+    id INTEGER PRIMARY KEY,
+    commit_sha TEXT NOT NULL,
+    dirty INTEGER NOT NULL DEFAULT 0,
+    recorded TEXT NOT NULL,
+    wall REAL NOT NULL,
+    command TEXT NOT NULL DEFAULT '',
+    report TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS phases (
+    build INTEGER NOT NULL REFERENCES builds(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    seconds REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    build INTEGER NOT NULL REFERENCES builds(id) ON DELETE CASCADE,
+    path TEXT NOT NULL,
+    project TEXT NOT NULL,
+    category TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    outcome TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS builds_commit ON builds(commit_sha);
+CREATE INDEX IF NOT EXISTS tasks_build ON tasks(build);
+CREATE INDEX IF NOT EXISTS tasks_project ON tasks(project);
+"""
+
+@dataclass
+class Profile:
+    tasks: List[dict] = field(default_factory=list)  # {"path", "project", "category", "seconds", "outcome"}
+    phases: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def wall(self) -> float:
+        return self.phases.get("Total Build Time", 0.0)
+
+def parse_duration(text: str) -> Optional[float]:
+    """Seconds from Gradle's terse durations ("0.412s", "1m3.25s", "2h0m1.5s"), None if not one."""
+    match = DURATION.match(text.strip())
+    if not match or not any(match.groups()):
+        return None
+    days, hours, minutes, seconds = (float(group or 0) for group in match.groups())
+    return ((days * 24 + hours) * 60 + minutes) * 60 + seconds
+
+def split_task_path(path: str):
+    """(":a:b", "task") from ":a:b:task"; root project tasks belong to ":"."""
+    project, _, name = path.rpartition(":")
+    return project or ":", name
+
+def categorize(name: str) -> str:
+    if name.startswith("ksp"):
+        return "ksp"
+    if name.startswith("compile") and "Kotlin" in name:
+        return "kotlinc"
+    if name.startswith("compile") and "Java" in name:
+        return "javac"
+    if name.startswith(("dexBuilder", "minify")) or ("Dex" in name and name.startswith("merge")):
+        return "dex"
+    if any(word in name for word in ("Resources", "Assets", "Manifest")):
+        return "resources"
+    if name.startswith(("package", "assemble", "sign", "zip", "createApk")):
+        return "packaging"
+    return "other"
+
+def parse_profile(path) -> Profile:
+    """Tasks and build phases of one `--profile` HTML report."""
+    root = parse_file(path)
+    profile = Profile()
+    for row in root.select("tr"):
+        cells = [cell.text() for cell in row.select("td")]
+        if len(cells) == 2 and cells[0] in PHASES:
+            seconds = parse_duration(cells[1])
+            if seconds is not None:
+                profile.phases[cells[0]] = seconds
+        elif len(cells) == 3 and cells[0].startswith(":") and cells[2] != "(total)":
+            seconds = parse_duration(cells[1])
+            if seconds is None:
+                continue
+            project, name = split_task_path(cells[0])
+            profile.tasks.append({
+                "path": cells[0],
+                "project": project,
+                "category": categorize(name),
+                "seconds": seconds,
+                "outcome": cells[2],
+            })
+    return profile
+
+def latest_profile(root: Path, since: float = 0.0) -> Optional[Path]:
+    """Newest report in <root>/build/reports/profile written at or after `since` (epoch seconds)."""
+    reports = [p for p in (root / PROFILE_DIR).glob("profile-*.html") if p.stat().st_mtime >= since]
+    return max(reports, key=lambda p: p.stat().st_mtime) if reports else None
+
+def current_commit(repo_root: Path):
+    """(HEAD sha, whether the work tree has changes), ("unknown", False) outside git."""
+    def git(*args):
+        result = subprocess.run(["git", *args], cwd=repo_root, capture_output=True, text=True)
+        return result.stdout.strip() if result.returncode == 0 else None
+
+    sha = git("rev-parse", "HEAD")
+    if sha is None:
+        return "unknown", False
+    return sha, bool(git("status", "--porcelain", "--untracked-files=no"))
+
+def rev_parse(ref: str, repo_root: Path) -> Optional[str]:
+    """Full sha of the commit a git ref names, None when git does not know it."""
+    result = subprocess.run(["git", "rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}"],
+                            cwd=repo_root, capture_output=True, text=True)
+    return result.stdout.strip() if result.returncode == 0 else None
+
+def resolve_commit(conn, ref: str, repo_root: Path) -> Optional[str]:
+    """Full sha of a recorded commit from a git ref or a sha prefix."""
+    prefix = rev_parse(ref, repo_root) or ref
+    rows = conn.execute("SELECT DISTINCT commit_sha FROM builds WHERE commit_sha LIKE ? || '%'", (prefix,)).fetchall()
+    return rows[0][0] if len(rows) == 1 else None
+
+def connect(path=DEFAULT_DB) -> sqlite3.Connection:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA foreign_keys = ON")
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version not in (0, SCHEMA_VERSION):
+        conn.close()
+        raise sqlite3.DatabaseError(f"{path} has schema version {version}, expected {SCHEMA_VERSION}")
+    conn.executescript(SCHEMA)
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return conn
+
+def record_build(conn, profile: Profile, commit: str, dirty: bool = False, wall: Optional[float] = None,
+                 command: str = "", report: str = "") -> int:
+    """Store one build; `wall` defaults to the report's total build time. Returns the build id."""
+    with conn:
+        cursor = conn.execute(
+            "INSERT INTO builds (commit_sha, dirty, recorded, wall, command, report) VALUES (?, ?, ?, ?, ?, ?)",
+            (commit, int(dirty), datetime.now(timezone.utc).isoformat(timespec="seconds"),
+             wall if wall is not None else profile.wall, command, report),
+        )
+        build = cursor.lastrowid
+        conn.executemany("INSERT INTO phases (build, name, seconds) VALUES (?, ?, ?)",
+                         [(build, name, seconds) for name, seconds in profile.phases.items()])
+        conn.executemany(
+            "INSERT INTO tasks (build, path, project, category, seconds, outcome) VALUES (?, ?, ?, ?, ?, ?)",
+            [(build, t["path"], t["project"], t["category"], t["seconds"], t["outcome"]) for t in profile.tasks],
+        )
+    return build
+
+def builds(conn, commit: Optional[str] = None, last: Optional[int] = None) -> List[dict]:
+    """Recorded builds, newest first, optionally of one commit and limited to the `last` ones."""
+    query = "SELECT id, commit_sha, dirty, recorded, wall, command FROM builds"
+    params: list = []
+    if commit:
+        query += " WHERE commit_sha = ?"
+        params.append(commit)
+    query += " ORDER BY id DESC"
+    if last:
+        query += " LIMIT ?"
+        params.append(last)
+    keys = ("id", "commit", "dirty", "recorded", "wall", "command")
+    return [dict(zip(keys, row)) for row in conn.execute(query, params)]
+
+def module_breakdown(conn, build_ids: List[int]) -> Dict[str, Dict[str, float]]:
+    """{project: {category or "total": median seconds of work}} over `build_ids`; a build counts
+    for a project only if one of its tasks ran there, so up-to-date builds do not pull medians to 0."""
+    if not build_ids:
+        return {}
+    marks = ",".join("?" * len(build_ids))
+    per_build: Dict[str, Dict[int, Dict[str, float]]] = {}
+    for project, build, category, seconds in conn.execute(
+            f"SELECT project, build, category, SUM(seconds) FROM tasks WHERE build IN ({marks}) "
+            f"AND outcome IN ({','.join('?' * len(EXECUTED))}) GROUP BY project, build, category",
+            [*build_ids, *EXECUTED]):
+        per_build.setdefault(project, {}).setdefault(build, {})[category] = seconds
+    breakdown = {}
+    for project, runs in per_build.items():
+        breakdown[project] = {
+            category: statistics.median(run.get(category, 0.0) for run in runs.values())
+            for category in CATEGORIES
+        }
+        breakdown[project]["total"] = statistics.median(sum(run.values()) for run in runs.values())
+    return breakdown
+
+def project_times(conn, last: int = 10) -> Dict[str, float]:
+    """Median seconds of work per project over the `last` builds, for sharding (plan-build.py --times)."""
+    ids = [build["id"] for build in builds(conn, last=last)]
+    return {project: round(times["total"], 1) for project, times in module_breakdown(conn, ids).items()}
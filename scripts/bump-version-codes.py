@@ -1,40 +1,208 @@
 #!/usr/bin/env python3
 """
-Bump versionCode by +1 in all build.gradle.kts files under sources/
+Bump versionCode by +1 in build.gradle.kts files under sources/
 
 Usage:
     python scripts/bump-version-codes.py           # Apply changes
     python scripts/bump-version-codes.py --dry-run # Preview changes
+
+    # Only bump sources changed since a git ref, and list them for CI
+    python scripts/bump-version-codes.py --since origin/master
+    python scripts/bump-version-codes.py --since v1.2.0 --json affected.json
 """
 
+import argparse
+import json
+import os
 import re
 import sys
 from pathlib import Path
 
-def bump_version_codes(base_path: str = "sources", dry_run: bool = False):
+from build_graph import changed_files, file_at
+from source_catalog import find_extension_blocks, load_catalog
+
+VERSION_CODE = re.compile(r'versionCode\s*=\s*(\d+)')
+SOURCE_DIR = re.compile(r'sourceDir\s*=\s*"([^"]+)"')
+
+def bump_text(text: str):
+    """(text with every versionCode bumped by one, [(old, new), ...]) in one pass."""
+    pieces = []
+    changes = []
+    last = 0
+    for match in VERSION_CODE.finditer(text):
+        old_version = int(match.group(1))
+        changes.append((old_version, old_version + 1))
+        pieces.append(text[last:match.start()])
+        pieces.append(f"versionCode = {old_version + 1}")
+        last = match.end()
+    pieces.append(text[last:])
+    return "".join(pieces), changes
+
+def write_atomic(path: Path, content: str):
+    """Replace `path` in one step; an interrupted write leaves the old file and no temp file."""
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        tmp.write_text(content, encoding="utf-8")
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+def bump_version_codes(base_path: str = "sources", dry_run: bool = False) -> int:
     total_updates = 0
-    
+
     for gradle_file in Path(base_path).rglob("build.gradle.kts"):
         content = gradle_file.read_text(encoding="utf-8")
-        
-        def replace_version(match):
-            nonlocal total_updates
-            old_version = int(match.group(1))
-            new_version = old_version + 1
-            total_updates += 1
+        if "versionCode" not in content:
+            continue
+
+        new_content, changes = bump_text(content)
+        for old_version, new_version in changes:
             print(f"  {gradle_file.name}: versionCode {old_version} -> {new_version}")
-            return f"versionCode = {new_version}"
-        
-        new_content = re.sub(r'versionCode\s*=\s*(\d+)', replace_version, content)
-        
-        if new_content != content and not dry_run:
-            gradle_file.write_text(new_content, encoding="utf-8")
-    
+        total_updates += len(changes)
+
+        if changes and not dry_run:
+            write_atomic(gradle_file, new_content)
+
     if dry_run:
         print(f"\nDry run complete. {total_updates} version codes would be updated.")
     else:
         print(f"\nDone! Updated {total_updates} version codes.")
+    return total_updates
+
+def _blocks(text: str):
+    """({sourceDir or None: block}, text outside the blocks), versionCodes blanked out."""
+    text = VERSION_CODE.sub("versionCode = N", text)
+    blocks, outside, last = {}, [], 0
+    for start, end in find_extension_blocks(text):
+        block = text[start:end]
+        match = SOURCE_DIR.search(block)
+        blocks[match.group(1) if match else None] = block
+        outside.append(text[last:start])
+        last = end
+    outside.append(text[last:])
+    # Separators between blocks come and go with the blocks themselves
+    return blocks, "\0".join(filter(None, (part.strip(" \t\r\n,") for part in outside)))
+
+def build_file_changes(old: str, new: str):
+    """
+    sourceDirs (None for a single-source file) whose Extension block changed
+    between two versions of a build file, or None when something outside the
+    blocks changed. versionCode edits alone are not changes, so a bump does
+    not make its own build file look changed.
+    """
+    old_blocks, old_outside = _blocks(old)
+    new_blocks, new_outside = _blocks(new)
+    if old_outside != new_outside:
+        return None
+    return {key for key, block in new_blocks.items() if old_blocks.get(key) != block}
+
+def affected_modules(paths, catalog, ref=None, repo_root=None):
+    """
+    Map changed paths to the modules that own them.
+
+    Individual sources live in sources/<lang>/<pkg>. Multisrc variants live in
+    sources/multisrc/<theme>/<variant>; anything else under a theme (its main/
+    code) fans out to every variant of that theme. With `ref`, build files are
+    compared with their version at `ref`: a theme build file only affects the
+    variants whose own Extension block changed, unless its shared part did.
+    """
+    modules = {}
+    for path in paths:
+        records = catalog.module_for_path(path)
+        if ref is not None and Path(path).name == "build.gradle.kts" and records:
+            current = repo_root / path
+            changes = build_file_changes(file_at(ref, Path(path).as_posix(), repo_root) or "",
+                                         current.read_text(encoding="utf-8") if current.exists() else "")
+            if changes is not None:
+                records = [r for r in records if (r.source_dir if r.is_multisrc else None) in changes]
+        for record in records:
+            modules.setdefault(record.module, {
+                "module": record.module,
+                "project": record.project,
+                "flavors": [],
+                "buildFile": record.build_file,
+                "sourceDir": record.source_dir if record.is_multisrc else None,
+            })
+            if record.flavor not in modules[record.module]["flavors"]:
+                modules[record.module]["flavors"].append(record.flavor)
+    return [modules[key] for key in sorted(modules)]
+
+def bump_modules(modules, repo_root: Path, dry_run: bool = False) -> int:
+    """
+    Bump the versionCode of `modules`. Multisrc variants only touch their own
+    block, and every build file is read and written once however many of its
+    variants changed.
+    """
+    by_file = {}
+    for module in modules:
+        by_file.setdefault(module["buildFile"], []).append(module)
+
+    updates = 0
+    for build_file, owners in by_file.items():
+        gradle_file = repo_root / build_file
+        content = gradle_file.read_text(encoding="utf-8")
+        blocks = None
+        spans = {}
+        for module in owners:
+            if module["sourceDir"] is None:
+                spans[(0, len(content))] = module["module"]
+                continue
+            if blocks is None:
+                blocks = [(span, set(SOURCE_DIR.findall(content[span[0]:span[1]])))
+                          for span in find_extension_blocks(content)]
+            spans.update((span, module["module"]) for span, dirs in blocks if module["sourceDir"] in dirs)
+
+        file_updates = 0
+        # Walk spans back to front so earlier offsets stay valid while rewriting.
+        for (start, end), name in sorted(spans.items(), reverse=True):
+            block, changes = bump_text(content[start:end])
+            for old_version, new_version in changes:
+                print(f"  {name}: versionCode {old_version} -> {new_version}", file=sys.stderr)
+            file_updates += len(changes)
+            content = content[:start] + block + content[end:]
+
+        if file_updates and not dry_run:
+            write_atomic(gradle_file, content)
+        updates += file_updates
+    return updates
+
+def bump_module(module, repo_root: Path, dry_run: bool = False) -> int:
+    """Bump the versionCode of one module. Multisrc variants only touch their own block."""
+    return bump_modules([module], repo_root, dry_run)
+
+def bump_changed_sources(ref: str, base_path: str = "sources", dry_run: bool = False, json_path=None):
+    base = Path(base_path)
+    repo_root = base.resolve().parent
+
+    modules = affected_modules(changed_files(ref, repo_root), load_catalog(base), ref, repo_root)
+    total_updates = bump_modules(modules, repo_root, dry_run)
+
+    report = json.dumps(modules, indent=2)
+    if json_path:
+        Path(json_path).write_text(report + "\n", encoding="utf-8")
+    else:
+        print(report)
+
+    action = "would be updated" if dry_run else "updated"
+    print(
+        f"\n{len(modules)} module(s) changed since {ref}, {total_updates} version codes {action}.",
+        file=sys.stderr,
+    )
+    return modules
+
+def main():
+    parser = argparse.ArgumentParser(description="Bump extension versionCodes")
+    parser.add_argument("--dry-run", action="store_true", help="Preview changes without writing")
+    parser.add_argument("--since", metavar="REF", help="Only bump modules changed since this git ref")
+    parser.add_argument("--json", metavar="PATH", help="Write the affected module list to PATH (with --since)")
+    parser.add_argument("--path", default="sources", help="Sources directory (default: sources)")
+    args = parser.parse_args()
+
+    if args.since:
+        bump_changed_sources(args.since, args.path, args.dry_run, args.json)
+    else:
+        bump_version_codes(args.path, dry_run=args.dry_run)
 
 if __name__ == "__main__":
-    dry_run = "--dry-run" in sys.argv
-    bump_version_codes(dry_run=dry_run)
+    main()
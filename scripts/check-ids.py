@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Check source IDs for collisions and drift without running Gradle.
+
+Builds an ID -> source index from the source catalog and the Kotlin ID
+declarations (override val id = ...L, @AutoSourceId, @MadaraSource) and
+reports:
+  - collisions: the same ID used by more than one source
+  - drift: stored IDs that match neither generator scheme
+    (hash of the raw name, or of the add-source.py class name)
+
+Usage:
+    python scripts/check-ids.py              # Report collisions and drift
+    python scripts/check-ids.py --json       # Machine-readable report
+    python scripts/check-ids.py --strict     # Also fail on drift
+    python scripts/check-ids.py --id 123456  # Who owns this ID?
+"""
+
+import argparse
+import json
+import sys
+import time
+from dataclasses import asdict
+
+from source_ids import build_index
+
+def main():
+    parser = argparse.ArgumentParser(description="Check source IDs for collisions and drift")
+    parser.add_argument("--path", default="sources", help="Sources directory (default: sources)")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--strict", action="store_true", help="Exit non-zero on drift too")
+    parser.add_argument("--id", type=int, help="Look up the owner of a single ID")
+    parser.add_argument("--rebuild", action="store_true", help="Ignore cached indexes")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    index = build_index(args.path, rebuild=args.rebuild)
+    elapsed = time.perf_counter() - started
+
+    if args.id is not None:
+        owners = index.lookup(args.id)
+        for entry in owners:
+            print(f"{entry.id}: {entry.name} ({entry.lang}) in {entry.module} [{entry.kind}]")
+        if not owners:
+            print(f"{args.id}: free")
+        return
+
+    collisions = index.collisions()
+    drift = index.drift()
+
+    if args.json:
+        print(json.dumps({
+            "sources": len(index.entries),
+            "collisions": {str(k): [asdict(e) for e in v] for k, v in collisions.items()},
+            "drift": [dict(asdict(e), expected=sorted(e.expected_ids)) for e in drift],
+        }, indent=2))
+    else:
+        print(f"\n=== Checking {len(index.entries)} source IDs ({elapsed * 1000:.0f} ms) ===\n")
+        if collisions:
+            print(f"Found {len(collisions)} collision(s):\n")
+            for source_id, entries in sorted(collisions.items()):
+                print(f"ID: {source_id}")
+                for entry in entries:
+                    print(f"  - {entry.name} ({entry.lang}) in {entry.module} [{entry.kind}]")
+                print()
+        else:
+            print("No collisions found.\n")
+
+        if drift:
+            print(f"{len(drift)} source(s) with IDs that match neither generator scheme:\n")
+            for entry in sorted(drift, key=lambda e: e.module):
+                print(f"  {entry.name.ljust(30)} {entry.lang:5} {entry.id:>20} [{entry.kind}] {entry.file}")
+            print()
+
+    if collisions or (args.strict and drift):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
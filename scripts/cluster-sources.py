@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Find individual sources that are near-duplicates of each other and could be
+folded into a multisrc theme.
+
+Every Kotlin file under sources/<lang>/<source>/ is reduced to a feature set
+(selectors, endpoint fragments, base class, overridden members, DSL arguments
+and code shingles, see source_similarity.py) and a MinHash signature, cached
+in .cache/source-shapes.json. Sources are bucketed with LSH and only pairs
+sharing a bucket and a base class are compared exactly, so the run stays
+close to linear in the number of sources. Pairs at or above --threshold are
+joined into clusters.
+
+For each cluster the report names a representative source (the one most
+similar to the rest, whose package becomes the suggested theme name unless
+sources/multisrc/ already has a theme of that name), the
+selectors every member shares and the DSL arguments that differ, which are
+what a theme would take per variant. --gradle prints the Extension(...)
+variant list for sources/multisrc/<theme>/build.gradle.kts.
+
+Usage:
+    python scripts/cluster-sources.py                          # Clusters, largest first
+    python scripts/cluster-sources.py --threshold 0.7 --min-size 3
+    python scripts/cluster-sources.py --gradle                 # Variant lists for each cluster
+    python scripts/cluster-sources.py --json > clusters.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+from source_catalog import cached_parse, load_catalog
+from source_similarity import LSHIndex, clusters, estimate, extract_shape, jaccard, merge_signatures
+
+CACHE_VERSION = 1
+DEFAULT_CACHE = Path(".cache") / "source-shapes.json"
+
+def module_files(base: Path, module: str) -> list:
+    root = base.parent / module
+    return sorted(path for path in root.rglob("*.kt") if "build" not in path.relative_to(root).parts)
+
+def dsl_arguments(dsl: dict) -> dict:
+    """{"explore[Latest].endpoint": value, "detail.nameSelector": value, ...} of one source."""
+    arguments = {}
+    for stage, fetchers in dsl.items():
+        if isinstance(fetchers, list):
+            for fetcher in fetchers:
+                for key, value in fetcher.items():
+                    if key != "key":
+                        arguments[f"{stage}[{fetcher.get('key', '')}].{key}"] = value
+        else:
+            for key, value in fetchers.items():
+                arguments[f"{stage}.{key}"] = value
+    return arguments
+
+def load_sources(catalog, base: Path, cache: Path, rebuild: bool, jobs: int) -> dict:
+    """module -> {"records", "files", "hashes", "signature", "selectors", "bases", "arguments"}."""
+    files = {module: module_files(base, module) for module in catalog.modules()
+             if not module.startswith(f"{base.name}/multisrc/")}
+    files = {module: paths for module, paths in files.items() if paths}
+    parsed = cached_parse([path for paths in files.values() for path in paths], base, extract_shape,
+                          cache, CACHE_VERSION, rebuild, jobs)
+    sources = {}
+    for module, paths in files.items():
+        shapes = [parsed[path.relative_to(base).as_posix()] for path in paths]
+        arguments = {}
+        for shape in shapes:
+            arguments.update(dsl_arguments(shape["dsl"]))
+        sources[module] = {
+            "records": catalog.by_module(module),
+            "files": len(paths),
+            "hashes": set().union(*(shape["hashes"] for shape in shapes)),
+            "signature": merge_signatures([shape["signature"] for shape in shapes]),
+            "selectors": set().union(*(shape["selectors"] for shape in shapes)),
+            "bases": set().union(*(shape["bases"] for shape in shapes)),
+            "arguments": arguments,
+        }
+    return sources
+
+def similar_pairs(sources: dict, threshold: float, bands: int):
+    """(pairs at or above threshold with their similarity, number of candidate pairs compared)."""
+    index = LSHIndex(bands)
+    for module, source in sources.items():
+        index.add(module, source["signature"])
+    pairs = {}
+    candidates = index.candidates()
+    for a, b in candidates:
+        if not sources[a]["bases"] & sources[b]["bases"]:
+            continue
+        similarity = jaccard(sources[a]["hashes"], sources[b]["hashes"])
+        if similarity >= threshold:
+            pairs[(a, b)] = similarity
+    return pairs, len(candidates)
+
+def theme_name(packages: list, taken: set) -> str:
+    """First of `packages` (closest to the rest first) that is not a theme yet, else the first numbered."""
+    for package in packages:
+        if package not in taken:
+            return package
+    number = 2
+    while f"{packages[0]}{number}" in taken:
+        number += 1
+    return f"{packages[0]}{number}"
+
+def describe(members: list, sources: dict, pairs: dict, taken: set = frozenset()) -> dict:
+    def similarity(a, b):
+        if a == b:
+            return 1.0
+        key = (a, b) if a < b else (b, a)
+        return pairs.get(key) or estimate(sources[a]["signature"], sources[b]["signature"])
+
+    closeness = {m: sum(similarity(m, other) for other in members if other != m) / (len(members) - 1)
+                 for m in members}
+    medoid = max(members, key=lambda m: (closeness[m], m))
+    shared_bases = set.intersection(*(sources[m]["bases"] for m in members))
+    keys = sorted(set().union(*(sources[m]["arguments"] for m in members)))
+    varying = [key for key in keys if len({json.dumps(sources[m]["arguments"].get(key)) for m in members}) > 1]
+    ranked = sorted(members, key=lambda m: (-closeness[m], m))
+    return {
+        "theme": theme_name([m.rsplit("/", 1)[-1] for m in ranked], taken),
+        "representative": medoid,
+        "base": sorted(shared_bases)[0] if shared_bases else "",
+        "similarity": round(sum(closeness.values()) / len(members), 3),
+        "members": [
+            {
+                "module": m,
+                "sources": [{"name": r.name, "lang": r.lang, "versionCode": r.version_code, "nsfw": r.nsfw}
+                            for r in sources[m]["records"]],
+                "files": sources[m]["files"],
+                "similarity": round(closeness[m], 3),
+            }
+            for m in ranked
+        ],
+        "sharedSelectors": sorted(set.intersection(*(sources[m]["selectors"] for m in members))),
+        "sharedArguments": [key for key in keys if key not in varying],
+        "variantArguments": varying,
+    }
+
+def variant_list(cluster: dict) -> str:
+    """Extension(...) blocks for sources/multisrc/<theme>/build.gradle.kts, versionCode bumped for the move."""
+    theme = cluster["theme"]
+    blocks = []
+    for member in cluster["members"]:
+        package = member["module"].rsplit("/", 1)[-1]
+        for source in member["sources"]:
+            blocks.append(
+                "    Extension(\n"
+                f"        name = \"{source['name']}\",\n"
+                f"        versionCode = {source['versionCode'] + 1},\n"
+                "        libVersion = \"2\",\n"
+                f"        lang = \"{source['lang']}\",\n"
+                "        description = \"\",\n"
+                f"        nsfw = {str(source['nsfw']).lower()},\n"
+                "        icon = DEFAULT_ICON,\n"
+                f"        assetsDir = \"multisrc/{theme}/{package}/assets\",\n"
+                f"        sourceDir = \"{package}\",\n"
+                "    ),"
+            )
+    return "listOf(\n" + "\n".join(blocks) + "\n).also(::register)"
+
+def print_report(clusters_found: list, total: int, compared: int, elapsed: float):
+    for number, cluster in enumerate(clusters_found, start=1):
+        print(f"Cluster {number}: {len(cluster['members'])} sources, {cluster['base'] or '?'}, "
+              f"similarity {cluster['similarity']:.2f}, theme \"{cluster['theme']}\"")
+        for member in cluster["members"]:
+            names = ", ".join(f"{s['name']} ({s['lang']})" for s in member["sources"])
+            print(f"  {member['module']:<40} {member['similarity']:.2f}  {names}")
+        print(f"  shared: {len(cluster['sharedSelectors'])} selectors, {len(cluster['sharedArguments'])} DSL arguments")
+        if cluster["variantArguments"]:
+            print(f"  per variant: {', '.join(cluster['variantArguments'])}")
+        print()
+    folded = sum(len(c["members"]) for c in clusters_found)
+    print(f"{len(clusters_found)} cluster(s) covering {folded} of {total} sources: "
+          f"{folded - len(clusters_found)} fewer modules as themes")
+    print(f"{compared} candidate pairs compared of {total * (total - 1) // 2} in {elapsed:.2f}s")
+
+def main():
+    parser = argparse.ArgumentParser(description="Cluster near-duplicate sources into multisrc theme candidates")
+    parser.add_argument("--path", default="sources", help="Sources directory (default: sources)")
+    parser.add_argument("--threshold", type=float, default=0.6,
+                        help="Jaccard similarity that links two sources (default: 0.6)")
+    parser.add_argument("--min-size", type=int, default=2, help="Smallest cluster reported (default: 2)")
+    parser.add_argument("--bands", type=int, default=32, help="LSH bands; more finds weaker pairs (default: 32)")
+    parser.add_argument("--gradle", action="store_true", help="Print the Extension(...) variant list of each cluster")
+    parser.add_argument("--json", action="store_true", help="Print the clusters as JSON")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 4, help="Parallel workers")
+    parser.add_argument("--rebuild", action="store_true", help="Ignore the cached shapes")
+    args = parser.parse_args()
+
+    if not 0 < args.threshold <= 1:
+        parser.error("--threshold must be in (0, 1]")
+    if args.min_size < 2:
+        parser.error("--min-size must be at least 2")
+
+    base = Path(args.path)
+    started = time.perf_counter()
+    try:
+        index = LSHIndex(args.bands)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.threshold < index.threshold:
+        print(f"Warning: with {args.bands} bands, pairs below {index.threshold:.2f} are often missed", file=sys.stderr)
+    catalog = load_catalog(base)
+    sources = load_sources(catalog, base, base.resolve().parent / DEFAULT_CACHE, args.rebuild, args.jobs)
+    pairs, compared = similar_pairs(sources, args.threshold, args.bands)
+    # Suggested themes must not clash with sources/multisrc/<theme> or with each other
+    taken = {d.name for d in (base / "multisrc").iterdir() if d.is_dir()} if (base / "multisrc").is_dir() else set()
+    found = []
+    for members in clusters(pairs):
+        if len(members) >= args.min_size:
+            found.append(describe(members, sources, pairs, taken))
+            taken.add(found[-1]["theme"])
+    elapsed = time.perf_counter() - started
+
+    if args.json:
+        print(json.dumps({"threshold": args.threshold, "sources": len(sources), "clusters": found}, indent=2))
+    elif args.gradle:
+        for cluster in found:
+            print(f"// sources/multisrc/{cluster['theme']}/build.gradle.kts ({cluster['base'] or '?'})")
+            print(variant_list(cluster))
+            print()
+    else:
+        print_report(found, len(sources), compared, elapsed)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Text codemods for Kotlin sources, used by run-codemod.py.
+
+A rule set is a JSON file in scripts/codemods/ with a list of rules. Each
+rule has a regex `pattern` (multiline, so ^ and $ are line anchors) and
+either a `replace` template (\\1 back-references) or a `message` that flags
+the match for manual work. Patterns cannot use named groups or refer back to
+their own groups, as the group numbers shift once the rules are combined:
+
+    {"pattern": "^import org\\.jsoup\\.Jsoup$", "replace": "import com.fleeksoft.ksoup.Ksoup"}
+    {"pattern": "\\bSimpleDateFormat\\(", "message": "Contains SimpleDateFormat - needs manual migration"}
+
+All patterns of a set are compiled into one alternation, so a file is
+scanned once however many rules there are; at each position the earliest
+rule wins. Rewrites should not match their own output (anchor imports with
+^...$) so that running a set twice changes nothing.
+"""
+
+import hashlib
+import json
+import os
+import re
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+RULES_DIR = Path(__file__).resolve().parent / "codemods"
+# \1 or (?(1)...) after an even number of backslashes: group numbers shift in
+# the combined alternation
+NUMBERED_REF = re.compile(r"(?<!\\)(?:\\\\)*(?:\\[1-9]|\(\?\(\d)")
+REPLACED = "Replaced"
+PENDING = "Pending"
+ATTENTION = "NeedsAttention"
+
+class RuleError(ValueError):
+    pass
+
+@dataclass(frozen=True)
+class Rule:
+    pattern: str
+    replace: Optional[str] = None
+    message: Optional[str] = None
+
+class RuleSet:
+    """Compiled rules: rewrite(text) -> (new text, changes)."""
+
+    def __init__(self, name: str, rules: List[Rule], description: str = ""):
+        self.name = name
+        self.description = description
+        self.rules = rules
+        self._regexes = []
+        for i, rule in enumerate(rules):
+            if (rule.replace is None) == (rule.message is None):
+                raise RuleError(f"{name} rule {i + 1}: needs exactly one of replace or message")
+            if "(?P<" in rule.pattern:
+                raise RuleError(f"{name} rule {i + 1}: named groups are not allowed, use \\1")
+            if NUMBERED_REF.search(rule.pattern):
+                raise RuleError(f"{name} rule {i + 1}: back-references are only allowed in replace")
+            try:
+                regex = re.compile(rule.pattern, re.M)
+            except re.error as e:
+                raise RuleError(f"{name} rule {i + 1}: {e}") from e
+            if regex.fullmatch(""):
+                raise RuleError(f"{name} rule {i + 1}: pattern matches the empty string")
+            self._regexes.append(regex)
+        self._matcher = re.compile("|".join(f"(?P<r{i}>{rule.pattern})" for i, rule in enumerate(rules)), re.M)
+        encoded = json.dumps([asdict(rule) for rule in rules], sort_keys=True).encode()
+        self.fingerprint = hashlib.sha1(encoded).hexdigest()[:12]
+
+    def rewrite(self, text: str) -> Tuple[str, List[list]]:
+        """
+        Apply every rule in one pass. Changes are [change, status, count]
+        rows: "old -> new" for rewrites, the message for flagged matches.
+        """
+        out = []
+        pos = 0
+        changes = {}
+        for match in self._matcher.finditer(text):
+            i = int(match.lastgroup[1:])
+            rule = self.rules[i]
+            matched = match.group()
+            if rule.message is not None:
+                key = (rule.message, ATTENTION)
+            else:
+                # Re-match alone so \1 refers to the rule's own groups, and in
+                # place so lookarounds still see their context
+                replacement = self._regexes[i].match(text, match.start()).expand(rule.replace)
+                out.append(text[pos:match.start()])
+                out.append(replacement)
+                pos = match.end()
+                key = (f"{matched} -> {replacement}", REPLACED)
+            changes[key] = changes.get(key, 0) + 1
+        out.append(text[pos:])
+        return "".join(out), [[change, status, count] for (change, status), count in changes.items()]
+
+@lru_cache(maxsize=None)
+def load_rules(name: str) -> RuleSet:
+    """A rule set by name (scripts/codemods/<name>.json) or path."""
+    path = Path(name)
+    if not path.is_file():
+        path = RULES_DIR / f"{name}.json"
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        rules = [Rule(**rule) for rule in data["rules"]]
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        raise RuleError(f"cannot load rules {name}: {e}") from e
+    return RuleSet(path.stem, rules, data.get("description", ""))
+
+def rule_set_names() -> List[str]:
+    return sorted(path.stem for path in RULES_DIR.glob("*.json"))
+
+def scan_file(rules: str, content: str, path=None) -> List[list]:
+    """Changes `rules` would make to one file; picklable for process pools."""
+    return load_rules(rules).rewrite(content)[1]
+
+def _read(path: Path) -> Tuple[str, bytes]:
+    data = path.read_bytes()
+    bom = b"\xef\xbb\xbf" if data.startswith(b"\xef\xbb\xbf") else b""
+    return data[len(bom):].decode("utf-8"), bom
+
+def apply_file(rules: str, path) -> List[list]:
+    """Rewrite one file in place (atomically) and return its changes."""
+    path = Path(path)
+    text, bom = _read(path)
+    new_text, changes = load_rules(rules).rewrite(text)
+    if new_text != text:
+        tmp = path.with_name(path.name + ".codemod.tmp")
+        tmp.write_bytes(bom + new_text.encode("utf-8"))
+        os.replace(tmp, path)
+    return changes
+
+def source_of(relative: str) -> str:
+    """Source a file belongs to: its package folder, or the theme for shared multisrc code."""
+    parts = relative.split("/")
+    if len(parts) > 3 and parts[1] == "multisrc":
+        return parts[2] if parts[3] == "main" else parts[3]
+    return parts[2] if len(parts) > 2 else parts[-1]
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Detect CSS selectors for a new source from saved page snapshots, offline.
+
+Save the site's pages from the browser into one folder as listing.html,
+detail.html, chapter.html (and chapters.html if the chapter list lives on its
+own page), then:
+
+Usage:
+    python scripts/detect-selectors.py ./saved-pages           # Print selectors
+    python scripts/detect-selectors.py ./saved-pages --json    # As JSON
+    python scripts/add-source.py -t html --snapshots ./saved-pages  # Use them
+
+Every detected selector is checked against its page and listed with the number
+of elements it matches.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from html_dom import parse_file, select
+from selector_detect import DEFAULT_SELECTORS, detect_selectors, find_snapshots
+
+# Page each selector is evaluated on, for the match counts
+SELECTOR_PAGES = {
+    "explore": "listing",
+    "detail": "detail",
+    "chapter": "chapters",
+    "content": "chapter",
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="Detect selectors from saved page snapshots")
+    parser.add_argument("folder", type=Path, help="Folder with listing/detail/chapter .html files")
+    parser.add_argument("--json", action="store_true", help="Print the selectors as JSON")
+    args = parser.parse_args()
+
+    snapshots = find_snapshots(args.folder)
+    if not snapshots:
+        print(f"Error: no listing/detail/chapter .html files in {args.folder}")
+        sys.exit(1)
+
+    started = time.perf_counter()
+    selectors = detect_selectors(args.folder)
+    elapsed = time.perf_counter() - started
+
+    if args.json:
+        print(json.dumps(selectors, indent=2))
+        return
+
+    trees = {kind: parse_file(path) for kind, path in snapshots.items()}
+    trees.setdefault("chapters", trees.get("detail"))
+
+    print(f"\n=== Selectors from {args.folder} ({elapsed * 1000:.0f} ms) ===\n")
+    for key in DEFAULT_SELECTORS:
+        value = selectors[key]
+        if key not in selectors["detected"]:
+            print(f"  {key:<20} {str(value):<40} (placeholder)")
+            continue
+        tree = trees.get(SELECTOR_PAGES[key.split("_")[0]])
+        if isinstance(value, str) and not key.endswith("_att") and tree is not None and key not in (
+                "explore_name", "explore_cover", "explore_link", "chapter_name", "chapter_link"):
+            print(f"  {key:<20} {value:<40} {len(select(tree, value))} match(es)")
+        else:
+            print(f"  {key:<20} {str(value)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Match saved site snapshots against the multisrc themes (madara, mtlnovel,
+readnovelfull, readwn, skynovel) to find sites that need no new code.
+
+Each argument is a snapshot .html file or a folder of them (one site per
+folder). Signatures come from the theme code and are cached in .cache/.
+
+Usage:
+    python scripts/detect-theme.py ./saved-pages            # One site
+    python scripts/detect-theme.py candidates/*             # Many sites
+    python scripts/detect-theme.py candidates/* --json      # Machine-readable
+    python scripts/add-source.py -n Name -u url --snapshots ./saved-pages  # Create it
+"""
+
+import argparse
+import json
+import sys
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+from theme_fingerprint import MIN_MARGIN, MIN_SCORE, load_signatures
+
+def snapshot_pages(target: Path):
+    files = sorted(target.glob("*.htm*")) if target.is_dir() else [target]
+    return [path.read_text(encoding="utf-8", errors="replace") for path in files]
+
+def main():
+    parser = argparse.ArgumentParser(description="Match site snapshots to multisrc themes")
+    parser.add_argument("targets", nargs="+", type=Path, help="Snapshot files or folders")
+    parser.add_argument("--path", default="sources", help="Sources directory (default: sources)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--min-score", type=float, default=MIN_SCORE, help="Minimum evidence for a match")
+    parser.add_argument("--rebuild", action="store_true", help="Ignore the cached signatures")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    signatures = load_signatures(args.path, rebuild=args.rebuild)
+    loaded = time.perf_counter()
+
+    results = []
+    for target in args.targets:
+        if not target.exists():
+            print(f"Error: {target} not found", file=sys.stderr)
+            continue
+        pages = snapshot_pages(target)
+        ranked = signatures.rank(pages)
+        match = signatures.classify_ranked(ranked, threshold=args.min_score)
+        results.append({
+            "target": target.as_posix(),
+            "theme": match.theme if match else None,
+            "ranking": [asdict(m) for m in ranked],
+        })
+    elapsed = time.perf_counter() - loaded
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"\n=== {len(results)} site(s) against {len(signatures.themes)} themes "
+          f"(index {(loaded - started) * 1000:.0f} ms, classify {elapsed * 1000:.0f} ms) ===\n")
+    print(f"{'Target':<40} {'Theme':<15} {'Score':>6}  Runner-up")
+    print("-" * 80)
+    for result in results:
+        ranking = result["ranking"]
+        theme = result["theme"] or "-"
+        score = ranking[0]["score"] if ranking else 0.0
+        # A lone candidate has no runner-up
+        runner_up = f"{ranking[1]['theme']} {ranking[1]['score']:.1f}" if len(ranking) > 1 else "-"
+        print(f"{result['target'][:40]:<40} {theme:<15} {score:>6.1f}  {runner_up}")
+    print(f"\nA match needs a score of {args.min_score:g} and {MIN_MARGIN:g}x the runner-up.")
+
+if __name__ == "__main__":
+    main()
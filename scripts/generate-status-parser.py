@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Generate StatusParser's keyword automaton from scripts/keywords/status.json.
+
+Every language's ongoing/completed/hiatus/cancelled keywords are merged into
+one Aho-Corasick automaton (keyword_automaton.py), written to :common as flat
+string tables that StatusParser walks in a single pass per status string.
+The samples of every language become the StatusParserTest corpus, and are
+checked against the automaton before anything is written.
+
+Usage:
+    python scripts/generate-status-parser.py            # Regenerate the tables and the test
+    python scripts/generate-status-parser.py --check    # CI: exit 1 if the generated files are stale
+    python scripts/generate-status-parser.py --match "Status: Completed"
+
+Keywords match anywhere in the text unless listed under whole_word for their
+language. When keywords overlap, the longest one wins ("discontinued" hides
+"continue"); separate matches resolve by the priority list.
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+from keyword_automaton import AutomatonError, build, match
+
+DATA_FILE = Path(__file__).parent / "keywords" / "status.json"
+COMMON = Path("common") / "src"
+TABLES_FILE = COMMON / "commonMain" / "kotlin" / "ireader" / "common" / "utils" / "StatusKeywords.kt"
+TEST_FILE = COMMON / "jvmTest" / "kotlin" / "ireader" / "common" / "utils" / "StatusParserTest.kt"
+
+# Status name in the data file -> MangaInfo constant
+STATUS_CONSTANTS = {
+    "ongoing": "MangaInfo.ONGOING",
+    "completed": "MangaInfo.COMPLETED",
+    "hiatus": "MangaInfo.ON_HIATUS",
+    "cancelled": "MangaInfo.CANCELLED",
+    "unknown": "MangaInfo.UNKNOWN",
+}
+
+HEADER = "// Generated by scripts/generate-status-parser.py from scripts/keywords/status.json. Do not edit.\n"
+
+def load_keywords(path: Path):
+    """(priority, {keyword: (rank, whole_word)}, [(lang, text, status)], languages) from the data file."""
+    data = json.loads(path.read_text(encoding="utf-8"))
+    priority = data["priority"]
+    unknown = set(priority) - STATUS_CONSTANTS.keys()
+    if unknown:
+        raise AutomatonError(f"unknown status in priority: {', '.join(sorted(unknown))}")
+    keywords, owners, samples = {}, {}, []
+    for lang, table in sorted(data["languages"].items()):
+        whole_word = set(table.get("whole_word", []))
+        for status in priority:
+            for keyword in table.get(status, []):
+                if any(ord(char) > 0xFFFF for char in keyword):
+                    raise AutomatonError(f"{lang}: {keyword!r} is outside the Basic Multilingual Plane")
+                entry = (priority.index(status), keyword in whole_word)
+                if keyword in keywords and keywords[keyword] != entry:
+                    raise AutomatonError(f"{lang}: {keyword!r} conflicts with {owners[keyword]}")
+                keywords[keyword] = entry
+                owners[keyword] = lang
+        stray = whole_word - {keyword for status in priority for keyword in table.get(status, [])}
+        if stray:
+            raise AutomatonError(f"{lang}: whole_word lists unknown keywords: {', '.join(sorted(stray))}")
+        for text, status in table.get("samples", []):
+            if status not in STATUS_CONSTANTS:
+                raise AutomatonError(f"{lang}: unknown status {status!r} for sample {text!r}")
+            samples.append((lang, text, status))
+    return priority, keywords, samples, sorted(data["languages"])
+
+def check_samples(automaton, priority, samples) -> list:
+    problems = []
+    for lang, text, expected in samples:
+        rank = match(automaton, text)
+        actual = priority[rank] if rank is not None else "unknown"
+        if actual != expected:
+            problems.append(f"{lang}: {text!r} parses as {actual}, expected {expected}")
+    return problems
+
+def kotlin_string(values, indent: str = " " * 8, per_line: int = 16) -> str:
+    """Chars (or ints stored as chars) as a Kotlin string constant, \\u-escaped and split over lines."""
+    chars = [value if isinstance(value, str) else chr(value) for value in values]
+    if any(ord(char) > 0xFFFF for char in chars):
+        raise AutomatonError("table value does not fit in a char")
+    chunks = ["".join(f"\\u{ord(char):04x}" for char in chars[i:i + per_line]) for i in range(0, len(chars), per_line)]
+    if not chunks:
+        return '""'
+    return f" +\n{indent}".join(f'"{chunk}"' for chunk in chunks)
+
+def render_tables(automaton, priority, languages) -> str:
+    tables = [
+        ("EDGE_START", automaton.edge_start, "First edge of each state; the edges of s end at EDGE_START[s + 1]"),
+        ("EDGE_CHARS", automaton.edge_chars, "Edge labels, sorted per state"),
+        ("EDGE_TARGETS", automaton.edge_targets, "Edge targets"),
+        ("FAIL", automaton.fail, "Failure link of each state"),
+        ("OUTPUT", automaton.output, "Keyword recognized in each state + 1, 0 for none"),
+        ("DICT", automaton.dict_link, "Nearest state with an output on the failure chain, 0 for none"),
+        ("KEYWORD_LENGTH", [len(keyword) for keyword in automaton.keywords], "Length of each keyword"),
+        ("KEYWORD_RANK", automaton.ranks, "Index of each keyword's status in STATUSES"),
+        ("KEYWORD_WHOLE_WORD", [int(flag) for flag in automaton.whole_word],
+         "1 when a keyword only counts as a whole word"),
+    ]
+    lines = [HEADER, "package ireader.common.utils", "", "import ireader.core.source.model.MangaInfo", "",
+             "/**",
+             f" * Status keyword automaton: {len(automaton.keywords)} keywords in {len(languages)} languages "
+             f"({', '.join(languages)}),",
+             f" * {automaton.states} states. Numbers are stored as the chars of string constants.",
+             " */",
+             "internal object StatusKeywords {",
+             "",
+             "    /** MangaInfo status of each rank, best first */",
+             f"    val STATUSES = longArrayOf({', '.join(STATUS_CONSTANTS[status] for status in priority)})",
+             ""]
+    for name, values, comment in tables:
+        lines.append(f"    /** {comment} */")
+        lines.append(f"    const val {name} =\n        {kotlin_string(values)}")
+        lines.append("")
+    lines[-1] = "}"
+    return "\n".join(lines) + "\n"
+
+def kotlin_literal(text: str) -> str:
+    escaped = text.replace("\\", "\\\\").replace('"', '\\"').replace("$", "\\$")
+    return f'"{escaped}"'
+
+def render_test(samples) -> str:
+    cases = "\n".join(f"        {kotlin_literal(text)} to {STATUS_CONSTANTS[status]}, // {lang}"
+                       for lang, text, status in samples)
+    return f'''{HEADER}
+package ireader.common.utils
+
+import ireader.core.source.model.MangaInfo
+import kotlin.test.Test
+import kotlin.test.assertEquals
+import kotlin.time.measureTime
+
+class StatusParserTest {{
+
+    private val corpus = listOf(
+{cases}
+    )
+
+    @Test
+    fun corpus() {{
+        for ((text, status) in corpus) {{
+            assertEquals(status, StatusParser.parseStatus(text), text)
+        }}
+    }}
+
+    @Test
+    fun benchmark() {{
+        val rounds = 20_000
+        repeat(rounds / 10) {{ corpus.forEach {{ StatusParser.parseStatus(it.first) }} }}
+        var checksum = 0L
+        val elapsed = measureTime {{
+            repeat(rounds) {{ corpus.forEach {{ checksum += StatusParser.parseStatus(it.first) }} }}
+        }}
+        assertEquals(rounds * corpus.sumOf {{ it.second }}, checksum)
+        println("StatusParser: ${{elapsed.inWholeNanoseconds / (rounds.toLong() * corpus.size)}} ns per status string")
+    }}
+}}
+'''
+
+def write_atomic(path: Path, content: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(content, encoding="utf-8")
+    os.replace(tmp, path)
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate StatusParser's keyword automaton")
+    parser.add_argument("--data", type=Path, default=DATA_FILE, help="Keyword data file")
+    parser.add_argument("--root", type=Path, default=Path("."), help="Repository root")
+    parser.add_argument("--check", action="store_true", help="Only check that the generated files are current")
+    parser.add_argument("--match", metavar="TEXT", help="Print the status TEXT parses as and exit")
+    args = parser.parse_args()
+
+    try:
+        priority, keywords, samples, languages = load_keywords(args.data)
+        automaton = build(keywords)
+    except (OSError, ValueError, KeyError) as e:
+        sys.exit(f"Error: {args.data}: {e}")
+
+    if args.match is not None:
+        rank = match(automaton, args.match)
+        print(priority[rank] if rank is not None else "unknown")
+        return
+
+    problems = check_samples(automaton, priority, samples)
+    if problems:
+        print(f"{len(problems)} sample(s) do not parse as expected:", file=sys.stderr)
+        for problem in problems:
+            print(f"  {problem}", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        outputs = {
+            args.root / TABLES_FILE: render_tables(automaton, priority, languages),
+            args.root / TEST_FILE: render_test(samples),
+        }
+    except AutomatonError as e:
+        sys.exit(f"Error: {e}")
+
+    stale = [path for path, content in outputs.items()
+             if not path.exists() or path.read_text(encoding="utf-8") != content]
+    if args.check:
+        for path in stale:
+            print(f"Stale: {path}")
+        sys.exit(1 if stale else 0)
+    for path in stale:
+        write_atomic(path, outputs[path])
+    print(f"{len(keywords)} keywords, {automaton.states} states, {len(samples)} samples; "
+          f"{len(stale)} file(s) updated")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,495 @@
+"""
+Small HTML tree and CSS selector engine for the offline tooling.
+
+Pages are parsed incrementally with the stdlib html.parser (no regex scraping,
+no third-party dependency), so multi-MB chapter lists can be streamed from
+disk. Selectors follow Jsoup semantics closely enough to evaluate the
+selectors our sources declare:
+
+    tag  *  #id  .class  [attr] [attr=v] [attr~=regex] [attr|=v] [attr^=v] [attr$=v] [attr*=v]
+    :first-child :last-child :only-child :nth-child(an+b) :nth-last-child(an+b)
+    :first-of-type :last-of-type :nth-of-type(an+b) :empty :root
+    :not(sel) :has(sel) :contains(text) :containsOwn(text) :matches(re) :matchesOwn(re)
+    :eq(n) :lt(n) :gt(n)
+    descendant, >, +, ~ combinators and comma groups
+
+Like Jsoup, `select(element, query)` can match `element` itself.
+"""
+
+import re
+from functools import lru_cache
+from html.parser import HTMLParser
+
+VOID_ELEMENTS = frozenset({
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+    "meta", "param", "source", "track", "wbr",
+})
+RAW_TEXT_ELEMENTS = frozenset({"script", "style", "template", "noscript"})
+BLOCK_ELEMENTS = frozenset({
+    "address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt",
+    "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6",
+    "header", "hr", "li", "main", "nav", "ol", "p", "pre", "section", "table",
+    "tbody", "td", "tfoot", "th", "thead", "tr", "ul",
+})
+# Opening the key element implicitly closes any open element in the value set.
+IMPLIED_END = {
+    **{tag: {"p"} for tag in (
+        "address", "article", "aside", "blockquote", "div", "dl", "fieldset", "figure",
+        "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "main",
+        "nav", "ol", "pre", "section", "table", "ul",
+    )},
+    "p": {"p"},
+    "li": {"li"},
+    "dt": {"dt", "dd"},
+    "dd": {"dt", "dd"},
+    "tr": {"tr", "td", "th"},
+    "td": {"td", "th"},
+    "th": {"td", "th"},
+    "option": {"option"},
+}
+SCOPE_BARRIERS = frozenset({"ul", "ol", "table", "dl", "select", "div", "body", "html"})
+WHITESPACE = re.compile(r'\s+')
+
+class SelectorError(ValueError):
+    pass
+
+class Node:
+    __slots__ = ("tag", "attrs", "parent", "children", "parts", "data", "index", "_text")
+
+    def __init__(self, tag, attrs=None, parent=None):
+        self.tag = tag
+        self.attrs = attrs or {}
+        self.parent = parent
+        self.children = []
+        self.parts = []
+        self.data = ""
+        self.index = 0
+        self._text = None
+
+    def __repr__(self):
+        return f"<{self.tag}{''.join(f' {k}={v!r}' for k, v in self.attrs.items())}>"
+
+    @property
+    def id(self):
+        return self.attrs.get("id", "")
+
+    @property
+    def classes(self):
+        return self.attrs.get("class", "").split()
+
+    def attr(self, name: str) -> str:
+        return self.attrs.get(name, "")
+
+    def iter(self):
+        """This node and all descendant elements, in document order."""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
+    def ancestors(self):
+        node = self.parent
+        while node is not None:
+            yield node
+            node = node.parent
+
+    def own_text(self) -> str:
+        return WHITESPACE.sub(" ", "".join(p for p in self.parts if isinstance(p, str))).strip()
+
+    def text(self) -> str:
+        """Whitespace-normalised text of this element and its descendants."""
+        if self._text is None:
+            out = []
+            stack = [self]
+            while stack:
+                item = stack.pop()
+                if isinstance(item, str):
+                    out.append(item)
+                    continue
+                if item.tag in BLOCK_ELEMENTS:
+                    out.append(" ")
+                stack.extend(reversed(item.parts))
+            self._text = WHITESPACE.sub(" ", "".join(out)).strip()
+        return self._text
+
+    def select(self, query: str):
+        return select(self, query)
+
+    def select_one(self, query: str):
+        return select_one(self, query)
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Node("#root")
+        self.stack = [self.root]
+
+    def _open(self, tag, attrs):
+        closes = IMPLIED_END.get(tag)
+        if closes:
+            for i in range(len(self.stack) - 1, 0, -1):
+                open_tag = self.stack[i].tag
+                if open_tag in closes:
+                    del self.stack[i:]
+                    break
+                if open_tag in SCOPE_BARRIERS:
+                    break
+        parent = self.stack[-1]
+        node = Node(tag, {k: (v or "") for k, v in attrs}, parent)
+        node.index = len(parent.children)
+        parent.children.append(node)
+        parent.parts.append(node)
+        return node
+
+    def handle_starttag(self, tag, attrs):
+        node = self._open(tag, attrs)
+        if tag not in VOID_ELEMENTS:
+            self.stack.append(node)
+
+    def handle_startendtag(self, tag, attrs):
+        self._open(tag, attrs)
+
+    def handle_endtag(self, tag):
+        for i in range(len(self.stack) - 1, 0, -1):
+            if self.stack[i].tag == tag:
+                del self.stack[i:]
+                return
+
+    def handle_data(self, data):
+        node = self.stack[-1]
+        if node.tag in RAW_TEXT_ELEMENTS:
+            node.data += data
+        else:
+            node.parts.append(data)
+
+def parse_html(html: str) -> Node:
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+def parse_file(path, chunk_size: int = 1 << 16) -> Node:
+    """Parse a saved page, streaming it through the parser in chunks."""
+    builder = _TreeBuilder()
+    with open(path, encoding="utf-8", errors="replace") as fh:
+        while True:
+            chunk = fh.read(chunk_size)
+            if not chunk:
+                break
+            builder.feed(chunk)
+    builder.close()
+    return builder.root
+
+# ---------------------------------------------------------------------------
+# Selector compilation
+# ---------------------------------------------------------------------------
+
+class _Compound:
+    __slots__ = ("tag", "ids", "classes", "attrs", "pseudos")
+
+    def __init__(self):
+        self.tag = None
+        self.ids = []
+        self.classes = []
+        self.attrs = []
+        self.pseudos = []
+
+    def matches(self, node, context) -> bool:
+        if node.tag == "#root":
+            return False
+        if self.tag and self.tag != node.tag:
+            return False
+        if self.ids and any(node.attrs.get("id") != i for i in self.ids):
+            return False
+        if self.classes:
+            classes = node.attrs.get("class", "").split()
+            if any(c not in classes for c in self.classes):
+                return False
+        for name, op, value in self.attrs:
+            if not _match_attr(node, name, op, value):
+                return False
+        for pseudo, arg in self.pseudos:
+            if not pseudo(node, arg, context):
+                return False
+        return True
+
+class _Selector:
+    """A compiled comma-separated selector group."""
+
+    def __init__(self, chains):
+        self.chains = chains
+
+    def matches(self, node, context) -> bool:
+        return any(_match_chain(node, chain, 0, context) for chain in self.chains)
+
+def _match_attr(node, name, op, value):
+    if name.startswith("^"):
+        prefix = name[1:]
+        return any(key.startswith(prefix) for key in node.attrs)
+    if name not in node.attrs:
+        return False
+    actual = node.attrs[name]
+    if op is None:
+        return True
+    if op == "=":
+        return actual.lower() == value.lower()
+    if op == "~=":
+        return value.search(actual) is not None
+    if op == "|=":
+        return actual == value or actual.startswith(value + "-")
+    if op == "^=":
+        return actual.lower().startswith(value.lower())
+    if op == "$=":
+        return actual.lower().endswith(value.lower())
+    if op == "*=":
+        return value.lower() in actual.lower()
+    return False
+
+def _match_chain(node, chain, i, context):
+    compound, combinator = chain[i]
+    if not compound.matches(node, context):
+        return False
+    if i == len(chain) - 1:
+        return True
+    if combinator == " ":
+        for ancestor in node.ancestors():
+            if _match_chain(ancestor, chain, i + 1, context):
+                return True
+            if ancestor is context:
+                return False
+        return False
+    if combinator == ">":
+        parent = node.parent
+        return parent is not None and _match_chain(parent, chain, i + 1, context)
+    siblings = node.parent.children if node.parent is not None else []
+    if combinator == "+":
+        return node.index > 0 and _match_chain(siblings[node.index - 1], chain, i + 1, context)
+    if combinator == "~":
+        return any(_match_chain(s, chain, i + 1, context) for s in siblings[:node.index])
+    return False
+
+def _parse_nth(arg: str):
+    arg = arg.replace(" ", "").lower()
+    if arg == "odd":
+        return 2, 1
+    if arg == "even":
+        return 2, 0
+    match = re.fullmatch(r'([+-]?\d*)n([+-]\d+)?', arg)
+    if match:
+        a = match.group(1)
+        a = 1 if a in ("", "+") else -1 if a == "-" else int(a)
+        return a, int(match.group(2) or 0)
+    if re.fullmatch(r'[+-]?\d+', arg):
+        return 0, int(arg)
+    raise SelectorError(f"bad nth expression: {arg}")
+
+def _nth_matches(position: int, ab) -> bool:
+    a, b = ab
+    if a == 0:
+        return position == b
+    return (position - b) % a == 0 and (position - b) // a >= 0
+
+def _of_type(node):
+    siblings = node.parent.children if node.parent is not None else [node]
+    return [s for s in siblings if s.tag == node.tag]
+
+PSEUDOS = {
+    "first-child": (lambda n, a, c: n.index == 0, None),
+    "last-child": (lambda n, a, c: n.parent is not None and n.index == len(n.parent.children) - 1, None),
+    "only-child": (lambda n, a, c: n.parent is not None and len(n.parent.children) == 1, None),
+    "nth-child": (lambda n, a, c: _nth_matches(n.index + 1, a), _parse_nth),
+    "nth-last-child": (lambda n, a, c: _nth_matches(len(n.parent.children) - n.index, a), _parse_nth),
+    "first-of-type": (lambda n, a, c: _of_type(n)[0] is n, None),
+    "last-of-type": (lambda n, a, c: _of_type(n)[-1] is n, None),
+    "nth-of-type": (lambda n, a, c: _nth_matches(_of_type(n).index(n) + 1, a), _parse_nth),
+    "empty": (lambda n, a, c: not n.children and not n.text(), None),
+    "root": (lambda n, a, c: n.parent is not None and n.parent.tag == "#root", None),
+    "not": (lambda n, a, c: not a.matches(n, c), lambda s: compile_selector(s)),
+    "has": (lambda n, a, c: any(a.matches(d, n) for d in n.iter() if d is not n), lambda s: compile_selector(s)),
+    "contains": (lambda n, a, c: a in n.text().lower(), lambda s: s.strip("'\"").lower()),
+    "containsOwn": (lambda n, a, c: a in n.own_text().lower(), lambda s: s.strip("'\"").lower()),
+    "matches": (lambda n, a, c: a.search(n.text()) is not None, lambda s: re.compile(s)),
+    "matchesOwn": (lambda n, a, c: a.search(n.own_text()) is not None, lambda s: re.compile(s)),
+    "eq": (lambda n, a, c: n.index == a, int),
+    "lt": (lambda n, a, c: n.index < a, int),
+    "gt": (lambda n, a, c: n.index > a, int),
+}
+
+_IDENT = r'-?[_a-zA-Z\u00a0-\uffff][_a-zA-Z0-9\u00a0-\uffff-]*'
+_TOKEN = re.compile(
+    r'(?P<comma>\s*,\s*)'
+    r'|(?P<comb>\s*[>+~]\s*)'
+    r'|(?P<ws>\s+)'
+    r'|(?P<tag>' + _IDENT + r'|\*)'
+    r'|\#(?P<id>[_a-zA-Z0-9\u00a0-\uffff-]+)'
+    r'|\.(?P<cls>' + _IDENT + r')'
+    r'|\[\s*(?P<attr>\^?[_a-zA-Z0-9:-]+)\s*(?:(?P<op>[~|^$*]?=)\s*(?P<val>"[^"]*"|\'[^\']*\'|[^\]\s]*)\s*)?\]'
+    r'|:(?P<pseudo>[a-zA-Z-]+)'
+)
+
+_TOKEN_KINDS = ("comma", "comb", "ws", "tag", "id", "cls", "attr", "pseudo")
+
+def _read_paren(query: str, pos: int):
+    depth = 0
+    for i in range(pos, len(query)):
+        if query[i] == "(":
+            depth += 1
+        elif query[i] == ")":
+            depth -= 1
+            if depth == 0:
+                return query[pos + 1:i], i + 1
+    raise SelectorError(f"unbalanced parenthesis in {query!r}")
+
+@lru_cache(maxsize=4096)
+def compile_selector(query: str) -> _Selector:
+    query = query.strip()
+    if not query:
+        raise SelectorError("empty selector")
+    chains = []
+    chain = []
+    compound = _Compound()
+    has_compound = False
+    combinator = None
+    pos = 0
+    while pos < len(query):
+        match = _TOKEN.match(query, pos)
+        if not match:
+            raise SelectorError(f"cannot parse {query!r} at {pos}")
+        kind = next(k for k in _TOKEN_KINDS if match.group(k) is not None)
+        pos = match.end()
+        if kind in ("ws", "comb"):
+            if has_compound:
+                chain.append((compound, None))
+                compound, has_compound = _Compound(), False
+            combinator = match.group("comb").strip() if kind == "comb" else (combinator or " ")
+            continue
+        if kind == "comma":
+            if not has_compound:
+                raise SelectorError(f"empty group in {query!r}")
+            chain.append((compound, None))
+            chains.append(chain)
+            chain, compound, has_compound, combinator = [], _Compound(), False, None
+            continue
+
+        if combinator and chain:
+            last, _ = chain[-1]
+            chain[-1] = (last, combinator)
+        combinator = None
+        has_compound = True
+        if kind == "tag":
+            compound.tag = None if match.group("tag") == "*" else match.group("tag").lower()
+        elif kind == "id":
+            compound.ids.append(match.group("id"))
+        elif kind == "cls":
+            compound.classes.append(match.group("cls"))
+        elif kind == "attr":
+            value = match.group("val")
+            if value and value[0] in "\"'":
+                value = value[1:-1]
+            if match.group("op") == "~=":
+                # A regex in Jsoup, not a whitespace-separated word as in CSS
+                try:
+                    value = re.compile(value)
+                except re.error as e:
+                    raise SelectorError(f"bad regex in {query!r}: {e}") from e
+            compound.attrs.append((match.group("attr").lower(), match.group("op"), value))
+        elif kind == "pseudo":
+            name = match.group("pseudo")
+            if name not in PSEUDOS:
+                raise SelectorError(f"unsupported pseudo-class :{name}")
+            test, parse_arg = PSEUDOS[name]
+            arg = None
+            if parse_arg is not None:
+                if pos >= len(query) or query[pos] != "(":
+                    raise SelectorError(f":{name} needs an argument")
+                raw, pos = _read_paren(query, pos)
+                try:
+                    arg = parse_arg(raw)
+                except (ValueError, re.error) as e:
+                    raise SelectorError(str(e)) from e
+            compound.pseudos.append((test, arg))
+
+    if not has_compound:
+        raise SelectorError(f"dangling combinator in {query!r}")
+    chain.append((compound, None))
+    chains.append(chain)
+
+    # Chains are matched right to left; the combinator stored with each compound
+    # links it to the compound on its left.
+    compiled = []
+    for chain in chains:
+        reversed_chain = []
+        for i in range(len(chain) - 1, -1, -1):
+            compound, _ = chain[i]
+            link = chain[i - 1][1] if i > 0 else None
+            reversed_chain.append((compound, link))
+        compiled.append(reversed_chain)
+    return _Selector(compiled)
+
+class SelectorIndex:
+    """
+    Many compiled selectors tested against one tree. Each chain is filed under
+    the id, first class or tag of its rightmost compound, so a node is only
+    tested against the chains that could match it; chains naming an id, class
+    or tag the page lacks anywhere are dropped before the walk.
+    """
+
+    def __init__(self, selectors):
+        self._chains = []
+        for value, selector in selectors.items():
+            for chain in selector.chains:
+                compounds = [compound for compound, _ in chain]
+                needs = (frozenset(c.tag for c in compounds if c.tag),
+                         frozenset(i for c in compounds for i in c.ids),
+                         frozenset(k for c in compounds for k in c.classes))
+                self._chains.append((value, chain, needs))
+
+    def matching(self, root: Node) -> set:
+        """Keys of the selectors that match anything under `root` (inclusive)."""
+        tags, ids, classes = set(), set(), set()
+        for node in root.iter():
+            tags.add(node.tag)
+            if "id" in node.attrs:
+                ids.add(node.attrs["id"])
+            if "class" in node.attrs:
+                classes.update(node.attrs["class"].split())
+
+        by_id, by_class, by_tag, rest = {}, {}, {}, []
+        for value, chain, (need_tags, need_ids, need_classes) in self._chains:
+            if not (need_tags <= tags and need_ids <= ids and need_classes <= classes):
+                continue
+            compound = chain[0][0]
+            if compound.ids:
+                by_id.setdefault(compound.ids[0], []).append((value, chain))
+            elif compound.classes:
+                by_class.setdefault(compound.classes[0], []).append((value, chain))
+            elif compound.tag:
+                by_tag.setdefault(compound.tag, []).append((value, chain))
+            else:
+                rest.append((value, chain))
+
+        found = set()
+        for node in root.iter():
+            candidates = [by_tag.get(node.tag, ()), rest]
+            if "id" in node.attrs:
+                candidates.append(by_id.get(node.attrs["id"], ()))
+            if "class" in node.attrs:
+                candidates.extend(by_class.get(c, ()) for c in node.attrs["class"].split())
+            for entries in candidates:
+                for value, chain in entries:
+                    if value not in found and _match_chain(node, chain, 0, root):
+                        found.add(value)
+        return found
+
+def select(context: Node, query: str):
+    """All elements under `context` (inclusive) matching `query`, in document order."""
+    selector = compile_selector(query)
+    return [node for node in context.iter() if selector.matches(node, context)]
+
+def select_one(context: Node, query: str):
+    selector = compile_selector(query)
+    for node in context.iter():
+        if selector.matches(node, context):
+            return node
+    return None
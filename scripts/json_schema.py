@@ -0,0 +1,412 @@
+"""
+Kotlin models inferred from sample JSON API responses.
+
+Given a folder with a site's API responses saved as files:
+
+    listing.json    a page of the novel listing (or search)
+    detail.json     one novel
+    chapters.json   a novel's chapter list
+
+the samples are merged into shapes (objects, arrays, primitives), every
+object becomes an @Serializable data class, and the listing/detail/chapter
+fields are matched to MangaInfo and ChapterInfo by their key names. The
+result is a set of Kotlin fragments for the source/json-typed template, which
+decodes each response straight into those classes:
+
+    from json_schema import infer_models
+    fields = infer_models("./api-samples")   # {"json_models": "...", ...}
+
+Every property is nullable (or an empty list) with a default, so fields a
+sample happened to carry but the API later omits still decode.
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+SAMPLE_NAMES = {
+    "listing": ("listing", "latest", "popular", "novels", "search", "list"),
+    "detail": ("detail", "novel", "book", "info"),
+    "chapters": ("chapters", "chapter-list", "toc"),
+}
+
+# MangaInfo / ChapterInfo field -> candidate keys, normalized (lowercase, no _ or -), best first
+NOVEL_KEYS = {
+    "title": ("title", "name", "noveltitle", "novelname", "booktitle", "bookname"),
+    "slug": ("slug", "novelslug", "bookslug", "id", "novelid", "bookid", "url", "link", "href", "path"),
+    "cover": ("cover", "coverurl", "coverimage", "image", "imageurl", "thumbnail", "thumb", "poster", "img"),
+    "description": ("description", "summary", "synopsis", "desc", "intro", "introduction", "about"),
+    "author": ("author", "authors", "authorname", "writer", "creator"),
+    "genres": ("genres", "genre", "tags", "categories", "category"),
+    "status": ("status", "state", "novelstatus"),
+}
+CHAPTER_KEYS = {
+    "name": ("title", "name", "chaptertitle", "chaptername"),
+    "slug": ("slug", "chapterslug", "id", "chapterid", "number", "chapternumber", "num", "index", "no",
+             "url", "link", "href", "path"),
+    "number": ("number", "chapternumber", "num", "index", "no", "order", "sequence"),
+    "date": ("date", "createdat", "publishedat", "releasedat", "releasedate", "uploadedat", "updatedat",
+             "timestamp", "time"),
+}
+LIST_KEYS = ("data", "novels", "books", "results", "items", "list", "content", "records")
+CHAPTER_LIST_KEYS = ("chapters", "data", "items", "results", "list", "content", "records")
+DETAIL_KEYS = ("data", "novel", "book", "result", "item")
+HAS_MORE_KEYS = ("hasmore", "hasnext", "hasnextpage", "more", "nextpage")
+LAST_PAGE_KEYS = (("currentpage", "page"), ("lastpage", "totalpages", "pages", "pagecount"))
+CURSOR_KEYS = ("nextcursor", "cursor", "next", "after", "endcursor")
+NAME_KEYS = ("name", "title", "label", "value")
+URL_KEYS = {"url", "link", "href", "path"}
+
+KOTLIN_KEYWORDS = {
+    "as", "break", "class", "continue", "do", "else", "false", "for", "fun", "if", "in", "interface",
+    "is", "null", "object", "package", "return", "super", "this", "throw", "true", "try", "typealias",
+    "typeof", "val", "var", "when", "while",
+}
+PRIMITIVES = {"string": "String", "long": "Long", "double": "Double", "boolean": "Boolean"}
+
+EMPTY = '""'
+
+# Epoch values below this are seconds, not milliseconds
+EPOCH_MILLIS = 10 ** 11
+
+class SchemaError(ValueError):
+    pass
+
+def normalize(key: str) -> str:
+    return re.sub(r'[^a-z0-9]', '', key.lower())
+
+# -- shapes -----------------------------------------------------------------
+
+def infer(value) -> dict:
+    """Shape of one JSON value."""
+    if value is None:
+        return {"kind": "null"}
+    if isinstance(value, bool):
+        return {"kind": "boolean"}
+    if isinstance(value, int):
+        return {"kind": "long", "max": abs(value)}
+    if isinstance(value, float):
+        return {"kind": "double", "max": abs(value)}
+    if isinstance(value, str):
+        return {"kind": "string"}
+    if isinstance(value, list):
+        item = infer(value[0]) if value else {"kind": "null"}
+        for element in value[1:]:
+            item = merge(item, infer(element))
+        return {"kind": "array", "item": item, "size": len(value)}
+    return {"kind": "object", "fields": {key: infer(element) for key, element in value.items()}}
+
+def merge(a: dict, b: dict) -> dict:
+    """Shape covering both `a` and `b`; conflicting kinds become "any" (JsonElement)."""
+    if a["kind"] == "null":
+        return dict(b, nullable=True) if b["kind"] != "null" else a
+    if b["kind"] == "null":
+        return dict(a, nullable=True)
+    nullable = a.get("nullable", False) or b.get("nullable", False)
+    kinds = {a["kind"], b["kind"]}
+    if kinds == {"long", "double"}:
+        return {"kind": "double", "max": max(a["max"], b["max"]), "nullable": nullable}
+    if len(kinds) > 1:
+        return {"kind": "any", "nullable": nullable}
+    kind = a["kind"]
+    if kind == "object":
+        fields = dict(a["fields"])
+        for key, shape in b["fields"].items():
+            fields[key] = merge(fields[key], shape) if key in fields else shape
+        return {"kind": "object", "fields": fields, "nullable": nullable}
+    if kind == "array":
+        # An empty array says nothing about its items
+        item = b["item"] if not a["size"] else a["item"] if not b["size"] else merge(a["item"], b["item"])
+        return {"kind": "array", "item": item, "size": max(a["size"], b["size"]), "nullable": nullable}
+    if kind in ("long", "double"):
+        return {"kind": kind, "max": max(a["max"], b["max"]), "nullable": nullable}
+    return {"kind": kind, "nullable": nullable}
+
+def load_samples(folder) -> Dict[str, dict]:
+    """Merged shape of every sample in `folder`, keyed by listing/detail/chapters."""
+    folder = Path(folder)
+    shapes = {}
+    for path in sorted(folder.glob("*.json")):
+        stem = path.stem.lower()
+        role = next((role for role, names in SAMPLE_NAMES.items()
+                     if any(stem == name or stem.startswith(name + "-") or stem.startswith(name + "_")
+                            for name in names)), None)
+        if role is None:
+            continue
+        try:
+            value = json.loads(path.read_text(encoding="utf-8-sig"))
+        except ValueError as e:
+            raise SchemaError(f"{path}: not valid JSON ({e})") from None
+        shapes[role] = merge(shapes[role], infer(value)) if role in shapes else infer(value)
+    missing = [role for role in SAMPLE_NAMES if role not in shapes]
+    if missing:
+        raise SchemaError(f"{folder}: no sample for {', '.join(missing)} "
+                          f"(expected {', '.join(names[0] + '.json' for names in SAMPLE_NAMES.values())})")
+    return shapes
+
+# -- Kotlin classes ---------------------------------------------------------
+
+def property_name(key: str) -> str:
+    words = [word for word in re.split(r'[^A-Za-z0-9]+', re.sub(r'([a-z0-9])([A-Z])', r'\1_\2', key)) if word]
+    name = "".join(word.lower() if i == 0 else word.capitalize() for i, word in enumerate(words)) or "value"
+    if name[0].isdigit():
+        name = "_" + name
+    return f"`{name}`" if name in KOTLIN_KEYWORDS else name
+
+def class_name(hint: str) -> str:
+    words = [word for word in re.split(r'[^A-Za-z0-9]+', re.sub(r'([a-z0-9])([A-Z])', r'\1_\2', hint)) if word]
+    name = "".join(word.capitalize() for word in words) or "Item"
+    return ("Item" + name if name[0].isdigit() else name) + "Dto"
+
+def singular(key: str) -> str:
+    if key.endswith("ies"):
+        return key[:-3] + "y"
+    if key.endswith("s") and not key.endswith(("ss", "us")):
+        return key[:-1]
+    return key
+
+def _kotlin_string(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('$', '\\$')
+
+class Models:
+    """@Serializable data classes for a set of shapes, one per object shape."""
+
+    def __init__(self):
+        self.classes: Dict[str, str] = {}
+        self.properties: Dict[int, Dict[str, str]] = {}
+
+    def type_of(self, shape: dict, hint: str, names: Dict[int, str]) -> str:
+        kind = shape["kind"]
+        if kind in PRIMITIVES:
+            return PRIMITIVES[kind]
+        if kind == "array":
+            item = shape["item"]
+            if item["kind"] == "null":
+                return "List<JsonElement>"
+            nullable = "?" if item.get("nullable") else ""
+            return f"List<{self.type_of(item, singular(hint), names)}{nullable}>"
+        if kind == "object":
+            return self.declare(shape, names.get(id(shape)) or class_name(hint), names)
+        return "JsonElement"
+
+    def declare(self, shape: dict, name: str, names: Dict[int, str]) -> str:
+        lines, props, used = [], {}, set()
+        for key, field in shape["fields"].items():
+            prop = property_name(key)
+            while prop in used:
+                prop = prop.rstrip("`") + "_" + ("`" if prop.startswith("`") else "")
+            used.add(prop)
+            props[key] = prop
+            kotlin_type = self.type_of(field, key, names)
+            default = "emptyList()" if field["kind"] == "array" else "null"
+            optional = "" if field["kind"] == "array" else "?"
+            serial = "" if prop.strip("`") == key else f'@SerialName("{_kotlin_string(key)}") '
+            lines.append(f"    {serial}val {prop}: {kotlin_type}{optional} = {default},")
+        self.properties[id(shape)] = props
+        body = "\n".join(lines)
+        base, n = name, 2
+        while name in self.classes:
+            name, n = f"{base}{n}", n + 1
+        self.classes[name] = (f"@Serializable\ninternal data class {name}(\n{body}\n)" if body
+                              else f"@Serializable\ninternal class {name}")
+        return name
+
+    def access(self, var: str, shape: dict, key: str) -> str:
+        return f"{var}.{self.properties[id(shape)][key]}"
+
+    def render(self) -> str:
+        return "\n\n".join(self.classes.values())
+
+# -- field mapping ----------------------------------------------------------
+
+def find_key(shape: dict, candidates) -> Optional[str]:
+    """The key of object `shape` that best matches `candidates`."""
+    if shape.get("kind") != "object":
+        return None
+    keys = {normalize(key): key for key in shape["fields"]}
+    return next((keys[candidate] for candidate in candidates if candidate in keys), None)
+
+def find_items(shape: dict, candidates) -> Optional[Tuple[Optional[str], dict]]:
+    """(key, array shape) of the array of objects holding the items, None key for a top-level array."""
+    if shape["kind"] == "array" and shape["item"]["kind"] == "object":
+        return None, shape
+    if shape["kind"] != "object":
+        return None
+    arrays = {key: field for key, field in shape["fields"].items()
+              if field["kind"] == "array" and field["item"]["kind"] == "object"}
+    if not arrays:
+        return None
+    keys = {normalize(key): key for key in arrays}
+    key = next((keys[c] for c in candidates if c in keys), None) or max(arrays, key=lambda k: arrays[k]["size"])
+    return key, arrays[key]
+
+def text_expr(models: Models, var: str, shape: dict, key: str) -> Optional[str]:
+    """Nullable String expression for `var.key`, or None when the field holds no text."""
+    field = shape["fields"][key]
+    expr = models.access(var, shape, key)
+    kind = field["kind"]
+    if kind == "string":
+        return expr
+    if kind in ("long", "double"):
+        return f"{expr}?.toString()"
+    if kind == "object":
+        inner = find_key(field, NAME_KEYS)
+        if inner and field["fields"][inner]["kind"] == "string":
+            return f"{expr}?.{models.properties[id(field)][inner]}"
+    if kind == "array":
+        names = list_expr(models, var, shape, key)
+        if names:
+            return f"{names}.takeIf {{ it.isNotEmpty() }}?.joinToString()"
+    return None
+
+def list_expr(models: Models, var: str, shape: dict, key: str) -> Optional[str]:
+    """List<String> expression for `var.key`, or None when the field holds no names."""
+    field = shape["fields"][key]
+    expr = models.access(var, shape, key)
+    if field["kind"] == "string":
+        return f'{expr}?.split(",")?.map {{ it.trim() }}?.filter {{ it.isNotEmpty() }}.orEmpty()'
+    if field["kind"] != "array":
+        return None
+    item = field["item"]
+    if item["kind"] == "string":
+        return f"{expr}.filterNotNull()" if item.get("nullable") else expr
+    if item["kind"] == "object":
+        inner = find_key(item, NAME_KEYS)
+        if inner and item["fields"][inner]["kind"] == "string":
+            safe = "?." if item.get("nullable") else "."
+            return f"{expr}.mapNotNull {{ it{safe}{models.properties[id(item)][inner]} }}"
+    return None
+
+def slug_expr(models: Models, var: str, shape: dict, candidates) -> Optional[str]:
+    key = find_key(shape, candidates)
+    if key is None:
+        return None
+    if shape["fields"][key]["kind"] == "long":
+        return models.access(var, shape, key)
+    expr = text_expr(models, var, shape, key)
+    if expr and normalize(key) in URL_KEYS:
+        expr = f'{expr}?.trimEnd(\'/\')?.substringAfterLast("/")'
+    return expr
+
+def novel_fields(models: Models, var: str, shape: dict, detail: bool) -> List[str]:
+    """MangaInfo(...) arguments, or manga.copy(...) arguments when `detail`."""
+    lines = []
+    fallback = {"title": "manga.title", "cover": "manga.cover"} if detail else {}
+    for field in ("title", "cover", "description", "author"):
+        key = find_key(shape, NOVEL_KEYS[field])
+        expr = key and text_expr(models, var, shape, key)
+        if expr:
+            lines.append(f"{field} = {expr} ?: {fallback.get(field, EMPTY)},")
+    key = find_key(shape, NOVEL_KEYS["genres"])
+    expr = key and list_expr(models, var, shape, key)
+    if expr:
+        lines.append(f"genres = {expr},")
+    key = find_key(shape, NOVEL_KEYS["status"])
+    expr = key and shape["fields"][key]["kind"] == "string" and text_expr(models, var, shape, key)
+    if expr:
+        lines.append(f'status = StatusParser.parseStatus({expr} ?: ""),')
+    return lines
+
+def chapter_fields(models: Models, var: str, shape: dict) -> List[str]:
+    lines = []
+    key = find_key(shape, CHAPTER_KEYS["name"])
+    number_key = find_key(shape, CHAPTER_KEYS["number"])
+    name = key and text_expr(models, var, shape, key)
+    if name:
+        lines.append(f'name = {name} ?: "",')
+    elif number_key:
+        lines.append(f'name = "Chapter ${{{models.access(var, shape, number_key)}}}",')
+    else:
+        lines.append('name = "",')
+    slug = slug_expr(models, var, shape, CHAPTER_KEYS["slug"]) or "null"
+    lines.append(f'key = "$baseUrl/novel/$slug/chapter/${{{slug}}}",')
+    if number_key and shape["fields"][number_key]["kind"] in ("long", "double"):
+        lines.append(f"number = {models.access(var, shape, number_key)}?.toFloat() ?: -1f,")
+    key = find_key(shape, CHAPTER_KEYS["date"])
+    if key:
+        field, expr = shape["fields"][key], models.access(var, shape, key)
+        if field["kind"] == "long":
+            scale = " * 1000" if field["max"] < EPOCH_MILLIS else ""
+            lines.append(f"dateUpload = {expr}?.let {{ it{scale} }} ?: 0L,")
+        elif field["kind"] == "string":
+            lines.append(f'dateUpload = DateParser.parseRelativeOrAbsoluteDate({expr} ?: ""),')
+    return lines
+
+def has_more_expr(models: Models, var: str, shape: dict, items: str) -> str:
+    """Boolean expression for "another listing page exists"."""
+    key = find_key(shape, HAS_MORE_KEYS)
+    if key and shape["fields"][key]["kind"] == "boolean":
+        return f"{models.access(var, shape, key)} ?: false"
+    current, last = (find_key(shape, keys) for keys in LAST_PAGE_KEYS)
+    if current and last and all(shape["fields"][k]["kind"] == "long" for k in (current, last)):
+        return f"({models.access(var, shape, current)} ?: 0) < ({models.access(var, shape, last)} ?: 0)"
+    return f"{items}.isNotEmpty()"
+
+def items_expr(models: Models, var: str, shape: dict, key: Optional[str], array: dict) -> str:
+    expr = models.access(var, shape, key) if key else var
+    return f"{expr}.filterNotNull()" if array["item"].get("nullable") else expr
+
+def _indent(lines: List[str], spaces: int) -> str:
+    return "\n".join(" " * spaces + line for line in lines)
+
+def infer_models(folder) -> Dict[str, str]:
+    """Template fields for source/json-typed from the samples in `folder`."""
+    shapes = load_samples(folder)
+    models = Models()
+
+    listing = find_items(shapes["listing"], LIST_KEYS)
+    if listing is None:
+        raise SchemaError("listing sample has no array of novels")
+    list_key, list_array = listing
+    novel = list_array["item"]
+    chapters = find_items(shapes["chapters"], CHAPTER_LIST_KEYS)
+    if chapters is None:
+        raise SchemaError("chapters sample has no array of chapters")
+    chapter_key, chapter_array = chapters
+    chapter = chapter_array["item"]
+    detail_root = shapes["detail"]
+    if detail_root["kind"] != "object":
+        raise SchemaError("detail sample is not an object")
+    detail_key = None
+    if find_key(detail_root, NOVEL_KEYS["title"]) is None:
+        detail_key = find_key(detail_root, DETAIL_KEYS)
+        if detail_key is None or detail_root["fields"][detail_key]["kind"] != "object":
+            raise SchemaError("detail sample has no novel title")
+    detail = detail_root["fields"][detail_key] if detail_key else detail_root
+
+    names = {id(novel): "NovelDto", id(chapter): "ChapterDto", id(detail): "NovelDetailDto"}
+    if list_key is not None:
+        names[id(shapes["listing"])] = "NovelListResponse"
+    if chapter_key is not None:
+        names[id(shapes["chapters"])] = "ChapterListResponse"
+    if detail_key is not None:
+        names[id(detail_root)] = "NovelDetailResponse"
+    list_type = models.type_of(shapes["listing"], "NovelListResponse", names)
+    detail_type = models.type_of(detail_root, "NovelDetailResponse", names)
+    chapters_type = models.type_of(shapes["chapters"], "ChapterListResponse", names)
+
+    list_items = items_expr(models, "response", shapes["listing"], list_key, list_array)
+    chapter_items = items_expr(models, "page", shapes["chapters"], chapter_key, chapter_array)
+    novel_slug = slug_expr(models, "item", novel, NOVEL_KEYS["slug"]) or "null"
+    manga = ([f'key = "$baseUrl/novel/${{{novel_slug}}}",']
+             + novel_fields(models, "item", novel, detail=False))
+    cursor_key = find_key(shapes["chapters"], CURSOR_KEYS) if chapter_key else None
+    cursor = shapes["chapters"]["fields"][cursor_key]["kind"] if cursor_key else None
+    next_cursor = {"string": "", "long": "?.toString()"}.get(cursor)
+    return {
+        "json_models": models.render(),
+        "list_type": list_type,
+        "list_items": list_items,
+        "list_has_more": has_more_expr(models, "response", shapes["listing"], "mangaList") if list_key else "mangaList.isNotEmpty()",
+        "manga_fields": _indent(manga, 20),
+        "detail_type": detail_type,
+        "detail_root": (f"{models.access('response', detail_root, detail_key)} ?: return manga"
+                        if detail_key else "response"),
+        "detail_fields": _indent(novel_fields(models, "novel", detail, detail=True), 16),
+        "chapters_type": chapters_type,
+        "chapter_items": chapter_items,
+        "chapter_fields": _indent(chapter_fields(models, "ch", chapter), 16),
+        "chapters_next": (models.access("page", shapes["chapters"], cursor_key) + next_cursor
+                          if next_cursor is not None else "null"),
+    }
@@ -0,0 +1,142 @@
+"""
+Aho-Corasick keyword automaton shared by generate-status-parser.py and its
+generated Kotlin matcher.
+
+build() turns {keyword: (rank, whole_word)} into flat tables (goto edges
+sorted by char, failure links, output and dictionary links) that the Kotlin
+side walks as-is. match() is the reference implementation of that walk: one
+pass over the normalized text, longest keyword per end position, keywords
+nested inside a longer match dropped, best (lowest) rank wins.
+
+    automaton = build({"ongoing": (0, False), "end": (1, True)})
+    match(automaton, "Status: Ongoing")   # -> 0
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+class AutomatonError(ValueError):
+    pass
+
+@dataclass
+class Automaton:
+    keywords: List[str] = field(default_factory=list)
+    ranks: List[int] = field(default_factory=list)
+    whole_word: List[bool] = field(default_factory=list)
+    # Per state; edges of state s are edge_chars/edge_targets[edge_start[s]:edge_start[s + 1]]
+    edge_start: List[int] = field(default_factory=list)
+    edge_chars: List[str] = field(default_factory=list)
+    edge_targets: List[int] = field(default_factory=list)
+    fail: List[int] = field(default_factory=list)
+    output: List[int] = field(default_factory=list)  # keyword index + 1, 0 for none
+    dict_link: List[int] = field(default_factory=list)  # nearest state with an output on the failure chain
+
+    @property
+    def states(self) -> int:
+        return len(self.fail)
+
+def lower_char(char: str) -> str:
+    """Char.lowercaseChar(): one char in, one char out (İ -> i)."""
+    lowered = char.lower()
+    return lowered if len(lowered) == 1 else lowered[0]
+
+def normalize(text: str) -> str:
+    """Lowercase per char and collapse whitespace runs to one space, as the Kotlin matcher does."""
+    out = []
+    for char in text:
+        char = " " if char.isspace() else lower_char(char)
+        if char == " " and (not out or out[-1] == " "):
+            continue
+        out.append(char)
+    return "".join(out)
+
+def build(keywords: Dict[str, Tuple[int, bool]]) -> Automaton:
+    automaton = Automaton()
+    children: List[Dict[str, int]] = [{}]
+    output = [0]
+    for keyword, (rank, whole_word) in sorted(keywords.items()):
+        keyword = normalize(keyword).strip()
+        if not keyword:
+            raise AutomatonError("empty keyword")
+        state = 0
+        for char in keyword:
+            if char not in children[state]:
+                children[state][char] = len(children)
+                children.append({})
+                output.append(0)
+            state = children[state][char]
+        if output[state]:
+            raise AutomatonError(f"duplicate keyword after normalization: {keyword!r}")
+        automaton.keywords.append(keyword)
+        automaton.ranks.append(rank)
+        automaton.whole_word.append(whole_word)
+        output[state] = len(automaton.keywords)
+
+    # Breadth-first, so every failure target is finished before it is used
+    fail = [0] * len(children)
+    dict_link = [0] * len(children)
+    queue = list(children[0].values())
+    for state in queue:
+        for char, child in children[state].items():
+            queue.append(child)
+            target = fail[state]
+            while target and char not in children[target]:
+                target = fail[target]
+            # Children of the root fail to the root
+            fail[child] = children[target].get(char, 0) if state else 0
+            link = fail[child]
+            dict_link[child] = link if output[link] else dict_link[link]
+
+    for state, edges in enumerate(children):
+        automaton.edge_start.append(len(automaton.edge_chars))
+        for char in sorted(edges):
+            automaton.edge_chars.append(char)
+            automaton.edge_targets.append(edges[char])
+    automaton.edge_start.append(len(automaton.edge_chars))
+    automaton.fail = fail
+    automaton.output = output
+    automaton.dict_link = dict_link
+    return automaton
+
+def step(automaton: Automaton, state: int, char: str) -> int:
+    while True:
+        lo, hi = automaton.edge_start[state], automaton.edge_start[state + 1]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if automaton.edge_chars[mid] < char:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < automaton.edge_start[state + 1] and automaton.edge_chars[lo] == char:
+            return automaton.edge_targets[lo]
+        if state == 0:
+            return 0
+        state = automaton.fail[state]
+
+def is_word_char(char: str) -> bool:
+    return char.isalnum()
+
+def matches(automaton: Automaton, text: str) -> List[Tuple[int, int, int]]:
+    """Non-nested (start, end, keyword) matches in normalized `text`."""
+    found: List[Tuple[int, int, int]] = []
+    state = 0
+    for index, char in enumerate(text):
+        state = step(automaton, state, char)
+        candidate = state if automaton.output[state] else automaton.dict_link[state]
+        while candidate:
+            keyword = automaton.output[candidate] - 1
+            start = index + 1 - len(automaton.keywords[keyword])
+            if not automaton.whole_word[keyword] or (
+                    (start == 0 or not is_word_char(text[start - 1]))
+                    and (index + 1 == len(text) or not is_word_char(text[index + 1]))):
+                while found and found[-1][0] >= start:
+                    found.pop()
+                found.append((start, index + 1, keyword))
+                break
+            candidate = automaton.dict_link[candidate]
+    return found
+
+def match(automaton: Automaton, text: str) -> Optional[int]:
+    """Best rank among the keywords in `text`, or None."""
+    ranks = [automaton.ranks[keyword] for _, _, keyword in matches(automaton, normalize(text))]
+    return min(ranks) if ranks else None
@@ -0,0 +1,242 @@
+"""
+Lightweight structural scan of Kotlin source files, used by lint-hotpaths.py.
+
+Not a parser: comments and string contents are blanked out (keeping offsets
+and line numbers), then functions, loops, iteration lambdas and async blocks
+are found by brace matching. Within each function the scan records the
+events a cost model needs, each with the stack of scopes it sits in:
+
+    request     client.get/post/submitForm(...)
+    select      <receiver>.select("...")/selectFirst("...")
+    call        a call to any function (resolved against the source later)
+    reversed    .reversed()
+    io          withContext(Dispatchers.IO)
+
+Scopes are {"kind": "pages" | "items" | "async", "line": n}; a loop is
+"pages" when its header or receiver looks like page arithmetic (page,
+1..n, until, downTo) or a while loop steps a page/offset/cursor variable,
+otherwise "items".
+"""
+
+import bisect
+import re
+from typing import List, Optional
+
+FUN = re.compile(r'\bfun\s+(?:<[^>]*>\s*)?(?:[\w.]+\.)?(\w+)\s*\(')
+LOOP = re.compile(r'\b(for|while)\s*\(')
+DO_LOOP = re.compile(r'\bdo\s*\{')
+ITERATION = re.compile(
+    r'\.\s*(?:map|mapNotNull|mapIndexed|mapIndexedNotNull|flatMap|forEach|forEachIndexed|filter|filterNot|'
+    r'associate|associateBy|associateWith|onEach|sumOf|groupBy|sortedBy|sortedByDescending|distinctBy)'
+    r'\s*(?:\([^()]*\)\s*)?\{'
+)
+REPEAT = re.compile(r'\brepeat\s*\(')
+ASYNC = re.compile(r'\b(?:async|launch)\s*(?:\([^()]*\)\s*)?\{')
+PAGE_HINT = re.compile(r'page|\d\s*\.\.|\.\.\s*\w|\buntil\b|\bdownTo\b', re.I)
+PAGE_STEP = re.compile(r'\b\w*(?:page|offset|cursor|skip)\w*\s*(?:\+\+|\+=)|\+\+\s*\w*page', re.I)
+REQUEST = re.compile(r'\b(?:client|httpClient)\s*\.\s*(?:get|post|submitForm|request|prepareGet)\s*[({]')
+SELECT = re.compile(r'(\w+)?(\)?)\s*\.\s*(select|selectFirst)\s*\(\s*"')
+CALL = re.compile(r'(?<![\w.])(\w+)\s*\(')
+REVERSED = re.compile(r'\.\s*reversed\s*\(\s*\)')
+IO = re.compile(r'\bwithContext\s*\(\s*Dispatchers\s*\.\s*IO\b')
+KEYWORDS = {"if", "for", "while", "when", "catch", "fun", "return", "throw", "super", "this", "listOf",
+            "mutableListOf", "setOf", "mapOf", "arrayOf", "println", "require", "check", "run", "let",
+            "apply", "also", "with", "repeat", "async", "launch", "withContext", "runCatching"}
+
+def mask(text: str) -> str:
+    """`text` with comments and string contents replaced by spaces (newlines and quotes kept)."""
+    out = list(text)
+    i, n = 0, len(text)
+
+    def blank(start, end):
+        for k in range(start, end):
+            if out[k] != "\n":
+                out[k] = " "
+
+    while i < n:
+        if text.startswith("//", i):
+            end = text.find("\n", i)
+            end = n if end == -1 else end
+            blank(i, end)
+            i = end
+        elif text.startswith("/*", i):
+            depth, j = 1, i + 2
+            while j < n and depth:
+                if text.startswith("/*", j):
+                    depth, j = depth + 1, j + 2
+                elif text.startswith("*/", j):
+                    depth, j = depth - 1, j + 2
+                else:
+                    j += 1
+            blank(i, j)
+            i = j
+        elif text.startswith('"""', i):
+            end = text.find('"""', i + 3)
+            end = n if end == -1 else end
+            blank(i + 3, end)
+            i = end + 3
+        elif text[i] == '"':
+            j = i + 1
+            while j < n and text[j] != '"' and text[j] != "\n":
+                j += 2 if text[j] == "\\" else 1
+            blank(i + 1, min(j, n))
+            i = j + 1
+        elif text[i] == "'":
+            j = i + 1
+            while j < n and text[j] != "'" and text[j] != "\n":
+                j += 2 if text[j] == "\\" else 1
+            blank(i + 1, min(j, n))
+            i = j + 1
+        else:
+            i += 1
+    return "".join(out)
+
+def matching(code: str, open_index: int) -> Optional[int]:
+    """Index of the bracket closing the one at `open_index` in masked code."""
+    depth = 0
+    for i in range(open_index, len(code)):
+        ch = code[i]
+        if ch in "([{":
+            depth += 1
+        elif ch in ")]}":
+            depth -= 1
+            if depth == 0:
+                return i
+    return None
+
+def _string_at(text: str, quote: int) -> str:
+    match = re.compile(r'"((?:[^"\\\n]|\\.)*)"').match(text, quote)
+    return match.group(1) if match else ""
+
+def _expression_end(code: str, start: int) -> int:
+    """End of an expression body starting at `start` (after `=`)."""
+    depth = 0
+    i = start
+    while i < len(code):
+        ch = code[i]
+        if ch in "([{":
+            depth += 1
+        elif ch in ")]}":
+            depth -= 1
+            if depth < 0:
+                return i
+        elif ch == "\n" and depth == 0 and code[start:i].strip():
+            rest = code[i:].lstrip()
+            if not rest.startswith((".", "?.", "?:", "+", "&&", "||")):
+                return i
+        i += 1
+    return i
+
+def functions(code: str) -> List[dict]:
+    """[{"name", "name_at", "start", "end"}] for every function with a body."""
+    found = []
+    for match in FUN.finditer(code):
+        params_end = matching(code, match.end() - 1)
+        if params_end is None:
+            continue
+        # Skip the return type up to the body: `{`, `=`, or nothing (abstract)
+        i, depth = params_end + 1, 0
+        while i < len(code):
+            ch = code[i]
+            if ch in "(<":
+                depth += 1
+            elif ch in ")>":
+                depth -= 1
+            elif depth == 0 and ch in "{=\n":
+                break
+            i += 1
+        if i < len(code) and code[i] == "\n":
+            rest = code[i:].lstrip()
+            if not rest.startswith(("{", "=")):
+                continue
+            i = len(code) - len(rest)
+        if i >= len(code):
+            continue
+        end = matching(code, i) if code[i] == "{" else _expression_end(code, i + 1)
+        if end is not None:
+            found.append({"name": match.group(1), "name_at": match.start(1), "start": match.start(), "end": end})
+    return found
+
+def scopes(code: str) -> List[dict]:
+    """Loops, iteration lambdas and async blocks as {"kind", "start", "end"}."""
+    found = []
+    for match in LOOP.finditer(code):
+        header_end = matching(code, match.end() - 1)
+        if header_end is None:
+            continue
+        body = re.compile(r'\s*\{').match(code, header_end + 1)
+        if not body:
+            continue
+        end = matching(code, body.end() - 1)
+        if end is None:
+            continue
+        header = code[match.end():header_end]
+        paged = PAGE_HINT.search(header) or match.group(1) == "while" and PAGE_STEP.search(code, body.end(), end)
+        found.append({"kind": "pages" if paged else "items", "start": match.start(), "end": end})
+    for match in DO_LOOP.finditer(code):
+        end = matching(code, match.end() - 1)
+        if end is not None:
+            tail = code[end:end + 200].split("\n", 1)[0]
+            paged = PAGE_HINT.search(tail) or PAGE_STEP.search(code, match.end(), end)
+            found.append({"kind": "pages" if paged else "items", "start": match.start(), "end": end})
+    for match in ITERATION.finditer(code):
+        end = matching(code, match.end() - 1)
+        if end is None:
+            continue
+        line_start = code.rfind("\n", 0, match.start()) + 1
+        receiver = code[line_start:match.start()]
+        found.append({"kind": "pages" if PAGE_HINT.search(receiver) else "items", "start": match.start(), "end": end})
+    for match in REPEAT.finditer(code):
+        args_end = matching(code, match.end() - 1)
+        body = re.compile(r'\s*\{').match(code, args_end + 1) if args_end else None
+        end = matching(code, body.end() - 1) if body else None
+        if end is not None:
+            found.append({"kind": "items", "start": match.start(), "end": end})
+    for match in ASYNC.finditer(code):
+        end = matching(code, match.end() - 1)
+        if end is not None:
+            found.append({"kind": "async", "start": match.start(), "end": end})
+    return found
+
+def scan(content: str, path=None) -> dict:
+    """{"functions": [{"name", "line", "events": [...]}]} for one Kotlin file."""
+    code = mask(content)
+    line_starts = [0] + [i + 1 for i, ch in enumerate(code) if ch == "\n"]
+
+    def line(offset):
+        return bisect.bisect_right(line_starts, offset)
+
+    funs = functions(code)
+    declarations = {fun["name_at"] for fun in funs}
+    spans = scopes(code)
+    events = []
+    for match in REQUEST.finditer(code):
+        events.append((match.start(), {"kind": "request"}))
+    for match in SELECT.finditer(code):
+        receiver = match.group(1) if match.group(1) and not match.group(2) else "<expr>"
+        events.append((match.start(), {"kind": "select", "receiver": receiver,
+                                       "selector": _string_at(content, match.end() - 1)}))
+    for match in CALL.finditer(code):
+        name = match.group(1)
+        if name not in KEYWORDS and not name[0].isupper():
+            events.append((match.start(), {"kind": "call", "name": name}))
+    for match in REVERSED.finditer(code):
+        events.append((match.start(), {"kind": "reversed"}))
+    for match in IO.finditer(code):
+        events.append((match.start(), {"kind": "io"}))
+
+    result = []
+    for fun in funs:
+        inner = [f for f in funs if f is not fun and fun["start"] < f["start"] and f["end"] <= fun["end"]]
+        own = []
+        for offset, event in sorted(events, key=lambda e: e[0]):
+            if not fun["start"] < offset <= fun["end"] or any(f["start"] <= offset <= f["end"] for f in inner):
+                continue
+            if offset in declarations:
+                continue
+            enclosing = sorted((s for s in spans if fun["start"] < s["start"] <= offset <= s["end"]),
+                               key=lambda s: s["start"])
+            own.append(dict(event, line=line(offset),
+                            scopes=[{"kind": s["kind"], "line": line(s["start"])} for s in enclosing]))
+        result.append({"name": fun["name"], "line": line(fun["start"]), "events": own})
+    return {"functions": result}
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Hot-path linter: find slow scraping patterns in the Kotlin sources and rank
+sources by the requests and DOM traversals a reader pays per novel.
+
+Rules:
+    HP001 repeated-select      the same selector run twice on one element, or
+                               many separate select() calls on one document
+    HP002 reversed-copy        .reversed() copies a whole (chapter) list
+    HP003 dispatchers-io       withContext(Dispatchers.IO) around suspending
+                               calls (no-op for ktor, missing on JS)
+    HP004 sequential-pages     a page loop that fetches one page at a time
+    HP005 request-per-item     a request inside a per-item loop (N+1)
+
+Costs follow SourceFactory's call flow (getChapterList -> getChapterListRequest
+-> chaptersParse -> chapterFromElement, ...), using the source's overrides
+where it has them and its DSL selectors otherwise. Loops multiply what they
+contain: page loops by the number of chapter pages, item loops by the
+chapters on a page (or in the list). The figures are estimates for ranking,
+not measurements.
+
+Usage:
+    python scripts/lint-hotpaths.py                        # Ranked table
+    python scripts/lint-hotpaths.py --json > hotpaths.json # Machine-readable
+    python scripts/lint-hotpaths.py novelfire --findings   # One source, every finding
+    python scripts/lint-hotpaths.py --rule HP004           # Only sequential page loops
+    python scripts/lint-hotpaths.py --chapters 5000 --per-page 100
+"""
+
+import argparse
+import json
+import math
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+from kotlin_scan import scan
+from source_catalog import cached_parse, load_catalog
+from source_selectors import load_source_selectors
+
+CACHE_VERSION = 1
+DEFAULT_CACHE = Path(".cache") / "kotlin-scan.json"
+
+RULES = {
+    "HP001": "repeated-select",
+    "HP002": "reversed-copy",
+    "HP003": "dispatchers-io",
+    "HP004": "sequential-pages",
+    "HP005": "request-per-item",
+}
+FAN_OUT = 4
+DETAIL_ITEMS = 20
+CONTENT_ITEMS = 50
+
+# SourceFactory defaults: callee, called once per item of the list
+DEFAULT_FLOW = {
+    "getMangaDetails": [("getMangaDetailsRequest", False), ("detailParse", False)],
+    "getChapterList": [("getChapterListRequest", False), ("chaptersParse", False)],
+    "chaptersParse": [("chapterFromElement", True)],
+    "getPageList": [("getContents", False)],
+    "getContents": [("getContentRequest", False), ("pageContentParse", False)],
+}
+DEFAULT_REQUESTS = {"getMangaDetailsRequest", "getChapterListRequest", "getContentRequest"}
+# Default parse function -> (DSL stage, also count the list selector)
+DEFAULT_PARSE = {
+    "detailParse": ("detail", False),
+    "chaptersParse": ("chapters", True),
+    "chapterFromElement": ("chapters", False),
+    "pageContentParse": ("content", False),
+}
+
+@dataclass
+class Cost:
+    requests: float = 0.0
+    sequential: float = 0.0
+    traversals: float = 0.0
+
+    def add(self, other: "Cost", times: float = 1.0, sequential_times: float = None):
+        self.requests += other.requests * times
+        self.sequential += other.sequential * (times if sequential_times is None else sequential_times)
+        self.traversals += other.traversals * times
+
+def multiplier(scopes, items: float, paged: bool, params):
+    """(total, sequential, paged) factor of the scopes around an event."""
+    total, sequential = 1.0, None
+    for i, scope in enumerate(scopes):
+        if scope["kind"] == "async":
+            sequential = total if sequential is None else sequential
+        elif scope["kind"] == "pages":
+            total *= params.pages
+            paged = True
+        elif not any(s["kind"] == "pages" for s in scopes[i + 1:]):
+            # Groups around a page loop (volumes) split the list rather than repeat it
+            total *= params.per_page if paged else items
+    return total, total if sequential is None else sequential, paged
+
+class SourceModel:
+    """Functions of one source (or multisrc theme) and its DSL selectors."""
+
+    def __init__(self, functions: dict, dsl: dict, params):
+        self.functions = functions
+        self.dsl = dsl
+        self.params = params
+        self.fetching = {name for name, overloads in functions.items()
+                         if any(e["kind"] == "request" for f in overloads for e in f["events"])}
+
+    def dsl_selectors(self, stage: str, with_list: bool) -> int:
+        fetcher = self.dsl.get(stage)
+        if not isinstance(fetcher, dict):
+            return 0
+        count = sum(1 for key, value in fetcher.items() if key.endswith("Selector") and value)
+        return count + (1 if with_list and fetcher.get("selector") else 0)
+
+    def cost(self, name: str, items: float, paged: bool = False, stack=()) -> Cost:
+        cost = Cost()
+        if name in stack:
+            return cost
+        stack = stack + (name,)
+        if name in self.functions:
+            for fun in self.functions[name]:
+                for event in fun["events"]:
+                    times, sequential, inner_paged = multiplier(event["scopes"], items, paged, self.params)
+                    if event["kind"] == "request":
+                        cost.add(Cost(1, 1, 0), times, sequential)
+                    elif event["kind"] == "select":
+                        cost.traversals += times
+                    elif event["kind"] == "call" and (event["name"] in self.functions or event["name"] in DEFAULT_FLOW
+                                                      or event["name"] in DEFAULT_REQUESTS or event["name"] in DEFAULT_PARSE):
+                        inner_items = self.params.per_page if inner_paged else items
+                        cost.add(self.cost(event["name"], inner_items, inner_paged, stack), times, sequential)
+            return cost
+        if name in DEFAULT_REQUESTS:
+            return Cost(1, 1, 0)
+        if name in DEFAULT_PARSE:
+            stage, with_list = DEFAULT_PARSE[name]
+            cost.traversals += self.dsl_selectors(stage, with_list)
+        for callee, per_item in DEFAULT_FLOW.get(name, []):
+            times = (self.params.per_page if paged else items) if per_item else 1
+            cost.add(self.cost(callee, items, paged, stack), times)
+        return cost
+
+    def findings(self, files: dict) -> list:
+        found = []
+        for name, overloads in self.functions.items():
+            items = self.params.chapters if "chapter" in name.lower() else DETAIL_ITEMS
+            for fun in overloads:
+                found.extend(self._function_findings(name, fun, files[id(fun)], items))
+        return found
+
+    def _function_findings(self, name: str, fun: dict, path: str, items: float) -> list:
+        found = []
+
+        def finding(rule, event, message, impact):
+            found.append({"rule": rule, "name": RULES[rule], "file": path, "line": event["line"],
+                          "function": name, "message": message, "impact": round(impact)})
+
+        groups, fan_out = {}, {}
+        for event in fun["events"]:
+            times, _, _ = multiplier(event["scopes"], items, False, self.params)
+            scope = event["scopes"][-1]["line"] if event["scopes"] else 0
+            in_async = any(s["kind"] == "async" for s in event["scopes"])
+            kinds = [s["kind"] for s in event["scopes"] if s["kind"] != "async"]
+            if event["kind"] == "select" and event["receiver"] != "<expr>":
+                groups.setdefault((event["receiver"], event["selector"], scope), []).append((event, times))
+                fan_out.setdefault((event["receiver"], scope), []).append((event, times))
+            elif event["kind"] == "reversed":
+                finding("HP002", event, ".reversed() copies the list; use asReversed() or reverseChapterList", times * items)
+            elif event["kind"] == "io":
+                finding("HP003", event, "withContext(Dispatchers.IO) around suspending ktor calls; drop it "
+                                        "(Dispatchers.IO does not exist on JS)", times)
+            elif (event["kind"] == "request" or event["kind"] == "call" and event["name"] in self.fetching
+                  and event["name"] != name) and kinds and not in_async:
+                if "pages" in kinds:
+                    finding("HP004", event, f"pages fetched one at a time (~{self.params.pages} sequential requests); "
+                                            "fetch them concurrently with async/awaitAll", times)
+                else:
+                    finding("HP005", event, "request inside a per-item loop (N+1 requests)", times)
+
+        for (receiver, selector, _), events in groups.items():
+            if len(events) > 1:
+                event, times = events[0]
+                finding("HP001", event, f'{receiver}.select("{selector}") evaluated {len(events)} times; '
+                                        "select once and reuse the element", times * (len(events) - 1))
+        for (receiver, _), events in fan_out.items():
+            distinct = {e["selector"] for e, _ in events}
+            if len(distinct) >= FAN_OUT:
+                event, times = events[0]
+                finding("HP001", event, f"{len(distinct)} separate traversals of `{receiver}`; "
+                                        "narrow to a container element first", times * len(distinct))
+        return found
+
+def units(catalog, root: Path):
+    """(key, label, files, DSL module) for every individual source and multisrc theme."""
+    result = []
+    themes = {}
+    for module in catalog.modules():
+        records = catalog.by_module(module)
+        if records[0].is_multisrc:
+            theme_dir = records[0].build_file.rsplit("/", 1)[0]
+            themes.setdefault(theme_dir, []).append(module)
+            continue
+        files = sorted((root / module).rglob("*.kt"))
+        result.append((module, f"{records[0].name} ({records[0].lang})", files, module))
+    for theme_dir, modules in sorted(themes.items()):
+        files = sorted((root / theme_dir).rglob("*.kt"))
+        label = f"{theme_dir.rsplit('/', 1)[-1]} (multisrc, {len(modules)} variants)"
+        result.append((theme_dir, label, files, modules[0]))
+    return result
+
+def analyze(args) -> list:
+    base = Path(args.path)
+    root = base.resolve().parent
+    catalog = load_catalog(base)
+    dsl = load_source_selectors(catalog)
+    all_units = units(catalog, root)
+    all_files = sorted({path for _, _, files, _ in all_units for path in files})
+    scanned = cached_parse(all_files, root, scan, root / DEFAULT_CACHE, CACHE_VERSION, args.rebuild, args.jobs)
+
+    results = []
+    for key, label, files, dsl_module in all_units:
+        if args.sources and not any(s.lower() in label.lower() or key.endswith("/" + s.strip("/")) for s in args.sources):
+            continue
+        functions, owners = {}, {}
+        for path in files:
+            relative = path.relative_to(root).as_posix()
+            for fun in scanned[relative]["functions"]:
+                functions.setdefault(fun["name"], []).append(fun)
+                owners[id(fun)] = relative
+        model = SourceModel(functions, dsl.get(dsl_module, {}), args)
+        per_novel = model.cost("getMangaDetails", DETAIL_ITEMS)
+        per_novel.add(model.cost("getChapterList", args.chapters))
+        per_chapter = model.cost("getPageList", CONTENT_ITEMS)
+        findings = [f for f in model.findings(owners) if not args.rule or f["rule"] in args.rule]
+        results.append({
+            "source": label,
+            "module": key,
+            "requestsPerNovel": round(per_novel.requests, 1),
+            "sequentialRequestsPerNovel": round(per_novel.sequential, 1),
+            "latencyPerNovelMs": round(per_novel.sequential * args.rtt),
+            "traversalsPerNovel": round(per_novel.traversals),
+            "requestsPerChapter": round(per_chapter.requests, 1),
+            "traversalsPerChapter": round(per_chapter.traversals),
+            "findings": sorted(findings, key=lambda f: -f["impact"]),
+        })
+    results.sort(key=lambda r: (-r["requestsPerNovel"], -r["traversalsPerNovel"], r["module"]))
+    if args.rule:
+        results = [r for r in results if r["findings"]]
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank sources by slow scraping patterns")
+    parser.add_argument("sources", nargs="*", help="Only these sources (name or module path)")
+    parser.add_argument("--path", default="sources", help="Sources directory (default: sources)")
+    parser.add_argument("--chapters", type=int, default=2000, help="Chapters of the novel being opened (default: 2000)")
+    parser.add_argument("--per-page", type=int, default=50, help="Chapters per chapter-list page (default: 50)")
+    parser.add_argument("--rtt", type=float, default=300.0, help="Round trip per request in ms (default: 300)")
+    parser.add_argument("--rule", action="append", choices=sorted(RULES), help="Only report this rule (repeatable)")
+    parser.add_argument("--findings", action="store_true", help="List every finding under each source")
+    parser.add_argument("--top", type=int, default=30, help="Rows in the table (default: 30)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 4, help="Parallel scan workers")
+    parser.add_argument("--rebuild", action="store_true", help="Ignore the cached scan")
+    args = parser.parse_args()
+    if args.per_page < 1 or args.chapters < 1:
+        parser.error("--chapters and --per-page must be positive")
+    args.pages = math.ceil(args.chapters / args.per_page)
+
+    results = analyze(args)
+    if args.json:
+        parameters = {"chapters": args.chapters, "perPage": args.per_page, "pages": args.pages, "rttMs": args.rtt}
+        print(json.dumps({"parameters": parameters, "rules": RULES, "sources": results}, indent=2))
+        return
+    if not results:
+        print("Nothing to report.")
+        return
+
+    print(f"\n=== {len(results)} source(s), novel of {args.chapters} chapters, {args.per_page} per page ===\n")
+    print(f"{'Source':<34} {'Req/novel':>9} {'Latency':>8} {'Select/novel':>12} {'Req/ch':>6}  Findings")
+    print("-" * 96)
+    for r in results[:args.top]:
+        counts = {}
+        for f in r["findings"]:
+            counts[f["rule"]] = counts.get(f["rule"], 0) + 1
+        summary = " ".join(f"{rule}x{n}" for rule, n in sorted(counts.items()))
+        print(f"{r['source'][:34]:<34} {r['requestsPerNovel']:>9g} {r['latencyPerNovelMs'] / 1000:>7.1f}s "
+              f"{r['traversalsPerNovel']:>12} {r['requestsPerChapter']:>6g}  {summary}")
+        if args.findings:
+            for f in r["findings"]:
+                print(f"      {f['rule']} {f['file']}:{f['line']} {f['function']}: {f['message']}")
+    if len(results) > args.top:
+        print(f"... and {len(results) - args.top} more (--top, --json)")
+    total = {rule: sum(1 for r in results for f in r["findings"] if f["rule"] == rule) for rule in RULES}
+    print("\n" + ", ".join(f"{rule} {RULES[rule]}: {n}" for rule, n in total.items()))
+
+if __name__ == "__main__":
+    main()
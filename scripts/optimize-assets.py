@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Icon pipeline: shrink each source's repo icon and, with --mipmaps, generate
+every launcher mipmap of a source from one image.
+
+By default only the repo icon (assets/icon.png, the file RepoTask copies to
+icon/ and clients download) is re-encoded losslessly, and only replaced when
+that makes it smaller. APKs are left alone.
+
+With --mipmaps the image is the repo icon unless --image is given. From it
+the tool renders res/mipmap-<density>/ic_launcher at 48/72/96/144/192 px
+(never larger than the image itself; Android scales the nearest density) and
+keeps the smallest encoding of each file:
+
+    png   optimized PNG (lossless), or a 256-colour palette with --quantize
+    webp  lossless WebP (minSdk 26 reads it everywhere)
+
+Mipmaps are what each APK carries in place of the 67-byte extensions/res
+placeholder, so they make APKs larger (up to ~140 KB for a detailed icon);
+the report counts the placeholder as what an APK has before. The repo icon
+is what clients download from icon/, so the report lists the two separately.
+
+Sources are processed in a process pool and results are cached by content
+hash in .cache/, so unchanged icons cost nothing on later runs. Without
+--write nothing in the tree changes; the report shows the bytes each APK and
+repo icon would save.
+
+Usage:
+    python scripts/optimize-assets.py                            # Dry run, every source
+    python scripts/optimize-assets.py --write                    # Shrink repo icons
+    python scripts/optimize-assets.py novelfull --mipmaps --image logo.png --write
+    python scripts/optimize-assets.py novelfull --mipmaps --format webp --write --json
+
+Needs Pillow (pip install Pillow).
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from source_catalog import load_catalog
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+CACHE_VERSION = 2
+DEFAULT_CACHE = Path(".cache") / "asset-optimizer"
+REPO_ICON = "icon.png"
+LAUNCHER = "ic_launcher"
+DENSITIES = {"mdpi": 48, "hdpi": 72, "xhdpi": 96, "xxhdpi": 144, "xxxhdpi": 192}
+FORMATS = ("png", "webp")
+PLACEHOLDER_RES = Path("extensions") / "res"
+
+def asset_dirs(record, base: Path):
+    """(assets dir, res dir) of one source, the way extension-setup and RepoTask find them."""
+    project_dir = Path(record.build_file).parent
+    if record.assets_dir:
+        assets = base / record.assets_dir
+    else:
+        assets = project_dir / record.source_dir / "assets"
+    return assets, project_dir / record.source_dir / "res"
+
+def launcher_files(res: Path):
+    return sorted(res.glob(f"mipmap-*/{LAUNCHER}.*")) if res.is_dir() else []
+
+def _encode_png(image, quantize: bool) -> bytes:
+    candidates = []
+    out = io.BytesIO()
+    image.save(out, "PNG", optimize=True)
+    candidates.append(out.getvalue())
+    if quantize:
+        method = Image.Quantize.FASTOCTREE if image.mode == "RGBA" else Image.Quantize.MEDIANCUT
+        out = io.BytesIO()
+        image.quantize(colors=256, method=method).save(out, "PNG", optimize=True)
+        candidates.append(out.getvalue())
+    return min(candidates, key=len)
+
+def _encode(image, fmt: str, quantize: bool) -> bytes:
+    if fmt == "webp":
+        out = io.BytesIO()
+        image.save(out, "WEBP", lossless=True, quality=100, method=6)
+        return out.getvalue()
+    return _encode_png(image, quantize)
+
+def _square(image):
+    image = image.convert("RGBA")
+    side = min(image.size)
+    left, top = (image.width - side) // 2, (image.height - side) // 2
+    return image.crop((left, top, left + side, top + side))
+
+def _store(blobs: Path, data: bytes) -> str:
+    digest = hashlib.sha256(data).hexdigest()
+    path = blobs / digest
+    if not path.exists():
+        tmp = path.with_name(f"{digest}.{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    return digest
+
+def render_icons(job):
+    """Encode one source image into every density; picklable for the process pool.
+
+    Returns {relative output path: blob digest}, with the blobs written to the
+    cache's content-addressed store.
+    """
+    image_path, fmt, quantize, repo_icon, mipmaps, blobs = job
+    blobs = Path(blobs)
+    data = Path(image_path).read_bytes()
+    source = _square(Image.open(io.BytesIO(data)))
+    outputs = {}
+    for density, size in DENSITIES.items() if mipmaps else ():
+        if size > source.width and density != "mdpi":
+            continue
+        icon = source if source.width == size else source.resize((size, size), Image.LANCZOS)
+        outputs[f"mipmap-{density}/{LAUNCHER}.{fmt}"] = _store(blobs, _encode(icon, fmt, quantize))
+    if repo_icon:
+        encoded = _encode_png(Image.open(io.BytesIO(data)), False)
+        outputs[REPO_ICON] = _store(blobs, encoded if len(encoded) < len(data) else data)
+    return outputs
+
+def file_digest(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+def load_index(cache: Path) -> dict:
+    path = cache / "index.json"
+    try:
+        index = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return index.get("entries", {}) if index.get("version") == CACHE_VERSION else {}
+
+def save_index(cache: Path, entries: dict):
+    path = cache / "index.json"
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps({"version": CACHE_VERSION, "entries": entries}, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, path)
+
+def apk_launcher_bytes(res: Path, base: Path) -> int:
+    """Launcher icon bytes an APK carries now: its own mipmaps, else the placeholder."""
+    files = launcher_files(res) or launcher_files(base.parent / PLACEHOLDER_RES)
+    return sum(path.stat().st_size for path in files)
+
+def plan_source(record, base: Path, image, fmt: str, quantize: bool, mipmaps: bool = False):
+    """What to render for one source, or None when it has no image to start from."""
+    assets, res = asset_dirs(record, base)
+    repo_icon = assets / REPO_ICON
+    image = Path(image) if image else repo_icon
+    if not image.is_file():
+        return None
+    settings = (f"{CACHE_VERSION}:{fmt}:{int(quantize)}:{int(repo_icon.is_file())}:{int(mipmaps)}:"
+                f"{sorted(DENSITIES.items())}")
+    key = hashlib.sha256(image.read_bytes() + settings.encode()).hexdigest()
+    return {
+        "record": record,
+        "image": image,
+        "assets": assets,
+        "res": res,
+        "repo_icon": repo_icon.is_file() and image == repo_icon,
+        "mipmaps": mipmaps,
+        "apk_before": apk_launcher_bytes(res, base),
+        "icon_before": repo_icon.stat().st_size if repo_icon.is_file() else 0,
+        "key": key,
+    }
+
+def destination(plan: dict, name: str) -> Path:
+    return plan["assets"] / name if name == REPO_ICON else plan["res"] / name
+
+def write_outputs(plan: dict, outputs: dict, blobs: Path) -> list:
+    """Write rendered files into the tree; returns the paths that changed."""
+    changed = []
+    wanted = {destination(plan, name) for name in outputs}
+    for stale in launcher_files(plan["res"]) if plan["mipmaps"] else ():
+        if stale not in wanted:
+            stale.unlink()
+            changed.append(stale)
+    for name, digest in outputs.items():
+        path = destination(plan, name)
+        if path.is_file() and file_digest(path) == digest:
+            continue
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_bytes((blobs / digest).read_bytes())
+        os.replace(tmp, path)
+        changed.append(path)
+    return changed
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate and optimize source launcher icons")
+    parser.add_argument("sources", nargs="*", help="Source names or module paths (default: all)")
+    parser.add_argument("--path", default="sources", help="Sources directory (default: sources)")
+    parser.add_argument("--mipmaps", action="store_true",
+                        help="Also render launcher mipmaps into each APK (makes APKs larger)")
+    parser.add_argument("--image", type=Path, help="Image to render mipmaps from (default: each source's assets/icon.png)")
+    parser.add_argument("--format", choices=FORMATS, default="png", help="Mipmap format (default: png)")
+    parser.add_argument("--quantize", action="store_true", help="Allow 256-colour palette PNGs when smaller")
+    parser.add_argument("--write", action="store_true", help="Write files into the tree (default: dry run)")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 4, help="Worker processes")
+    parser.add_argument("--cache", type=Path, default=DEFAULT_CACHE, help="Cache directory")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    if args.image and not args.mipmaps:
+        parser.error("--image is only used for mipmaps; add --mipmaps")
+    if Image is None:
+        sys.exit("Error: Pillow is required (pip install Pillow)")
+    base = Path(args.path)
+    catalog = load_catalog(base)
+    wanted = {name.lower().strip("/") for name in args.sources}
+    records = [r for r in catalog
+               if not wanted or r.name.lower() in wanted or any(r.module.endswith(w) for w in wanted)]
+    if args.image and len(records) != 1:
+        sys.exit(f"Error: --image needs exactly one source, {len(records)} matched")
+
+    plans, skipped = [], []
+    for record in records:
+        plan = plan_source(record, base, args.image, args.format, args.quantize, args.mipmaps)
+        (plans if plan else skipped).append(plan or record)
+
+    blobs = args.cache / "blobs"
+    blobs.mkdir(parents=True, exist_ok=True)
+    index = load_index(args.cache)
+    todo = {}
+    for plan in plans:
+        cached = index.get(plan["key"])
+        if cached and all((blobs / digest).exists() for digest in cached.values()):
+            plan["outputs"] = cached
+        else:
+            todo.setdefault(plan["key"], []).append(plan)
+
+    jobs = [(str(group[0]["image"]), args.format, args.quantize, group[0]["repo_icon"], args.mipmaps, str(blobs))
+            for group in todo.values()]
+    failed = []
+    if jobs:
+        with ProcessPoolExecutor(max_workers=max(1, min(args.jobs, len(jobs)))) as pool:
+            futures = [(key, pool.submit(render_icons, job)) for key, job in zip(todo, jobs)]
+            for key, future in futures:
+                try:
+                    outputs = future.result()
+                except (OSError, ValueError) as e:
+                    failed.extend((plan["record"], str(e)) for plan in todo[key])
+                    continue
+                index[key] = outputs
+                for plan in todo[key]:
+                    plan["outputs"] = outputs
+        save_index(args.cache, index)
+
+    report = []
+    for plan in plans:
+        if "outputs" not in plan:
+            continue
+        sizes = {name: (blobs / digest).stat().st_size for name, digest in plan["outputs"].items()}
+        icon_after = sizes.pop(REPO_ICON, plan["icon_before"])
+        changed = write_outputs(plan, plan["outputs"], blobs) if args.write else []
+        record = plan["record"]
+        report.append({
+            "source": f"{record.name} ({record.lang})",
+            "module": record.module,
+            "flavor": record.flavor,
+            "apkBefore": plan["apk_before"],
+            "apkAfter": sum(sizes.values()) if plan["mipmaps"] else plan["apk_before"],
+            "iconBefore": plan["icon_before"],
+            "iconAfter": icon_after,
+            "files": len(plan["outputs"]),
+            "changed": [path.as_posix() for path in changed],
+            "cached": plan["key"] not in todo,
+        })
+
+    if args.json:
+        print(json.dumps({"sources": report, "skipped": [r.module for r in skipped],
+                          "failed": [{"module": r.module, "error": e} for r, e in failed]}, indent=2))
+    else:
+        print(f"{'Source':<34} {'Flavor':<14} {'APK mipmaps':>19} {'Repo icon':>19}")
+        print("-" * 89)
+        for row in sorted(report, key=lambda r: (r["apkAfter"] - r["apkBefore"], r["iconAfter"] - r["iconBefore"])):
+            print(f"{row['source'][:34]:<34} {row['flavor'][:14]:<14} {row['apkBefore']:>8} -> {row['apkAfter']:<7} "
+                  f"{row['iconBefore']:>8} -> {row['iconAfter']:<7}")
+        totals = {key: sum(r[key] for r in report) for key in ("apkBefore", "apkAfter", "iconBefore", "iconAfter")}
+        cached = sum(r["cached"] for r in report)
+        print(f"\n{len(report)} source(s), {cached} from cache")
+        if args.mipmaps:
+            print(f"  APK mipmaps: {totals['apkBefore']:,} -> {totals['apkAfter']:,} bytes "
+                  f"({totals['apkBefore'] - totals['apkAfter']:+,} saved)")
+        print(f"  Repo icons:  {totals['iconBefore']:,} -> {totals['iconAfter']:,} bytes "
+              f"({totals['iconBefore'] - totals['iconAfter']:+,} saved)")
+        if skipped:
+            print(f"{len(skipped)} source(s) without an {REPO_ICON} to render from were skipped")
+        for record, error in failed:
+            print(f"Failed: {record.module}: {error}")
+        if args.write:
+            print(f"Wrote {sum(len(r['changed']) for r in report)} file(s)")
+        else:
+            print("Dry run, use --write to update the tree")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
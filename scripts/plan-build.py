@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Plan the minimal set of extension assemble tasks for a change, split across
+CI workers.
+
+Changed paths are mapped through the module graph (see build_graph.py):
+projectDependencies, multisrc variants, ireader.common imports and build-wide
+inputs such as buildSrc/. For build.gradle.kts files, only flavors whose
+Extension(...) block actually changed are rebuilt when --since is given.
+
+Usage:
+    python scripts/plan-build.py --since origin/main                # Print the plan
+    python scripts/plan-build.py --since origin/main --shards 4     # Split over 4 workers
+    python scripts/plan-build.py --since origin/main --shards 4 --shard 0   # Tasks for worker 0
+    python scripts/plan-build.py sources/en/novelfull/main/src/...  # Explicit paths
+    python scripts/plan-build.py --since HEAD~1 --times build-times.json --json
+
+--times takes {"<task or project>": seconds} (or {"tasks": {...}}) from
+earlier builds, or the build-times database of profile-build.py; tasks
+without history use the median of the known ones.
+"""
+
+import argparse
+import json
+import sqlite3
+import statistics
+import sys
+from pathlib import Path
+
+from build_graph import changed_extension_records, changed_files, file_at, load_graph, shard, task_name
+from build_times import connect, project_times
+from source_catalog import load_catalog
+
+DEFAULT_TASK_SECONDS = 90.0
+PROJECT_OVERHEAD_SECONDS = 20.0
+
+def load_times(path) -> dict:
+    if not path:
+        return {}
+    if Path(path).suffix in (".db", ".sqlite"):
+        if not Path(path).is_file():
+            print(f"Warning: ignoring build times {path}: not found", file=sys.stderr)
+            return {}
+        try:
+            return project_times(connect(path))
+        except sqlite3.DatabaseError as e:
+            print(f"Warning: ignoring build times {path}: {e}", file=sys.stderr)
+            return {}
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        print(f"Warning: ignoring build times {path}: {e}", file=sys.stderr)
+        return {}
+    data = data.get("tasks", data) if isinstance(data, dict) else {}
+    return {key: float(value) for key, value in data.items() if isinstance(value, (int, float))}
+
+def estimate(tasks: dict, times: dict) -> dict:
+    """Seconds per task from history: task, then its project, then the median."""
+    default = statistics.median(times.values()) if times else DEFAULT_TASK_SECONDS
+    return {task: times.get(task, times.get(project, default)) for task, project in tasks.items()}
+
+def build_file_changes(paths, ref, repo_root: Path, base: Path) -> dict:
+    changes = {}
+    for path in paths:
+        if path.startswith(base.name + "/") and path.endswith("/build.gradle.kts"):
+            current = repo_root / path
+            new = current.read_text(encoding="utf-8-sig") if current.exists() else None
+            changes[path] = changed_extension_records(path, file_at(ref, path, repo_root), new, base)
+    return changes
+
+def main():
+    parser = argparse.ArgumentParser(description="Plan extension builds for a change")
+    parser.add_argument("paths", nargs="*", help="Changed paths (repo-relative)")
+    parser.add_argument("--since", metavar="REF", help="Use the files changed since this git ref")
+    parser.add_argument("--path", default="sources", help="Sources directory (default: sources)")
+    parser.add_argument("--shards", type=int, default=1, help="Number of CI workers")
+    parser.add_argument("--shard", type=int, help="Print only the tasks of this worker")
+    parser.add_argument("--times", help="JSON file of historical build times in seconds, or a build-times .db")
+    parser.add_argument("--build-type", default="Release", choices=["Release", "Debug"])
+    parser.add_argument("--json", action="store_true", help="Print the plan as JSON")
+    args = parser.parse_args()
+
+    base = Path(args.path)
+    repo_root = base.resolve().parent
+    if not args.since and not args.paths:
+        parser.error("give changed paths or --since REF")
+    if args.shard is not None and not 0 <= args.shard < args.shards:
+        parser.error(f"--shard must be in 0..{args.shards - 1}")
+
+    paths = sorted(set(args.paths) | set(changed_files(args.since, repo_root, untracked=".") if args.since else set()))
+    catalog = load_catalog(base)
+    graph = load_graph(catalog)
+    changes = build_file_changes(paths, args.since, repo_root, base) if args.since else {}
+    impact = graph.impact(paths, changes)
+
+    tasks = {task_name(record, args.build_type): record.project for record in impact.records}
+    costs = estimate(tasks, load_times(args.times))
+    shards = shard(costs, tasks, args.shards, PROJECT_OVERHEAD_SECONDS)
+
+    if args.shard is not None:
+        print(" ".join(shards[args.shard]["tasks"]))
+        return
+
+    if args.json:
+        print(json.dumps({
+            "changed": paths,
+            "full": impact.full,
+            "tasks": sorted(tasks),
+            "reasons": {task_name(r, args.build_type): impact.reasons[f"{r.project}:{r.flavor}"]
+                        for r in impact.records},
+            "shards": shards,
+        }, indent=2))
+        return
+
+    print(f"\n=== {len(paths)} changed path(s) -> {len(tasks)} of {len(catalog)} flavors ===\n")
+    if impact.full:
+        print("Build-wide input changed, everything is rebuilt.\n")
+    for record in sorted(impact.records, key=task_name)[:50]:
+        reasons = impact.reasons[f"{record.project}:{record.flavor}"]
+        print(f"  {task_name(record, args.build_type)}  <- {reasons[0]}")
+    if len(impact.records) > 50:
+        print(f"  ... and {len(impact.records) - 50} more")
+
+    if args.shards > 1:
+        print()
+        for i, s in enumerate(shards):
+            print(f"Shard {i}: {len(s['tasks'])} task(s), ~{s['seconds'] / 60:.1f} min")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Profile Gradle builds per module and keep a trend database of the results.
+
+`run` wraps `./gradlew --profile`, `import` reads reports that were already
+written (CI artifacts, older builds), both offline. Task times are stored per
+commit in .cache/build-times.db (see build_times.py) and attributed to
+modules and to KSP, kotlinc, dex, packaging and the rest. Gradle runs tasks
+in parallel, so a module's share of the build's wall time is estimated from
+its share of the summed task time.
+
+Usage:
+    python scripts/profile-build.py run assembleDebug            # Build, profile and record
+    python scripts/profile-build.py import build/reports/profile/profile-*.html
+    python scripts/profile-build.py report                       # Slowest modules, KSP share
+    python scripts/profile-build.py compare origin/main HEAD     # Modules that got slower
+    python scripts/profile-build.py history --module :extensions:individual:en:novelfull
+    python scripts/profile-build.py export build-times.json      # Times for plan-build.py --times
+
+plan-build.py also reads the database directly: --times .cache/build-times.db
+"""
+
+import argparse
+import json
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from build_times import (CATEGORIES, DEFAULT_DB, builds, connect, current_commit, latest_profile,
+                         module_breakdown, parse_profile, project_times, record_build, resolve_commit,
+                         rev_parse)
+from source_catalog import load_catalog
+
+def remote_dependencies(base: Path) -> dict:
+    """project -> number of remoteDependencies of its flavors."""
+    counts = {}
+    for record in load_catalog(base):
+        counts[record.project] = max(counts.get(record.project, 0), len(record.remote_dependencies))
+    return counts
+
+def summarize(conn, build_ids: list) -> dict:
+    breakdown = module_breakdown(conn, build_ids)
+    walls = [build["wall"] for build in builds(conn) if build["id"] in build_ids]
+    wall = statistics.median(walls) if walls else 0.0
+    task_total = sum(times["total"] for times in breakdown.values())
+    categories = {category: round(sum(times[category] for times in breakdown.values()), 1) for category in CATEGORIES}
+    modules = []
+    for project, times in sorted(breakdown.items(), key=lambda item: (-item[1]["total"], item[0])):
+        modules.append({
+            "project": project,
+            "seconds": round(times["total"], 1),
+            "wall": round(wall * times["total"] / task_total, 1) if task_total else 0.0,
+            "ksp": round(times["ksp"], 1),
+            "categories": {category: round(times[category], 1) for category in CATEGORIES if times[category]},
+        })
+    return {
+        "builds": len(build_ids),
+        "wall": round(wall, 1),
+        "taskSeconds": round(task_total, 1),
+        "kspShare": round(categories["ksp"] / task_total, 3) if task_total else 0.0,
+        "categories": categories,
+        "modules": modules,
+    }
+
+def print_summary(summary: dict, top: int, dependencies: dict):
+    print(f"\n=== {summary['commit'][:12]}, {summary['builds']} build(s): {summary['wall']:.0f}s wall, "
+          f"{summary['taskSeconds']:.0f}s of task time ===\n")
+    total = summary["taskSeconds"] or 1.0
+    for category, seconds in summary["categories"].items():
+        if seconds:
+            print(f"  {category:<10} {seconds:>8.1f}s  {seconds / total:>6.1%}")
+    print(f"\nKSP share of task time: {summary['kspShare']:.1%}\n")
+    print(f"  {'module':<50} {'tasks':>8} {'~wall':>7} {'ksp':>7} {'deps':>5}")
+    for module in summary["modules"][:top]:
+        print(f"  {module['project']:<50} {module['seconds']:>7.1f}s {module['wall']:>6.1f}s "
+              f"{module['ksp']:>6.1f}s {dependencies.get(module['project'], 0):>5}")
+    if len(summary["modules"]) > top:
+        print(f"  ... and {len(summary['modules']) - top} more")
+
+def compare(conn, base: str, head: str, tolerance: float, min_seconds: float) -> list:
+    """Modules whose median time moved by more than `tolerance` and `min_seconds`, biggest change first."""
+    before = module_breakdown(conn, [b["id"] for b in builds(conn, commit=base)])
+    after = module_breakdown(conn, [b["id"] for b in builds(conn, commit=head)])
+    changes = []
+    for project in sorted(before.keys() | after.keys()):
+        old = before.get(project, {}).get("total", 0.0)
+        new = after.get(project, {}).get("total", 0.0)
+        delta = new - old
+        if not delta or abs(delta) < min_seconds or (old and abs(delta) / old < tolerance):
+            continue
+        ksp_delta = after.get(project, {}).get("ksp", 0.0) - before.get(project, {}).get("ksp", 0.0)
+        changes.append({"project": project, "before": round(old, 1), "after": round(new, 1),
+                        "delta": round(delta, 1), "kspDelta": round(ksp_delta, 1)})
+    return sorted(changes, key=lambda c: (-abs(c["delta"]), c["project"]))
+
+def commit_or_exit(conn, ref: str, repo_root: Path) -> str:
+    commit = resolve_commit(conn, ref, repo_root)
+    if commit is None:
+        sys.exit(f"Error: no single recorded commit matches {ref}")
+    return commit
+
+def record(conn, report: Path, repo_root: Path, commit=None, wall=None, command: str = "") -> int:
+    profile = parse_profile(report)
+    if not profile.tasks:
+        print(f"Warning: no tasks in {report}, is it a --profile report?", file=sys.stderr)
+    sha, dirty = (commit, False) if commit else current_commit(repo_root)
+    build = record_build(conn, profile, sha, dirty, wall, command, str(report))
+    print(f"Recorded {len(profile.tasks)} task(s) from {report.name} for {sha[:12]}{' (dirty)' if dirty else ''}")
+    return build
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-module Gradle build profiles and their trend")
+    parser.add_argument("--db", default=str(DEFAULT_DB), help=f"Trend database (default: {DEFAULT_DB})")
+    parser.add_argument("--path", default="sources", help="Sources directory (default: sources)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run a profiled Gradle build and record it")
+    run_parser.add_argument("gradle_args", nargs=argparse.REMAINDER, help="Tasks and Gradle options")
+    run_parser.add_argument("--gradle", default="./gradlew", help="Gradle command (default: ./gradlew)")
+
+    import_parser = commands.add_parser("import", help="Record existing --profile HTML reports")
+    import_parser.add_argument("reports", nargs="+", type=Path)
+    import_parser.add_argument("--commit", help="Commit the reports belong to (default: HEAD)")
+
+    report_parser = commands.add_parser("report", help="Slowest modules and time per category")
+    report_parser.add_argument("--commit", help="Only builds of this commit (default: the latest build's)")
+    report_parser.add_argument("--last", type=int, default=5, help="Builds of that commit to take the median of")
+    report_parser.add_argument("--top", type=int, default=25, help="Modules to list (default: 25)")
+    report_parser.add_argument("--json", action="store_true")
+
+    compare_parser = commands.add_parser("compare", help="Modules that got slower or faster between two commits")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("head")
+    compare_parser.add_argument("--tolerance", type=float, default=0.2, help="Relative change to report (default: 0.2)")
+    compare_parser.add_argument("--min-seconds", type=float, default=5.0, help="Absolute change to report (default: 5)")
+    compare_parser.add_argument("--check", action="store_true", help="Exit 1 if a module got slower")
+    compare_parser.add_argument("--json", action="store_true")
+
+    history_parser = commands.add_parser("history", help="Recorded builds, newest first")
+    history_parser.add_argument("--module", help="Show this Gradle project's time per build")
+    history_parser.add_argument("--last", type=int, default=20)
+
+    export_parser = commands.add_parser("export", help="Write {project: seconds} for plan-build.py --times")
+    export_parser.add_argument("output", type=Path)
+    export_parser.add_argument("--last", type=int, default=10, help="Builds to take the median of (default: 10)")
+
+    args = parser.parse_args()
+    base = Path(args.path)
+    repo_root = base.resolve().parent
+    try:
+        conn = connect(args.db)
+    except sqlite3.DatabaseError as e:
+        sys.exit(f"Error: {e}")
+
+    if args.command == "run":
+        gradle_args = [arg for arg in args.gradle_args if arg != "--"]
+        if not gradle_args:
+            run_parser.error("give the Gradle tasks to run")
+        command = [args.gradle, "--profile", *gradle_args]
+        started = time.time()
+        clock = time.perf_counter()
+        result = subprocess.run(command, cwd=repo_root)
+        wall = time.perf_counter() - clock
+        if result.returncode != 0:
+            sys.exit(f"Error: Gradle failed with exit code {result.returncode}, build not recorded")
+        report = latest_profile(repo_root, since=started)
+        if report is None:
+            sys.exit(f"Error: Gradle wrote no profile report under {repo_root / 'build/reports/profile'}")
+        build = record(conn, report, repo_root, wall=wall, command=" ".join(gradle_args))
+        summary = summarize(conn, [build])
+        summary["commit"] = builds(conn, last=1)[0]["commit"]
+        print_summary(summary, 10, remote_dependencies(base))
+
+    elif args.command == "import":
+        # Stored as a full sha, so later refs and prefixes resolve to it
+        commit = args.commit and rev_parse(args.commit, repo_root)
+        if args.commit and commit is None:
+            sys.exit(f"Error: {args.commit} is not a commit in {repo_root}")
+        for report in args.reports:
+            if not report.is_file():
+                sys.exit(f"Error: {report} not found")
+            record(conn, report, repo_root, commit=commit)
+
+    elif args.command == "report":
+        latest = builds(conn, last=1)
+        if not latest:
+            sys.exit("Error: no builds recorded yet, use `run` or `import` first")
+        commit = commit_or_exit(conn, args.commit, repo_root) if args.commit else latest[0]["commit"]
+        summary = summarize(conn, [b["id"] for b in builds(conn, commit=commit, last=args.last)])
+        summary["commit"] = commit
+        if args.json:
+            print(json.dumps(summary, indent=2))
+        else:
+            print_summary(summary, args.top, remote_dependencies(base))
+
+    elif args.command == "compare":
+        base_commit = commit_or_exit(conn, args.base, repo_root)
+        head_commit = commit_or_exit(conn, args.head, repo_root)
+        changes = compare(conn, base_commit, head_commit, args.tolerance, args.min_seconds)
+        slower = [c for c in changes if c["delta"] > 0]
+        if args.json:
+            print(json.dumps({"base": base_commit, "head": head_commit, "changes": changes}, indent=2))
+        else:
+            print(f"\n=== {base_commit[:12]} -> {head_commit[:12]}: {len(slower)} slower, "
+                  f"{len(changes) - len(slower)} faster ===\n")
+            for change in changes:
+                ksp = f"  (ksp {change['kspDelta']:+.1f}s)" if change["kspDelta"] else ""
+                print(f"  {change['project']:<50} {change['before']:>7.1f}s -> {change['after']:>7.1f}s "
+                      f"{change['delta']:>+8.1f}s{ksp}")
+        if args.check and slower:
+            sys.exit(1)
+
+    elif args.command == "history":
+        recorded = builds(conn, last=args.last)
+        times = {}
+        if args.module:
+            times = {b["id"]: module_breakdown(conn, [b["id"]]).get(args.module, {}).get("total") for b in recorded}
+        for build in recorded:
+            line = (f"  #{build['id']:<5} {build['recorded']}  {build['commit'][:12]}{'+' if build['dirty'] else ' '} "
+                    f"{build['wall']:>7.1f}s  {build['command']}")
+            if args.module:
+                seconds = times[build["id"]]
+                line += f"  [{args.module}: {'-' if seconds is None else f'{seconds:.1f}s'}]"
+            print(line)
+
+    elif args.command == "export":
+        times = project_times(conn, last=args.last)
+        args.output.write_text(json.dumps({"tasks": times}, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"Wrote {len(times)} project time(s) to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Publish the extension repo built by `./gradlew repo` as content-addressed
+releases, and sync mirrors from them incrementally.
+
+RepoTask rebuilds build/repo from scratch on every run, so copying it to a
+mirror re-sends every APK. This script stores each file once under its
+SHA-256 and describes a release as a manifest of path -> hash:
+
+    <remote>/objects/3f/3fa4...            blobs (APKs, JARs, icons, JS, indexes)
+    <remote>/releases/<name>.json          full manifest of one release
+    <remote>/releases/<name>.delta.json    what changed since the previous one
+    <remote>/latest.json                   {"release": "<name>"}
+
+Publishing uploads only the blobs the remote does not have yet. The delta
+lists added, changed and removed files and which extensions (by package)
+were added, updated or removed, so a mirror or client can fetch only those.
+A remote is a local directory or an HTTP server that accepts PUT.
+
+Usage:
+    python scripts/publish-repo.py publish --remote ../repo-store
+    python scripts/publish-repo.py publish --remote http://127.0.0.1:9000/ --release v2.45
+    python scripts/publish-repo.py sync --remote ../repo-store ../mirror    # Apply deltas to a plain repo tree
+    python scripts/publish-repo.py publish --remote ../repo-store --dry-run
+"""
+
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import shutil
+import sys
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+MANIFEST_VERSION = 1
+DEFAULT_REPO = Path("build") / "repo"
+SKIP = {".gitignore"}
+HASH_CHUNK = 1 << 20
+
+def sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def object_path(digest: str) -> str:
+    return f"objects/{digest[:2]}/{digest}"
+
+class DirectoryRemote:
+    """A remote that is a plain directory (a mirror checkout, a mounted bucket)."""
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def exists(self, name: str) -> bool:
+        return (self.root / name).is_file()
+
+    def read(self, name: str):
+        path = self.root / name
+        return path.read_bytes() if path.is_file() else None
+
+    def write(self, name: str, data: bytes):
+        path = self.root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+    def upload(self, name: str, source: Path):
+        path = self.root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        shutil.copyfile(source, tmp)
+        os.replace(tmp, path)
+
+class HttpRemote:
+    """A remote reached over HTTP: GET/HEAD to read, PUT to write."""
+
+    TIMEOUT = 120
+
+    def __init__(self, url: str):
+        self.url = url.rstrip("/") + "/"
+
+    def _request(self, name: str, method: str, data: bytes = None):
+        request = urllib.request.Request(urllib.parse.urljoin(self.url, name), data=data, method=method)
+        return urllib.request.urlopen(request, timeout=self.TIMEOUT)
+
+    def exists(self, name: str) -> bool:
+        try:
+            with self._request(name, "HEAD"):
+                return True
+        except urllib.error.HTTPError as e:
+            if e.code == 404:
+                return False
+            raise
+
+    def read(self, name: str):
+        try:
+            with self._request(name, "GET") as response:
+                return response.read()
+        except urllib.error.HTTPError as e:
+            if e.code == 404:
+                return None
+            raise
+
+    def write(self, name: str, data: bytes):
+        with self._request(name, "PUT", data):
+            pass
+
+    def upload(self, name: str, source: Path):
+        self.write(name, source.read_bytes())
+
+def open_remote(location: str):
+    if location.startswith(("http://", "https://")):
+        return HttpRemote(location)
+    return DirectoryRemote(location)
+
+def read_json(remote, name: str):
+    data = remote.read(name)
+    return json.loads(data) if data is not None else None
+
+def write_json(remote, name: str, value):
+    remote.write(name, (json.dumps(value, indent=2, sort_keys=True) + "\n").encode("utf-8"))
+
+def scan_repo(repo: Path, jobs: int) -> dict:
+    """path relative to the repo -> {"sha256", "size"} for every published file."""
+    paths = sorted(p for p in repo.rglob("*") if p.is_file() and p.name not in SKIP)
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        digests = list(pool.map(sha256_file, paths))
+    return {
+        path.relative_to(repo).as_posix(): {"sha256": digest, "size": path.stat().st_size}
+        for path, digest in zip(paths, digests)
+    }
+
+def extension_files(entry: dict) -> list:
+    """Files RepoTask writes for one index.json entry."""
+    apk = entry["apk"]
+    stem = apk[:-len(".apk")] if apk.endswith(".apk") else apk
+    return [f"apk/{apk}", f"jar/{stem}.jar", f"icon/{stem}.png"]
+
+def load_extensions(repo: Path) -> dict:
+    index = repo / "index.json"
+    if not index.is_file():
+        return {}
+    return {entry["pkg"]: entry for entry in json.loads(index.read_text(encoding="utf-8"))}
+
+def diff_releases(old: dict, new: dict) -> dict:
+    """Delta between two manifests, at file and at extension level."""
+    old_files, new_files = old.get("files", {}) if old else {}, new["files"]
+    added = {p: f for p, f in new_files.items() if p not in old_files}
+    changed = {p: f for p, f in new_files.items() if p in old_files and old_files[p]["sha256"] != f["sha256"]}
+    removed = sorted(p for p in old_files if p not in new_files)
+
+    old_ext, new_ext = old.get("extensions", {}) if old else {}, new["extensions"]
+    touched = set(added) | set(changed)
+    updated = sorted(pkg for pkg, entry in new_ext.items() if pkg in old_ext
+                     and (entry != old_ext[pkg] or touched.intersection(extension_files(entry))))
+    return {
+        "version": MANIFEST_VERSION,
+        "from": old["release"] if old else None,
+        "to": new["release"],
+        "added": added,
+        "changed": changed,
+        "removed": removed,
+        "extensions": {
+            "added": sorted(pkg for pkg in new_ext if pkg not in old_ext),
+            "updated": updated,
+            "removed": sorted(pkg for pkg in old_ext if pkg not in new_ext),
+        },
+        "bytes": sum(f["size"] for f in (*added.values(), *changed.values())),
+    }
+
+def publish(args) -> int:
+    repo = Path(args.repo)
+    if not (repo / "index.json").is_file():
+        print(f"Error: {repo} has no index.json; run ./gradlew repo first", file=sys.stderr)
+        return 1
+    remote = open_remote(args.remote)
+    latest = read_json(remote, "latest.json")
+    previous = read_json(remote, f"releases/{latest['release']}.json") if latest else None
+
+    release = args.release or datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%d-%H%M%S")
+    if remote.exists(f"releases/{release}.json"):
+        print(f"Error: release {release} already exists on {args.remote}", file=sys.stderr)
+        return 1
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "release": release,
+        "previous": previous["release"] if previous else None,
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "files": scan_repo(repo, args.jobs),
+        "extensions": load_extensions(repo),
+    }
+    delta = diff_releases(previous, manifest)
+
+    # One upload per distinct blob the remote is missing
+    blobs = {}
+    for path, info in manifest["files"].items():
+        blobs.setdefault(info["sha256"], path)
+    known = {f["sha256"] for f in previous["files"].values()} if previous else set()
+    candidates = [digest for digest in blobs if digest not in known]
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        present = list(pool.map(lambda d: remote.exists(object_path(d)), candidates))
+    missing = [digest for digest, there in zip(candidates, present) if not there]
+    upload_bytes = sum(manifest["files"][blobs[d]]["size"] for d in missing)
+
+    if not args.dry_run:
+        with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+            list(pool.map(lambda d: remote.upload(object_path(d), repo / blobs[d]), missing))
+        write_json(remote, f"releases/{release}.json", manifest)
+        write_json(remote, f"releases/{release}.delta.json", delta)
+        write_json(remote, "latest.json", {"release": release, "previous": manifest["previous"]})
+
+    total = sum(f["size"] for f in manifest["files"].values())
+    ext = delta["extensions"]
+    print(f"Release {release}" + (f" (previous: {manifest['previous']})" if previous else " (first release)"))
+    print(f"  {len(manifest['files'])} files, {total:,} bytes, {len(manifest['extensions'])} extensions")
+    print(f"  Extensions: +{len(ext['added'])} added, ~{len(ext['updated'])} updated, -{len(ext['removed'])} removed")
+    print(f"  Files: +{len(delta['added'])} added, ~{len(delta['changed'])} changed, -{len(delta['removed'])} removed")
+    print(f"  Uploaded {len(missing)} new blob(s), {upload_bytes:,} bytes"
+          + (" (dry run, nothing written)" if args.dry_run else ""))
+    return 0
+
+def release_chain(remote, start, target: str) -> list:
+    """Deltas to apply to go from release `start` (None: empty) to `target`."""
+    chain = []
+    release = target
+    while release and release != start:
+        delta = read_json(remote, f"releases/{release}.delta.json")
+        if delta is None:
+            return None
+        chain.append(delta)
+        release = delta["from"]
+    if release != start:
+        return None
+    return list(reversed(chain))
+
+def sync(args) -> int:
+    remote = open_remote(args.remote)
+    mirror = Path(args.mirror)
+    latest = read_json(remote, "latest.json")
+    if not latest:
+        print(f"Error: nothing published on {args.remote}", file=sys.stderr)
+        return 1
+    state_path = mirror / ".release.json"
+    current = json.loads(state_path.read_text(encoding="utf-8"))["release"] if state_path.is_file() else None
+    target = latest["release"]
+    if current == target:
+        print(f"{mirror} is at {target}, nothing to do")
+        return 0
+
+    # Follow deltas when the mirror's release is in the chain, else fetch the full manifest
+    chain = release_chain(remote, current, target) if current else None
+    if chain:
+        wanted, removed = {}, set()
+        for delta in chain:
+            for path in delta["removed"]:
+                wanted.pop(path, None)
+                removed.add(path)
+            for path, info in {**delta["added"], **delta["changed"]}.items():
+                wanted[path] = info
+                removed.discard(path)
+    else:
+        manifest = read_json(remote, f"releases/{target}.json")
+        wanted = manifest["files"]
+        on_disk = {p.relative_to(mirror).as_posix() for p in mirror.rglob("*") if p.is_file()} if mirror.is_dir() else set()
+        removed = {p for p in on_disk - set(wanted) if not p.startswith(".") and p not in SKIP}
+
+    fetch = {path: info for path, info in wanted.items()
+             if not ((mirror / path).is_file() and sha256_file(mirror / path) == info["sha256"])}
+
+    def download(item):
+        path, info = item
+        data = remote.read(object_path(info["sha256"]))
+        if data is None or hashlib.sha256(data).hexdigest() != info["sha256"]:
+            raise OSError(f"blob for {path} is missing or corrupt on the remote")
+        dest = mirror / path
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(dest.name + ".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, dest)
+        return len(data)
+
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        fetched = sum(pool.map(download, fetch.items()))
+    for path in removed:
+        (mirror / path).unlink(missing_ok=True)
+    mirror.mkdir(parents=True, exist_ok=True)
+    state_path.write_text(json.dumps({"release": target}) + "\n", encoding="utf-8")
+
+    how = f"{len(chain)} delta(s)" if chain else "full manifest"
+    print(f"{mirror}: {current or 'empty'} -> {target} via {how}")
+    print(f"  Downloaded {len(fetch)} file(s), {fetched:,} bytes; removed {len(removed)}")
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Content-addressed publishing of the extension repo")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    publish_parser = commands.add_parser("publish", help="Upload build/repo as a new release")
+    publish_parser.add_argument("--repo", default=str(DEFAULT_REPO), help=f"Built repo (default: {DEFAULT_REPO})")
+    publish_parser.add_argument("--remote", required=True, help="Store directory or http(s) URL")
+    publish_parser.add_argument("--release", help="Release name (default: UTC timestamp)")
+    publish_parser.add_argument("--dry-run", action="store_true", help="Report what would be uploaded")
+    publish_parser.add_argument("--jobs", "-j", type=int, default=8, help="Parallel hashes and uploads")
+
+    sync_parser = commands.add_parser("sync", help="Bring a plain repo tree up to the latest release")
+    sync_parser.add_argument("mirror", help="Mirror directory (apk/, icon/, index.json, ...)")
+    sync_parser.add_argument("--remote", required=True, help="Store directory or http(s) URL")
+    sync_parser.add_argument("--jobs", "-j", type=int, default=8, help="Parallel downloads")
+
+    args = parser.parse_args()
+    try:
+        status = publish(args) if args.command == "publish" else sync(args)
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        status = 1
+    sys.exit(status)
+
+if __name__ == "__main__":
+    main()
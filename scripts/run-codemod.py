@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Run a codemod rule set (scripts/codemods/*.json) over every Kotlin file in
+sources/ and write a report of the changes.
+
+Files are scanned in a process pool, one pass per file for all rules. Scan
+results are cached in .cache/codemod-<rules>.json by content hash, so
+unchanged files are skipped until the rules change. Rewrites only touch
+files with pending changes and are written atomically; after writing, the
+files are scanned again to prove the run is idempotent.
+
+Usage:
+    python scripts/run-codemod.py                          # Dry run of the kmp rules
+    python scripts/run-codemod.py --write --report         # Migrate, write codemod-report.csv
+    python scripts/run-codemod.py --check                  # CI: exit 1 if anything is left to rewrite
+    python scripts/run-codemod.py --rules path/to/rules.json --report out.csv
+
+The report is the CSV ("Source","File","Change","Status") plus a summary in
+<report>-summary.txt. Dry runs list rewrites as Pending; --write as Replaced.
+migration-report.csv is the record of the original Jsoup -> Ksoup migration;
+it is only overwritten when passed explicitly as --report.
+"""
+
+import argparse
+import csv
+import datetime
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+
+from codemod_engine import ATTENTION, PENDING, REPLACED, RuleError, apply_file, load_rules, scan_file, source_of
+from source_catalog import cached_parse
+
+CACHE_VERSION = 1
+DEFAULT_REPORT = "codemod-report.csv"
+
+def pending_rewrites(changes) -> bool:
+    return any(status == REPLACED for _, status, _ in changes)
+
+def report_rows(results: dict, written: bool) -> list:
+    rows = []
+    for key in sorted(results):
+        for change, status, _ in results[key]:
+            if status == REPLACED and not written:
+                status = PENDING
+            rows.append([source_of(key), key.rsplit("/", 1)[-1], change, status])
+    return rows
+
+def write_report(path: Path, rows: list):
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f, quoting=csv.QUOTE_ALL, lineterminator="\n")
+        writer.writerow(["Source", "File", "Change", "Status"])
+        writer.writerows(rows)
+    os.replace(tmp, path)
+
+    by_status, by_source = {}, {}
+    for source, _, _, status in rows:
+        by_status[status] = by_status.get(status, 0) + 1
+        by_source[source] = by_source.get(source, 0) + 1
+    lines = [
+        "IReader KMP Migration Report",
+        "============================",
+        f"Generated: {datetime.datetime.now():%m/%d/%Y %H:%M:%S}",
+        "",
+        f"Total Changes: {len(rows)}",
+        "",
+        "By Status:",
+        *(f"  {status}: {count}" for status, count in by_status.items()),
+        "",
+        "By Source:",
+        *(f"  {source}: {count} changes" for source, count in by_source.items()),
+    ]
+    summary = path.with_name(f"{path.stem}-summary.txt")
+    summary.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return summary
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a codemod rule set over the sources")
+    parser.add_argument("--rules", default="kmp", help="Rule set name in scripts/codemods/ or a JSON file (default: kmp)")
+    parser.add_argument("--path", default="sources", help="Sources directory (default: sources)")
+    parser.add_argument("--write", action="store_true", help="Rewrite the files")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if any file still needs a rewrite")
+    parser.add_argument("--report", nargs="?", const=DEFAULT_REPORT, help=f"Write the CSV report (default: {DEFAULT_REPORT})")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 4, help="Parallel workers")
+    parser.add_argument("--rebuild", action="store_true", help="Ignore the cached scan results")
+    args = parser.parse_args()
+
+    try:
+        rules = load_rules(args.rules)
+    except RuleError as e:
+        sys.exit(f"Error: {e}")
+    rules_key = args.rules if not Path(args.rules).is_file() else str(Path(args.rules).resolve())
+
+    base = Path(args.path)
+    root = base.resolve().parent
+    cache = root / ".cache" / f"codemod-{rules.name}.json"
+    version = f"{CACHE_VERSION}-{rules.fingerprint}"
+    scan = partial(scan_file, rules_key)
+
+    started = time.perf_counter()
+    files = sorted(base.resolve().rglob("*.kt"))
+    results = cached_parse(files, root, scan, cache, version, args.rebuild, args.jobs)
+    pending = sorted(key for key, changes in results.items() if pending_rewrites(changes))
+    scanned = time.perf_counter() - started
+
+    if args.write and pending:
+        paths = [root / key for key in pending]
+        if args.jobs > 1 and len(paths) > 1:
+            with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+                applied = list(pool.map(partial(apply_file, rules_key), paths))
+        else:
+            applied = [apply_file(rules_key, path) for path in paths]
+        results.update(zip(pending, applied))
+        rescan = cached_parse(files, root, scan, cache, version, False, args.jobs)
+        leftover = sorted(key for key, changes in rescan.items() if pending_rewrites(changes))
+        if leftover:
+            print(f"Warning: {rules.name} rules match their own output in {len(leftover)} file(s), "
+                  f"e.g. {leftover[0]}", file=sys.stderr)
+    elapsed = time.perf_counter() - started
+
+    rows = report_rows(results, args.write)
+    counts = {}
+    for row in rows:
+        counts[row[3]] = counts.get(row[3], 0) + 1
+
+    print(f"\n=== {rules.name}: {len(files)} file(s) scanned in {scanned:.2f}s, total {elapsed:.2f}s ===\n")
+    touched = sorted({(row[0], row[1]) for row in rows})
+    for source, name in touched[:40]:
+        changes = [row for row in rows if row[0] == source and row[1] == name]
+        print(f"  {source}/{name}")
+        for _, _, change, status in changes:
+            print(f"      [{status}] {change}")
+    if len(touched) > 40:
+        print(f"  ... and {len(touched) - 40} more file(s)")
+    print(f"\n{counts.get(REPLACED, 0)} replaced, {counts.get(PENDING, 0)} pending, "
+          f"{counts.get(ATTENTION, 0)} need attention")
+
+    if args.report:
+        summary = write_report(Path(args.report), rows)
+        print(f"Report: {args.report}, {summary}")
+    if args.check and pending and not args.write:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
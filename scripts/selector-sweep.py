@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Selector-health sweep: run every source's DSL selectors against a versioned
+corpus of saved pages and record which sources broke and which selectors are
+slow.
+
+The corpus keeps one folder per capture date for each source, named like the
+fixtures of smoke-test.py:
+
+    corpus/en/novelfull/2026-10-16/listing.html, detail.html, chapter.html
+    corpus/multisrc/readwn/wuxiav/2026-09-01/...
+
+The corpus is served over HTTP from 127.0.0.1, standing in for the live sites,
+and sources are swept in parallel processes. Each selector's match time is
+measured on the page it runs against.
+
+Usage:
+    python scripts/selector-sweep.py --add novelfull ./saved-pages     # Store a new capture
+    python scripts/selector-sweep.py                                   # Sweep the latest captures
+    python scripts/selector-sweep.py --as-of 2026-09-01                # As the corpus was then
+    python scripts/selector-sweep.py --write                           # Update the tracker files
+    python scripts/selector-sweep.py --corpus-url http://host:8000/    # Use a corpus server
+
+--write marks failing sources in not-working-source.json as "need update",
+including ones listed as "Working"; entries with any other status are
+hand-written notes and are left alone. CI disables every source listed in
+that file, so once a source passes again its entry is deleted, or put back to
+what it was if it was listed before. The sweep's own entries, counts and
+timings go to the "selectorHealth" section of sources-fix-tracker.json.
+Sources whose pages could not be fetched count as errors and change nothing.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from html_dom import parse_html
+from selector_detect import find_snapshots
+from source_catalog import load_catalog
+from source_selectors import STAGES, failed, load_source_selectors, run_stages
+
+NOT_WORKING = Path("not-working-source.json")
+FIX_TRACKER = Path("sources-fix-tracker.json")
+SWEEP_STATUS = "need update"
+WORKING_STATUS = "Working"
+FETCH_TIMEOUT = 30
+SLOW_SELECTOR_MS = 50.0
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+def serve_corpus(root: Path):
+    """Serve `root` on a free local port; returns (server, base URL)."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(QuietHandler, directory=str(root)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/"
+
+def pick_version(folder: Path, as_of=None):
+    """Latest capture folder of one source, or the latest on or before `as_of`."""
+    versions = sorted(d.name for d in folder.iterdir() if d.is_dir() and find_snapshots(d))
+    if as_of:
+        versions = [v for v in versions if v <= as_of]
+    return versions[-1] if versions else None
+
+def fetch(url: str) -> str:
+    with urllib.request.urlopen(url, timeout=FETCH_TIMEOUT) as response:
+        return response.read().decode("utf-8", errors="replace")
+
+def sweep_source(job):
+    """Fetch one source's pages from the corpus server and run its selectors."""
+    key, label, version, stages, pages = job
+    timings = {}
+    fetch_seconds = [0.0]
+
+    def load(url):
+        started = time.perf_counter()
+        html = fetch(url)
+        fetch_seconds[0] += time.perf_counter() - started
+        return parse_html(html)
+
+    started = time.perf_counter()
+    try:
+        results = run_stages(stages, pages, load, timings)
+    except OSError as e:
+        # The corpus server, not the source, is broken
+        results = {stage: {"ok": False, "error": f"fetch failed: {e}"} for stage in STAGES}
+        status = "error"
+    else:
+        if failed(results):
+            status = "fail"
+        elif all(result["ok"] is None for result in results.values()):
+            status = "skip"
+        else:
+            status = "pass"
+    return {
+        "key": key,
+        "source": label,
+        "version": version,
+        "status": status,
+        "stages": results,
+        "selectors": {selector: {"ms": round(seconds * 1000, 2), "calls": calls}
+                      for selector, (seconds, calls) in sorted(timings.items(), key=lambda t: -t[1][0])},
+        "fetchMs": round(fetch_seconds[0] * 1000, 1),
+        "ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+
+def find_module(catalog, wanted: str):
+    for module in catalog.modules():
+        names = {r.name.lower() for r in catalog.by_module(module)}
+        if wanted.lower() in names or module.endswith("/" + wanted.strip("/")):
+            return module
+    return None
+
+def add_capture(catalog, corpus: Path, wanted: str, folder: Path, version: str):
+    module = find_module(catalog, wanted)
+    if not module:
+        sys.exit(f"Error: no source named {wanted}")
+    snapshots = find_snapshots(folder)
+    if not snapshots:
+        sys.exit(f"Error: no listing/detail/chapter .html files in {folder}")
+    target = corpus / Path(module).relative_to(catalog.base) / version
+    target.mkdir(parents=True, exist_ok=True)
+    for path in snapshots.values():
+        shutil.copyfile(path, target / path.name)
+    print(f"Stored {len(snapshots)} page(s) as {target}")
+
+def stage_counts(result: dict) -> dict:
+    """Numbers and verdict of one stage, without the sample strings."""
+    return {k: v for k, v in result.items() if k in ("ok", "error") or isinstance(v, (int, float)) and not isinstance(v, bool)}
+
+def write_json(path: Path, data: dict):
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+
+def update_trackers(results: list, root: Path, corpus: str, today: str):
+    not_working_path = root / NOT_WORKING
+    not_working = json.loads(not_working_path.read_text(encoding="utf-8")) if not_working_path.exists() else {}
+    sources = not_working.get("sources", {})
+    tracker_path = root / FIX_TRACKER
+    tracker = json.loads(tracker_path.read_text(encoding="utf-8")) if tracker_path.exists() else {}
+    # Entries the sweep wrote, with the status they had before (None: not listed)
+    marked = {key: previous for key, previous in tracker.get("selectorHealth", {}).get("marked", {}).items()
+              if sources.get(key) == SWEEP_STATUS}
+    added, cleared = [], []
+    for result in results:
+        key = result["key"]
+        status = sources.get(key, WORKING_STATUS)
+        if result["status"] == "fail" and status == WORKING_STATUS:
+            marked[key] = sources.get(key)
+            sources[key] = SWEEP_STATUS
+            added.append(key)
+        elif result["status"] == "pass" and key in marked:
+            previous = marked.pop(key)
+            if previous is None:
+                del sources[key]
+            else:
+                sources[key] = previous
+            cleared.append(key)
+    not_working["lastUpdated"] = today
+    not_working["sources"] = dict(sorted(sources.items()))
+    write_json(not_working_path, not_working)
+
+    tracker["selectorHealth"] = {
+        "lastRun": today,
+        "corpus": corpus,
+        "passed": sum(r["status"] == "pass" for r in results),
+        "failed": sum(r["status"] == "fail" for r in results),
+        "errors": sum(r["status"] == "error" for r in results),
+        "marked": dict(sorted(marked.items())),
+        "sources": {
+            r["key"]: {
+                "status": r["status"],
+                "version": r["version"],
+                "stages": {stage: stage_counts(value) for stage, value in r["stages"].items()},
+                "selectorMs": {selector: t["ms"] for selector, t in r["selectors"].items()},
+            }
+            for r in sorted(results, key=lambda r: r["key"])
+        },
+    }
+    write_json(tracker_path, tracker)
+    return added, cleared
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep source selectors over the snapshot corpus")
+    parser.add_argument("sources", nargs="*", help="Source names or module paths (default: all in the corpus)")
+    parser.add_argument("--path", default="sources", help="Sources directory (default: sources)")
+    parser.add_argument("--corpus", type=Path, default=Path("corpus"), help="Corpus directory (default: corpus)")
+    parser.add_argument("--corpus-url", help="Fetch the corpus from this server instead of serving it locally")
+    parser.add_argument("--as-of", metavar="VERSION", help="Use the latest capture on or before this version")
+    parser.add_argument("--add", nargs=2, metavar=("SOURCE", "DIR"), help="Store saved pages as a new capture")
+    parser.add_argument("--version", default=datetime.date.today().isoformat(), help="Capture name for --add")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 4, help="Parallel workers")
+    parser.add_argument("--slow", type=float, default=SLOW_SELECTOR_MS, help="Report selectors slower than this (ms)")
+    parser.add_argument("--write", action="store_true", help="Update not-working-source.json and sources-fix-tracker.json")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    base = Path(args.path)
+    root = base.resolve().parent
+    catalog = load_catalog(base)
+    if args.add:
+        add_capture(catalog, args.corpus, args.add[0], Path(args.add[1]), args.version)
+        return
+
+    started = time.perf_counter()
+    server = None
+    if args.corpus_url:
+        url = args.corpus_url.rstrip("/") + "/"
+    else:
+        if not args.corpus.is_dir():
+            sys.exit(f"Error: corpus {args.corpus} not found; store captures with --add")
+        server, url = serve_corpus(args.corpus)
+
+    wanted = {find_module(catalog, name) for name in args.sources}
+    if None in wanted:
+        sys.exit(f"Error: unknown source in {' '.join(args.sources)}")
+    selectors = load_source_selectors(catalog)
+    jobs = []
+    for module, stages in sorted(selectors.items()):
+        rel = Path(module).relative_to(base)
+        folder = args.corpus / rel
+        if wanted and module not in wanted:
+            continue
+        if not folder.is_dir():
+            continue
+        version = pick_version(folder, args.as_of)
+        if not version:
+            continue
+        pages = {kind: f"{url}{rel.as_posix()}/{version}/{path.name}"
+                 for kind, path in find_snapshots(folder / version).items()}
+        records = catalog.by_module(module)
+        label = f"{records[0].name} ({records[0].lang})" if records else module
+        jobs.append((rel.name, label, version, stages, pages))
+
+    try:
+        if len(jobs) > 1 and args.jobs > 1:
+            with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+                results = list(pool.map(sweep_source, jobs, chunksize=max(1, len(jobs) // (args.jobs * 4))))
+        else:
+            results = [sweep_source(job) for job in jobs]
+    finally:
+        if server:
+            server.shutdown()
+    elapsed = time.perf_counter() - started
+
+    if args.write and results:
+        added, cleared = update_trackers(results, root, args.corpus.as_posix(), datetime.date.today().isoformat())
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    elif not results:
+        print(f"No captures found under {args.corpus}.")
+    else:
+        print(f"\n=== {len(results)} source(s) swept ({elapsed:.2f}s) ===\n")
+        print(f"{'Source':<32} {'Capture':<12} {'Status':<7} {'Items':>7} {'Chapters':>9} {'Select ms':>10}")
+        print("-" * 82)
+        for r in sorted(results, key=lambda r: (r["status"] != "fail", r["key"])):
+            explore, chapters = r["stages"]["explore"], r["stages"]["chapters"]
+            select_ms = sum(t["ms"] for t in r["selectors"].values())
+            print(f"{r['source'][:32]:<32} {r['version']:<12} {r['status']:<7} "
+                  f"{explore.get('valid', '-'):>7} {chapters.get('valid', '-'):>9} {select_ms:>10.1f}")
+
+        slow = sorted(((t["ms"], r["key"], selector) for r in results for selector, t in r["selectors"].items()
+                       if t["ms"] > args.slow), reverse=True)
+        if slow:
+            print(f"\nSelectors slower than {args.slow:g} ms:")
+            for ms, key, selector in slow[:20]:
+                print(f"  {ms:>8.1f} ms  {key:<20} {selector}")
+        counts = {status: sum(r["status"] == status for r in results) for status in ("pass", "fail", "skip", "error")}
+        print(f"\n{counts['pass']} passed, {counts['fail']} failed, {counts['skip']} without DSL selectors"
+              + (f", {counts['error']} not fetched" if counts["error"] else ""))
+
+    if args.write and results and not args.json:
+        print(f"Updated {NOT_WORKING} (+{len(added)} need update, -{len(cleared)} fixed) and {FIX_TRACKER}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+"""
+Offline CSS selector detection from saved page snapshots.
+
+Given a folder with a site's pages saved from the browser:
+
+    listing.html    a Latest/Popular listing page
+    detail.html     a novel's detail page
+    chapters.html   the chapter list (optional, detail.html is used otherwise)
+    chapter.html    a chapter's reading page
+
+candidate selectors are scored on the parsed tree: repeated sibling
+structures for the listing and chapter list, the largest text-dense block for
+chapter content, and class/href hints for the detail fields. The result maps
+straight onto BaseExploreFetcher, SourceFactory.Detail, Chapters and Content.
+"""
+
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from html_dom import Node, SelectorError, parse_file, select, select_one
+
+SNAPSHOT_NAMES = {
+    "listing": ("listing", "latest", "popular", "explore", "list"),
+    "detail": ("detail", "novel", "book", "info"),
+    "chapters": ("chapters", "chapter-list", "toc"),
+    "chapter": ("chapter", "content", "reader"),
+}
+
+DEFAULT_SELECTORS = {
+    "explore_selector": ".novel-item",
+    "explore_name": ".title",
+    "explore_cover": "img",
+    "explore_cover_att": "src",
+    "explore_link": "a",
+    "explore_link_att": "href",
+    "detail_name": "h1",
+    "detail_cover": ".cover img",
+    "detail_cover_att": "src",
+    "detail_description": ".description",
+    "detail_author": ".author",
+    "detail_category": ".genres a",
+    "detail_status": ".status",
+    "chapter_selector": ".chapter-list li",
+    "chapter_name": "a",
+    "chapter_link": "a",
+    "chapter_link_att": "href",
+    "chapter_reverse": True,
+    "content_title": "h1",
+    "content_selector": ".chapter-content p",
+}
+
+UNSTABLE_CLASS = re.compile(
+    r'\d{3,}|^(active|current|selected|odd|even|first|last|clearfix|hidden|show|open|'
+    r'row|col|col-.*|d-.*|m[trblxy]?-\d|p[trblxy]?-\d|text-.*|lazy.*|loaded|swiper-.*)$'
+)
+CHROME_HINT = re.compile(r'nav|menu|footer|header|breadcrumb|sidebar|widget|pagination|comment|social|share', re.I)
+CHAPTER_TEXT = re.compile(r'chapter|chap\b|ch\.\s*\d|episode|\bep\.?\s*\d|第|章|глава|bölüm|capítulo|chapitre|فصل|\d+', re.I)
+CHAPTER_NUMBER = re.compile(r'(\d+(?:\.\d+)?)')
+LAZY_ATTRS = ("data-src", "data-lazy-src", "data-original", "data-lazy", "data-cfsrc", "src")
+
+def find_snapshots(folder) -> Dict[str, Path]:
+    """Map each page kind to a saved file in `folder`, by file stem."""
+    folder = Path(folder)
+    files = {p.stem.lower(): p for p in folder.glob("*.htm*")}
+    found = {}
+    for kind, stems in SNAPSHOT_NAMES.items():
+        for stem in stems:
+            if stem in files:
+                found[kind] = files[stem]
+                break
+    return found
+
+def _stable_classes(node: Node) -> List[str]:
+    return [c for c in node.classes if not UNSTABLE_CLASS.search(c)][:2]
+
+def token(node: Node) -> str:
+    """Short selector for a node: tag plus up to two stable classes."""
+    classes = _stable_classes(node)
+    return node.tag + "".join(f".{c}" for c in classes)
+
+def _is_chrome(node: Node) -> bool:
+    for element in [node, *node.ancestors()]:
+        if element.tag in ("nav", "header", "footer", "aside"):
+            return True
+        hint = element.attrs.get("class", "") + " " + element.attrs.get("id", "")
+        if hint.strip() and CHROME_HINT.search(hint):
+            return True
+    return False
+
+def unique_selector(node: Node, root: Node) -> str:
+    """Shortest selector from `token` up the ancestors that matches `node` first."""
+    if node.id and not UNSTABLE_CLASS.search(node.id):
+        return f"#{node.id}"
+    selector = token(node)
+    for ancestor in node.ancestors():
+        try:
+            matches = select(root, selector)
+        except SelectorError:
+            break
+        if matches and matches[0] is node and len(matches) == 1:
+            return selector
+        if ancestor.tag == "#root":
+            break
+        if ancestor.id and not UNSTABLE_CLASS.search(ancestor.id):
+            return f"#{ancestor.id} {selector}"
+        if _stable_classes(ancestor):
+            selector = f"{token(ancestor)} {selector}"
+    return selector
+
+def relative_selector(items: List[Node], pick) -> Optional[str]:
+    """Selector, relative to each item, that finds what `pick(item)` returns in most items."""
+    targets = [(item, pick(item)) for item in items]
+    targets = [(item, target) for item, target in targets if target is not None]
+    if not targets:
+        return None
+    candidates = []
+    for _, target in targets[:5]:
+        for candidate in (target.tag, token(target)):
+            if candidate not in candidates:
+                candidates.append(candidate)
+    best, best_hits = None, 0
+    for candidate in candidates:
+        hits = sum(1 for item, target in targets if select_one(item, candidate) is target)
+        if hits > best_hits:
+            best, best_hits = candidate, hits
+    return best
+
+def repeated_groups(root: Node, min_count: int = 3):
+    """Yield (parent, signature, items) for sibling runs sharing tag and classes."""
+    for parent in root.iter():
+        if len(parent.children) < min_count:
+            continue
+        groups = {}
+        for child in parent.children:
+            key = (child.tag, tuple(sorted(_stable_classes(child))))
+            groups.setdefault(key, []).append(child)
+        for key, items in groups.items():
+            if len(items) >= min_count:
+                yield parent, key, items
+
+def _link(item: Node) -> Optional[Node]:
+    for node in item.iter():
+        if node.tag == "a" and node.attr("href") and not node.attr("href").startswith(("#", "javascript")):
+            return node
+    return None
+
+def _image(item: Node) -> Optional[Node]:
+    return next((n for n in item.iter() if n.tag == "img"), None)
+
+def _image_attr(images: List[Node]) -> str:
+    for attr in LAZY_ATTRS:
+        if images and sum(1 for img in images if img.attr(attr).strip()) >= len(images) / 2:
+            return attr
+    return "src"
+
+def group_selector(parent: Node, items: List[Node], root: Node) -> str:
+    """Selector that matches exactly the items of a repeated group."""
+    item_token = token(items[0])
+    try:
+        if item_token != items[0].tag and len(select(root, item_token)) == len(items):
+            return item_token
+    except SelectorError:
+        pass
+    return f"{unique_selector(parent, root)} > {item_token}"
+
+def best_list(root: Node, chapter_like: bool = False):
+    """Highest scoring repeated structure, or (None, None, [])."""
+    best, best_score = (None, None, []), 0.0
+    for parent, key, items in repeated_groups(root):
+        if _is_chrome(parent):
+            continue
+        links = [_link(item) for item in items]
+        link_frac = sum(1 for link in links if link is not None) / len(items)
+        if link_frac < 0.6:
+            continue
+        hrefs = {link.attr("href") for link in links if link is not None}
+        distinct = len(hrefs) / len(items)
+        texts = [item.text() for item in items]
+        avg_text = sum(len(t) for t in texts) / len(items)
+        if chapter_like:
+            chapterish = sum(1 for t in texts if CHAPTER_TEXT.search(t)) / len(items)
+            score = len(items) * link_frac * distinct * (0.2 + chapterish)
+        else:
+            img_frac = sum(1 for item in items if _image(item) is not None) / len(items)
+            score = len(items) * link_frac * distinct * (1 + 2 * img_frac) * min(avg_text, 60) / 60
+        if score > best_score:
+            best, best_score = (parent, key, items), score
+    return best
+
+def detect_listing(root: Node) -> Dict[str, str]:
+    parent, _, items = best_list(root)
+    if not items:
+        return {}
+    result = {"explore_selector": group_selector(parent, items, root)}
+
+    def name_node(item):
+        for node in item.iter():
+            if node.tag in ("h1", "h2", "h3", "h4", "h5", "h6") and node.text():
+                return node
+        for node in item.iter():
+            if re.search(r'title|name', node.attrs.get("class", ""), re.I) and node.text():
+                return node
+        links = [n for n in item.iter() if n.tag == "a" and n.text()]
+        return max(links, key=lambda n: len(n.text()), default=None)
+
+    name = relative_selector(items, name_node)
+    link = relative_selector(items, _link)
+    cover = relative_selector(items, _image)
+    if name:
+        result["explore_name"] = name
+    if link:
+        result["explore_link"] = link
+        result["explore_link_att"] = "href"
+    if cover:
+        result["explore_cover"] = cover
+        result["explore_cover_att"] = _image_attr([img for img in map(_image, items) if img])
+    return result
+
+def detect_chapters(root: Node) -> Dict[str, object]:
+    parent, _, items = best_list(root, chapter_like=True)
+    if not items:
+        return {}
+    link = relative_selector(items, _link) or "a"
+    result = {
+        "chapter_selector": group_selector(parent, items, root),
+        "chapter_name": link,
+        "chapter_link": link,
+        "chapter_link_att": "href",
+    }
+    numbers = []
+    for item in (items[0], items[-1]):
+        match = CHAPTER_NUMBER.search(item.text())
+        numbers.append(float(match.group(1)) if match else None)
+    if None not in numbers and numbers[0] != numbers[1]:
+        result["chapter_reverse"] = numbers[0] > numbers[1]
+    return result
+
+def detect_content(root: Node) -> Dict[str, str]:
+    best, best_score = None, 0.0
+    for node in root.iter():
+        if node.tag not in ("div", "article", "section", "main", "td") or _is_chrome(node):
+            continue
+        direct = sum(len(child.text()) for child in node.children if child.tag == "p")
+        direct += len(node.own_text())
+        if direct < 200:
+            continue
+        link_text = sum(len(a.text()) for a in node.iter() if a.tag == "a")
+        density = 1 - min(link_text / max(len(node.text()), 1), 1)
+        score = direct * density
+        if score > best_score:
+            best, best_score = node, score
+    if best is None:
+        return {}
+
+    container = unique_selector(best, root)
+    paragraphs = [child for child in best.children if child.tag == "p"]
+    result = {"content_selector": f"{container} p" if len(paragraphs) >= 3 else container}
+
+    headings = [n for n in root.iter() if n.tag in ("h1", "h2", "h3") and n.text() and not _is_chrome(n)]
+    titled = [n for n in headings if CHAPTER_TEXT.search(n.text())]
+    if titled or headings:
+        result["content_title"] = unique_selector((titled or headings)[0], root)
+    return result
+
+def _hinted(root: Node, pattern: str) -> List[Node]:
+    hint = re.compile(pattern, re.I)
+    return [
+        n for n in root.iter()
+        if n.tag != "#root" and hint.search(n.attrs.get("class", "") + " " + n.attrs.get("id", ""))
+        and not _is_chrome(n)
+    ]
+
+def detect_detail(root: Node) -> Dict[str, str]:
+    result = {}
+    heading = next((n for n in root.iter() if n.tag == "h1" and n.text() and not _is_chrome(n)), None)
+    if heading is not None:
+        result["detail_name"] = unique_selector(heading, root)
+
+    for holder in _hinted(root, r'cover|thumb|poster|book-img|summary_image'):
+        img = holder if holder.tag == "img" else _image(holder)
+        if img is not None:
+            result["detail_cover"] = unique_selector(img, root) if holder is img else f"{unique_selector(holder, root)} img"
+            result["detail_cover_att"] = _image_attr([img])
+            break
+
+    descriptions = _hinted(root, r'summary|desc|synopsis|intro|about')
+    if descriptions:
+        desc = max(descriptions, key=lambda n: len(n.text()))
+        if desc.text():
+            result["detail_description"] = unique_selector(desc, root)
+
+    author_links = [n for n in root.iter() if n.tag == "a" and re.search(r'author', n.attr("href"), re.I)]
+    if author_links:
+        result["detail_author"] = 'a[href*=author]'
+    else:
+        authors = [n for n in _hinted(root, r'author') if n.text()]
+        if authors:
+            result["detail_author"] = unique_selector(authors[0], root)
+
+    genre_links = [n for n in root.iter() if n.tag == "a" and re.search(r'genre|categor|/tag', n.attr("href"), re.I)]
+    if genre_links:
+        parent = genre_links[0].parent
+        siblings = [n for n in genre_links if n.parent is parent]
+        if len(siblings) >= 2 and parent.tag != "#root":
+            result["detail_category"] = f"{unique_selector(parent, root)} a"
+        else:
+            hint = re.search(r'genre|categor|/tag', genre_links[0].attr("href"), re.I).group(0).strip("/")
+            result["detail_category"] = f"a[href*={hint.lower()}]"
+
+    statuses = [n for n in _hinted(root, r'status') if n.text()]
+    if statuses:
+        result["detail_status"] = unique_selector(min(statuses, key=lambda n: len(n.text())), root)
+    return result
+
+def detect_selectors(folder) -> Dict[str, object]:
+    """
+    Detect selectors from the snapshots in `folder`. Missing pages or fields
+    fall back to DEFAULT_SELECTORS; `detected` lists the keys that were found.
+    """
+    snapshots = find_snapshots(folder)
+    detected = {}
+    trees = {kind: parse_file(path) for kind, path in snapshots.items()}
+
+    if "listing" in trees:
+        detected.update(detect_listing(trees["listing"]))
+    if "detail" in trees:
+        detected.update(detect_detail(trees["detail"]))
+    chapter_tree = trees.get("chapters") or trees.get("detail")
+    if chapter_tree is not None:
+        detected.update(detect_chapters(chapter_tree))
+    if "chapter" in trees:
+        detected.update(detect_content(trees["chapter"]))
+
+    selectors = dict(DEFAULT_SELECTORS)
+    selectors.update(detected)
+    selectors["detected"] = sorted(detected)
+    return selectors
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Smoke-test source selectors against saved pages, offline and without Gradle.
+
+Selectors come from each source's Kotlin DSL (BaseExploreFetcher,
+SourceFactory.Detail/Chapters/Content) and are applied to fixtures the way
+SourceFactory applies them at runtime. Fixtures are saved pages laid out like
+the sources tree, named as for detect-selectors.py:
+
+    fixtures/en/novelfull/listing.html    explore
+    fixtures/en/novelfull/detail.html     detail (and chapters, unless chapters.html exists)
+    fixtures/en/novelfull/chapter.html    content
+    fixtures/multisrc/readwn/wuxiav/...   multisrc variant
+
+Usage:
+    python scripts/smoke-test.py                          # Every source with fixtures
+    python scripts/smoke-test.py novelfull en/fanmtl      # Only these (name or module)
+    python scripts/smoke-test.py --json > smoke.json      # Machine-readable
+    python scripts/detect-selectors.py ./saved-pages --json > fields.json
+    python scripts/smoke-test.py --fields fields.json --snapshots ./saved-pages  # Before generating
+
+Sources are checked in parallel across processes. Exit code 1 if any stage fails.
+Sources without DSL selectors (most multisrc variants) are listed as "no
+selectors", and ones whose fixtures no stage reads as "untested"; neither
+counts as passed.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from html_dom import parse_file
+from selector_detect import find_snapshots
+from source_catalog import load_catalog
+from source_selectors import STAGES, failed, load_source_selectors, run_stages, selectors_from_fields, stage_cell
+
+def verdict(results: dict) -> str:
+    """passed, failed, no selectors (nothing to run) or untested (no fixture for any stage)."""
+    if failed(results):
+        return "failed"
+    if all(result["ok"] is None for result in results.values()):
+        return "no selectors" if all(r.get("error") == "no DSL selectors" for r in results.values()) else "untested"
+    return "passed"
+
+def check_source(job):
+    """Run every stage of one source on its fixtures; picklable for the process pool."""
+    label, stages, folder = job
+    started = time.perf_counter()
+    pages = {kind: path.as_posix() for kind, path in find_snapshots(folder).items()}
+    results = run_stages(stages, pages, parse_file)
+    return {
+        "source": label,
+        "fixtures": Path(folder).as_posix(),
+        "status": verdict(results),
+        "stages": results,
+        "ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+
+def selected(module: str, names: set, filters: list) -> bool:
+    if not filters:
+        return True
+    return any(f.lower() in names or module.endswith("/" + f.strip("/")) for f in filters)
+
+def main():
+    parser = argparse.ArgumentParser(description="Smoke-test source selectors against saved pages")
+    parser.add_argument("sources", nargs="*", help="Source names or module paths (default: all with fixtures)")
+    parser.add_argument("--path", default="sources", help="Sources directory (default: sources)")
+    parser.add_argument("--fixtures", type=Path, default=Path("fixtures"), help="Fixtures directory (default: fixtures)")
+    parser.add_argument("--fields", type=Path, help="Selectors from detect-selectors.py --json instead of a source")
+    parser.add_argument("--snapshots", type=Path, help="Page folder to test --fields against")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 4, help="Parallel workers")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--rebuild", action="store_true", help="Ignore the cached selectors")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    if args.fields:
+        if not args.snapshots:
+            parser.error("--fields needs --snapshots")
+        try:
+            fields = json.loads(args.fields.read_text(encoding="utf-8"))
+            jobs = [(args.fields.stem, selectors_from_fields(fields), args.snapshots)]
+        except (OSError, ValueError, KeyError) as e:
+            sys.exit(f"Error: cannot read selectors from {args.fields}: {e}")
+        total = 1
+    else:
+        base = Path(args.path)
+        catalog = load_catalog(base)
+        selectors = load_source_selectors(catalog, rebuild=args.rebuild)
+        total = len(selectors)
+        jobs = []
+        for module, stages in sorted(selectors.items()):
+            records = catalog.by_module(module)
+            if not selected(module, {r.name.lower() for r in records}, args.sources):
+                continue
+            folder = args.fixtures / Path(module).relative_to(base)
+            if folder.is_dir():
+                label = f"{records[0].name} ({records[0].lang})" if records else module
+                jobs.append((label, stages, folder))
+
+    if len(jobs) > 1 and args.jobs > 1:
+        with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            results = list(pool.map(check_source, jobs, chunksize=max(1, len(jobs) // (args.jobs * 4))))
+    else:
+        results = [check_source(job) for job in jobs]
+    elapsed = time.perf_counter() - started
+    broken = [r for r in results if r["status"] == "failed"]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        sys.exit(1 if broken else 0)
+
+    if not results:
+        print(f"No fixtures found under {args.fixtures} for {total} source module(s).")
+        return
+
+    print(f"\n=== {len(results)} source(s) with fixtures ({elapsed:.2f}s) ===\n")
+    print(f"{'Source':<32} {'Explore':<12} {'Detail':<8} {'Chapters':<12} {'Content':<10} {'ms':>6}")
+    print("-" * 84)
+    for result in results:
+        cells = [stage_cell(stage, result["stages"][stage]) for stage in STAGES]
+        print(f"{result['source'][:32]:<32} {cells[0]:<12} {cells[1]:<8} {cells[2]:<12} {cells[3]:<10} "
+              f"{result['ms']:>6.0f}")
+    print("\nvalid/items: entries with both a name and a link. - no fixture or no DSL selectors,")
+    print("? selector the offline engine cannot evaluate, FAIL sel: invalid selector")
+    counts = {status: sum(r["status"] == status for r in results)
+              for status in ("passed", "failed", "no selectors", "untested")}
+    print(", ".join(f"{count} {status}" for status, count in counts.items() if count or status in ("passed", "failed")))
+    sys.exit(1 if broken else 0)
+
+if __name__ == "__main__":
+    main()
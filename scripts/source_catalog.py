@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+Source catalog shared by the scripts in this folder.
+
+Parses every Extension(...) block under sources/ into a compact SourceRecord
+and persists the result to an on-disk index, so warm runs only re-parse the
+build.gradle.kts files whose mtime and content hash changed.
+
+Usage:
+    python scripts/source_catalog.py             # Print a summary
+    python scripts/source_catalog.py --json      # Dump every record as JSON
+    python scripts/source_catalog.py --rebuild   # Ignore the on-disk index
+
+From another script:
+    from source_catalog import load_catalog
+    catalog = load_catalog()
+    catalog.find("NovelFull", "en")
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+CACHE_VERSION = 2
+DEFAULT_CACHE = Path(".cache") / "source-catalog.json"
+
+EXTENSION_CALL = re.compile(r'\bExtension\s*\(')
+LANG_LIST = re.compile(r'listOf\(([^)]*)\)\s*\.map\s*\{\s*(\w+)\s*->')
+STRING_LITERAL = re.compile(r'"((?:[^"\\]|\\.)*)"')
+
+def generate_source_id(name: str, lang: str, version: int = 1) -> int:
+    """Same hash as generateSourceId() in buildSrc/Extension.kt."""
+    key = f"{name.lower()}/{lang}/{version}"
+    digest = hashlib.md5(key.encode()).digest()
+    return int.from_bytes(digest[:8], 'big') & 0x7FFFFFFFFFFFFFFF
+
+@dataclass
+class SourceRecord:
+    name: str
+    lang: str
+    version_code: int
+    lib_version: str
+    nsfw: bool
+    source_dir: str
+    assets_dir: str
+    source_id: int
+    module: str
+    build_file: str
+    project: str
+    explicit_id: bool = False
+    project_dependencies: List[str] = field(default_factory=list)
+    remote_dependencies: List[str] = field(default_factory=list)
+
+    @property
+    def flavor(self) -> str:
+        return self.lang if self.source_dir == "main" else f"{self.source_dir}-{self.lang}"
+
+    @property
+    def is_multisrc(self) -> bool:
+        return self.project.startswith(":extensions:multisrc:")
+
+def find_extension_blocks(content: str):
+    """Return (start, end) spans of every Extension(...) call in a build file."""
+    spans = []
+    for match in EXTENSION_CALL.finditer(content):
+        end = _matching_paren(content, match.end() - 1)
+        if end is not None:
+            spans.append((match.start(), end + 1))
+    return spans
+
+def _matching_paren(content: str, open_index: int) -> Optional[int]:
+    depth = 0
+    in_string = False
+    i = open_index
+    while i < len(content):
+        ch = content[i]
+        if in_string:
+            if ch == '\\':
+                i += 1
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in '([{':
+            depth += 1
+        elif ch in ')]}':
+            depth -= 1
+            if depth == 0:
+                return i
+        i += 1
+    return None
+
+def split_arguments(block: str) -> Dict[str, str]:
+    """Split the named arguments of an Extension(...) call into raw values."""
+    body = block[block.index('(') + 1:-1]
+    args = {}
+    depth = 0
+    in_string = False
+    start = 0
+    parts = []
+    i = 0
+    while i < len(body):
+        ch = body[i]
+        if in_string:
+            if ch == '\\':
+                i += 1
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in '([{':
+            depth += 1
+        elif ch in ')]}':
+            depth -= 1
+        elif ch == ',' and depth == 0:
+            parts.append(body[start:i])
+            start = i + 1
+        i += 1
+    parts.append(body[start:])
+
+    for part in parts:
+        key, sep, value = part.partition('=')
+        if sep and key.strip().isidentifier():
+            args[key.strip()] = value.strip()
+    return args
+
+def _string_value(raw: Optional[str], default: str = "") -> str:
+    if raw is None:
+        return default
+    match = STRING_LITERAL.fullmatch(raw)
+    return match.group(1) if match else default
+
+def _string_set(raw: Optional[str]) -> List[str]:
+    return STRING_LITERAL.findall(raw) if raw else []
+
+def module_location(build_file: Path, base: Path):
+    """Return (module, project) for a build file under the sources directory."""
+    rel = build_file.parent.relative_to(base)
+    if rel.parts[0] == "multisrc":
+        return f"{base.name}/{rel.as_posix()}", f":extensions:multisrc:{rel.parts[1]}"
+    return f"{base.name}/{rel.as_posix()}", f":extensions:individual:{rel.parts[0]}:{rel.parts[1]}"
+
+def parse_build_file(content: str, build_file: Path, base: Path) -> List[SourceRecord]:
+    """Parse all Extension(...) blocks in one build.gradle.kts."""
+    module, project = module_location(build_file, base)
+    lang_vars = {
+        var: STRING_LITERAL.findall(values) for values, var in LANG_LIST.findall(content)
+    }
+
+    records = []
+    for start, end in find_extension_blocks(content):
+        args = split_arguments(content[start:end])
+        name = _string_value(args.get("name"))
+        if not name:
+            continue
+
+        raw_lang = args.get("lang", '"en"')
+        langs = lang_vars.get(raw_lang) or [_string_value(raw_lang, "en")]
+
+        source_dir = _string_value(args.get("sourceDir"), "main")
+        raw_id = args.get("sourceId", "").rstrip("Ll")
+        for lang in langs:
+            explicit = raw_id.isdigit()
+            records.append(SourceRecord(
+                name=name,
+                lang=lang,
+                version_code=int(args.get("versionCode", "0") or 0),
+                lib_version=_string_value(args.get("libVersion")),
+                nsfw=args.get("nsfw", "false") == "true",
+                source_dir=source_dir,
+                assets_dir=_string_value(args.get("assetsDir")),
+                source_id=int(raw_id) if explicit else generate_source_id(name, lang),
+                module=module if source_dir == "main" else f"{module}/{source_dir}",
+                build_file=f"{module}/build.gradle.kts",
+                project=project,
+                explicit_id=explicit,
+                project_dependencies=_string_set(args.get("projectDependencies")),
+                remote_dependencies=_string_set(args.get("remoteDependencies")),
+            ))
+    return records
+
+def discover_build_files(base: Path) -> List[Path]:
+    """Build files of individual sources and multisrc themes, mirroring settings.gradle.kts."""
+    files = []
+    if not base.is_dir():
+        return files
+    for lang_dir in sorted(base.iterdir()):
+        if not lang_dir.is_dir():
+            continue
+        for module_dir in sorted(lang_dir.iterdir()):
+            build_file = module_dir / "build.gradle.kts"
+            if build_file.is_file():
+                files.append(build_file)
+    return files
+
+class Catalog:
+    """All source records, with lookups used by the other scripts."""
+
+    def __init__(self, records: List[SourceRecord], base: Path):
+        self.records = records
+        self.base = base
+        self._by_module = {}
+        for record in records:
+            self._by_module.setdefault(record.module, []).append(record)
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __len__(self):
+        return len(self.records)
+
+    def modules(self) -> List[str]:
+        return sorted(self._by_module)
+
+    def by_module(self, module: str) -> List[SourceRecord]:
+        return self._by_module.get(module, [])
+
+    def find(self, name: str, lang: str) -> Optional[SourceRecord]:
+        for record in self.records:
+            if record.name.lower() == name.lower() and record.lang == lang:
+                return record
+        return None
+
+    def theme_variants(self, theme: str) -> List[SourceRecord]:
+        project = f":extensions:multisrc:{theme}"
+        return [record for record in self.records if record.project == project]
+
+    def module_exists(self, path) -> bool:
+        return Path(path).as_posix() in self._by_module
+
+    def module_for_path(self, path) -> List[SourceRecord]:
+        """
+        Records owning a repo-relative path. Files inside a multisrc variant map
+        to that variant; anything else under a theme maps to every variant.
+        """
+        parts = Path(path).parts
+        if len(parts) < 3 or parts[0] != self.base.name:
+            return []
+        if parts[1] == "multisrc":
+            variants = self.theme_variants(parts[2])
+            if len(parts) > 4:
+                owned = [r for r in variants if r.source_dir == parts[3]]
+                if owned:
+                    return owned
+            return variants
+        return self.by_module(f"{parts[0]}/{parts[1]}/{parts[2]}")
+
+def _file_hash(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+def cached_parse(files, root: Path, parse, cache: Path, version, rebuild: bool = False, jobs: int = 1,
+                 partial: bool = False):
+    """
+    Run `parse(content, path)` over `files`, reusing results stored in `cache`.
+
+    Entries are keyed by path relative to `root`. A file is re-parsed only when
+    its mtime/size moved and its content hash changed too; a file that was just
+    touched keeps its cached result. With `jobs` > 1 the files that need parsing
+    are spread over a process pool, so `parse` must be picklable. Returns
+    {relative path: parse result}.
+
+    With `partial`, `files` is only part of what the cache covers (a watcher
+    re-checking one module): entries of other files are kept, and a listed
+    file that no longer exists is dropped from the cache.
+    """
+    entries = {}
+    if not rebuild and cache.exists():
+        try:
+            index = json.loads(cache.read_text(encoding="utf-8"))
+            if index.get("version") == version:
+                entries = index.get("files", {})
+        except (OSError, ValueError):
+            entries = {}
+
+    fresh = {}
+    stale = []
+    dirty = False
+    for path in files:
+        key = path.relative_to(root).as_posix()
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            if not partial:
+                raise
+            dirty = entries.pop(key, None) is not None or dirty
+            continue
+        entry = entries.get(key)
+
+        if entry and entry["mtime"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            fresh[key] = entry
+            continue
+
+        data = path.read_bytes()
+        digest = _file_hash(data)
+        dirty = True
+        if entry and entry["sha1"] == digest:
+            fresh[key] = dict(entry, mtime=stat.st_mtime_ns, size=stat.st_size)
+            continue
+        fresh[key] = {"mtime": stat.st_mtime_ns, "size": stat.st_size, "sha1": digest}
+        stale.append((key, path, data.decode("utf-8-sig", errors="replace")))
+
+    if jobs > 1 and len(stale) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(parse, [s[2] for s in stale], [s[1] for s in stale],
+                                    chunksize=max(1, len(stale) // (jobs * 4))))
+    else:
+        results = [parse(content, path) for _, path, content in stale]
+    for (key, _, _), result in zip(stale, results):
+        fresh[key]["result"] = result
+
+    if partial:
+        if dirty:
+            _write_index(cache, {"version": version, "files": dict(entries, **fresh)})
+    elif dirty or fresh.keys() != entries.keys():
+        _write_index(cache, {"version": version, "files": fresh})
+
+    return {key: entry["result"] for key, entry in fresh.items()}
+
+def _record_parser(base: Path):
+    def parse(content, build_file):
+        return [asdict(r) for r in parse_build_file(content, build_file, base)]
+    return parse
+
+def load_catalog(base_path="sources", cache_path=None, rebuild: bool = False) -> Catalog:
+    """
+    Load the catalog, re-parsing only build files that changed since the index
+    was written.
+    """
+    base = Path(base_path)
+    cache = Path(cache_path) if cache_path else base.resolve().parent / DEFAULT_CACHE
+
+    parsed = cached_parse(discover_build_files(base), base, _record_parser(base), cache, CACHE_VERSION, rebuild)
+    records = [SourceRecord(**r) for result in parsed.values() for r in result]
+    return Catalog(records, base)
+
+def update_catalog(catalog: Catalog, build_files, cache_path=None) -> Catalog:
+    """
+    `catalog` with only `build_files` re-parsed, for callers that know what
+    changed (watch-sources.py). A deleted build file drops its sources. The
+    shared index is updated too, so the next load_catalog agrees.
+    """
+    base = catalog.base
+    cache = Path(cache_path) if cache_path else base.resolve().parent / DEFAULT_CACHE
+
+    build_files = [Path(path) for path in build_files]
+    parsed = cached_parse(build_files, base, _record_parser(base), cache, CACHE_VERSION, partial=True)
+    replaced = {f"{base.name}/{path.relative_to(base).as_posix()}" for path in build_files}
+    records = [record for record in catalog if record.build_file not in replaced]
+    records += [SourceRecord(**r) for result in parsed.values() for r in result]
+    return Catalog(records, base)
+
+def _write_index(cache: Path, index: dict):
+    try:
+        cache.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache.with_suffix(".tmp")
+        tmp.write_text(json.dumps(index, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, cache)
+    except OSError as e:
+        print(f"Warning: could not write index {cache}: {e}", file=sys.stderr)
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse and cache the source catalog")
+    parser.add_argument("--path", default="sources", help="Sources directory (default: sources)")
+    parser.add_argument("--json", action="store_true", help="Print every record as JSON")
+    parser.add_argument("--rebuild", action="store_true", help="Ignore the on-disk index")
+    args = parser.parse_args()
+
+    catalog = load_catalog(args.path, rebuild=args.rebuild)
+
+    if args.json:
+        print(json.dumps([dict(asdict(r), flavor=r.flavor) for r in catalog], indent=2))
+        return
+
+    langs = {}
+    for record in catalog:
+        langs[record.lang] = langs.get(record.lang, 0) + 1
+    print(f"{len(catalog)} sources in {len(catalog.modules())} modules")
+    for lang, count in sorted(langs.items()):
+        print(f"  {lang}: {count}")
+
+if __name__ == "__main__":
+    main()
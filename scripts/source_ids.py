@@ -0,0 +1,153 @@
+"""
+Source ID index shared by check-ids.py and the source generators.
+
+Every source ends up with an ID from one of these places, in order:
+    override val id = ...L / sourceId = ... in Kotlin    (literal)
+    @MadaraSource(id = ...L)                             (madara)
+    @AutoSourceId(seed = ...)                            (auto)
+    sourceId = ...L in build.gradle.kts, else a hash     (gradle)
+
+The IDs extracted from Kotlin files are cached in .cache/source-ids.json with
+the same mtime/hash scheme as the source catalog.
+"""
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from source_catalog import cached_parse, generate_source_id, load_catalog
+
+CACHE_VERSION = 1
+DEFAULT_CACHE = Path(".cache") / "source-ids.json"
+
+MADARA_SOURCE = re.compile(r'@MadaraSource\s*\((.*?)\)\s*(?:object|class)', re.S)
+AUTO_SOURCE_ID = re.compile(r'@AutoSourceId\b(?:\s*\(([^)]*)\))?')
+ID_LITERAL = re.compile(r'override\s+val\s+id\s*(?::\s*Long)?\s*(?:get\(\)\s*)?=\s*(\d+)L?\b')
+CONSTRUCTOR_ID = re.compile(r'\bsourceId\s*=\s*(\d+)L?\b')
+NAMED_STRING = r'\b{}\s*=\s*"([^"]*)"'
+NAMED_INT = r'\b{}\s*=\s*(\d+)L?\b'
+
+def generate_id(name: str, lang: str, version: int = 1) -> int:
+    """MD5 of "name/lang/version"; identical to buildSrc and the KSP processors."""
+    return generate_source_id(name, lang, version)
+
+def clean_name(name: str) -> str:
+    """Class name add-source.py derives from a display name."""
+    return ''.join(word.capitalize() for word in re.sub(r'[^a-zA-Z0-9\s]', '', name).split())
+
+@dataclass
+class IdEntry:
+    id: int
+    name: str
+    lang: str
+    kind: str
+    module: str
+    file: str
+
+    @property
+    def expected_ids(self):
+        """IDs the two generator schemes would produce for this source."""
+        return {generate_id(self.name, self.lang), generate_id(clean_name(self.name), self.lang)}
+
+    @property
+    def drifted(self) -> bool:
+        return self.id not in self.expected_ids
+
+def _named(pattern: str, key: str, text: str) -> Optional[str]:
+    match = re.search(pattern.format(key), text)
+    return match.group(1) if match else None
+
+def extract_kotlin_ids(content: str, path=None) -> List[dict]:
+    """Raw ID declarations in one Kotlin file; names and langs are filled in later."""
+    found = []
+    for match in MADARA_SOURCE.finditer(content):
+        args = match.group(1)
+        source_id = _named(NAMED_INT, "id", args)
+        found.append({
+            "kind": "madara",
+            "id": int(source_id) if source_id else None,
+            "name": _named(NAMED_STRING, "name", args),
+            "lang": _named(NAMED_STRING, "lang", args),
+        })
+    for match in AUTO_SOURCE_ID.finditer(content):
+        args = match.group(1) or ""
+        version = _named(NAMED_INT, "version", args)
+        found.append({
+            "kind": "auto",
+            "seed": _named(NAMED_STRING, "seed", args) or "",
+            "version": int(version) if version else 1,
+        })
+    for pattern in (ID_LITERAL, CONSTRUCTOR_ID):
+        for match in pattern.finditer(content):
+            found.append({"kind": "literal", "id": int(match.group(1))})
+    return found
+
+class IdIndex:
+    """ID -> entries, built from the catalog plus the Kotlin declarations."""
+
+    def __init__(self, entries: List[IdEntry]):
+        self.entries = entries
+        self.by_id: Dict[int, List[IdEntry]] = {}
+        for entry in entries:
+            self.by_id.setdefault(entry.id, []).append(entry)
+
+    def lookup(self, source_id: int) -> List[IdEntry]:
+        return self.by_id.get(source_id, [])
+
+    def collisions(self) -> Dict[int, List[IdEntry]]:
+        return {
+            source_id: entries for source_id, entries in self.by_id.items()
+            if len({e.module for e in entries}) > 1 or len({e.lang for e in entries}) > 1
+        }
+
+    def drift(self) -> List[IdEntry]:
+        return [entry for entry in self.entries if entry.drifted]
+
+def _resolve(record, declarations, files) -> IdEntry:
+    """Pick the ID the source actually uses at runtime."""
+    for kind in ("literal", "madara", "auto"):
+        for decl, path in declarations:
+            if decl["kind"] != kind:
+                continue
+            if kind == "auto":
+                seed = decl["seed"] or record.name
+                source_id = generate_id(seed, record.lang, decl["version"])
+            else:
+                source_id = decl["id"]
+                if source_id is None:
+                    continue
+            return IdEntry(source_id, record.name, record.lang, kind, record.module, path)
+    return IdEntry(record.source_id, record.name, record.lang, "gradle", record.module,
+                   files[0] if files else record.build_file)
+
+def build_index(base_path="sources", cache_path=None, rebuild: bool = False, catalog=None,
+                modules=None) -> IdIndex:
+    """
+    The ID index of every source, or with `modules` of those modules' sources
+    only (their Kotlin files alone are checked; the cache keeps the rest).
+    """
+    base = Path(base_path)
+    root = base.resolve().parent
+    cache = Path(cache_path) if cache_path else root / DEFAULT_CACHE
+    catalog = catalog or load_catalog(base, rebuild=rebuild)
+    records = [record for record in catalog if modules is None or record.module in modules]
+
+    kotlin_files = {}
+    for record in records:
+        src = root / record.module / ("src" if record.is_multisrc and record.source_dir != "main" else "main/src")
+        kotlin_files[record.module] = sorted(src.rglob("*.kt")) if src.is_dir() else []
+
+    all_files = sorted({path for files in kotlin_files.values() for path in files})
+    parsed = cached_parse(all_files, root, extract_kotlin_ids, cache, CACHE_VERSION, rebuild,
+                          partial=modules is not None)
+
+    entries = []
+    for record in records:
+        rel_files = [path.relative_to(root).as_posix() for path in kotlin_files[record.module]]
+        declarations = [
+            (decl, rel) for rel in rel_files for decl in parsed.get(rel, [])
+            if decl.get("lang") in (None, record.lang)
+        ]
+        entries.append(_resolve(record, declarations, rel_files))
+    return IdIndex(entries)
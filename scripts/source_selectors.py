@@ -0,0 +1,295 @@
+"""
+Selectors of SourceFactory-based sources, read from the Kotlin DSL, and an
+offline evaluator that applies them to saved pages the way SourceFactory
+does at runtime. Used by smoke-test.py, selector-sweep.py and watch-sources.py.
+
+Stages and the DSL calls they come from:
+    explore   BaseExploreFetcher(...)    (Type.Search fetchers are skipped)
+    detail    SourceFactory.Detail(...)
+    chapters  SourceFactory.Chapters(...)
+    content   SourceFactory.Content(...)
+
+Extraction results are cached per Kotlin file in .cache/source-selectors.json
+with the same mtime/hash scheme as the source catalog. Sources that parse
+pages by hand (most multisrc themes) simply have no DSL stages.
+"""
+
+import re
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from html_dom import Node, SelectorError, select
+from source_catalog import _matching_paren, cached_parse, split_arguments
+
+CACHE_VERSION = 1
+DEFAULT_CACHE = Path(".cache") / "source-selectors.json"
+
+STAGES = ("explore", "detail", "chapters", "content")
+FETCHER_CALL = re.compile(r'\b(BaseExploreFetcher|Detail|Chapters|Content)\s*\(')
+STAGE_OF_CALL = {"BaseExploreFetcher": "explore", "Detail": "detail", "Chapters": "chapters", "Content": "content"}
+KOTLIN_STRING = re.compile(r'"((?:[^"\\]|\\.)*)"')
+FIRST_ARGUMENT = re.compile(r'\(\s*"((?:[^"\\]|\\.)*)"')
+ESCAPE = re.compile(r'\\(.)')
+
+# Snapshot kind (see selector_detect.SNAPSHOT_NAMES) read by each stage;
+# chapter lists fall back to the detail page, where most sites render them.
+STAGE_PAGES = {
+    "explore": ("listing",),
+    "detail": ("detail",),
+    "chapters": ("chapters", "detail"),
+    "content": ("chapter",),
+}
+
+def _literal(raw: str):
+    """Kotlin literal -> str/bool, or None for anything computed."""
+    raw = raw.strip()
+    match = KOTLIN_STRING.fullmatch(raw)
+    if match:
+        return ESCAPE.sub(r'\1', match.group(1))
+    if raw in ("true", "false"):
+        return raw == "true"
+    return None
+
+def extract_fetchers(content: str, path=None) -> dict:
+    """DSL stages of one Kotlin file: {"explore": [fetcher, ...], "detail": {...}, ...}."""
+    found = {}
+    for match in FETCHER_CALL.finditer(content):
+        end = _matching_paren(content, match.end() - 1)
+        if end is None:
+            continue
+        block = content[match.start():end + 1]
+        fetcher = {}
+        for key, raw in split_arguments(block).items():
+            value = _literal(raw)
+            if value is not None:
+                fetcher[key] = value
+            elif key == "type":
+                fetcher[key] = raw.strip().rsplit(".", 1)[-1]
+        stage = STAGE_OF_CALL[match.group(1)]
+        if stage == "explore":
+            first = FIRST_ARGUMENT.match(block, len(match.group(1)))
+            fetcher.setdefault("key", ESCAPE.sub(r'\1', first.group(1)) if first else "")
+            found.setdefault("explore", []).append(fetcher)
+        elif any(key.endswith("Selector") or key == "selector" for key in fetcher):
+            found[stage] = fetcher
+    return found
+
+def selectors_from_fields(fields: dict) -> dict:
+    """Stages from add-source/detect-selectors fields (selector_detect.DEFAULT_SELECTORS keys)."""
+    return {
+        "explore": [{
+            "key": "Latest",
+            "selector": fields["explore_selector"],
+            "nameSelector": fields["explore_name"],
+            "coverSelector": fields["explore_cover"],
+            "coverAtt": fields["explore_cover_att"],
+            "linkSelector": fields["explore_link"],
+            "linkAtt": fields["explore_link_att"],
+        }],
+        "detail": {
+            "nameSelector": fields["detail_name"],
+            "coverSelector": fields["detail_cover"],
+            "coverAtt": fields["detail_cover_att"],
+            "descriptionSelector": fields["detail_description"],
+            "authorBookSelector": fields["detail_author"],
+            "categorySelector": fields["detail_category"],
+            "statusSelector": fields["detail_status"],
+        },
+        "chapters": {
+            "selector": fields["chapter_selector"],
+            "nameSelector": fields["chapter_name"],
+            "linkSelector": fields["chapter_link"],
+            "linkAtt": fields["chapter_link_att"],
+        },
+        "content": {
+            "pageTitleSelector": fields["content_title"],
+            "pageContentSelector": fields["content_selector"],
+        },
+    }
+
+def load_source_selectors(catalog, rebuild: bool = False, cache_path=None, modules=None) -> Dict[str, dict]:
+    """
+    Stages per source module, or per module in `modules` only. A multisrc
+    variant falls back to its theme's shared code for stages it does not
+    declare itself.
+    """
+    base = catalog.base
+    root = base.resolve().parent
+    cache = Path(cache_path) if cache_path else root / DEFAULT_CACHE
+
+    module_files, theme_files = {}, {}
+    for record in catalog:
+        if record.module in module_files or modules is not None and record.module not in modules:
+            continue
+        module_dir = root / record.module
+        module_files[record.module] = sorted(module_dir.rglob("*.kt")) if module_dir.is_dir() else []
+        if record.is_multisrc:
+            theme_main = root / record.build_file.rsplit("/", 1)[0] / "main"
+            theme_files[record.module] = sorted(theme_main.rglob("*.kt")) if theme_main.is_dir() else []
+
+    all_files = sorted({p for files in (*module_files.values(), *theme_files.values()) for p in files})
+    parsed = cached_parse(all_files, root, extract_fetchers, cache, CACHE_VERSION, rebuild,
+                          partial=modules is not None)
+
+    def merged(files):
+        stages = {}
+        for path in files:
+            for stage, value in parsed[path.relative_to(root).as_posix()].items():
+                if stage == "explore":
+                    stages.setdefault("explore", []).extend(value)
+                else:
+                    stages.setdefault(stage, value)
+        return stages
+
+    result = {}
+    for module, files in module_files.items():
+        stages = merged(files)
+        for stage, value in merged(theme_files.get(module, [])).items():
+            stages.setdefault(stage, value)
+        result[module] = stages
+    return result
+
+def _attr(node: Node, att: str) -> str:
+    return node.attr(att[4:] if att.startswith("abs:") else att)
+
+def _select(context: Node, selector: str, timings: Optional[dict]) -> List[Node]:
+    if timings is None:
+        return select(context, selector)
+    started = time.perf_counter()
+    try:
+        return select(context, selector)
+    finally:
+        entry = timings.setdefault(selector, [0.0, 0])
+        entry[0] += time.perf_counter() - started
+        entry[1] += 1
+
+def string_value(context: Node, selector: Optional[str], att: Optional[str], timings: Optional[dict] = None) -> str:
+    """SourceFactory.selectorReturnerStringType."""
+    if not selector:
+        return _attr(context, att) if att else ""
+    matches = _select(context, selector, timings)
+    if not att:
+        return " ".join(text for text in (node.text() for node in matches) if text)
+    for node in matches:
+        value = _attr(node, att)
+        if value:
+            return value
+    return ""
+
+def list_value(context: Node, selector: Optional[str], att: Optional[str], timings: Optional[dict] = None) -> List[str]:
+    """SourceFactory.selectorReturnerListType."""
+    if selector and not att:
+        return [text for text in (node.text() for node in _select(context, selector, timings)) if text]
+    value = string_value(context, selector, att, timings)
+    return [value] if value else []
+
+def _explore(fetcher: dict, root: Node, timings) -> dict:
+    items = _select(root, fetcher["selector"], timings) if fetcher.get("selector") else []
+    valid = covers = 0
+    sample = ""
+    for item in items:
+        title = string_value(item, fetcher.get("nameSelector"), fetcher.get("nameAtt"), timings)
+        link = string_value(item, fetcher.get("linkSelector"), fetcher.get("linkAtt"), timings)
+        if title and link:
+            valid += 1
+            sample = sample or title
+        covers += bool(string_value(item, fetcher.get("coverSelector"), fetcher.get("coverAtt"), timings))
+    return {"fetcher": fetcher.get("key", ""), "items": len(items), "valid": valid, "covers": covers,
+            "sample": sample, "ok": valid > 0}
+
+def _detail(fetcher: dict, root: Node, timings) -> dict:
+    def value(selector, att):
+        return string_value(root, fetcher.get(selector), fetcher.get(att), timings)
+
+    def values(selector, att):
+        return list_value(root, fetcher.get(selector), fetcher.get(att), timings)
+
+    result = {
+        "name": value("nameSelector", "nameAtt"),
+        "cover": value("coverSelector", "coverAtt"),
+        "author": value("authorBookSelector", "authorBookAtt"),
+        "status": value("statusSelector", "statusAtt"),
+        "description": len(values("descriptionSelector", "descriptionBookAtt")),
+        "genres": len(values("categorySelector", "categoryAtt")),
+    }
+    result["ok"] = bool(result["name"])
+    return result
+
+def _chapters(fetcher: dict, root: Node, timings) -> dict:
+    items = _select(root, fetcher["selector"], timings) if fetcher.get("selector") else []
+    valid = 0
+    first = ""
+    for item in items:
+        name = string_value(item, fetcher.get("nameSelector"), fetcher.get("nameAtt"), timings)
+        link = string_value(item, fetcher.get("linkSelector"), fetcher.get("linkAtt"), timings)
+        if name and link:
+            valid += 1
+            first = first or name
+    return {"items": len(items), "valid": valid, "sample": first, "ok": valid > 0}
+
+def _content(fetcher: dict, root: Node, timings) -> dict:
+    paragraphs = list_value(root, fetcher.get("pageContentSelector"), fetcher.get("pageContentAtt"), timings)
+    title = string_value(root, fetcher.get("pageTitleSelector"), fetcher.get("pageTitleAtt"), timings)
+    return {"paragraphs": len(paragraphs), "chars": sum(map(len, paragraphs)), "title": title,
+            "ok": bool(paragraphs)}
+
+def run_stage(stage: str, fetchers, root: Node, timings: Optional[dict] = None) -> dict:
+    """
+    Apply one stage's selectors to a parsed page. Explore tries every
+    non-search fetcher and reports the best. A selector Jsoup would reject
+    fails the stage; one that only the offline engine cannot evaluate (a
+    Jsoup-specific pseudo-class) gives {"ok": None, "error": ...} instead.
+    `timings`, if given, collects {selector: [seconds, calls]}.
+    """
+    try:
+        if stage == "explore":
+            results = [_explore(f, root, timings) for f in fetchers if f.get("type") != "Search"]
+            if not results:
+                return {"ok": None, "error": "only search fetchers"}
+            return max(results, key=lambda r: r["valid"])
+        return {"detail": _detail, "chapters": _chapters, "content": _content}[stage](fetchers, root, timings)
+    except SelectorError as e:
+        if str(e).startswith("unsupported"):
+            return {"ok": None, "error": f"unsupported selector: {e}"}
+        return {"ok": False, "error": f"invalid selector: {e}"}
+
+def run_stages(stages: dict, pages: Dict[str, str], load: Callable[[str], Node],
+               timings: Optional[dict] = None) -> Dict[str, dict]:
+    """
+    Every stage of one source. `pages` maps snapshot kinds to a location
+    (file or URL) that `load` turns into a parsed page; each page is loaded
+    at most once.
+    """
+    trees = {}
+    results = {}
+    for stage in STAGES:
+        if stage not in stages:
+            results[stage] = {"ok": None, "error": "no DSL selectors"}
+            continue
+        kind = next((k for k in STAGE_PAGES[stage] if k in pages), None)
+        if kind is None:
+            results[stage] = {"ok": None, "error": "no fixture"}
+            continue
+        if kind not in trees:
+            trees[kind] = load(pages[kind])
+        result = run_stage(stage, stages[stage], trees[kind], timings)
+        results[stage] = dict(result, page=str(pages[kind]).rsplit("/", 1)[-1])
+    return results
+
+def failed(results: Dict[str, dict]) -> bool:
+    return any(result["ok"] is False for result in results.values())
+
+def stage_cell(stage: str, result: dict) -> str:
+    """Short table cell for one stage result: counts, FAIL, "-" (no selectors) or "?" (unsupported)."""
+    if result["ok"] is None:
+        return "?" if result.get("error", "").startswith("unsupported") else "-"
+    if "error" in result:
+        return "FAIL sel"
+    if stage in ("explore", "chapters"):
+        text = f"{result['valid']}/{result['items']}"
+    elif stage == "content":
+        text = f"{result['paragraphs']} p"
+    else:
+        text = "ok" if result["ok"] else ""
+    return text if result["ok"] else f"FAIL {text}".strip()
@@ -0,0 +1,147 @@
+"""
+Source shapes and MinHash/LSH similarity, used by cluster-sources.py.
+
+A Kotlin file's shape is a set of hashed features:
+
+    sel:<selector>        CSS selectors in string literals (theme_fingerprint)
+    url:<fragment>        endpoint fragments in string literals
+    base:<class>          the class the source extends
+    fn:<name> / val:<name> overridden members
+    dsl:<stage>.<arg>     SourceFactory DSL arguments that are set
+    <5 tokens>            shingles of the code with strings, numbers and the
+                          source's own class name blanked out
+
+so two sources made from the same boilerplate share most shingles even when
+every selector differs. Every file gets a MinHash signature; the signature of
+a module (several files) is the element-wise minimum of its files' ones, so
+per-file signatures can be cached. LSHIndex buckets signatures by band and
+only pairs sharing a bucket are compared, which keeps a catalog-wide run
+close to linear in the number of sources.
+
+    shape = extract_shape(content)
+    index = LSHIndex(bands=32)
+    index.add("sources/en/a", shape["signature"])
+    index.candidates()   # {("sources/en/a", "sources/en/b"), ...}
+"""
+
+import random
+import re
+import zlib
+from itertools import combinations
+from typing import Dict, Iterable, List, Set, Tuple
+
+from kotlin_scan import mask
+from source_selectors import extract_fetchers
+from theme_fingerprint import extract_features
+
+NUM_PERM = 128
+SHINGLE = 5
+MERSENNE = (1 << 61) - 1
+# Fixed seed: signatures are cached and must stay comparable between runs
+PERMUTATIONS = [(rng.randrange(1, MERSENNE), rng.randrange(MERSENNE))
+                for rng in [random.Random(20261016)] for _ in range(NUM_PERM)]
+
+BASE_CLASS = re.compile(r'\bclass\s+(\w+)\s*(?:\([^)]*\))?\s*:\s*([\w.]+)')
+OVERRIDE = re.compile(r'\boverride\s+(?:suspend\s+)?(fun|val|var)\s+(?:<[^>]*>\s*)?(?:[\w.]+\.)?(\w+)')
+HEADER_LINE = re.compile(r'^\s*(?:package|import)\s.*$', re.M)
+TOKEN = re.compile(r'"[^"\n]*"|[A-Za-z_]\w*|\d[\w.]*|[^\s\w]')
+
+def feature_hash(feature: str) -> int:
+    return zlib.crc32(feature.encode("utf-8"))
+
+def minhash(hashes: Iterable[int]) -> List[int]:
+    hashes = list(hashes)
+    if not hashes:
+        return [MERSENNE] * NUM_PERM
+    return [min((a * h + b) % MERSENNE for h in hashes) for a, b in PERMUTATIONS]
+
+def merge_signatures(signatures: List[List[int]]) -> List[int]:
+    """Signature of the union of the files behind `signatures`."""
+    return [min(column) for column in zip(*signatures)] if signatures else minhash([])
+
+def estimate(a: List[int], b: List[int]) -> float:
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+def jaccard(a: Set[int], b: Set[int]) -> float:
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+def shingles(content: str, class_names: Set[str]) -> Set[str]:
+    code = HEADER_LINE.sub("", mask(content))
+    tokens = []
+    for token in TOKEN.findall(code):
+        if token.startswith('"'):
+            token = '""'
+        elif token[0].isdigit():
+            token = "0"
+        elif token in class_names:
+            token = "SRC"
+        tokens.append(token)
+    return {" ".join(tokens[i:i + SHINGLE]) for i in range(max(0, len(tokens) - SHINGLE + 1))}
+
+def extract_shape(content: str, path=None) -> dict:
+    """Features, hashes and MinHash signature of one Kotlin file."""
+    found = extract_features(content)
+    features = {f"sel:{selector}" for selector in found["selectors"]}
+    features |= {f"url:{fragment}" for fragment in found["fragments"]}
+    class_names = set()
+    for name, base in BASE_CLASS.findall(mask(content)):
+        class_names.add(name)
+        features.add(f"base:{base.rsplit('.', 1)[-1]}")
+    features |= {f"{kind}:{name}" for kind, name in OVERRIDE.findall(mask(content))}
+    dsl = extract_fetchers(content)
+    for stage, fetchers in dsl.items():
+        for fetcher in fetchers if isinstance(fetchers, list) else [fetchers]:
+            features |= {f"dsl:{stage}.{key}" for key in fetcher if key != "key"}
+    hashes = sorted({feature_hash(feature) for feature in features | shingles(content, class_names)})
+    return {
+        "selectors": found["selectors"],
+        "bases": sorted(feature[5:] for feature in features if feature.startswith("base:")),
+        "dsl": dsl,
+        "hashes": hashes,
+        "signature": minhash(hashes),
+    }
+
+class LSHIndex:
+    """Banded LSH over MinHash signatures; pairs that share any band are candidates."""
+
+    def __init__(self, bands: int = 32):
+        if NUM_PERM % bands:
+            raise ValueError(f"bands must divide {NUM_PERM}")
+        self.bands = bands
+        self.rows = NUM_PERM // bands
+        self.buckets: Dict[Tuple[int, Tuple[int, ...]], List[str]] = {}
+
+    @property
+    def threshold(self) -> float:
+        """Similarity at which a pair becomes a candidate with probability about 1/2."""
+        return (1 / self.bands) ** (1 / self.rows)
+
+    def add(self, key: str, signature: List[int]):
+        for band in range(self.bands):
+            rows = tuple(signature[band * self.rows:(band + 1) * self.rows])
+            self.buckets.setdefault((band, rows), []).append(key)
+
+    def candidates(self) -> Set[Tuple[str, str]]:
+        pairs = set()
+        for keys in self.buckets.values():
+            for a, b in combinations(sorted(set(keys)), 2):
+                pairs.add((a, b))
+        return pairs
+
+def clusters(pairs: Iterable[Tuple[str, str]]) -> List[List[str]]:
+    """Connected components of `pairs`, largest first."""
+    parent: Dict[str, str] = {}
+
+    def find(key: str) -> str:
+        parent.setdefault(key, key)
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    for a, b in pairs:
+        parent[find(a)] = find(b)
+    groups: Dict[str, List[str]] = {}
+    for key in list(parent):
+        groups.setdefault(find(key), []).append(key)
+    return sorted((sorted(group) for group in groups.values()), key=lambda g: (-len(g), g))
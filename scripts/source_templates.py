@@ -0,0 +1,306 @@
+"""
+Templates for generated sources, shared by add-source.py and
+create-empty-source.py.
+
+Templates live in scripts/templates/ as plain Kotlin/Gradle text with
+{{placeholder}} fields and {{#flag}} ... {{/flag}} sections ({{^flag}} for the
+inverse); everything else,
+braces included, is copied verbatim. Every placeholder has a declared kind
+(FIELDS) that is checked when a template is compiled and again when it is
+rendered, and text values are escaped for Kotlin string literals on the way
+in, so a quote or `$` in a name or selector cannot break the output. Code
+fields carry Kotlin generated by json_schema and are inserted as they are.
+
+    from source_templates import render
+    render("source/html", class_name="NovelFull", ...)
+
+Each template is read and compiled into a render function once per process.
+"""
+
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from selector_detect import DEFAULT_SELECTORS
+
+TEMPLATE_DIR = Path(__file__).resolve().parent / "templates"
+TEMPLATE_SUFFIX = ".tmpl"
+
+class TemplateError(ValueError):
+    pass
+
+def _matching(pattern: str, what: str) -> Callable:
+    regex = re.compile(pattern)
+
+    def check(value) -> str:
+        value = str(value)
+        if not regex.fullmatch(value):
+            raise TemplateError(f"invalid {what}: {value!r}")
+        return value
+    return check
+
+def _text(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('$', '\\$')
+
+def _integer(value) -> str:
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise TemplateError(f"expected an integer, got {value!r}")
+    return str(value)
+
+def _code(value) -> str:
+    if not isinstance(value, str):
+        raise TemplateError(f"expected Kotlin code, got {value!r}")
+    return value
+
+def _boolean(value) -> str:
+    if not isinstance(value, bool):
+        raise TemplateError(f"expected a boolean, got {value!r}")
+    return "true" if value else "false"
+
+IDENTIFIER = _matching(r'[A-Za-z_][A-Za-z0-9_]*', "identifier")
+KINDS = {
+    "identifier": IDENTIFIER,
+    "package": _matching(r'[a-z_][a-z0-9_]*', "package name"),
+    "lang": _matching(r'[a-z]{2,5}(?:-[A-Za-z]{2,4})?', "language code"),
+    "url": _matching(r'https?://[^\s"\\$]+', "URL"),
+    "integer": _integer,
+    "boolean": _boolean,
+    "text": _text,
+    "code": _code,
+}
+
+# Placeholder name -> kind. Templates may only use these.
+FIELDS = {
+    "class_name": "identifier",
+    "base_class": "identifier",
+    "package": "package",
+    "model_package": "package",
+    "theme": "package",
+    "lang": "lang",
+    "url": "url",
+    "source_id": "integer",
+    "nsfw": "boolean",
+    "js": "boolean",
+    "description": "text",
+    "paginated": "boolean",
+    "by_page": "boolean",
+    "by_offset": "boolean",
+    "by_cursor": "boolean",
+    "chapter_parallelism": "integer",
+    "chapter_page_size": "integer",
+    "common": "boolean",
+    "http_cache": "boolean",
+    "cache_entries": "integer",
+    "cache_ttl_latest": "integer",
+    "cache_ttl_popular": "integer",
+    "cache_ttl_search": "integer",
+    "cache_ttl_detail": "integer",
+    "cache_ttl_chapters": "integer",
+    "cache_ttl_content": "integer",
+    "instrument": "boolean",
+    "request_hooks": "boolean",
+    "json_models": "code",
+    "list_type": "code",
+    "list_items": "code",
+    "list_has_more": "code",
+    "manga_fields": "code",
+    "detail_type": "code",
+    "detail_root": "code",
+    "detail_fields": "code",
+    "chapters_type": "code",
+    "chapter_items": "code",
+    "chapter_fields": "code",
+    "chapters_next": "code",
+}
+FIELDS.update({key: "boolean" if isinstance(value, bool) else "text" for key, value in DEFAULT_SELECTORS.items()})
+
+# Multisrc theme -> (template, fixed fields)
+THEME_VARIANTS = {
+    "madara": ("source/madara", {}),
+    "readnovelfull": ("variant/scraper", {"base_class": "ReadNovelFullScraper"}),
+    "readwn": ("variant/scraper", {"base_class": "ReaderWnScraper"}),
+    "mtlnovel": ("variant/model", {"base_class": "MtlNovelModel", "model_package": "mtlnovelmodel"}),
+    "skynovel": ("variant/model", {"base_class": "SkyNovelModel", "model_package": "skynovelmodel"}),
+}
+
+# --chapter-pagination mode -> section flag in the source templates
+PAGINATION_MODES = {
+    "page": "by_page",
+    "offset": "by_offset",
+    "cursor": "by_cursor",
+}
+
+# Templates that can fetch a paginated chapter list
+PAGINATED = {"source/html", "source/json", "source/json-typed", "source/parsed"}
+
+# Templates that can keep responses in a ResponseCache
+CACHEABLE = {"source/html", "source/json", "source/parsed"}
+
+# Templates that can time their fetch/parse/select phases with SourceTrace
+INSTRUMENTABLE = {"source/html", "source/json", "source/parsed"}
+
+# ResponseCache endpoint -> default TTL in seconds (ResponseCache.DEFAULT_TTLS)
+CACHE_TTLS = {
+    "latest": 5 * 60,
+    "popular": 60 * 60,
+    "search": 10 * 60,
+    "detail": 60 * 60,
+    "chapters": 10 * 60,
+    "content": 7 * 24 * 60 * 60,
+}
+
+# Templates whose Kotlin compiles for the JS target (no Jsoup, no Dispatchers.IO)
+JS_COMPATIBLE = {"source/html", "source/json", "source/json-typed", "source/madara", "variant/scraper", "variant/model"}
+
+TAG = re.compile(r'\{\{\s*([#^/]?)([A-Za-z_][A-Za-z0-9_]*)\s*\}\}')
+
+def _tokens(text: str) -> List[Tuple[str, str]]:
+    """Split into ("text", s), ("field", name), ("open" | "invert", name), ("close", name)."""
+    tokens = []
+    pos = 0
+    for match in TAG.finditer(text):
+        start, end = match.start(), match.end()
+        sigil, name = match.groups()
+        if sigil:
+            # A section tag alone on its line takes the line with it
+            line_start = text.rfind("\n", 0, start) + 1
+            line_end = text.find("\n", end)
+            line_end = len(text) if line_end == -1 else line_end
+            if not text[line_start:start].strip() and not text[end:line_end].strip():
+                start, end = max(line_start, pos), min(line_end + 1, len(text))
+        tokens.append(("text", text[pos:start]))
+        tokens.append(({"": "field", "#": "open", "^": "invert", "/": "close"}[sigil], name))
+        pos = end
+    tokens.append(("text", text[pos:]))
+    return [token for token in tokens if token != ("text", "")]
+
+class Template:
+    """A compiled template: render(values) -> str."""
+
+    def __init__(self, name: str, text: str):
+        self.name = name
+        self.fields = set()
+        self._render = self._compile(_tokens(text))
+
+    def _compile(self, tokens):
+        parts = []
+        stack = []
+        for kind, value in tokens:
+            if kind == "text":
+                parts.append(value)
+                continue
+            if value not in FIELDS:
+                raise TemplateError(f"{self.name}: unknown placeholder {{{{{value}}}}}")
+            self.fields.add(value)
+            if kind == "field":
+                parts.append((value, KINDS[FIELDS[value]]))
+            elif kind in ("open", "invert"):
+                stack.append((value, kind == "invert", parts))
+                parts = []
+            else:
+                if not stack or stack[-1][0] != value:
+                    raise TemplateError(f"{self.name}: unexpected {{{{/{value}}}}}")
+                flag, inverted, outer = stack.pop()
+                outer.append((flag, self._section(parts, inverted)))
+                parts = outer
+        if stack:
+            raise TemplateError(f"{self.name}: unclosed {{{{#{stack[-1][0]}}}}}")
+        return self._join(parts)
+
+    def _section(self, parts, inverted=False):
+        body = self._join(parts)
+
+        def section(flag_value, values):
+            _boolean(flag_value)
+            return body(values) if flag_value != inverted else ""
+        section.is_section = True
+        return section
+
+    @staticmethod
+    def _join(parts):
+        plan = []
+        for part in parts:
+            if isinstance(part, str):
+                plan.append((None, part))
+            else:
+                plan.append(part)
+
+        def render(values):
+            out = []
+            for name, action in plan:
+                if name is None:
+                    out.append(action)
+                elif getattr(action, "is_section", False):
+                    out.append(action(values[name], values))
+                else:
+                    out.append(action(values[name]))
+            return "".join(out)
+        return render
+
+    def render(self, values: Dict[str, object]) -> str:
+        missing = self.fields - values.keys()
+        if missing:
+            raise TemplateError(f"{self.name}: missing {', '.join(sorted(missing))}")
+        return self._render(values)
+
+@lru_cache(maxsize=None)
+def get_template(name: str) -> Template:
+    path = TEMPLATE_DIR / name
+    matches = sorted(path.parent.glob(f"{path.name}.*{TEMPLATE_SUFFIX}"))
+    if not matches:
+        raise TemplateError(f"no template named {name}")
+    return Template(name, matches[0].read_text(encoding="utf-8"))
+
+def template_names() -> List[str]:
+    names = []
+    for path in sorted(TEMPLATE_DIR.rglob(f"*{TEMPLATE_SUFFIX}")):
+        rel = path.relative_to(TEMPLATE_DIR).as_posix()
+        names.append(rel.split(".", 1)[0])
+    return names
+
+def render(name: str, values: Dict[str, object] = None, **fields) -> str:
+    """Render template `name` (e.g. "source/html") with validated fields."""
+    values = dict(values or {}, **fields)
+    return get_template(name).render(values)
+
+def pagination_fields(mode: str = None, parallelism: int = 4, page_size: int = 20) -> Dict[str, object]:
+    """Template fields for a chapter list fetched in `mode` pages, or in one request."""
+    if mode is not None and mode not in PAGINATION_MODES:
+        raise TemplateError(f"unknown chapter pagination mode: {mode}")
+    if parallelism < 1 or page_size < 1:
+        raise TemplateError("chapter parallelism and page size must be at least 1")
+    fields = {flag: flag == PAGINATION_MODES.get(mode) for flag in PAGINATION_MODES.values()}
+    return dict(fields, paginated=mode is not None, chapter_parallelism=parallelism, chapter_page_size=page_size)
+
+def cache_fields(enabled: bool = False, entries: int = 256, ttls: Dict[str, int] = None) -> Dict[str, object]:
+    """Template fields for a per-source response cache, with TTLs in seconds per endpoint."""
+    unknown = set(ttls or {}) - CACHE_TTLS.keys()
+    if unknown:
+        raise TemplateError(f"unknown cache endpoint: {', '.join(sorted(unknown))}")
+    ttls = dict(CACHE_TTLS, **(ttls or {}))
+    if entries < 1 or any(ttl < 0 for ttl in ttls.values()):
+        raise TemplateError("cache entries must be at least 1 and TTLs at least 0")
+    fields = {f"cache_ttl_{endpoint}": ttl for endpoint, ttl in ttls.items()}
+    return dict(fields, http_cache=enabled, cache_entries=entries)
+
+def hook_fields(http_cache: bool = False, instrument: bool = False) -> Dict[str, object]:
+    """Template fields for SourceTrace timing; both it and the cache replace the plain request calls."""
+    return {"instrument": instrument, "request_hooks": http_cache or instrument}
+
+def parse_cache_ttls(spec: str) -> Dict[str, int]:
+    """"latest=60,content=86400" -> {"latest": 60, "content": 86400}."""
+    ttls = {}
+    for part in filter(None, (part.strip() for part in spec.split(","))):
+        endpoint, _, seconds = part.partition("=")
+        if not seconds.strip().isdigit():
+            raise TemplateError(f"bad cache TTL {part!r}, expected endpoint=seconds")
+        ttls[endpoint.strip().lower()] = int(seconds)
+    return ttls
+
+def render_variant(theme: str, values: Dict[str, object]) -> str:
+    """Kotlin source of a variant of multisrc `theme`."""
+    if theme not in THEME_VARIANTS:
+        raise TemplateError(f"no variant template for theme {theme}")
+    name, fixed = THEME_VARIANTS[theme]
+    return render(name, dict(values, theme=theme, **fixed))
@@ -0,0 +1,165 @@
+"""
+File change notification for watch-sources.py: inotify on Linux (through
+ctypes, so nothing to install), mtime polling everywhere else.
+
+Both watch whole trees, skip build output, and hand back changed paths;
+grouping an editor's write/rename/chmod burst into one change is left to
+the caller.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import struct
+import sys
+from pathlib import Path
+from typing import Iterable, List, Set, Tuple
+
+SKIP_DIRS = {"build", ".gradle", ".git", ".idea", ".cache", "node_modules", "__pycache__"}
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT = struct.Struct("iIII")
+
+def _directories(root: Path) -> Iterable[Path]:
+    """`root` and every directory below it, minus SKIP_DIRS."""
+    for current, dirs, _ in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS and not d.startswith("."))
+        yield Path(current)
+
+class Inotify:
+    """Recursive inotify watches on some trees; `fileno` goes into a selector."""
+
+    kind = "inotify"
+
+    def __init__(self, roots: Iterable[Path]):
+        name = ctypes.util.find_library("c")
+        if not sys.platform.startswith("linux") or not name:
+            raise OSError(errno.ENOSYS, "inotify is only available on Linux")
+        self._libc = ctypes.CDLL(name, use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._paths = {}
+        try:
+            for root in roots:
+                for directory in _directories(root):
+                    self._add(directory)
+        except OSError:
+            self.close()
+            raise
+
+    def _add(self, directory: Path):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            code = ctypes.get_errno()
+            if code == errno.ENOSPC:
+                raise OSError(code, "out of inotify watches (raise fs.inotify.max_user_watches)")
+            if code != errno.ENOENT:
+                raise OSError(code, f"inotify_add_watch failed for {directory}")
+            return
+        self._paths[wd] = directory
+
+    def fileno(self) -> int:
+        return self._fd
+
+    def read(self) -> Tuple[List[Path], bool]:
+        """(changed paths, overflowed) from the events queued so far."""
+        changed, overflow = [], False
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = EVENT.unpack_from(data, offset)
+                name = data[offset + EVENT.size:offset + EVENT.size + length].rstrip(b"\0")
+                offset += EVENT.size + length
+                if mask & IN_Q_OVERFLOW:
+                    overflow = True
+                    continue
+                if mask & IN_IGNORED:
+                    self._paths.pop(wd, None)
+                    continue
+                directory = self._paths.get(wd)
+                if directory is None or not name:
+                    continue
+                path = directory / os.fsdecode(name)
+                if mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO) and path.name not in SKIP_DIRS:
+                        # Files created before the watch exists would be missed
+                        for sub in _directories(path):
+                            self._add(sub)
+                            try:
+                                changed.extend(p for p in sub.iterdir() if p.is_file())
+                            except OSError:
+                                pass
+                    continue
+                changed.append(path)
+        return changed, overflow
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+class Poller:
+    """The same, by comparing mtimes and sizes every `interval` seconds."""
+
+    kind = "poll"
+
+    def __init__(self, roots: Iterable[Path], interval: float = 0.5):
+        self.roots = list(roots)
+        self.interval = interval
+        self._state = self._scan()
+
+    def _scan(self) -> dict:
+        state = {}
+        for root in self.roots:
+            for directory in _directories(root):
+                try:
+                    entries = list(os.scandir(directory))
+                except OSError:
+                    continue
+                for entry in entries:
+                    try:
+                        if entry.is_file():
+                            stat = entry.stat()
+                            state[Path(entry.path)] = (stat.st_mtime_ns, stat.st_size)
+                    except OSError:
+                        continue
+        return state
+
+    def fileno(self):
+        return None
+
+    def read(self) -> Tuple[List[Path], bool]:
+        state = self._scan()
+        changed: Set[Path] = {path for path, mark in state.items() if self._state.get(path) != mark}
+        changed |= self._state.keys() - state.keys()
+        self._state = state
+        return sorted(changed), False
+
+    def close(self):
+        pass
+
+def watch(roots: Iterable[Path], poll: bool = False):
+    """An Inotify where possible, else a Poller; returns (watcher, warning or None)."""
+    roots = [Path(root) for root in roots if Path(root).is_dir()]
+    if not poll:
+        try:
+            return Inotify(roots), None
+        except OSError as e:
+            return Poller(roots), f"inotify unavailable ({e.strerror or e}), polling instead"
+    return Poller(roots), None
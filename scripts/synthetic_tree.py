@@ -0,0 +1,73 @@
+"""
+Synthetic sources/ trees for benchmarking and testing the scripts on catalogs
+much larger than the real one, used by bench-tooling.py and scripts/tests.
+
+Most modules are individual sources (sources/<lang>/<pkg>); the rest are
+variants of multisrc themes whose single build file holds `variants`
+Extension(...) blocks. Build files are rendered from the same templates as
+add-source.py, and every module gets a small Kotlin class. Names, languages
+and versionCodes come from `seed`, so a size always gives the same tree.
+
+    counts = make_tree(Path("/tmp/bench/sources"), modules=1000)
+"""
+
+import random
+from pathlib import Path
+
+from source_templates import render
+
+LANGS = ("en", "es", "fr", "de", "pt", "ru", "tu", "in", "ar", "zh", "ja", "ko")
+WORDS = ("novel", "light", "web", "read", "full", "top", "box", "wuxia", "world", "free", "mtl", "land",
+         "hub", "site", "book", "tale", "scan", "cool", "dream", "rain")
+MULTISRC_SHARE = 0.2
+
+def source_name(rng: random.Random, index: int) -> str:
+    return "".join(rng.choice(WORDS).capitalize() for _ in range(rng.randint(2, 3))) + str(index)
+
+def kotlin_class(package: str, class_name: str) -> str:
+    return (f"package ireader.{package}\n\n"
+            "import ireader.core.source.Dependencies\n"
+            "import ireader.core.source.SourceFactory\n\n"
+            f"abstract class {class_name}(deps: Dependencies) : SourceFactory(deps = deps) {{\n"
+            f"    override val name: String get() = \"{class_name}\"\n"
+            f"    override val baseUrl: String get() = \"https://{package}.example\"\n"
+            "}\n")
+
+def with_version_code(block: str, version_code: int) -> str:
+    return block.replace("versionCode = 1,", f"versionCode = {version_code},", 1)
+
+def make_tree(base: Path, modules: int, variants: int = 50, seed: int = 1) -> dict:
+    """Write `modules` modules under `base`; returns {"individual", "themes", "variants"}."""
+    rng = random.Random(seed)
+    multisrc = int(modules * MULTISRC_SHARE)
+    individual = modules - multisrc
+    for index in range(individual):
+        class_name = source_name(rng, index)
+        package = class_name.lower()
+        lang = rng.choice(LANGS)
+        module = base / lang / package
+        (module / "main" / "src" / "ireader" / package).mkdir(parents=True)
+        build = render("build/individual", class_name=class_name, lang=lang, package=package,
+                       nsfw=rng.random() < 0.1, description="", js=False, common=rng.random() < 0.3)
+        (module / "build.gradle.kts").write_text(with_version_code(build, rng.randint(1, 40)), encoding="utf-8")
+        (module / "main" / "src" / "ireader" / package / f"{class_name}.kt").write_text(
+            kotlin_class(package, class_name), encoding="utf-8")
+
+    themes = 0
+    for start in range(0, multisrc, variants):
+        theme = base / "multisrc" / f"theme{themes}"
+        blocks = []
+        for index in range(start, min(start + variants, multisrc)):
+            class_name = source_name(rng, individual + index)
+            package = class_name.lower()
+            blocks.append(with_version_code(
+                render("build/variant-extension", class_name=class_name, lang=rng.choice(LANGS), package=package,
+                       theme=f"theme{themes}", nsfw=False, description="", js=False),
+                rng.randint(1, 40)))
+            (theme / package / "src" / "ireader" / package).mkdir(parents=True)
+            (theme / package / "src" / "ireader" / package / f"{class_name}.kt").write_text(
+                kotlin_class(package, class_name), encoding="utf-8")
+        (theme / "build.gradle.kts").write_text("listOf(\n" + "".join(blocks) + ").also(::register)\n",
+                                                encoding="utf-8")
+        themes += 1
+    return {"individual": individual, "themes": themes, "variants": multisrc}
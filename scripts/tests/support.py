@@ -0,0 +1,27 @@
+"""
+Helpers for the scripts/ tests: puts scripts/ on sys.path and imports the
+hyphenated CLI scripts as modules.
+
+    python -m pytest scripts/tests
+    python -m unittest discover scripts/tests
+"""
+
+import sys
+from pathlib import Path
+
+SCRIPTS = Path(__file__).resolve().parents[1]
+if str(SCRIPTS) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS))
+
+_scripts = {}
+
+def load_script(name: str):
+    """bump-version-codes.py and friends, imported once."""
+    if name not in _scripts:
+        import importlib.util
+
+        spec = importlib.util.spec_from_file_location(name.replace("-", "_"), SCRIPTS / f"{name}.py")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _scripts[name] = module
+    return _scripts[name]
@@ -0,0 +1,141 @@
+"""
+Interrupted writes: a build or source file is either the old one or the new
+one, never half-written, and no temp file is left behind.
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import support
+from source_catalog import Catalog, load_catalog
+from source_ids import IdIndex
+from synthetic_tree import make_tree
+
+bump = support.load_script("bump-version-codes")
+add_source = support.load_script("add-source")
+
+class Interrupt(BaseException):
+    """Stands in for KeyboardInterrupt without stopping the test run."""
+
+def interrupt_after(calls: int, real):
+    """A replacement for `real` that raises Interrupt on call number `calls` + 1."""
+    count = {"n": 0}
+
+    def wrapper(*args, **kwargs):
+        if count["n"] == calls:
+            raise Interrupt()
+        count["n"] += 1
+        return real(*args, **kwargs)
+    return wrapper
+
+class WriteAtomicTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "build.gradle.kts"
+        self.path.write_text("old content\n", encoding="utf-8")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def leftovers(self):
+        return sorted(p.name for p in self.path.parent.iterdir() if p != self.path)
+
+    def test_interrupted_before_replace(self):
+        with mock.patch.object(bump.os, "replace", side_effect=Interrupt()), self.assertRaises(Interrupt):
+            bump.write_atomic(self.path, "new content\n")
+        self.assertEqual("old content\n", self.path.read_text(encoding="utf-8"))
+        self.assertEqual([], self.leftovers())
+
+    def test_interrupted_while_writing(self):
+        real_write = Path.write_text
+
+        def partial_write(path, content, *args, **kwargs):
+            real_write(path, content[:3], *args, **kwargs)
+            raise Interrupt()
+
+        with mock.patch.object(Path, "write_text", partial_write), self.assertRaises(Interrupt):
+            bump.write_atomic(self.path, "new content\n")
+        self.assertEqual("old content\n", self.path.read_text(encoding="utf-8"))
+        self.assertEqual([], self.leftovers())
+
+    def test_completed_write(self):
+        bump.write_atomic(self.path, "new content\n")
+        self.assertEqual("new content\n", self.path.read_text(encoding="utf-8"))
+        self.assertEqual([], self.leftovers())
+
+class InterruptedBumpTest(unittest.TestCase):
+
+    def test_each_build_file_is_old_or_new(self):
+        for stop_after in (0, 3, 17):
+            with tempfile.TemporaryDirectory() as tmp:
+                base = Path(tmp) / "sources"
+                make_tree(base, 60, variants=10)
+                files = sorted(base.rglob("build.gradle.kts"))
+                before = {path: path.read_text(encoding="utf-8") for path in files}
+                expected = {path: bump.bump_text(content)[0] for path, content in before.items()}
+
+                with mock.patch.object(bump.os, "replace", interrupt_after(stop_after, os.replace)), \
+                        contextlib.redirect_stdout(io.StringIO()), self.assertRaises(Interrupt):
+                    bump.bump_version_codes(str(base))
+
+                after = {path: path.read_text(encoding="utf-8") for path in files}
+                self.assertEqual(stop_after, sum(after[path] == expected[path] for path in files))
+                self.assertTrue(all(after[path] in (before[path], expected[path]) for path in files))
+                self.assertEqual([], sorted(base.rglob("*.tmp")))
+                self.assertEqual(60, len(load_catalog(base)))
+
+class InterruptedSourceTest(unittest.TestCase):
+
+    def test_no_partial_source_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            plan = add_source.plan_source("Novel Example", "novelexample.com", "en", "html", False)
+            plan["base"] = Path(tmp) / plan["base"]
+            rendered = add_source.render_source(plan)
+            with mock.patch.object(add_source.os, "replace", interrupt_after(1, os.replace)), \
+                    self.assertRaises(Interrupt):
+                add_source.write_source(plan)
+            for path, content in rendered.items():
+                if path.exists():
+                    self.assertEqual(content, path.read_text(encoding="utf-8"))
+            self.assertEqual(1, sum(path.exists() for path in rendered))
+
+            # A re-run finishes the source instead of refusing the existing directory
+            empty = Catalog([], Path(tmp) / "sources")
+            self.assertEqual("partial", add_source.check_source(plan, empty, IdIndex([])))
+            add_source.write_source(plan)
+            for path, content in rendered.items():
+                self.assertEqual(content, path.read_text(encoding="utf-8"))
+
+            (plan["base"] / "main" / "src" / "Other.kt").write_text("class Other", encoding="utf-8")
+            self.assertEqual(f"{plan['module']} already exists", add_source.check_source(plan, empty, IdIndex([])))
+
+class ManifestTest(unittest.TestCase):
+
+    def test_bad_json_line_is_a_row_error(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            manifest = Path(tmp) / "sources.jsonl"
+            manifest.write_text('{"name": "One", "url": "one.com"}\n\n{"name": "Two",\n[1]\n', encoding="utf-8")
+            rows = add_source.load_manifest(manifest)
+            self.assertEqual([1, 3, 4], [row["line"] for row in rows])
+            self.assertIsNone(rows[0]["error"])
+            self.assertTrue(rows[1]["error"].startswith("invalid JSON"))
+            self.assertIn("expected an object", rows[2]["error"])
+
+    def test_theme_without_register_marker(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            plan = add_source.plan_source("Novel Example", "novelexample.com", "en", "html", False, theme="madara")
+            plan["base"] = Path(tmp) / plan["base"]
+            build_file = plan["base"].parent / "build.gradle.kts"
+            build_file.parent.mkdir(parents=True)
+            build_file.write_text("listOf(\n    Extension(name = \"One\"),\n)\n", encoding="utf-8")
+            with self.assertRaisesRegex(add_source.TemplateError, "build.gradle.kts has no"):
+                add_source.render_source(plan)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+"""
+Round trips of build.gradle.kts edits: bumping versionCodes must change
+nothing but those numbers, and a multisrc bump nothing but its own variants.
+"""
+
+import contextlib
+import io
+import random
+import tempfile
+import unittest
+from dataclasses import replace
+from pathlib import Path
+
+import support
+from source_catalog import find_extension_blocks, load_catalog, parse_build_file
+
+bump = support.load_script("bump-version-codes")
+
+BASE = Path("sources")
+THEME_FILE = BASE / "multisrc" / "theme" / "build.gradle.kts"
+TRICKY = ("", "Novels (raw), translated", "Say \\\"hi\\\"", "a = b", "{braces} [and] (parens)", "ünïcödé")
+
+def quoted(text: str) -> str:
+    return f'"{text}"'
+
+def random_block(rng: random.Random, index: int) -> str:
+    args = [
+        ("name", quoted(f"Source{index}")),
+        ("versionCode", str(rng.randint(0, 999))),
+        ("libVersion", quoted("2")),
+        ("lang", quoted(rng.choice(("en", "es", "fr")))),
+        ("description", quoted(rng.choice(TRICKY))),
+        ("nsfw", rng.choice(("true", "false"))),
+        ("icon", "DEFAULT_ICON"),
+        ("sourceDir", quoted(f"variant{index}")),
+    ]
+    if rng.random() < 0.3:
+        args.append(("remoteDependencies", 'listOf("org.example:lib:1.0")'))
+    rng.shuffle(args)
+    separator = rng.choice((" = ", "=", "  =  "))
+    indent = rng.choice(("    ", "\t", "        "))
+    body = ",\n".join(f"{indent}{key}{separator}{value}" for key, value in args)
+    return f"Extension(\n{body}{rng.choice((',', ''))}\n)"
+
+def random_build_file(rng: random.Random, blocks: int) -> str:
+    return "listOf(\n" + ",\n".join(random_block(rng, i) for i in range(blocks)) + ",\n).also(::register)\n"
+
+def without_version_codes(text: str) -> str:
+    return bump.VERSION_CODE.sub("versionCode = N", text)
+
+class BumpTextTest(unittest.TestCase):
+
+    def test_round_trip(self):
+        rng = random.Random(3)
+        for _ in range(200):
+            content = random_build_file(rng, rng.randint(1, 12))
+            bumped, changes = bump.bump_text(content)
+            before = parse_build_file(content, THEME_FILE, BASE)
+            after = parse_build_file(bumped, THEME_FILE, BASE)
+            self.assertEqual(len(before), len(changes))
+            self.assertEqual([replace(r, version_code=r.version_code + 1) for r in before], after)
+            self.assertEqual(without_version_codes(content), without_version_codes(bumped))
+            self.assertEqual(len(find_extension_blocks(content)), len(find_extension_blocks(bumped)))
+
+    def test_text_without_version_codes_is_unchanged(self):
+        content = 'listOf("en").map { lang -> Extension(name = "A", lang = lang) }.also(::register)\n'
+        self.assertEqual((content, []), bump.bump_text(content))
+
+    def test_bumps_compose(self):
+        rng = random.Random(5)
+        content = random_build_file(rng, 6)
+        twice, _ = bump.bump_text(bump.bump_text(content)[0])
+        expected = [replace(r, version_code=r.version_code + 2) for r in parse_build_file(content, THEME_FILE, BASE)]
+        self.assertEqual(expected, parse_build_file(twice, THEME_FILE, BASE))
+
+class BumpModulesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        (self.root / THEME_FILE).parent.mkdir(parents=True)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def bump_quietly(self, modules, dry_run=False) -> int:
+        with contextlib.redirect_stderr(io.StringIO()):
+            return bump.bump_modules(modules, self.root, dry_run)
+
+    def test_only_chosen_variants_change(self):
+        rng = random.Random(9)
+        for _ in range(50):
+            content = random_build_file(rng, rng.randint(2, 15))
+            (self.root / THEME_FILE).write_text(content, encoding="utf-8")
+            records = parse_build_file(content, THEME_FILE, BASE)
+            chosen = set(rng.sample(range(len(records)), rng.randint(1, len(records))))
+            modules = [{"module": records[i].module, "buildFile": THEME_FILE.as_posix(), "sourceDir": records[i].source_dir}
+                       for i in chosen]
+
+            self.assertEqual(len(chosen), self.bump_quietly(modules))
+            bumped = (self.root / THEME_FILE).read_text(encoding="utf-8")
+            after = parse_build_file(bumped, THEME_FILE, BASE)
+            for i, (old, new) in enumerate(zip(records, after)):
+                self.assertEqual(old.version_code + (i in chosen), new.version_code)
+            old_blocks = [content[s:e] for s, e in find_extension_blocks(content)]
+            new_blocks = [bumped[s:e] for s, e in find_extension_blocks(bumped)]
+            for i in set(range(len(records))) - chosen:
+                self.assertEqual(old_blocks[i], new_blocks[i])
+
+    def test_dry_run_writes_nothing(self):
+        content = random_build_file(random.Random(1), 4)
+        (self.root / THEME_FILE).write_text(content, encoding="utf-8")
+        record = parse_build_file(content, THEME_FILE, BASE)[2]
+        module = {"module": record.module, "buildFile": THEME_FILE.as_posix(), "sourceDir": record.source_dir}
+        self.assertEqual(1, self.bump_quietly([module], dry_run=True))
+        self.assertEqual(content, (self.root / THEME_FILE).read_text(encoding="utf-8"))
+
+class BuildFileChangesTest(unittest.TestCase):
+
+    def test_only_edited_blocks_count(self):
+        rng = random.Random(5)
+        for _ in range(50):
+            content = random_build_file(rng, rng.randint(2, 10))
+            spans = find_extension_blocks(content)
+            dirs = [record.source_dir for record in parse_build_file(content, THEME_FILE, BASE)]
+
+            self.assertEqual(set(), bump.build_file_changes(content, bump.bump_text(content)[0]))
+            start, end = spans[rng.randrange(len(spans))]
+            edited = content[:start] + content[start:end].replace("Extension(", "Extension(\n    nsfw = true,", 1) + content[end:]
+            self.assertEqual({dirs[spans.index((start, end))]}, bump.build_file_changes(content, edited))
+
+            added = content.replace(",\n).also", ",\n" + random_block(rng, 99) + ",\n).also")
+            self.assertEqual({"variant99"}, bump.build_file_changes(content, added))
+            self.assertEqual(set(), bump.build_file_changes(added, content))
+            self.assertIsNone(bump.build_file_changes(content, content.replace(").also(::register)", ").onEach(::register)")))
+
+        single = 'listOf("en").map { lang ->\n  Extension(\n    name = "A",\n    versionCode = 3,\n  )\n}.also(::register)\n'
+        self.assertEqual(set(), bump.build_file_changes(single, single.replace("= 3", "= 4")))
+        self.assertEqual({None}, bump.build_file_changes(single, single.replace('"A"', '"B"')))
+
+class BumpTreeTest(unittest.TestCase):
+
+    def test_every_version_code_moves_by_one(self):
+        from synthetic_tree import make_tree
+
+        with tempfile.TemporaryDirectory() as tmp:
+            base = Path(tmp) / "sources"
+            make_tree(base, 200, variants=15)
+            before = {(r.name, r.lang): r for r in load_catalog(base)}
+            with contextlib.redirect_stdout(io.StringIO()):
+                updates = bump.bump_version_codes(str(base))
+            after = {(r.name, r.lang): r for r in load_catalog(base)}
+            self.assertEqual(len(before), updates)
+            self.assertEqual(before.keys(), after.keys())
+            for key, record in before.items():
+                self.assertEqual(replace(record, version_code=record.version_code + 1), after[key])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+"""
+Codemod rule sets: every rule rewrites as it would on its own once the rules
+are combined into one alternation.
+"""
+
+import unittest
+
+import support
+from codemod_engine import ATTENTION, REPLACED, Rule, RuleError, RuleSet, load_rules
+
+class RuleSetTest(unittest.TestCase):
+
+    def test_lookarounds(self):
+        rules = RuleSet("t", [
+            Rule(pattern=r"\bJsoup(?=\.parse)", replace="Ksoup"),
+            Rule(pattern=r"(?<=val )doc\b", replace="document"),
+        ])
+        text, changes = rules.rewrite("val doc = Jsoup.parse(x)\nJsoup.connect(y)\n")
+        self.assertEqual("val document = Ksoup.parse(x)\nJsoup.connect(y)\n", text)
+        self.assertEqual([["doc -> document", REPLACED, 1], ["Jsoup -> Ksoup", REPLACED, 1]], changes)
+
+    def test_groups_per_rule(self):
+        rules = RuleSet("t", [
+            Rule(pattern=r"^import (x)$", replace=r"import y.\1"),
+            Rule(pattern=r"\b(\w+)Format\(", replace=r"\1Fmt("),
+            Rule(pattern=r"\bThread\.sleep\(", message="blocking"),
+        ])
+        text, changes = rules.rewrite("import x\nDateFormat(a)\nThread.sleep(1)\n")
+        self.assertEqual("import y.x\nDateFmt(a)\nThread.sleep(1)\n", text)
+        self.assertIn(["blocking", ATTENTION, 1], changes)
+
+    def test_pattern_back_references_rejected(self):
+        for pattern in (r"(\w+)\.\1\b", r"(a)?(?(1)b|c)", r"(?P<n>a)"):
+            with self.assertRaises(RuleError, msg=pattern):
+                RuleSet("t", [Rule(pattern=pattern, replace="x")])
+        # An escaped backslash before a digit is not a back-reference
+        self.assertEqual("x", RuleSet("t", [Rule(pattern=r"\\1", replace="x")]).rewrite("\\1")[0])
+
+    def test_bundled_rule_sets_load(self):
+        self.assertTrue(load_rules("kmp").rules)
+
+if __name__ == "__main__":
+    unittest.main()
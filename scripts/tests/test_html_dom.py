@@ -0,0 +1,24 @@
+"""
+html_dom selectors follow Jsoup where it differs from CSS: [attr~=regex] is
+a regex search, not a whitespace-separated word.
+"""
+
+import unittest
+
+import support
+from html_dom import SelectorError, compile_selector, parse_html, select
+
+class AttributeRegexTest(unittest.TestCase):
+
+    def test_regex_search(self):
+        root = parse_html('<a href="/novel/12.html">a</a><a href="/tag/x">b</a><div class="item big">c</div>')
+        self.assertEqual(["a"], [n.text() for n in select(root, r"a[href~=/novel/\d+]")])
+        self.assertEqual(["c"], [n.text() for n in select(root, 'div[class~="^item b"]')])
+        self.assertEqual([], select(root, "div[class~=^big]"))
+
+    def test_bad_regex(self):
+        with self.assertRaises(SelectorError):
+            compile_selector('a[href~="("]')
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+"""
+Bundle analysis: modules map to the right dependency, and each bundle's size
+on disk is shared out over its dependencies without losing bytes.
+"""
+
+import contextlib
+import io
+import json
+import random
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import support
+
+analyzer = support.load_script("analyze-js-bundles")
+
+LIBRARIES = ("kotlin-kotlin-stdlib", "ktor-ktor-client-core", "ksoup", "kotlinx-serialization-kotlinx-serialization-json")
+
+def module(name: str, size: int) -> dict:
+    return {"name": name, "size": size}
+
+def synthetic_stats(rng: random.Random, sources: int) -> dict:
+    chunks = [
+        {"names": ["runtime"], "files": ["runtime.js"],
+         "modules": [module(f"./kotlin/{lib}/pkg/File{i}.mjs", rng.randint(100, 5000)) for lib in LIBRARIES for i in range(3)]},
+        {"names": ["shared"], "files": ["shared.js"],
+         "modules": [module("../../node_modules/@js-joda/core/dist/js-joda.esm.js", 9000)]},
+    ]
+    for i in range(sources):
+        own = [module(f"./kotlin/{analyzer.OWN_MODULE}/ireader/source{i}/en/File{j}.mjs", rng.randint(200, 3000))
+               for j in range(rng.randint(1, 5))]
+        chunks.append({"names": [f"en-source{i}"], "files": [f"en-source{i}.js", f"en-source{i}.js.map"],
+                       "modules": [{"name": f"./js-entries/en-source{i}.mjs + {len(own)} modules", "size": 0, "modules": own}]})
+    chunks.append({"names": ["sources-bundle"], "files": ["sources-bundle.js"],
+                   "modules": [m for chunk in chunks for m in chunk["modules"]]})
+    assets = [{"name": chunk["files"][0], "size": rng.randint(1000, 90000)} for chunk in chunks]
+    return {"assets": assets, "chunks": chunks}
+
+class DependencyTest(unittest.TestCase):
+
+    def test_dependency_of(self):
+        cases = {
+            "../../node_modules/ws/index.js": "ws",
+            "../../node_modules/@js-joda/core/dist/js-joda.esm.js": "@js-joda/core",
+            "../../node_modules/a/node_modules/b/lib.js": "b",
+            "./kotlin/kotlin-kotlin-stdlib/kotlin/collections/ArrayList.mjs": "kotlin-kotlin-stdlib",
+            f"./kotlin/{analyzer.OWN_MODULE}/ireader/freewebnovel/en/FreeWebNovel.mjs":
+                f"{analyzer.OWN_MODULE}:ireader.freewebnovel.en",
+            f"./kotlin/{analyzer.OWN_MODULE}/Main.mjs": analyzer.OWN_MODULE,
+            "C:\\build\\js\\packages\\x\\kotlin\\ksoup\\Ksoup.mjs": "ksoup",
+            "webpack/runtime/define property getters": "webpack runtime",
+            "./js-entries/en-foo.mjs": "entry",
+            "data:text/javascript,": "other",
+        }
+        for name, expected in cases.items():
+            self.assertEqual(expected, analyzer.dependency_of(name), name)
+
+class AnalyzeTest(unittest.TestCase):
+
+    def test_bytes_are_attributed(self):
+        rng = random.Random(21)
+        for _ in range(50):
+            stats = synthetic_stats(rng, rng.randint(1, 30))
+            bundles = analyzer.analyze(stats)
+            sizes = {asset["name"]: asset["size"] for asset in stats["assets"]}
+            self.assertEqual(len(stats["chunks"]), len(bundles))
+            for bundle in bundles:
+                self.assertEqual(sizes[bundle["file"]], bundle["bytes"])
+                # Rounding loses at most half a byte per dependency
+                self.assertLessEqual(abs(bundle["bytes"] - sum(bundle["dependencies"].values())),
+                                     len(bundle["dependencies"]))
+                if bundle["kind"] == "source":
+                    self.assertEqual(bundle["bytes"], analyzer.own_code(bundle) + sum(
+                        size for dep, size in bundle["dependencies"].items() if not dep.startswith(analyzer.OWN_MODULE)))
+            self.assertEqual(["runtime", "shared"], [b["kind"] for b in bundles[:2]])
+            self.assertEqual("full", bundles[-1]["kind"])
+
+    def test_duplicated_dependencies_are_counted(self):
+        stats = {"chunks": [
+            {"names": [f"en-s{i}"], "files": [f"en-s{i}.js"],
+             "modules": [module("../../node_modules/big/index.js", 100), module(f"./kotlin/{analyzer.OWN_MODULE}/s{i}/S.mjs", 100)]}
+            for i in range(3)
+        ], "assets": [{"name": f"en-s{i}.js", "size": 2000} for i in range(3)]}
+        totals = analyzer.dependency_totals(analyzer.analyze(stats))
+        self.assertEqual({"runtime": 0, "shared": 0, "sources": 3000, "copies": 3}, totals["big"])
+
+    def test_cli_budget_and_names(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            dist = Path(tmp)
+            stats = synthetic_stats(random.Random(3), 4)
+            for chunk in stats["chunks"]:
+                (dist / chunk["files"][0]).write_bytes(b"x" * (2048 if chunk["names"][0] == "en-source2" else 512))
+            (dist / "bundle-stats.json").write_text(json.dumps(stats), encoding="utf-8")
+            (dist / "js-index.json").write_text(json.dumps({"sources": [{"file": "en-source2.js", "name": "Two"}]}),
+                                                encoding="utf-8")
+            bundles = analyzer.analyze(stats, dist, json.loads((dist / "js-index.json").read_text()))
+            self.assertEqual("Two", next(b["name"] for b in bundles if b["file"] == "en-source2.js"))
+            self.assertTrue(all(b["bytes"] in (512, 2048) and b["gzip"] for b in bundles))
+
+            with mock.patch("sys.argv", ["analyze-js-bundles.py", str(dist), "--budget", "1", "--json"]), \
+                    contextlib.redirect_stdout(io.StringIO()) as out, self.assertRaises(SystemExit) as exit:
+                analyzer.main()
+            self.assertEqual(1, exit.exception.code)
+            self.assertEqual(["en-source2.js"], json.loads(out.getvalue())["overBudget"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+"""
+selector-sweep.py --write: a failing source is listed as "need update", and
+only the entries the sweep wrote are undone once it passes; hand-written
+notes and fetch errors change nothing.
+"""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import support
+
+sweep = support.load_script("selector-sweep")
+
+def result(key: str, status: str) -> dict:
+    return {"key": key, "status": status, "version": "2026-10-16", "stages": {}, "selectors": {}}
+
+class UpdateTrackersTest(unittest.TestCase):
+
+    def test_statuses(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            listed = {
+                "working": "Working", "broken": "need update", "blocked": "Cloudflare protection blocking requests",
+                "skipped": "Working", "unreachable": "Working",
+            }
+            (root / sweep.NOT_WORKING).write_text(json.dumps({"sources": listed}), encoding="utf-8")
+            results = [result("working", "fail"), result("broken", "pass"), result("blocked", "fail"),
+                       result("skipped", "skip"), result("unreachable", "error"), result("new", "fail"),
+                       result("fine", "pass"), result("down", "error")]
+            added, cleared = sweep.update_trackers(results, root, "corpus", "2026-10-16")
+
+            sources = json.loads((root / sweep.NOT_WORKING).read_text(encoding="utf-8"))["sources"]
+            self.assertEqual(dict(listed, working="need update", new="need update"), sources)
+            self.assertEqual((["working", "new"], []), (added, cleared))
+            tracker = json.loads((root / sweep.FIX_TRACKER).read_text(encoding="utf-8"))["selectorHealth"]
+            self.assertEqual((2, 3, 2), (tracker["passed"], tracker["failed"], tracker["errors"]))
+            self.assertEqual({"new": None, "working": "Working"}, tracker["marked"])
+
+            # Passing again undoes the sweep's own entries, not the hand-written "need update"
+            results = [result("working", "pass"), result("new", "pass"), result("broken", "pass")]
+            added, cleared = sweep.update_trackers(results, root, "corpus", "2026-10-17")
+            sources = json.loads((root / sweep.NOT_WORKING).read_text(encoding="utf-8"))["sources"]
+            self.assertEqual(listed, sources)
+            self.assertEqual(([], ["working", "new"]), (added, cleared))
+            tracker = json.loads((root / sweep.FIX_TRACKER).read_text(encoding="utf-8"))["selectorHealth"]
+            self.assertEqual({}, tracker["marked"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+"""
+smoke-test.py verdicts: a source only passes when a stage actually ran, so
+sources without DSL selectors or without matching fixtures are not counted.
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import support
+from source_selectors import STAGES, stage_cell
+
+smoke = support.load_script("smoke-test")
+
+class VerdictTest(unittest.TestCase):
+
+    def test_verdicts(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            folder = Path(tmp)
+            (folder / "chapter.html").write_text("<h1>T</h1><div class='text'><p>a</p></div>", encoding="utf-8")
+            content = {"pageTitleSelector": "h1", "pageContentSelector": "div.text p"}
+            cases = {
+                "no selectors": {},
+                "passed": {"content": content},
+                "failed": {"content": dict(content, pageContentSelector="div.missing p")},
+                "untested": {"explore": [{"key": "Latest", "selector": "li", "nameSelector": "a"}]},
+            }
+            for expected, stages in cases.items():
+                result = smoke.check_source(("Source", stages, folder))
+                self.assertEqual(expected, result["status"], stages)
+                self.assertEqual(set(STAGES), set(result["stages"]))
+
+class StageCellTest(unittest.TestCase):
+
+    def test_cells(self):
+        self.assertEqual("-", stage_cell("detail", {"ok": None}))
+        self.assertEqual("?", stage_cell("detail", {"ok": None, "error": "unsupported selector: :lang"}))
+        self.assertEqual("FAIL sel", stage_cell("detail", {"ok": False, "error": "bad selector"}))
+        self.assertEqual("FAIL 0/3", stage_cell("chapters", {"ok": False, "valid": 0, "items": 3}))
+        self.assertEqual("4 p", stage_cell("content", {"ok": True, "paragraphs": 4}))
+
+if __name__ == "__main__":
+    unittest.main()
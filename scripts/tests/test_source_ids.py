@@ -0,0 +1,95 @@
+"""
+ID stability: a source's ID is stored by every installed app, so
+generate_id(name, lang) must never change for a name/lang that already
+exists. source-ids.json snapshots the IDs of every source in the tree (by
+display name and by add-source.py class name); append new sources to it,
+never edit an existing entry.
+"""
+
+import hashlib
+import json
+import random
+import string
+import tempfile
+import unittest
+from pathlib import Path
+
+import support
+from source_catalog import generate_source_id, load_catalog
+from source_ids import clean_name, generate_id
+from synthetic_tree import LANGS, make_tree
+
+SNAPSHOT = Path(__file__).with_name("source-ids.json")
+MAX_ID = (1 << 63) - 1
+
+def reference_id(name: str, lang: str, version: int = 1) -> int:
+    digest = hashlib.md5(f"{name.lower()}/{lang}/{version}".encode()).digest()
+    return int.from_bytes(digest[:8], "big") & MAX_ID
+
+def random_name(rng: random.Random) -> str:
+    alphabet = string.ascii_letters + string.digits + " -'.!&éüß中"
+    return "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 24)))
+
+class SourceIdTest(unittest.TestCase):
+
+    def test_snapshot(self):
+        snapshot = json.loads(SNAPSHOT.read_text(encoding="utf-8"))
+        self.assertGreater(len(snapshot), 100)
+        changed = []
+        for key, expected in snapshot.items():
+            name, _, lang = key.rpartition("/")
+            if generate_id(name, lang) != expected:
+                changed.append(key)
+        self.assertEqual([], changed, "generate_id changed for existing sources")
+
+    def test_every_source_is_in_snapshot(self):
+        snapshot = json.loads(SNAPSHOT.read_text(encoding="utf-8"))
+        catalog = load_catalog(support.SCRIPTS.parent / "sources")
+        missing = sorted({f"{r.name}/{r.lang}" for r in catalog} - snapshot.keys())
+        self.assertEqual([], missing, f"add the new sources to {SNAPSHOT.name}")
+
+    def test_matches_reference(self):
+        rng = random.Random(7)
+        for _ in range(2000):
+            name, lang, version = random_name(rng), rng.choice(LANGS), rng.randint(1, 3)
+            source_id = generate_id(name, lang, version)
+            self.assertEqual(reference_id(name, lang, version), source_id)
+            self.assertEqual(generate_source_id(name, lang, version), source_id)
+            self.assertTrue(0 <= source_id <= MAX_ID)
+
+    def test_name_case_does_not_matter(self):
+        # ASCII only: "ß".upper() is "SS", which lowercases to a different name
+        flip = str.maketrans(string.ascii_letters, string.ascii_letters.swapcase())
+        rng = random.Random(11)
+        for _ in range(500):
+            name, lang = random_name(rng), rng.choice(LANGS)
+            self.assertEqual(generate_id(name, lang), generate_id(name.translate(flip), lang))
+
+    def test_lang_and_version_change_the_id(self):
+        rng = random.Random(13)
+        for _ in range(500):
+            name = random_name(rng)
+            self.assertNotEqual(generate_id(name, "en"), generate_id(name, "es"))
+            self.assertNotEqual(generate_id(name, "en", 1), generate_id(name, "en", 2))
+
+    def test_clean_name_settles(self):
+        # "NovelFull" cleans to "Novelfull" (the ID add-source.py has always used), which stays put
+        rng = random.Random(17)
+        for _ in range(500):
+            name = clean_name(clean_name(random_name(rng)))
+            self.assertEqual(name, clean_name(name))
+            self.assertTrue(name == "" or name.isalnum())
+
+    def test_catalog_ids_of_synthetic_tree(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            base = Path(tmp) / "sources"
+            make_tree(base, 300, variants=20)
+            catalog = load_catalog(base)
+            self.assertEqual(300, len(catalog))
+            for record in catalog:
+                self.assertFalse(record.explicit_id)
+                self.assertEqual(generate_id(record.name, record.lang), record.source_id)
+            self.assertEqual(len(catalog), len({record.source_id for record in catalog}))
+
+if __name__ == "__main__":
+    unittest.main()
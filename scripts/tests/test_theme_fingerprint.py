@@ -0,0 +1,68 @@
+"""
+Theme fingerprints: the selector index finds exactly what testing every
+selector on every node finds, and classify() agrees with rank().
+"""
+
+import random
+import re
+import unittest
+
+import support
+from html_dom import SelectorIndex, compile_selector, parse_html
+from theme_fingerprint import SignatureIndex, load_signatures
+
+TAGS = ("div", "span", "a", "p", "li", "ul", "h3", "img", "section")
+
+def random_page(rng: random.Random, tokens: list, nodes: int) -> str:
+    """Nested elements carrying ids, classes and attributes taken from real selectors."""
+    out, open_tags = [], []
+    for _ in range(nodes):
+        if open_tags and rng.random() < 0.4:
+            out.append(f"</{open_tags.pop()}>")
+            continue
+        tag = rng.choice(TAGS)
+        attrs = []
+        if rng.random() < 0.6:
+            attrs.append(f'class="{" ".join(rng.sample(tokens, rng.randint(1, 3)))}"')
+        if rng.random() < 0.2:
+            attrs.append(f'id="{rng.choice(tokens)}"')
+        if rng.random() < 0.2:
+            attrs.append(f'href="/{rng.choice(tokens)}/1.html" data-novel-id="{rng.randint(1, 9)}"')
+        out.append(f"<{tag} {' '.join(attrs)}>{rng.choice(tokens)}")
+        open_tags.append(tag)
+    return "<html><body>" + "".join(out) + "</body></html>"
+
+class SelectorIndexTest(unittest.TestCase):
+
+    def test_matches_brute_force(self):
+        signatures = load_signatures(support.SCRIPTS.parent / "sources")
+        tokens = sorted({t for value in signatures.selectors for t in re.findall(r"[\w-]+", value)})
+        index = SelectorIndex(signatures.selectors)
+        rng = random.Random(11)
+        for _ in range(40):
+            root = parse_html(random_page(rng, tokens, rng.randint(5, 300)))
+            expected = {value for value, selector in signatures.selectors.items()
+                        if any(selector.matches(node, root) for node in root.iter())}
+            self.assertEqual(expected, index.matching(root))
+
+    def test_groups_and_universal(self):
+        selectors = {q: compile_selector(q) for q in ("h1, .title", "*", "ul > li.x", "#main a[href]", "[data-id]")}
+        root = parse_html('<div id="main"><ul><li class="x y">1</li></ul><a href="/">a</a></div>')
+        self.assertEqual({"*", "ul > li.x", "#main a[href]"}, SelectorIndex(selectors).matching(root))
+
+class ClassifyTest(unittest.TestCase):
+
+    def test_classify_uses_ranking(self):
+        signatures = SignatureIndex({
+            "madara": {"selectors": [".c-blog__heading", "div.summary_image"], "fragments": []},
+            "readwn": {"selectors": [".novel-item"], "fragments": ["e/search/index.php"]},
+        })
+        page = '<div class="C-Blog__heading"><link href="/WP-Content/themes/madara/x.css"></div><div class="summary_image">'
+        ranked = signatures.rank([page])
+        self.assertEqual("madara", ranked[0].theme)
+        self.assertEqual(ranked[0], signatures.classify([page]))
+        self.assertEqual(signatures.classify([page]), signatures.classify_ranked(ranked))
+        self.assertIsNone(signatures.classify_ranked(ranked, threshold=100))
+
+if __name__ == "__main__":
+    unittest.main()
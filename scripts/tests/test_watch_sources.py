@@ -0,0 +1,231 @@
+"""
+watch-sources.py: a save re-checks only the module it touches, against the
+in-memory catalog and ID index, without shrinking the shared caches; the
+socket speaks JSON lines and WebSocket.
+"""
+
+import json
+import shutil
+import socket
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import support
+from source_catalog import load_catalog
+from source_watch import watch
+from synthetic_tree import make_tree
+
+watcher = support.load_script("watch-sources")
+
+CONTENT = '''
+    override val content: Content get() = SourceFactory.Content(
+        pageTitleSelector = "h1",
+        pageContentSelector = "div.text p",
+    )
+}
+'''
+
+def kotlin_file(base: Path, record) -> Path:
+    return next((base.parent / record.module).rglob("*.kt"))
+
+class RevalidatorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.base = Path(self.tmp.name) / "sources"
+        self.fixtures = Path(self.tmp.name) / "fixtures"
+        make_tree(self.base, 40, variants=5)
+        self.revalidator = watcher.Revalidator(self.base, self.fixtures)
+        self.record, self.other = [r for r in self.revalidator.catalog if not r.is_multisrc][:2]
+
+    def test_affected_modules(self):
+        kt = kotlin_file(self.base, self.record)
+        variant = next(r for r in self.revalidator.catalog if r.is_multisrc)
+        theme_file = self.base.parent / variant.build_file
+        cases = {
+            kt: ({self.record.module}, set()),
+            kt.with_suffix(".txt"): (set(), set()),
+            self.fixtures / Path(self.other.module).relative_to("sources") / "chapter.html": ({self.other.module}, set()),
+            theme_file: ({r.module for r in self.revalidator.catalog if r.build_file == variant.build_file},
+                         {self.base / Path(variant.build_file).relative_to("sources")}),
+            Path(self.tmp.name) / "elsewhere.kt": (set(), set()),
+        }
+        for path, (modules, build_files) in cases.items():
+            found_build_files, found_modules = self.revalidator.affected([path])
+            self.assertEqual(modules, found_modules, path)
+            self.assertEqual(build_files, found_build_files, path)
+
+    def test_id_collision_and_fixture(self):
+        kt = kotlin_file(self.base, self.record)
+        text = kt.read_text(encoding="utf-8").rstrip().rstrip("}")
+        kt.write_text(text + f"    override val id: Long get() = {self.other.source_id}L\n" + CONTENT, encoding="utf-8")
+        folder = self.fixtures / Path(self.record.module).relative_to("sources")
+        folder.mkdir(parents=True)
+        (folder / "chapter.html").write_text("<h1>One</h1><div class='text'><p>a</p><p>b</p></div>", encoding="utf-8")
+
+        [result] = self.revalidator.revalidate([kt])
+        self.assertEqual(self.record.module, result["module"])
+        self.assertFalse(result["ok"])
+        self.assertEqual([self.other.source_id], [c["id"] for c in result["ids"]["collisions"]])
+        self.assertIn(self.other.module, result["ids"]["collisions"][0]["with"][0])
+        self.assertEqual({"paragraphs": 2, "ok": True}, {k: result["stages"]["content"][k] for k in ("paragraphs", "ok")})
+        self.assertIsNone(result["stages"]["explore"]["ok"])
+
+        # Other sources stay in the ID index, and in the shared cache
+        self.assertEqual(len(self.revalidator.catalog), len(self.revalidator.ids.entries))
+        ids = json.loads((Path(self.tmp.name) / ".cache" / "source-ids.json").read_text(encoding="utf-8"))
+        self.assertEqual(len({r.module for r in self.revalidator.catalog}), len(ids["files"]))
+
+        kt.write_text(text + "}\n", encoding="utf-8")
+        [result] = self.revalidator.revalidate([kt])
+        self.assertTrue(result["ok"])
+        self.assertEqual([], result["ids"]["collisions"])
+
+    def test_build_file_edits(self):
+        build = self.base.parent / self.record.build_file
+        build.write_text(build.read_text(encoding="utf-8").replace(f'"{self.record.name}"', '"Renamed"', 1),
+                         encoding="utf-8")
+        [result] = self.revalidator.revalidate([build])
+        self.assertEqual([f"Renamed ({self.record.lang})"], result["sources"])
+        self.assertIsNotNone(self.revalidator.catalog.find("Renamed", self.record.lang))
+        self.assertEqual(len(load_catalog(self.base)), len(self.revalidator.catalog))
+
+        # A rename: the source is copied to a new module, then the old one is deleted
+        module_dir = self.base.parent / self.record.module
+        copy = module_dir.with_name(module_dir.name + "renamed")
+        shutil.copytree(module_dir, copy)
+        [copied] = self.revalidator.revalidate([copy / "build.gradle.kts"])
+        self.assertFalse(copied["ok"])
+
+        shutil.rmtree(module_dir)
+        removed, checked = self.revalidator.revalidate([build, next(copy.rglob("*.kt"))])
+        self.assertEqual({"event": "removed", "module": self.record.module}, {k: removed[k] for k in ("event", "module")})
+        self.assertEqual([], self.revalidator.catalog.by_module(self.record.module))
+        self.assertEqual(len(self.revalidator.catalog), len(load_catalog(self.base)))
+        self.assertEqual([], checked["ids"]["collisions"])
+        self.assertNotIn(self.record.module, {entry.module for entry in self.revalidator.ids.entries})
+
+class WebSocketTest(unittest.TestCase):
+
+    def test_frames(self):
+        for size in (0, 5, 125, 126, 70000):
+            payload = bytes(i % 251 for i in range(size))
+            frame = watcher.websocket_frame(payload)
+            self.assertIsNone(watcher.websocket_parse(frame[:-1] if size else frame[:1]))
+            self.assertEqual((1, payload, len(frame)), watcher.websocket_parse(frame + b"rest"))
+
+        mask = b"\x01\x02\x03\x04"
+        masked = bytes([0x81, 0x80 | 3, *mask]) + bytes(b ^ mask[i % 4] for i, b in enumerate(b"abc"))
+        self.assertEqual((1, b"abc", len(masked)), watcher.websocket_parse(masked))
+        # RFC 6455, section 1.3
+        self.assertEqual("s3pPLMBiTxaQ9kYGzzhZRbK+xOo=", watcher.websocket_accept("dGhlIHNhbXBsZSBub25jZQ=="))
+
+    def test_hub_speaks_both(self):
+        listener = socket.create_server(("127.0.0.1", 0))
+        self.addCleanup(listener.close)
+        hub = watcher.Hub()
+        port = listener.getsockname()[1]
+
+        silent = socket.create_connection(("127.0.0.1", port))
+        ws = socket.create_connection(("127.0.0.1", port))
+        self.addCleanup(silent.close)
+        self.addCleanup(ws.close)
+        # Adding never waits for the client, even one that sends nothing
+        started = time.monotonic()
+        lines_client = hub.add(listener.accept()[0])
+        ws_client = hub.add(listener.accept()[0])
+        self.assertLess(time.monotonic() - started, 0.2)
+
+        # Events wait until the protocol is known
+        hub.broadcast({"event": "hello"})
+        ws.sendall(b"GET / HTTP/1.1\r\nHost: x\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                   b"Sec-WebSocket-Key: dGhlIHNhbXBsZSBub25jZQ==\r\nSec-WebSocket-Version: 13\r\n\r\n")
+        self.assertEqual([], hub.receive(ws_client))
+        self.assertEqual([], hub.expire(time.monotonic()))
+        self.assertEqual([lines_client], hub.undecided())
+        self.assertEqual([], hub.expire(time.monotonic() + watcher.HANDSHAKE_WAIT))
+        self.assertEqual([], hub.undecided())
+        hub.broadcast({"event": "result", "ok": True})
+
+        lines = silent.makefile()
+        self.assertEqual([{"event": "hello"}, {"event": "result", "ok": True}],
+                         [json.loads(lines.readline()) for _ in range(2)])
+        ws.settimeout(5)
+        data = b""
+        while b"\r\n\r\n" not in data or not self.frames(data.split(b"\r\n\r\n", 1)[1], 2):
+            data += ws.recv(4096)
+        head, frames = data.split(b"\r\n\r\n", 1)
+        self.assertIn(b"101 Switching Protocols", head)
+        self.assertIn(b"s3pPLMBiTxaQ9kYGzzhZRbK+xOo=", head)
+        self.assertEqual([{"event": "hello"}, {"event": "result", "ok": True}],
+                         [json.loads(payload) for payload in self.frames(frames, 2)])
+
+    def test_stalled_upgrade_is_dropped(self):
+        listener = socket.create_server(("127.0.0.1", 0))
+        self.addCleanup(listener.close)
+        hub = watcher.Hub()
+        sock = socket.create_connection(listener.getsockname())
+        self.addCleanup(sock.close)
+        client = hub.add(listener.accept()[0])
+        sock.sendall(b"GET / HTTP/1.1\r\n")
+        self.assertEqual([], hub.receive(client))
+        self.assertEqual([], hub.expire(time.monotonic() + watcher.HANDSHAKE_WAIT))
+        self.assertEqual([client], hub.expire(time.monotonic() + watcher.HANDSHAKE_TIMEOUT))
+
+    @staticmethod
+    def frames(data: bytes, count: int) -> list:
+        """The first `count` frame payloads in `data`, or [] while incomplete."""
+        payloads = []
+        while len(payloads) < count:
+            frame = watcher.websocket_parse(data)
+            if frame is None:
+                return []
+            payloads.append(frame[1])
+            data = data[frame[2]:]
+        return payloads
+
+class WatchTest(unittest.TestCase):
+
+    def changes(self, watched, expected: Path) -> set:
+        found = set()
+        deadline = time.monotonic() + 5
+        while expected not in found and time.monotonic() < deadline:
+            time.sleep(0.05)
+            found.update(watched.read()[0])
+        return found
+
+    def check_watcher(self, poll: bool):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / "en" / "one" / "build").mkdir(parents=True)
+            watched, warning = watch([root], poll=poll)
+            self.addCleanup(watched.close)
+            self.assertIsNone(warning)
+            time.sleep(0.02)
+
+            edited = root / "en" / "one" / "One.kt"
+            edited.write_text("class One", encoding="utf-8")
+            self.assertIn(edited, self.changes(watched, edited))
+
+            created = root / "en" / "two" / "main" / "Two.kt"
+            created.parent.mkdir(parents=True)
+            created.write_text("class Two", encoding="utf-8")
+            self.assertIn(created, self.changes(watched, created))
+
+            (root / "en" / "one" / "build" / "out.class").write_text("x", encoding="utf-8")
+            edited.unlink()
+            self.assertNotIn(root / "en" / "one" / "build" / "out.class", self.changes(watched, edited))
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "inotify is Linux only")
+    def test_inotify(self):
+        self.check_watcher(poll=False)
+
+    def test_poller(self):
+        self.check_watcher(poll=True)
+
+if __name__ == "__main__":
+    unittest.main()
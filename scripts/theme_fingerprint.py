@@ -0,0 +1,209 @@
+"""
+Multisrc theme fingerprints, used by detect-theme.py and add-source.py.
+
+Signatures are derived from each theme's shared code under
+sources/multisrc/<theme>/main/src (the CSS selectors and URL fragments it
+scrapes with) plus a few hand-picked asset/AJAX markers per theme. Each
+feature is weighted by how many themes share it, so DOM patterns common to
+every WordPress site count for little.
+
+The extracted features are cached per Kotlin file in .cache/theme-signatures.json
+with the same mtime/hash scheme as the source catalog. SignatureIndex compiles
+them once: selectors are indexed by their rightmost id/class/tag so each node
+is only tested against those that could match it, and each text marker is
+searched for once in the lowercased page.
+"""
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from html_dom import SelectorError, SelectorIndex, compile_selector, parse_html
+from source_catalog import cached_parse
+
+CACHE_VERSION = 1
+DEFAULT_CACHE = Path(".cache") / "theme-signatures.json"
+
+# Markers that are not spelled out in the theme code: asset paths, AJAX
+# endpoints and form fields the sites built on each theme serve.
+THEME_MARKERS = {
+    "madara": [
+        r'wp-content/(?:themes|plugins)/madara',
+        r'madara-core',
+        r'wp-manga-chapter',
+        r'manga_get_chapters',
+        r'c-blog__heading',
+    ],
+    "mtlnovel": [
+        r'<amp-img',
+        r'mtlnovels?\.(?:com|net)',
+        r'class="ch-list',
+        r'class="nov-head',
+    ],
+    "readnovelfull": [
+        r'data-novel-id',
+        r'ajax/chapter-archive',
+        r'id="chr-content',
+        r'class="novel-title',
+        r'id="list-chapter',
+    ],
+    "readwn": [
+        r'/e/search/index\.php',
+        r'name="tempid"',
+        r'class="novel-item',
+        r'class="header-stats',
+        r'all-onclick-\d+\.html',
+    ],
+    "skynovel": [
+        r'class="cha-tit',
+        r'g_txt_over',
+        r'cha-content',
+    ],
+}
+MARKER_WEIGHT = 3.0
+SELECTOR_WEIGHT = 1.0
+FRAGMENT_WEIGHT = 0.5
+# A match needs roughly one marker plus one selector, and twice the runner-up
+MIN_SCORE = 4.0
+MIN_MARGIN = 2.0
+
+KOTLIN_STRING = re.compile(r'"((?:[^"\\\n]|\\.)*)"')
+TEMPLATE_EXPR = re.compile(r'\$\{[^}]*\}|\$\w+')
+URL_FRAGMENT = re.compile(r'[\w\-./?=&]{6,}')
+SELECTOR_HINT = re.compile(r'[.#\[]')
+NOT_A_SELECTOR = re.compile(r'^\.(?:html?|php|json|jpe?g|png|webp)$')
+NOT_A_FRAGMENT = re.compile(r'^(?:image|text|application|audio|video)/|/[\d.]+(?:/|$)|^[\d/.-]+$')
+
+def extract_features(content: str, path=None) -> dict:
+    """CSS selectors and URL fragments found in string literals of one Kotlin file."""
+    selectors, fragments = set(), set()
+    for literal in KOTLIN_STRING.findall(content):
+        if "$" in literal or "/" in literal:
+            for piece in TEMPLATE_EXPR.split(literal):
+                for fragment in URL_FRAGMENT.findall(piece):
+                    fragment = fragment.strip("/?&=")
+                    if NOT_A_FRAGMENT.search(fragment):
+                        continue
+                    if "/" in fragment or ".php" in fragment or "_" in fragment:
+                        fragments.add(fragment)
+            continue
+        for part in literal.split(","):
+            part = part.strip()
+            if not SELECTOR_HINT.search(part) or NOT_A_SELECTOR.match(part) or len(part) > 60:
+                continue
+            try:
+                compile_selector(part)
+            except SelectorError:
+                continue
+            selectors.add(part)
+    return {"selectors": sorted(selectors), "fragments": sorted(f for f in fragments if len(f) >= 6)}
+
+@dataclass
+class ThemeMatch:
+    theme: str
+    score: float
+    coverage: float
+    matched: List[str]
+
+class SignatureIndex:
+    """Compiled theme signatures; classify() takes a page's HTML."""
+
+    def __init__(self, features: Dict[str, dict]):
+        self.themes = sorted(features)
+        owners = {}
+        for theme, found in features.items():
+            for selector in found["selectors"]:
+                owners.setdefault(("selector", selector), set()).add(theme)
+            for fragment in found["fragments"]:
+                owners.setdefault(("fragment", re.escape(fragment)), set()).add(theme)
+            for marker in THEME_MARKERS.get(theme, []):
+                owners.setdefault(("marker", marker), set()).add(theme)
+
+        base = {"selector": SELECTOR_WEIGHT, "fragment": FRAGMENT_WEIGHT, "marker": MARKER_WEIGHT}
+        self.features = []
+        self.totals = {theme: 0.0 for theme in self.themes}
+        for (kind, value), themes in sorted(owners.items()):
+            weight = base[kind] / len(themes)
+            self.features.append((kind, value, frozenset(themes), weight))
+            for theme in themes:
+                self.totals[theme] += weight
+
+        self.selectors = {value: compile_selector(value) for kind, value, _, _ in self.features if kind == "selector"}
+        self._selector_index = SelectorIndex(self.selectors)
+        # Matching is case-insensitive: pages are lowercased once instead of
+        # using re.I, which is many times slower on multi-MB pages. Markers
+        # must not use uppercase escapes (\S, \W, ...) for this to hold.
+        self._text = [(value, re.compile(value.lower())) for kind, value, _, _ in self.features if kind != "selector"]
+
+    def hits(self, html: str) -> set:
+        """Feature values present in one page."""
+        lowered = html.lower()
+        found = {value for value, pattern in self._text if pattern.search(lowered)}
+        return found | self._selector_index.matching(parse_html(html))
+
+    def rank(self, pages: List[str]) -> List[ThemeMatch]:
+        """
+        Themes ordered by the weighted evidence seen on any of `pages`. Coverage
+        is the share of a theme's total weight; a single page rarely shows more
+        than a third of it, so it is reported but not used for ranking.
+        """
+        found = set()
+        for html in pages:
+            found |= self.hits(html)
+        scores = {theme: 0.0 for theme in self.themes}
+        matched = {theme: [] for theme in self.themes}
+        for kind, value, themes, weight in self.features:
+            if value in found:
+                for theme in themes:
+                    scores[theme] += weight
+                    matched[theme].append(f"{kind}:{value}")
+        results = [
+            ThemeMatch(theme, scores[theme], scores[theme] / self.totals[theme] if self.totals[theme] else 0.0,
+                       matched[theme])
+            for theme in self.themes
+        ]
+        return sorted(results, key=lambda m: m.score, reverse=True)
+
+    def classify(self, pages: List[str], threshold: float = MIN_SCORE, margin: float = MIN_MARGIN) -> Optional[ThemeMatch]:
+        """Best theme if it clears `threshold` and beats the runner-up by `margin` times, else None."""
+        return self.classify_ranked(self.rank(pages), threshold, margin)
+
+    @staticmethod
+    def classify_ranked(ranked: List[ThemeMatch], threshold: float = MIN_SCORE,
+                        margin: float = MIN_MARGIN) -> Optional[ThemeMatch]:
+        """classify() on an existing rank() result."""
+        if not ranked or ranked[0].score < threshold:
+            return None
+        if len(ranked) > 1 and ranked[1].score * margin > ranked[0].score:
+            return None
+        return ranked[0]
+
+def theme_dirs(base: Path) -> Dict[str, Path]:
+    multisrc = base / "multisrc"
+    if not multisrc.is_dir():
+        return {}
+    return {
+        d.name: d / "main" / "src" for d in sorted(multisrc.iterdir())
+        if (d / "build.gradle.kts").is_file() and (d / "main" / "src").is_dir()
+    }
+
+def load_signatures(base_path="sources", cache_path=None, rebuild: bool = False) -> SignatureIndex:
+    base = Path(base_path)
+    root = base.resolve().parent
+    cache = Path(cache_path) if cache_path else root / DEFAULT_CACHE
+
+    themes = theme_dirs(base)
+    files = {theme: sorted(src.rglob("*.kt")) for theme, src in themes.items()}
+    all_files = [path for paths in files.values() for path in paths]
+    parsed = cached_parse(all_files, base, extract_features, cache, CACHE_VERSION, rebuild)
+
+    features = {}
+    for theme, paths in files.items():
+        selectors, fragments = set(), set()
+        for path in paths:
+            result = parsed[path.relative_to(base).as_posix()]
+            selectors.update(result["selectors"])
+            fragments.update(result["fragments"])
+        features[theme] = {"selectors": sorted(selectors), "fragments": sorted(fragments)}
+    return SignatureIndex(features)
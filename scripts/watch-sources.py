@@ -0,0 +1,574 @@
+#!/usr/bin/env python3
+"""
+Watch sources/ and re-check a source the moment it is saved, without Gradle.
+
+On every save under sources/ (or fixtures/) only the touched module is
+re-read: its build file into the shared catalog index, its Kotlin files for
+ID declarations (collisions are checked against every other source), and its
+DSL selectors, which are run against its smoke-test fixtures. Results are
+printed and pushed to every client of a local socket, typically well under a
+second after the save.
+
+Changes are picked up with inotify on Linux and by polling elsewhere (or with
+--poll). Gradle only runs when asked: type `gradle` (last checked source) or
+`gradle <source>` in the terminal, or send {"cmd": "gradle", "source": ...}.
+
+The socket on 127.0.0.1 speaks newline-delimited JSON, or WebSocket when a
+client opens with an HTTP upgrade (a browser page, the test server's UI).
+Clients receive "hello", "result", "removed" and "gradle" events and may send
+{"cmd": "check" | "gradle" | "status", "source": name or module path}.
+
+Usage:
+    python scripts/watch-sources.py                    # Watch, serve on 127.0.0.1:8765
+    python scripts/watch-sources.py --port 0 --poll    # Any free port, no inotify
+    python scripts/watch-sources.py --once sources/en/novelfull/main/src/ireader/novelfull/NovelFull.kt
+    nc 127.0.0.1 8765                                  # Follow the results as JSON lines
+
+Terminal commands: check [source], gradle [source], status, quit
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import os
+import selectors
+import socket
+import struct
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from build_graph import task_name
+from html_dom import parse_file
+from selector_detect import find_snapshots
+from source_catalog import load_catalog, update_catalog
+from source_ids import IdIndex, build_index
+from source_selectors import STAGES, failed, load_source_selectors, run_stages, stage_cell
+from source_watch import watch
+
+DEFAULT_PORT = 8765
+SETTLE_SECONDS = 0.05
+WATCHED_SUFFIXES = {".kt", ".kts", ".html", ".htm"}
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+# A client silent this long is a line client; an upgrade must be complete within the timeout
+HANDSHAKE_WAIT = 0.25
+HANDSHAKE_TIMEOUT = 2.0
+
+class Revalidator:
+    """The catalog and ID index in memory, updated one module at a time."""
+
+    def __init__(self, base: Path, fixtures: Path):
+        self.base = base
+        self.root = base.resolve().parent
+        self.fixtures = fixtures
+        self.rescan()
+
+    def rescan(self):
+        self.catalog = load_catalog(self.base)
+        self.ids = build_index(self.base, catalog=self.catalog)
+
+    def find_module(self, wanted: str) -> Optional[str]:
+        """Module of a source name or module path (sources/en/novelfull, en/novelfull)."""
+        wanted = wanted.strip().strip("/")
+        for module in self.catalog.modules():
+            names = {record.name.lower() for record in self.catalog.by_module(module)}
+            if wanted.lower() in names or module == wanted or module.endswith("/" + wanted):
+                return module
+        return None
+
+    def _relative(self, path: Path) -> Optional[Path]:
+        try:
+            return path.resolve().relative_to(self.root)
+        except ValueError:
+            return None
+
+    def affected(self, paths) -> tuple:
+        """(build files, modules) a batch of changed paths touches."""
+        build_files, modules = set(), set()
+        fixtures = self.fixtures.resolve()
+        for path in map(Path, paths):
+            if path.suffix not in WATCHED_SUFFIXES:
+                continue
+            try:
+                under_fixtures = path.resolve().parent.relative_to(fixtures)
+            except ValueError:
+                under_fixtures = None
+            if under_fixtures is not None:
+                modules.add(f"{self.base.name}/{under_fixtures.as_posix()}")
+                continue
+            rel = self._relative(path)
+            if rel is None:
+                continue
+            if path.name == "build.gradle.kts":
+                build_files.add(self.base / rel.relative_to(self.base.name))
+            modules.update(record.module for record in self.catalog.module_for_path(rel))
+        return build_files, modules
+
+    def revalidate(self, paths) -> List[dict]:
+        """Results for every module `paths` touch, plus "removed" events for deleted sources."""
+        started = time.perf_counter()
+        build_files, modules = self.affected(paths)
+        events = []
+        if build_files:
+            before = {record.module for record in self.catalog if record.build_file in
+                      {f"{self.base.name}/{path.relative_to(self.base).as_posix()}" for path in build_files}}
+            self.catalog = update_catalog(self.catalog, build_files)
+            after = {record.module for record in self.catalog if record.build_file in
+                     {f"{self.base.name}/{path.relative_to(self.base).as_posix()}" for path in build_files}}
+            modules |= after
+            removed = before - after
+            events += [{"event": "removed", "module": module} for module in sorted(removed)]
+            modules -= removed
+            if removed:
+                self.ids = IdIndex([entry for entry in self.ids.entries if entry.module not in removed])
+        modules = {module for module in modules if self.catalog.by_module(module)}
+        if modules:
+            events += self.check(modules)
+        for event in events:
+            event.setdefault("ms", round((time.perf_counter() - started) * 1000, 1))
+        return events
+
+    def check(self, modules) -> List[dict]:
+        """Re-check IDs and selectors of `modules` against the in-memory catalog."""
+        started = time.perf_counter()
+        fresh = build_index(self.base, catalog=self.catalog, modules=modules).entries
+        self.ids = IdIndex([entry for entry in self.ids.entries if entry.module not in modules] + fresh)
+        collisions = self.ids.collisions()
+        selectors = load_source_selectors(self.catalog, modules=modules)
+
+        results = []
+        for module in sorted(modules):
+            records = self.catalog.by_module(module)
+            entries = [entry for entry in fresh if entry.module == module]
+            clashes = [{"id": entry.id, "name": entry.name, "lang": entry.lang,
+                        "with": sorted({f"{other.name} ({other.lang}) in {other.module}"
+                                        for other in collisions[entry.id] if other is not entry})}
+                       for entry in entries if entry.id in collisions]
+            drift = [dict(asdict(entry), expected=sorted(entry.expected_ids)) for entry in entries if entry.drifted]
+
+            folder = self.fixtures / Path(module).relative_to(self.base.name)
+            stages = selectors.get(module, {})
+            if folder.is_dir():
+                pages = {kind: path.as_posix() for kind, path in find_snapshots(folder).items()}
+                stage_results = run_stages(stages, pages, parse_file)
+            else:
+                stage_results = {stage: {"ok": None, "error": "no fixture"} for stage in STAGES}
+
+            results.append({
+                "event": "result",
+                "module": module,
+                "sources": [f"{record.name} ({record.lang})" for record in records],
+                "catalog": [{"name": r.name, "lang": r.lang, "versionCode": r.version_code, "id": r.source_id}
+                            for r in records],
+                "ids": {"collisions": clashes, "drift": drift},
+                "fixtures": folder.as_posix() if folder.is_dir() else None,
+                "stages": stage_results,
+                "ok": not clashes and not failed(stage_results),
+                "checkMs": round((time.perf_counter() - started) * 1000, 1),
+            })
+        return results
+
+def run_gradle(gradle: str, records, root: Path) -> dict:
+    """Assemble the debug APK of `records`; the last lines of output on failure."""
+    tasks = sorted({task_name(record, "Debug") for record in records})
+    started = time.perf_counter()
+    try:
+        result = subprocess.run([gradle, *tasks], cwd=root, capture_output=True, text=True)
+        ok, output = result.returncode == 0, result.stdout + result.stderr
+    except OSError as e:
+        ok, output = False, str(e)
+    return {"event": "gradle", "tasks": tasks, "ok": ok, "seconds": round(time.perf_counter() - started, 1),
+            "tail": [] if ok else output.strip().splitlines()[-20:]}
+
+def websocket_accept(key: str) -> str:
+    return base64.b64encode(hashlib.sha1((key + WEBSOCKET_GUID).encode()).digest()).decode()
+
+def websocket_frame(payload: bytes, opcode: int = 1) -> bytes:
+    """One unmasked, unfragmented server frame."""
+    size = len(payload)
+    if size < 126:
+        header = struct.pack("!BB", 0x80 | opcode, size)
+    elif size < 1 << 16:
+        header = struct.pack("!BBH", 0x80 | opcode, 126, size)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, size)
+    return header + payload
+
+def websocket_parse(buffer: bytes):
+    """(opcode, payload, bytes used) of the first complete frame in `buffer`, or None."""
+    if len(buffer) < 2:
+        return None
+    opcode, size, offset = buffer[0] & 0x0F, buffer[1] & 0x7F, 2
+    if size == 126:
+        if len(buffer) < 4:
+            return None
+        size, offset = struct.unpack_from("!H", buffer, 2)[0], 4
+    elif size == 127:
+        if len(buffer) < 10:
+            return None
+        size, offset = struct.unpack_from("!Q", buffer, 2)[0], 10
+    mask = b""
+    if buffer[1] & 0x80:
+        mask, offset = bytes(buffer[offset:offset + 4]), offset + 4
+    if len(buffer) < offset + size or len(mask) not in (0, 4):
+        return None
+    payload = bytes(buffer[offset:offset + size])
+    if mask:
+        payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+    return opcode, payload, offset + size
+
+class Client:
+    """One socket client, JSON lines or WebSocket."""
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.buffer = b""
+        self.websocket = False
+        # Events wait here until the first bytes (or silence) tell the protocol
+        self.queued: Optional[List[dict]] = []
+        self.connected = time.monotonic()
+
+    def handshake(self) -> bool:
+        """Upgrade to WebSocket if the client asked for it; False until its request is complete."""
+        if b"\r\n\r\n" not in self.buffer:
+            return False
+        request, self.buffer = self.buffer.split(b"\r\n\r\n", 1)
+        headers = {}
+        for line in request.decode("latin-1").split("\r\n")[1:]:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        self.sock.sendall(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                           f"Sec-WebSocket-Accept: {websocket_accept(headers.get('sec-websocket-key', ''))}"
+                           "\r\n\r\n").encode())
+        self.websocket = True
+        return True
+
+    def decide(self) -> bool:
+        """Settle the protocol and send what was queued; False while an upgrade request is incomplete."""
+        if self.queued is None:
+            return True
+        if self.buffer and b"GET ".startswith(self.buffer[:4]) and not self.handshake():
+            return False
+        queued, self.queued = self.queued, None
+        for event in queued:
+            self.send(event)
+        return True
+
+    @property
+    def deadline(self) -> float:
+        """When an undecided client is settled by expire()."""
+        return self.connected + (HANDSHAKE_TIMEOUT if self.buffer else HANDSHAKE_WAIT)
+
+    def expire(self, now: float):
+        """Called while undecided: silent clients become line clients, stalled upgrades raise ConnectionError."""
+        if now < self.deadline:
+            return
+        if self.buffer:
+            raise ConnectionError("no complete WebSocket upgrade")
+        self.decide()
+
+    def send(self, event: dict):
+        if self.queued is not None:
+            self.queued.append(event)
+            return
+        data = json.dumps(event, ensure_ascii=False).encode()
+        self.sock.sendall(websocket_frame(data) if self.websocket else data + b"\n")
+
+    def messages(self) -> List[str]:
+        """Complete messages received so far; a WebSocket close raises ConnectionError."""
+        messages = []
+        if not self.decide():
+            return messages
+        if not self.websocket:
+            *lines, self.buffer = self.buffer.split(b"\n")
+            return [line.decode("utf-8", errors="replace") for line in lines if line.strip()]
+        while True:
+            frame = websocket_parse(self.buffer)
+            if frame is None:
+                return messages
+            opcode, payload, used = frame
+            self.buffer = self.buffer[used:]
+            if opcode == 8:
+                raise ConnectionError("closed")
+            if opcode == 9:
+                self.sock.sendall(websocket_frame(payload, 10))
+            elif opcode == 1:
+                messages.append(payload.decode("utf-8", errors="replace"))
+
+class Hub:
+    """Connected clients; broadcasts may come from the Gradle thread."""
+
+    def __init__(self):
+        self.clients: Dict[socket.socket, Client] = {}
+        self.lock = threading.Lock()
+
+    def add(self, sock: socket.socket) -> Client:
+        # Nothing is read here: the protocol is settled by receive() or expire(),
+        # so a silent client cannot stall the selector loop. The timeout bounds sends.
+        sock.settimeout(2)
+        client = Client(sock)
+        with self.lock:
+            self.clients[sock] = client
+        return client
+
+    def receive(self, client: Client) -> List[str]:
+        """Read what the selector reported; raises OSError when the client is gone."""
+        data = client.sock.recv(65536)
+        if not data:
+            raise ConnectionError("closed")
+        client.buffer += data
+        with self.lock:
+            return client.messages()
+
+    def undecided(self) -> List[Client]:
+        with self.lock:
+            return [client for client in self.clients.values() if client.queued is not None]
+
+    def expire(self, now: float) -> List[Client]:
+        """Settle clients that stayed silent; returns the ones to drop."""
+        dropped = []
+        for client in self.undecided():
+            try:
+                with self.lock:
+                    client.expire(now)
+            except OSError:
+                dropped.append(client)
+        return dropped
+
+    def drop(self, sock: socket.socket):
+        with self.lock:
+            self.clients.pop(sock, None)
+        sock.close()
+
+    def send(self, client: Client, event: dict):
+        try:
+            with self.lock:
+                client.send(event)
+        except OSError:
+            self.drop(client.sock)
+
+    def broadcast(self, event: dict):
+        with self.lock:
+            clients = list(self.clients.values())
+        for client in clients:
+            self.send(client, event)
+
+def describe(event: dict) -> str:
+    """One terminal line per event."""
+    kind = event["event"]
+    if kind == "removed":
+        return f"  removed {event['module']}"
+    if kind == "gradle":
+        status = "ok" if event["ok"] else "FAILED"
+        lines = "".join(f"\n      {line}" for line in event["tail"])
+        return f"  gradle {' '.join(event['tasks'])}: {status} ({event['seconds']}s){lines}"
+    if kind != "result":
+        return f"  {json.dumps(event)}"
+    ids = event["ids"]
+    parts = [f"ID {c['id']} also used by {', '.join(c['with'])}" for c in ids["collisions"]] or ["ids ok"]
+    if ids["drift"]:
+        parts.append(f"{len(ids['drift'])} drifted ID(s)")
+    if event["fixtures"]:
+        parts += [f"{stage} {stage_cell(stage, event['stages'][stage])}" for stage in STAGES]
+    else:
+        parts.append("no fixtures")
+    mark = "ok  " if event["ok"] else "FAIL"
+    return f"{mark} {', '.join(event['sources'])[:40]:<40} {' | '.join(parts)}  ({event['ms']:.0f} ms)"
+
+class Daemon:
+    def __init__(self, revalidator: Revalidator, hub: Hub, gradle: str, quiet: bool):
+        self.revalidator = revalidator
+        self.hub = hub
+        self.gradle = gradle
+        self.quiet = quiet
+        self.last_module = None
+        self.building = threading.Lock()
+        self.running = True
+
+    def publish(self, events: List[dict]):
+        for event in events:
+            if event["event"] == "result":
+                self.last_module = event["module"]
+            if not self.quiet:
+                print(describe(event), flush=True)
+            self.hub.broadcast(event)
+
+    def status(self) -> dict:
+        catalog = self.revalidator.catalog
+        return {"event": "status", "sources": len(catalog), "modules": len(catalog.modules()),
+                "clients": len(self.hub.clients), "last": self.last_module,
+                "building": self.building.locked()}
+
+    def command(self, command: dict, client: Optional[Client] = None):
+        """check / gradle / status for `command["source"]`, else the last checked source."""
+        name = command.get("cmd")
+        wanted = command.get("source")
+        module = self.revalidator.find_module(wanted) if wanted else self.last_module
+        reply = None
+        if name == "status":
+            reply = self.status()
+        elif name not in ("check", "gradle"):
+            reply = {"event": "error", "error": f"unknown command {name!r}; use check, gradle or status"}
+        elif module is None:
+            reply = {"event": "error", "error": f"no source {wanted!r}" if wanted else "no source checked yet"}
+        elif name == "check":
+            started = time.perf_counter()
+            events = self.revalidator.check({module})
+            for event in events:
+                event["ms"] = round((time.perf_counter() - started) * 1000, 1)
+            self.publish(events)
+        elif not self.building.acquire(blocking=False):
+            reply = {"event": "error", "error": "a Gradle build is already running"}
+        else:
+            records = self.revalidator.catalog.by_module(module)
+            if not self.quiet:
+                print(f"  gradle: building {module}...", flush=True)
+
+            def build():
+                try:
+                    self.publish([dict(run_gradle(self.gradle, records, self.revalidator.root), module=module)])
+                finally:
+                    self.building.release()
+            threading.Thread(target=build, daemon=True).start()
+        if reply:
+            if client:
+                self.hub.send(client, reply)
+            elif not self.quiet:
+                print(describe(reply), flush=True)
+
+    def terminal(self, line: str):
+        words = line.split(maxsplit=1)
+        if not words:
+            return
+        if words[0] in ("quit", "exit", "q"):
+            self.running = False
+            return
+        self.command({"cmd": words[0], "source": words[1] if len(words) > 1 else None})
+
+    def serve(self, watched, listener: socket.socket, use_stdin: bool):
+        selector = selectors.DefaultSelector()
+        selector.register(listener, selectors.EVENT_READ, "accept")
+        if watched.fileno() is not None:
+            selector.register(watched, selectors.EVENT_READ, "watch")
+        if use_stdin:
+            selector.register(sys.stdin, selectors.EVENT_READ, "stdin")
+
+        pending, deadline = set(), None
+        next_poll = time.monotonic() + getattr(watched, "interval", 0)
+        while self.running:
+            now = time.monotonic()
+            waits = [deadline - now] if deadline else []
+            if watched.fileno() is None:
+                waits.append(next_poll - now)
+            undecided = self.hub.undecided()
+            if undecided:
+                waits.append(min(client.deadline for client in undecided) - now)
+            for key, _ in selector.select(max(0.0, min(waits)) if waits else None):
+                if key.data == "accept":
+                    sock, _ = listener.accept()
+                    client = self.hub.add(sock)
+                    selector.register(sock, selectors.EVENT_READ, client)
+                    self.hub.send(client, dict(self.status(), event="hello", watcher=watched.kind))
+                elif key.data == "watch":
+                    changed, overflow = watched.read()
+                    pending.update(changed)
+                    if overflow:
+                        self.revalidator.rescan()
+                    deadline = time.monotonic() + SETTLE_SECONDS if pending else deadline
+                elif key.data == "stdin":
+                    line = sys.stdin.readline()
+                    if not line:
+                        selector.unregister(sys.stdin)
+                    else:
+                        self.terminal(line)
+                else:
+                    self.receive(selector, key.data)
+
+            now = time.monotonic()
+            for client in self.hub.expire(now):
+                selector.unregister(client.sock)
+                self.hub.drop(client.sock)
+            if watched.fileno() is None and now >= next_poll:
+                changed, _ = watched.read()
+                pending.update(changed)
+                next_poll = now + watched.interval
+                if changed:
+                    deadline = now + SETTLE_SECONDS
+            if pending and deadline and now >= deadline:
+                batch, pending, deadline = pending, set(), None
+                self.publish(self.revalidator.revalidate(batch))
+
+    def receive(self, selector, client: Client):
+        try:
+            messages = self.hub.receive(client)
+        except OSError:
+            selector.unregister(client.sock)
+            self.hub.drop(client.sock)
+            return
+        for message in messages:
+            try:
+                command = json.loads(message)
+                if not isinstance(command, dict):
+                    raise ValueError("not an object")
+            except ValueError as e:
+                self.hub.send(client, {"event": "error", "error": f"bad command: {e}"})
+                continue
+            self.command(command, client)
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-check sources on save and push the results to a local socket")
+    parser.add_argument("--path", default="sources", help="Sources directory (default: sources)")
+    parser.add_argument("--fixtures", type=Path, default=Path("fixtures"), help="Fixtures directory (default: fixtures)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port on 127.0.0.1 (default: {DEFAULT_PORT})")
+    parser.add_argument("--poll", action="store_true", help="Poll for changes instead of using inotify")
+    parser.add_argument("--gradle", default="./gradlew", help="Gradle command for `gradle` (default: ./gradlew)")
+    parser.add_argument("--once", nargs="+", metavar="FILE", help="Check the sources owning these files and exit")
+    parser.add_argument("--json", action="store_true", help="With --once, print the results as JSON")
+    parser.add_argument("--quiet", action="store_true", help="Only serve results, print nothing per save")
+    args = parser.parse_args()
+
+    base = Path(args.path)
+    if not base.is_dir():
+        sys.exit(f"Error: sources directory {base} not found")
+
+    started = time.perf_counter()
+    revalidator = Revalidator(base, args.fixtures)
+    if args.once:
+        events = revalidator.revalidate([Path(path) for path in args.once])
+        if args.json:
+            print(json.dumps(events, indent=2))
+        else:
+            for event in events:
+                print(describe(event))
+            if not events:
+                print("No source owns these files.")
+        sys.exit(0 if all(event.get("ok", True) for event in events) else 1)
+
+    watched, warning = watch([base, args.fixtures], poll=args.poll)
+    if warning:
+        print(f"Warning: {warning}", file=sys.stderr)
+    try:
+        listener = socket.create_server(("127.0.0.1", args.port))
+    except OSError as e:
+        sys.exit(f"Error: cannot listen on 127.0.0.1:{args.port}: {e}")
+    listener.setblocking(False)
+
+    daemon = Daemon(revalidator, Hub(), args.gradle, args.quiet)
+    print(f"Watching {len(revalidator.catalog)} sources ({watched.kind}, {time.perf_counter() - started:.1f}s to load); "
+          f"results on 127.0.0.1:{listener.getsockname()[1]}")
+    print("Commands: check [source], gradle [source], status, quit", flush=True)
+    try:
+        daemon.serve(watched, listener, use_stdin=os.name == "posix" and sys.stdin is not None and sys.stdin.isatty())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watched.close()
+        listener.close()
+
+if __name__ == "__main__":
+    main()
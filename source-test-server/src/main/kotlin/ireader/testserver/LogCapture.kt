@@ -3,6 +3,11 @@ package ireader.testserver
 import co.touchlab.kermit.LogWriter
 import co.touchlab.kermit.Logger
 import co.touchlab.kermit.Severity
+import kotlinx.serialization.json.Json
+import kotlinx.serialization.json.double
+import kotlinx.serialization.json.jsonObject
+import kotlinx.serialization.json.jsonPrimitive
+import java.util.concurrent.ConcurrentHashMap
 import java.util.concurrent.ConcurrentLinkedDeque
 import java.time.LocalDateTime
 import java.time.format.DateTimeFormatter
@@ -10,12 +15,32 @@ import java.time.format.DateTimeFormatter
 /**
  * Captures logs from sources and makes them available via API.
  * Also prints to console for immediate visibility.
+ *
+ * Timing spans from instrumented sources (tag SourceTrace) are not buffered;
+ * they are folded into per-source totals, see getTraces().
  */
 object LogCapture {
     
     private val logs = ConcurrentLinkedDeque<LogEntry>()
     private const val MAX_LOGS = 500
     private val formatter = DateTimeFormatter.ofPattern("HH:mm:ss.SSS")
+    private const val TRACE_TAG = "SourceTrace"
+    
+    // source -> (operation, phase) -> stats
+    private val traces = ConcurrentHashMap<String, ConcurrentHashMap<Pair<String, String>, TraceStats>>()
+    
+    private class TraceStats {
+        var count = 0
+        var totalMs = 0.0
+        var maxMs = 0.0
+        
+        @Synchronized
+        fun add(ms: Double) {
+            count++
+            totalMs += ms
+            maxMs = maxOf(maxMs, ms)
+        }
+    }
     
     data class LogEntry(
         val timestamp: String,
@@ -32,6 +57,8 @@ object LogCapture {
         Logger.setMinSeverity(Severity.Verbose)
         Logger.addLogWriter(object : LogWriter() {
             override fun log(severity: Severity, message: String, tag: String, throwable: Throwable?) {
+                if (tag == TRACE_TAG && recordTrace(message)) return
+                
                 val entry = LogEntry(
                     timestamp = LocalDateTime.now().format(formatter),
                     level = severity.name,
@@ -86,4 +113,54 @@ object LogCapture {
     fun clearLogs() {
         logs.clear()
     }
+    
+    private fun recordTrace(message: String): Boolean {
+        val span = try {
+            Json.parseToJsonElement(message).jsonObject
+        } catch (e: Exception) {
+            return false
+        }
+        val source = span["source"]?.jsonPrimitive?.content ?: return false
+        val operation = span["operation"]?.jsonPrimitive?.content ?: return false
+        val phase = span["phase"]?.jsonPrimitive?.content ?: return false
+        val ms = span["ms"]?.jsonPrimitive?.double ?: return false
+        traces.getOrPut(source) { ConcurrentHashMap() }
+            .getOrPut(operation to phase) { TraceStats() }
+            .add(ms)
+        return true
+    }
+    
+    /**
+     * Per-source time by operation and phase, slowest source first.
+     */
+    fun getTraces(source: String? = null): List<SourceTraceSummary> {
+        return traces.entries
+            .filter { source == null || it.key.equals(source, ignoreCase = true) }
+            .map { (name, spans) ->
+                val rows = spans.map { (key, stats) ->
+                    synchronized(stats) {
+                        TraceSpan(key.first, key.second, stats.count, stats.totalMs, stats.totalMs / stats.count, stats.maxMs)
+                    }
+                }.sortedByDescending { it.totalMs }
+                SourceTraceSummary(name, rows.sumOf { it.totalMs }, rows)
+            }
+            .sortedByDescending { it.totalMs }
+    }
+    
+    /**
+     * Traces as folded stacks ("source;operation;phase microseconds"),
+     * the input format of flamegraph.pl and speedscope.
+     */
+    fun getFoldedTraces(source: String? = null): String {
+        return getTraces(source).flatMap { summary ->
+            summary.spans.map { "${summary.source};${it.operation};${it.phase} ${(it.totalMs * 1000).toLong()}" }
+        }.joinToString("\n")
+    }
+    
+    /**
+     * Clear aggregated traces.
+     */
+    fun clearTraces() {
+        traces.clear()
+    }
 }
@@ -101,3 +101,23 @@ data class SourceTestSuite(
     val source: String,
     val tests: List<TestResult>
 )
+
+/**
+ * Time a source spent in one operation/phase, aggregated from SourceTrace logs
+ */
+@Serializable
+data class TraceSpan(
+    val operation: String,
+    val phase: String,
+    val count: Int,
+    val totalMs: Double,
+    val meanMs: Double,
+    val maxMs: Double
+)
+
+@Serializable
+data class SourceTraceSummary(
+    val source: String,
+    val totalMs: Double,
+    val spans: List<TraceSpan>
+)
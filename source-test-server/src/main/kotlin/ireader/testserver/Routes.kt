@@ -69,6 +69,21 @@ fun Application.configureRouting() {
                 call.respond(mapOf("success" to true, "message" to "Logs cleared"))
             }
             
+            // Fetch/parse/select timings of instrumented sources
+            get("/traces") {
+                call.respond(LogCapture.getTraces(call.request.queryParameters["source"]))
+            }
+            
+            // The same timings as folded stacks for flame graph tools
+            get("/traces/folded") {
+                call.respondText(LogCapture.getFoldedTraces(call.request.queryParameters["source"]), ContentType.Text.Plain)
+            }
+            
+            post("/traces/clear") {
+                LogCapture.clearTraces()
+                call.respond(mapOf("success" to true, "message" to "Traces cleared"))
+            }
+            
             // Reload sources (adds new sources only)
             post("/reload") {
                 val deps = sourceManager.getDependencies()
@@ -199,6 +214,19 @@ fun Application.configureRouting() {
                 }
             }
             
+            // Where source requests go: the live web, or a local snapshot site
+            get("/mock-origin") {
+                call.respond(mapOf("origin" to (sourceManager.mockOrigin ?: "")))
+            }
+            
+            post("/mock-origin") {
+                sourceManager.mockOrigin = call.request.queryParameters["url"]?.takeIf { it.isNotBlank() }
+                call.respond(mapOf(
+                    "success" to true,
+                    "origin" to (sourceManager.mockOrigin ?: "")
+                ))
+            }
+            
             // Start watching for file changes (auto-rebuild)
             post("/watch/start") {
                 if (sourceWatcher.isWatching) {
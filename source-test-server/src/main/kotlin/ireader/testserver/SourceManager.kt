@@ -22,6 +22,7 @@ import kotlinx.coroutines.CoroutineScope
 import kotlinx.serialization.KSerializer
 import kotlinx.serialization.json.Json
 import kotlinx.serialization.modules.SerializersModule
+import okhttp3.HttpUrl.Companion.toHttpUrlOrNull
 import java.util.concurrent.ConcurrentHashMap
 
 /**
@@ -31,6 +32,14 @@ class SourceManager {
     private val sources = ConcurrentHashMap<Long, CatalogSource>()
     private val sourcesByName = ConcurrentHashMap<String, CatalogSource>()
     
+    /**
+     * Origin that every source request is sent to instead of the live site,
+     * e.g. a local snapshot server. The real host is passed along in the
+     * [ORIGINAL_HOST_HEADER] header. Null sends requests to the live web.
+     */
+    @Volatile
+    var mockOrigin: String? = System.getenv("IREADER_MOCK_ORIGIN")?.takeIf { it.isNotBlank() }
+    
     private val httpClient = HttpClient(OkHttp) {
         install(ContentNegotiation) {
             json(Json {
@@ -42,6 +51,21 @@ class SourceManager {
             config {
                 followRedirects(true)
                 followSslRedirects(true)
+                addInterceptor { chain ->
+                    val request = chain.request()
+                    val origin = mockOrigin?.toHttpUrlOrNull() ?: return@addInterceptor chain.proceed(request)
+                    val url = request.url.newBuilder()
+                        .scheme(origin.scheme)
+                        .host(origin.host)
+                        .port(origin.port)
+                        .build()
+                    chain.proceed(
+                        request.newBuilder()
+                            .url(url)
+                            .header(ORIGINAL_HOST_HEADER, request.url.host)
+                            .build()
+                    )
+                }
             }
         }
     }
@@ -51,6 +75,10 @@ class SourceManager {
         preferences = TestPreferenceStore()
     )
     
+    companion object {
+        const val ORIGINAL_HOST_HEADER = "X-Original-Host"
+    }
+    
     fun registerSource(source: CatalogSource) {
         sources[source.id] = source
         sourcesByName[source.name.lowercase()] = source